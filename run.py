@@ -2,6 +2,7 @@
 """
 Script principal para executar o GLaDOS Philosophy Planner
 """
+import multiprocessing
 import sys
 import os
 
@@ -12,4 +13,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from ui.main import main
 
 if __name__ == "__main__":
+    # Necessário para o pool de processos do OCR no executável empacotado
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
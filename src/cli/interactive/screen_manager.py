@@ -366,6 +366,18 @@ class ScreenManager:
             f"Blessed: {self.terminal.use_blessed}"
         ]
         
+        render = self.terminal.get_stats()
+        if render.get("render_count"):
+            stats.extend([
+                f"Render: {render['render_last_ms']:.2f}ms "
+                f"(média {render['render_avg_ms']:.2f}, máx {render['render_max_ms']:.2f})",
+                f"Saída: {render['bytes_last_frame']}B/frame "
+                f"(média {render['bytes_avg_frame']}B)",
+                f"Linhas alteradas: {render['rows_last_frame']}",
+                f"Limite: {render['max_fps']} fps | "
+                f"sem mudança: {render['frames_skipped']}",
+            ])
+        
         # Mostra estatísticas no canto superior direito
         for i, stat in enumerate(stats):
             x = term_width - len(stat) - 2
@@ -12,7 +12,6 @@ import re
 from typing import Dict, List, Optional, Tuple, Any, Union
 from enum import Enum
 import threading
-from collections import defaultdict
 
 try:
     from blessed import Terminal
@@ -136,6 +135,9 @@ class Key(Enum):
 class GLTerminal:
     """Terminal otimizado com Blessed e double buffering."""
     
+    # Teto de quadros por segundo (0 desativa o limite)
+    DEFAULT_MAX_FPS = 60
+    
     def __init__(self, use_blessed: bool = True):
         self.use_blessed = use_blessed and HAS_BLESSED
         
@@ -165,13 +167,20 @@ class GLTerminal:
                 self.width = 80
                 self.height = 24
         
-        # Buffers para renderização
-        self._current_buffer = {}
-        self._next_buffer = {}
-        self._dirty_regions = set()
+        # Frames por linha: caracteres e id de estilo por célula
+        # (_current_* = o que está na tela, _next_* = o frame em montagem)
+        self._frame_size = (0, 0)
+        self._current_chars: List[List[str]] = []
+        self._current_styles: List[List[int]] = []
+        self._next_chars: List[List[str]] = []
+        self._next_styles: List[List[int]] = []
+        self._dirty_rows = set()
+        self._all_rows_dirty = False
+        self._full_repaint = False
         
-        # Cache de estilos
+        # Cache de estilos: chave do dict -> id; id -> sequência de escape
         self._style_cache = {}
+        self._style_prefixes = [""]
         
         # Estado
         self.cursor_visible = False
@@ -179,6 +188,21 @@ class GLTerminal:
         self.last_render_time = 0
         self.render_count = 0
         
+        # Limite de quadros e estatísticas de renderização
+        self.max_fps = self.DEFAULT_MAX_FPS
+        self._last_frame_at = 0.0
+        self._render_stats = {
+            "frames": 0,
+            "skipped": 0,
+            "throttled": 0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+            "total_ms": 0.0,
+            "last_bytes": 0,
+            "total_bytes": 0,
+            "last_rows": 0,
+        }
+        
         # Lock para thread safety
         self._lock = threading.RLock()
         
@@ -316,11 +340,41 @@ class GLTerminal:
         
         return self.width, self.height
     
+    def _blank_rows(self, width: int, height: int) -> Tuple[List[List[str]], List[List[int]]]:
+        """Cria linhas vazias (espaço sem estilo) para um frame."""
+        return [[" "] * width for _ in range(height)], [[0] * width for _ in range(height)]
+    
+    def _ensure_frame(self):
+        """Ajusta os frames ao tamanho atual do terminal."""
+        size = (max(1, int(self.width)), max(1, int(self.height)))
+        if size == self._frame_size:
+            return
+        
+        width, height = size
+        next_chars, next_styles = self._blank_rows(width, height)
+        # Preserva o que já foi montado na área comum
+        for y in range(min(height, len(self._next_chars))):
+            keep = min(width, len(self._next_chars[y]))
+            next_chars[y][:keep] = self._next_chars[y][:keep]
+            next_styles[y][:keep] = self._next_styles[y][:keep]
+        
+        self._next_chars, self._next_styles = next_chars, next_styles
+        self._current_chars, self._current_styles = self._blank_rows(width, height)
+        self._frame_size = size
+        # Tamanho mudou: a tela real não corresponde mais ao frame atual
+        self._full_repaint = True
+        self._all_rows_dirty = True
+        self._dirty_rows.clear()
+    
     def clear(self):
         """Limpa o buffer interno."""
         with self._lock:
-            self._next_buffer.clear()
-            self._dirty_regions.clear()
+            self._ensure_frame()
+            width, height = self._frame_size
+            self._next_chars, self._next_styles = self._blank_rows(width, height)
+            # Qualquer linha pode ter ficado vazia: o flush compara todas
+            self._all_rows_dirty = True
+            self._dirty_rows.clear()
     
     def clear_screen(self):
         """Limpa completamente a tela real e buffers."""
@@ -334,9 +388,13 @@ class GLTerminal:
                 print("\033[2J\033[H", end="", flush=True)
             
             # Limpa buffers internos
-            self._current_buffer.clear()
-            self._next_buffer.clear()
-            self._dirty_regions.clear()
+            self._ensure_frame()
+            width, height = self._frame_size
+            self._current_chars, self._current_styles = self._blank_rows(width, height)
+            self._next_chars, self._next_styles = self._blank_rows(width, height)
+            self._dirty_rows.clear()
+            self._all_rows_dirty = False
+            self._full_repaint = False
             
             # Força um flush do stdout
             sys.stdout.flush()
@@ -345,26 +403,45 @@ class GLTerminal:
         """Adiciona texto ao buffer na posição especificada."""
         with self._lock:
             # Valida posição
-            if x < 0 or y < 0:
+            if x < 0 or y < 0 or not text:
                 return
             
-            # Aplica estilo se fornecido
-            if style:
-                styled_text = self._apply_style(text, style)
-            else:
-                styled_text = text
+            self._ensure_frame()
+            width, height = self._frame_size
+            if y >= height or x >= width:
+                return
             
-            # Armazena no buffer caractere por caractere
-            for i, char in enumerate(styled_text):
-                key = (y, x + i)
-                self._next_buffer[key] = char
+            # Texto já com escapes ocuparia células: guarda só o texto visível
+            if "\x1b" in text:
+                text = self._strip_ansi(text)
+            text = text[:width - x]
+            if not text:
+                return
             
-            # Marca região como suja
-            if styled_text:
-                self._dirty_regions.add((y, x, len(styled_text)))
+            style_id = self._style_id(style) if style else 0
+            end = x + len(text)
+            self._next_chars[y][x:end] = text
+            self._next_styles[y][x:end] = [style_id] * len(text)
+            
+            # Marca linha como suja
+            self._dirty_rows.add(y)
     
-    def _apply_style(self, text: str, style: Dict) -> str:
-        """Aplica estilos ao texto."""
+    def _style_id(self, style: Dict) -> int:
+        """Id do estilo no cache (0 = sem estilo)."""
+        cache_key = tuple(sorted(style.items()))
+        style_id = self._style_cache.get(cache_key)
+        if style_id is None:
+            prefix = self._style_prefix(style)
+            if prefix:
+                style_id = len(self._style_prefixes)
+                self._style_prefixes.append(prefix)
+            else:
+                style_id = 0
+            self._style_cache[cache_key] = style_id
+        return style_id
+    
+    def _style_prefix(self, style: Dict) -> str:
+        """Sequência de escape que liga o estilo."""
         if not self.use_blessed:
             # Fallback ANSI básico
             ansi_codes = []
@@ -394,160 +471,192 @@ class GLTerminal:
             if style.get("blink"):
                 ansi_codes.append("\033[5m")
             
-            if ansi_codes:
-                return f"{''.join(ansi_codes)}{text}\033[0m"
-            return text
+            return "".join(ansi_codes)
         
         # Usando Blessed
-        cache_key = hash(frozenset(style.items()))
-        if cache_key in self._style_cache:
-            style_func = self._style_cache[cache_key]
-        else:
-            # Converte estilos para Blessed
-            blessed_style = []
-            
-            # Mapeamento de cores
-            color_map = {
-                "primary": self.term.silver,
-                "accent": self.term.orange,
-                "secondary": self.term.blue,
-                "success": self.term.green,
-                "warning": self.term.yellow,
-                "error": self.term.red,
-                "info": self.term.gray,
-                "dim": self.term.dim,
-            }
-            
-            if "color" in style:
-                color_name = style["color"]
-                if color_name in color_map:
-                    blessed_style.append(color_map[color_name])
-            
-            if style.get("bold"):
-                blessed_style.append(self.term.bold)
-            if style.get("underline"):
-                blessed_style.append(self.term.underline)
-            if style.get("reverse"):
-                blessed_style.append(self.term.reverse)
-            if style.get("blink"):
-                blessed_style.append(self.term.blink)
-            
-            # Cria função de estilo
-            if blessed_style:
-                style_func = lambda t: "".join(blessed_style) + t + self.term.normal
-            else:
-                style_func = lambda t: t
-            
-            self._style_cache[cache_key] = style_func
+        blessed_style = []
         
-        return style_func(text)
+        # Mapeamento de cores
+        color_map = {
+            "primary": self.term.silver,
+            "accent": self.term.orange,
+            "secondary": self.term.blue,
+            "success": self.term.green,
+            "warning": self.term.yellow,
+            "error": self.term.red,
+            "info": self.term.gray,
+            "dim": self.term.dim,
+        }
+        
+        if "color" in style:
+            color_name = style["color"]
+            if color_name in color_map:
+                blessed_style.append(color_map[color_name])
+        
+        if style.get("bold"):
+            blessed_style.append(self.term.bold)
+        if style.get("underline"):
+            blessed_style.append(self.term.underline)
+        if style.get("reverse"):
+            blessed_style.append(self.term.reverse)
+        if style.get("blink"):
+            blessed_style.append(self.term.blink)
+        
+        return "".join(str(part) for part in blessed_style)
+    
+    def _style_reset(self) -> str:
+        return str(self.term.normal) if self.use_blessed else "\033[0m"
     
-    def flush(self):
-        """Renderiza apenas as alterações desde o último flush."""
+    def _apply_style(self, text: str, style: Dict) -> str:
+        """Aplica estilos ao texto."""
+        prefix = self._style_prefixes[self._style_id(style)]
+        if not prefix:
+            return text
+        return f"{prefix}{text}{self._style_reset()}"
+    
+    def _move(self, y: int, x: int) -> str:
+        if self.use_blessed:
+            return self.term.move(y, x)
+        return f"\033[{y+1};{x+1}H"
+    
+    def _clear_eol(self) -> str:
+        return str(self.term.clear_eol) if self.use_blessed else "\033[K"
+    
+    def flush(self, force: bool = False):
+        """
+        Renderiza apenas as linhas que mudaram desde o último flush.
+        
+        Cada linha suja é comparada com a da tela; só o trecho entre a
+        primeira e a última célula diferentes é reescrito (cauda vazia vira
+        "limpar até o fim da linha"). O frame sai numa única escrita. Acima
+        de ``max_fps`` o flush espera o intervalo restante, a menos que
+        ``force`` seja usado. A espera acontece fora do lock, para não
+        travar ``write``/``clear``/redimensionamento enquanto isso.
+        """
+        wait = 0.0
         with self._lock:
-            if not self._dirty_regions:
+            self._ensure_frame()
+            if not self._all_rows_dirty and not self._dirty_rows:
                 return
-            
-            # Se não usar Blessed, renderiza de forma simples
-            if not self.use_blessed:
-                self._simple_flush()
+            if not force and self.max_fps and self._last_frame_at:
+                wait = self._last_frame_at + 1.0 / self.max_fps - time.perf_counter()
+                if wait > 0:
+                    self._render_stats["throttled"] += 1
+        
+        if wait > 0:
+            time.sleep(wait)
+        
+        with self._lock:
+            # Outro flush pode ter desenhado o frame durante a espera
+            self._ensure_frame()
+            if not self._all_rows_dirty and not self._dirty_rows:
                 return
             
-            # Usando Blessed - calcula regiões otimizadas
-            regions = self._optimize_regions()
+            started = time.perf_counter()
+            height = self._frame_size[1]
+            if self._all_rows_dirty:
+                rows = range(height)
+            else:
+                rows = sorted(self._dirty_rows)
             
-            # Renderiza cada região
-            output_lines = []
-            for y, x_start, x_end in regions:
-                line_chars = []
-                for x in range(x_start, x_end):
-                    key = (y, x)
-                    if key in self._next_buffer:
-                        char = self._next_buffer[key]
-                        line_chars.append((x, char))
-                    elif key in self._current_buffer:
-                        # Espaço para limpar caractere anterior
-                        line_chars.append((x, " "))
-                
-                # Ordena por x e renderiza linha
-                if line_chars:
-                    line_chars.sort(key=lambda c: c[0])
-                    # Move cursor para início da linha
-                    output_lines.append(self.term.move(y, x_start))
-                    
-                    current_x = x_start
-                    for x, char in line_chars:
-                        if x > current_x:
-                            # Move para posição correta
-                            output_lines.append(self.term.move(y, x))
-                        output_lines.append(char)
-                        current_x = x + 1
+            output = []
+            if self._full_repaint:
+                output.append(self._clear_all())
+            changed = 0
+            for y in rows:
+                segment = self._diff_row(y)
+                if segment:
+                    output.append(segment)
+                    changed += 1
+            
+            self._dirty_rows.clear()
+            self._all_rows_dirty = False
+            self._full_repaint = False
+            
+            if not output:
+                self._render_stats["skipped"] += 1
+                return
             
             # Renderiza tudo de uma vez
-            if output_lines:
-                print("".join(output_lines), end="", flush=True)
+            frame = "".join(output)
+            sys.stdout.write(frame)
+            sys.stdout.flush()
             
-            # Atualiza buffers
-            self._current_buffer = self._next_buffer.copy()
-            self._dirty_regions.clear()
+            finished = time.perf_counter()
+            self._last_frame_at = finished
             self.render_count += 1
             self.last_render_time = time.time()
+            self._record_frame((finished - started) * 1000.0, len(frame.encode("utf-8")), changed)
     
-    def _simple_flush(self):
-        """Renderização simples sem Blessed."""
-        output_lines = []
-        
-        for (y, x, length) in self._dirty_regions:
-            # Pega o conteúdo para esta região
-            line_content = []
-            for i in range(length):
-                key = (y, x + i)
-                char = self._next_buffer.get(key, " ")
-                line_content.append(char)
-            
-            # Move cursor para posição e renderiza
-            output_lines.append(f"\033[{y+1};{x+1}H")
-            output_lines.append("".join(line_content))
-        
-        if output_lines:
-            print("".join(output_lines), end="", flush=True)
-        
-        self._current_buffer = self._next_buffer.copy()
-        self._dirty_regions.clear()
-        self.render_count += 1
-        self.last_render_time = time.time()
-    
-    def _optimize_regions(self) -> List[Tuple[int, int, int]]:
-        """Otimiza regiões sujas para renderização mínima."""
-        # Agrupa por linha
-        lines = defaultdict(list)
-        for y, x, length in self._dirty_regions:
-            lines[y].append((x, x + length))
-        
-        # Consolida intervalos por linha
-        optimized = []
-        for y, intervals in lines.items():
-            intervals.sort()
-            merged = []
-            
-            if not intervals:
-                continue
-                
-            current_start, current_end = intervals[0]
-            
-            for start, end in intervals[1:]:
-                if start <= current_end:
-                    current_end = max(current_end, end)
-                else:
-                    merged.append((current_start, current_end))
-                    current_start, current_end = start, end
-            
-            merged.append((current_start, current_end))
-            
-            for start, end in merged:
-                optimized.append((y, start, end))
+    def _clear_all(self) -> str:
+        if self.use_blessed:
+            return str(self.term.clear) + self.term.move(0, 0)
+        return "\033[2J\033[H"
+    
+    def _diff_row(self, y: int) -> str:
+        """Saída mínima para levar a linha ``y`` da tela ao próximo frame."""
+        next_chars = self._next_chars[y]
+        next_styles = self._next_styles[y]
+        current_chars = self._current_chars[y]
+        current_styles = self._current_styles[y]
+        if next_chars == current_chars and next_styles == current_styles:
+            return ""
         
-        return optimized
+        width = len(next_chars)
+        start = 0
+        while next_chars[start] == current_chars[start] and next_styles[start] == current_styles[start]:
+            start += 1
+        end = width - 1
+        while next_chars[end] == current_chars[end] and next_styles[end] == current_styles[end]:
+            end -= 1
+        
+        # Fim do conteúdo visível da linha nova
+        content_end = width
+        while content_end > start and next_chars[content_end - 1] == " " and next_styles[content_end - 1] == 0:
+            content_end -= 1
+        
+        parts = [self._move(y, start)]
+        if content_end > start:
+            parts.append(self._render_runs(next_chars, next_styles, start, min(end + 1, content_end)))
+        if end >= content_end:
+            parts.append(self._clear_eol())
+        
+        current_chars[:] = next_chars
+        current_styles[:] = next_styles
+        return "".join(parts)
+    
+    def _render_runs(self, chars: List[str], styles: List[int], start: int, stop: int) -> str:
+        """Texto de ``start`` a ``stop`` agrupado em trechos de mesmo estilo."""
+        parts = []
+        active = 0
+        x = start
+        while x < stop:
+            style_id = styles[x]
+            run_end = x + 1
+            while run_end < stop and styles[run_end] == style_id:
+                run_end += 1
+            if style_id != active:
+                if active:
+                    parts.append(self._style_reset())
+                if style_id:
+                    parts.append(self._style_prefixes[style_id])
+                active = style_id
+            parts.append("".join(chars[x:run_end]))
+            x = run_end
+        if active:
+            parts.append(self._style_reset())
+        return "".join(parts)
+    
+    def _record_frame(self, elapsed_ms: float, size: int, rows: int):
+        stats = self._render_stats
+        stats["frames"] += 1
+        stats["last_ms"] = elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["total_ms"] += elapsed_ms
+        stats["last_bytes"] = size
+        stats["total_bytes"] += size
+        stats["last_rows"] = rows
+    
     
     def _strip_ansi(self, text: str) -> str:
         """Remove códigos ANSI do texto."""
@@ -876,6 +985,15 @@ class GLTerminal:
                 print(self.term.clear_eol, end="", flush=True)
             else:
                 print("\033[K", end="", flush=True)
+            
+            # Mantém os frames coerentes com a tela: a linha ficou vazia
+            with self._lock:
+                if 0 <= y < len(self._next_chars):
+                    width = self._frame_size[0]
+                    for rows in (self._next_chars, self._current_chars):
+                        rows[y][:] = [" "] * width
+                    for rows in (self._next_styles, self._current_styles):
+                        rows[y][:] = [0] * width
         except:
             pass
     
@@ -895,13 +1013,28 @@ class GLTerminal:
     
     def get_stats(self) -> Dict:
         """Retorna estatísticas de renderização."""
+        with self._lock:
+            render = dict(self._render_stats)
+            frame_width, frame_height = self._frame_size
+            dirty_rows = frame_height if self._all_rows_dirty else len(self._dirty_rows)
+        
+        frames = render["frames"]
         return {
             "render_count": self.render_count,
             "last_render_time": self.last_render_time,
-            "buffer_size": len(self._current_buffer),
-            "dirty_regions": len(self._dirty_regions),
+            "buffer_size": frame_width * frame_height,
+            "dirty_regions": dirty_rows,
             "using_blessed": self.use_blessed,
             "terminal_size": f"{self.width}x{self.height}",
+            "max_fps": self.max_fps,
+            "frames_skipped": render["skipped"],
+            "frames_throttled": render["throttled"],
+            "render_last_ms": round(render["last_ms"], 3),
+            "render_avg_ms": round(render["total_ms"] / frames, 3) if frames else 0.0,
+            "render_max_ms": round(render["max_ms"], 3),
+            "bytes_last_frame": render["last_bytes"],
+            "bytes_avg_frame": render["total_bytes"] // frames if frames else 0,
+            "rows_last_frame": render["last_rows"],
         }
     
     def enable_debug(self, enabled: bool = True):
@@ -20,6 +20,7 @@ class BackendController(QObject):
     operation_completed = pyqtSignal(str, dict)  # (operation, result)
     operation_failed = pyqtSignal(str, str, dict)  # (operation, error, context)
     progress_updated = pyqtSignal(str, int, str, dict)  # (operation, %, msg, data)
+    stream_chunk = pyqtSignal(str, str)  # (operation, trecho parcial)
     data_changed = pyqtSignal(str, dict)  # (data_type, data)
     
     def __init__(self, backend_module: Any, name: str):
@@ -88,6 +89,9 @@ class BackendController(QObject):
         worker.progress_updated.connect(
             lambda pct, msg: self.progress_updated.emit(operation, pct, msg, {})
         )
+        worker.chunk_ready.connect(
+            lambda chunk: self.stream_chunk.emit(operation, chunk)
+        )
         
         # Conectar início/fim da thread
         worker_thread.started.connect(worker.run)
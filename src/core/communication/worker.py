@@ -15,6 +15,7 @@ class BackendWorker(QObject):
     result_ready = pyqtSignal(object)
     error_occurred = pyqtSignal(str)
     progress_updated = pyqtSignal(int, str)
+    chunk_ready = pyqtSignal(str)  # Trecho parcial de operações com streaming
     finished = pyqtSignal()
     
     def __init__(self, backend_instance, method_name: str, *args, **kwargs):
@@ -46,19 +47,18 @@ class BackendWorker(QObject):
             
             method = getattr(self.backend, self.method_name)
             
-            # Verificar se método aceita callback de progresso
+            # Verificar se método aceita callbacks de progresso/streaming
             sig = inspect.signature(method)
+            callbacks = {}
             
             if 'progress_callback' in sig.parameters:
                 # Método suporta callback de progresso
-                result = method(
-                    *self.args,
-                    progress_callback=self._progress_callback,
-                    **self.kwargs
-                )
-            else:
-                # Método normal
-                result = method(*self.args, **self.kwargs)
+                callbacks['progress_callback'] = self._progress_callback
+            if 'stream_callback' in sig.parameters and 'stream_callback' not in self.kwargs:
+                # Método suporta streaming (ex.: geração LLM token a token)
+                callbacks['stream_callback'] = self._stream_callback
+            
+            result = method(*self.args, **callbacks, **self.kwargs)
             
             # Verificar cancelamento
             if self.is_cancelled:
@@ -112,6 +112,23 @@ class BackendWorker(QObject):
         
         return True
     
+    def _stream_callback(self, chunk: str) -> bool:
+        """
+        Callback para trechos parciais (streaming)
+        
+        Returns:
+            bool: True para continuar, False para parar
+        """
+        if self.is_cancelled:
+            return False
+        
+        try:
+            self.chunk_ready.emit(chunk)
+        except Exception as e:
+            logger.error(f"Erro ao emitir trecho parcial: {e}")
+        
+        return True
+    
     def get_info(self) -> dict:
         """Retorna informações sobre o worker"""
         return {
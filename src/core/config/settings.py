@@ -40,6 +40,8 @@ class LlmCloudConfig(BaseModel):
     organization: str = ""
     timeout_seconds: int = 120
     max_retries: int = 1
+    # Tempo que o Ollama mantém o modelo carregado entre perguntas ("" = padrão do servidor)
+    ollama_keep_alive: str = "30m"
 
 class GladosAreaBehavior(BaseModel):
     sarcasm_level: float = 0.5
@@ -78,6 +80,8 @@ class LlmConfig(BaseModel):
     repeat_penalty: float = 1.12
     max_tokens: int = 384
     use_semantic_search: bool = True
+    watch_vault: bool = True
+    prefix_cache_mb: int = 96
     cpu: CpuConfig = CpuConfig()
     cloud: LlmCloudConfig = LlmCloudConfig()
     glados: GladosPersonalityConfig = GladosPersonalityConfig()
@@ -146,6 +150,7 @@ class CacheConfig(BaseModel):
     enabled: bool = True
     max_size: int = 100
     ttl: int = 3600
+    max_bytes_mb: int = 16
     preload_vault: bool = False
 
 class DevelopmentConfig(BaseModel):
@@ -4,9 +4,10 @@ Runtime LLM backend selector (local or cloud).
 from __future__ import annotations
 
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from core.config.settings import settings
+from core.llm.streaming import StreamCallback, iter_stream_events
 
 
 class LLMBackendProxy:
@@ -108,6 +109,7 @@ class LLMBackendProxy:
         request_metadata: Optional[Dict[str, Any]] = None,
         context: Optional[str] = None,
         max_tokens: Optional[int] = None,
+        stream_callback: Optional[StreamCallback] = None,
         **_kwargs,
     ) -> Dict[str, Any]:
         backend = self._ensure_backend()
@@ -129,6 +131,10 @@ class LLMBackendProxy:
                 except Exception:
                     pass
 
+        stream_kwargs: Dict[str, Any] = {}
+        if stream_callback is not None:
+            stream_kwargs["stream_callback"] = stream_callback
+
         try:
             try:
                 result = backend.generate(
@@ -136,6 +142,7 @@ class LLMBackendProxy:
                     user_name=effective_user,
                     use_semantic=use_semantic,
                     request_metadata=metadata,
+                    **stream_kwargs,
                 )
             except TypeError:
                 # Compatibilidade com assinaturas antigas que não aceitam request_metadata.
@@ -164,6 +171,37 @@ class LLMBackendProxy:
             "model": str(getattr(settings.llm, "model_name", "llm")),
         }
 
+    def generate_stream(
+        self,
+        query: str,
+        user_name: Optional[str] = None,
+        use_semantic: bool = True,
+        request_metadata: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Versão em streaming de ``generate``.
+
+        Produz ``{"type": "token", "text": ...}`` conforme a LLM gera e termina
+        com ``{"type": "done", "result": {...}}`` (mesmo dict de ``generate``)
+        ou ``{"type": "error", "error": ...}``. Backends sem streaming emitem
+        apenas o evento final.
+        """
+
+        def _run(callback: StreamCallback) -> Dict[str, Any]:
+            return self.generate(
+                query=query,
+                user_name=user_name,
+                use_semantic=use_semantic,
+                request_metadata=request_metadata,
+                context=context,
+                max_tokens=max_tokens,
+                stream_callback=callback,
+            )
+
+        return iter_stream_events(_run)
+
     def query(self, prompt: str, context: str = None, user_name: str = None):
         result = self.generate(
             query=str(prompt or ""),
@@ -3,22 +3,21 @@ CloudLLM backend using LiteLLM, keeping API compatibility with LocalLLM.
 """
 from __future__ import annotations
 
-import hashlib
 import json
 import os
-import pickle
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
-from urllib import error as urllib_error
-from urllib import request as urllib_request
 from urllib.parse import urlsplit, urlunsplit
 
 from core.config.settings import settings
 from core.llm.glados.brain.vault_connector import VaultStructure
 from core.llm.glados.personality import create_personality_voice
+from core.llm.ollama_client import OllamaConnectionError, OllamaHTTPClient, OllamaHTTPError, get_ollama_client
+from core.llm.response_cache import ResponseCache
+from core.llm.streaming import IncrementalSanitizer, StreamCallback, StreamRelay
 
 os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "true")
 
@@ -55,7 +54,7 @@ class CloudLLM:
         self.model = None
         self.vault_structure = None
         self.sembrain = None
-        self.response_cache: Dict[str, Any] = {}
+        self.response_cache = self._load_cache()
         self.query_history: List[Dict[str, Any]] = []
         model_label = str(getattr(settings.llm.cloud, "model", "") or "")
         resolved_api_base = self._resolve_api_base(model_label)
@@ -92,8 +91,9 @@ class CloudLLM:
 
         if bool(getattr(settings.llm, "use_semantic_search", True)):
             self._init_sembrain()
+        if self.vault_structure is not None and bool(getattr(settings.llm, "watch_vault", True)):
+            self.vault_structure.start_watching()
 
-        self._load_cache()
         self._initialized = True
         print("✅ CloudLLM inicializado")
 
@@ -101,9 +101,19 @@ class CloudLLM:
         try:
             from core.llm.glados.brain.semantic_search import Sembrain
 
+            existing_semantic_search = getattr(self.vault_structure, "semantic_search", None)
+            if existing_semantic_search is not None:
+                self.sembrain = existing_semantic_search
+                print(f"🧠 Sembrain (cloud) reutilizado: {len(self.sembrain.notes)} notas indexadas")
+                return
+
             notes = self.vault_structure.get_all_notes() if self.vault_structure else []
             vault_path = Path(settings.paths.vault).expanduser()
-            self.sembrain = Sembrain(vault_path, notes)
+            self.sembrain = Sembrain(
+                vault_path,
+                notes,
+                index_path=getattr(self.vault_structure, "semantic_index_path", None),
+            )
             print(f"🧠 Sembrain (cloud) inicializado: {len(notes)} notas indexadas")
         except Exception as exc:
             print(f"⚠️ Sembrain indisponivel no cloud backend: {exc}")
@@ -156,71 +166,58 @@ class CloudLLM:
             return "ollama-via-litellm"
         return "litellm"
 
-    def _probe_ollama(self, api_base: str, timeout_seconds: int = 2) -> Dict[str, Any]:
+    def _ollama_client(self, api_base: str) -> OllamaHTTPClient:
         target_base = self._normalize_ollama_api_base(
             str(api_base or "").strip().rstrip("/") or self.OLLAMA_DEFAULT_API_BASE
         )
-        tags_url = f"{target_base}/api/tags"
-        try:
-            req = urllib_request.Request(tags_url, method="GET")
-            opener = urllib_request.build_opener(urllib_request.ProxyHandler({}))
-            with opener.open(req, timeout=max(1, int(timeout_seconds))) as resp:
-                body = resp.read().decode("utf-8", errors="replace")
-                payload = json.loads(body or "{}")
-            models = payload.get("models", []) if isinstance(payload, dict) else []
-            model_names = []
-            for item in models:
-                if isinstance(item, dict):
-                    name = str(item.get("name") or "").strip()
-                    if name:
-                        model_names.append(name)
-            return {
-                "reachable": True,
-                "api_base": target_base,
-                "models_count": len(model_names),
-                "models": model_names[:20],
-            }
-        except urllib_error.URLError as exc:
-            return {
-                "reachable": False,
-                "api_base": target_base,
-                "error": str(exc.reason if hasattr(exc, "reason") else exc),
-            }
-        except Exception as exc:
-            return {
-                "reachable": False,
-                "api_base": target_base,
-                "error": str(exc),
-            }
+        return get_ollama_client(target_base)
 
-    def _get_cache_key(self, query: str, user_name: Optional[str] = None) -> str:
-        key_data = (
-            f"{query}_{user_name or 'default'}_"
-            f"{getattr(settings.llm.cloud, 'model', '')}_"
-            f"{getattr(settings.llm, 'temperature', 0.35)}_"
-            f"{getattr(settings.llm, 'top_p', 0.9)}_"
-            f"{getattr(settings.llm, 'max_tokens', 384)}"
+    def _probe_ollama(self, api_base: str, timeout_seconds: int = 2, *, force: bool = False) -> Dict[str, Any]:
+        # Cache com TTL curto no cliente compartilhado: evita uma ida a /api/tags por pergunta
+        return self._ollama_client(api_base).probe(timeout=max(1, int(timeout_seconds)), force=force)
+
+    @staticmethod
+    def _ollama_keep_alive() -> str:
+        return str(getattr(settings.llm.cloud, "ollama_keep_alive", "") or "").strip()
+
+    def _get_cache_key(self, query: str, user_name: Optional[str] = None, context: str = "") -> str:
+        glados_cfg = settings.llm.glados
+        return ResponseCache.make_key(
+            query,
+            model=str(getattr(settings.llm.cloud, "model", "") or ""),
+            personality=(
+                f"{getattr(glados_cfg, 'personality_profile', 'auto')}|"
+                f"{getattr(glados_cfg, 'personality_intensity', 0.7)}|"
+                f"{getattr(glados_cfg, 'glados_name', 'GLaDOS')}"
+            ),
+            user=user_name or "default",
+            context=context,
+            params={
+                "temperature": getattr(settings.llm, "temperature", 0.35),
+                "top_p": getattr(settings.llm, "top_p", 0.9),
+                "max_tokens": getattr(settings.llm, "max_tokens", 384),
+            },
         )
-        return hashlib.md5(key_data.encode()).hexdigest()
 
-    def _load_cache(self):
-        cache_path = Path(settings.paths.cache_dir) / "llm_cloud_responses.pkl"
-        if not cache_path.exists():
-            return
-        try:
-            with open(cache_path, "rb") as f:
-                self.response_cache = pickle.load(f)
-            print(f"📦 Cache cloud carregado: {len(self.response_cache)} respostas")
-        except Exception as exc:
-            print(f"⚠️ Erro carregando cache cloud: {exc}")
-            self.response_cache = {}
+    @staticmethod
+    def _load_cache() -> ResponseCache:
+        cache_cfg = settings.cache
+        store_path = None
+        if bool(getattr(cache_cfg, "enabled", True)):
+            store_path = Path(settings.paths.cache_dir) / "llm_cloud_responses.sqlite3"
+        cache = ResponseCache(
+            store_path=store_path,
+            max_entries=500,
+            max_bytes=int(getattr(cache_cfg, "max_bytes_mb", 16) or 16) * 1024 * 1024,
+            ttl_seconds=float(getattr(cache_cfg, "ttl", 3600) or 3600),
+        )
+        if len(cache):
+            print(f"📦 Cache cloud carregado: {len(cache)} respostas")
+        return cache
 
     def _save_cache(self):
         try:
-            cache_path = Path(settings.paths.cache_dir) / "llm_cloud_responses.pkl"
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "wb") as f:
-                pickle.dump(self.response_cache, f)
+            self.response_cache.flush()
         except Exception as exc:
             print(f"⚠️ Erro salvando cache cloud: {exc}")
 
@@ -413,7 +410,7 @@ class CloudLLM:
             "Resposta:\n"
         )
 
-    def _call_litellm(self, prompt: str) -> str:
+    def _call_litellm(self, prompt: str, stream_callback: Optional[StreamCallback] = None) -> str:
         cloud_cfg = settings.llm.cloud
         model_name = str(getattr(cloud_cfg, "model", "") or "").strip()
         if not model_name:
@@ -433,7 +430,12 @@ class CloudLLM:
                 raise RuntimeError(
                     f"Ollama indisponivel em {probe.get('api_base', api_base)}. Inicie com: ollama serve"
                 )
-            return self._call_ollama_direct(prompt=prompt, model_name=model_name, api_base=api_base)
+            return self._call_ollama_direct(
+                prompt=prompt,
+                model_name=model_name,
+                api_base=api_base,
+                stream_callback=stream_callback,
+            )
 
         if not LITELLM_AVAILABLE or litellm_completion is None:
             raise RuntimeError(
@@ -450,6 +452,8 @@ class CloudLLM:
             "num_retries": int(getattr(cloud_cfg, "max_retries", 2) or 2),
             "drop_params": True,
         }
+        if stream_callback is not None:
+            kwargs["stream"] = True
 
         api_key = str(getattr(cloud_cfg, "api_key", "") or "").strip()
         api_version = str(getattr(cloud_cfg, "api_version", "") or "").strip()
@@ -475,6 +479,10 @@ class CloudLLM:
             if self._is_qwen3_ollama_model(model_name):
                 # Qwen3 tende a gastar muitos tokens com "thinking"; desativar melhora latência no chat.
                 extra_body_payload["think"] = False
+            keep_alive = self._ollama_keep_alive()
+            if keep_alive:
+                # Mantém o modelo residente entre perguntas (evita recarregar os pesos)
+                extra_body_payload["keep_alive"] = keep_alive
             kwargs["extra_body"] = extra_body_payload
         elif api_base:
             kwargs["api_base"] = api_base
@@ -510,6 +518,7 @@ class CloudLLM:
                     or "max retries exceeded" in lowered
                     or "failed to establish a new connection" in lowered
                 ):
+                    self._ollama_client(api_base).mark_reachable(False, str(exc))
                     raise RuntimeError(
                         f"Ollama indisponivel em {api_base}. Inicie com: ollama serve"
                     ) from exc
@@ -519,6 +528,8 @@ class CloudLLM:
                         f"Modelo '{ollama_name}' nao encontrado no Ollama. Execute: ollama pull {ollama_name}"
                     ) from exc
             raise
+        if stream_callback is not None:
+            return self._consume_litellm_stream(response, stream_callback)
         try:
             return str(response.choices[0].message.content or "").strip()
         except Exception:
@@ -528,12 +539,75 @@ class CloudLLM:
             except Exception as exc:
                 raise RuntimeError(f"Resposta invalida do provedor cloud: {exc}") from exc
 
-    def _call_ollama_direct(self, prompt: str, model_name: str, api_base: str) -> str:
+    def _stream_sanitizer(self) -> IncrementalSanitizer:
+        return IncrementalSanitizer(self._sanitize_response_text)
+
+    def _consume_litellm_stream(self, response: Any, stream_callback: StreamCallback) -> str:
+        """Lê os deltas do stream do litellm repassando trechos sanitizados"""
+        sanitizer = self._stream_sanitizer()
+        for chunk in response:
+            try:
+                piece = chunk.choices[0].delta.content
+            except Exception:
+                try:
+                    piece = chunk["choices"][0]["delta"].get("content")
+                except Exception:
+                    piece = None
+            if not piece:
+                continue
+            delta = sanitizer.feed(str(piece))
+            if delta and stream_callback(delta) is False:
+                close = getattr(response, "close", None)
+                if callable(close):
+                    close()
+                break
+        else:
+            tail = sanitizer.finish()
+            if tail:
+                stream_callback(tail)
+        return sanitizer.raw.strip()
+
+    def _read_ollama_stream(self, resp: Any, stream_callback: StreamCallback) -> str:
+        """Lê o NDJSON de /api/chat com stream=true"""
+        sanitizer = self._stream_sanitizer()
+        for raw_line in resp:
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            parsed = json.loads(line)
+            if not isinstance(parsed, dict):
+                continue
+            error_text = str(parsed.get("error") or "").strip()
+            if error_text:
+                raise RuntimeError(error_text)
+            message = parsed.get("message")
+            piece = message.get("content") if isinstance(message, dict) else parsed.get("response")
+            if piece:
+                delta = sanitizer.feed(str(piece))
+                if delta and stream_callback(delta) is False:
+                    break
+            if parsed.get("done"):
+                tail = sanitizer.finish()
+                if tail:
+                    stream_callback(tail)
+                break
+        content = sanitizer.raw.strip()
+        if not content:
+            raise RuntimeError("Resposta invalida recebida do Ollama.")
+        return content
+
+    def _call_ollama_direct(
+        self,
+        prompt: str,
+        model_name: str,
+        api_base: str,
+        stream_callback: Optional[StreamCallback] = None,
+    ) -> str:
         short_model = model_name.split("/", 1)[1] if "/" in model_name else model_name
         payload: Dict[str, Any] = {
             "model": short_model,
             "messages": [{"role": "user", "content": prompt}],
-            "stream": False,
+            "stream": stream_callback is not None,
             "options": {
                 "num_ctx": int(getattr(settings.llm, "n_ctx", 2048) or 2048),
                 "num_thread": int(self.OLLAMA_LOCKED_CPU_THREADS),
@@ -541,20 +615,20 @@ class CloudLLM:
         }
         if self._is_qwen3_ollama_model(model_name):
             payload["think"] = False
+        keep_alive = self._ollama_keep_alive()
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
 
-        body = json.dumps(payload).encode("utf-8")
-        url = f"{self._normalize_ollama_api_base(api_base)}/api/chat"
-        req = urllib_request.Request(
-            url,
-            data=body,
-            method="POST",
-            headers={"Content-Type": "application/json"},
-        )
-        opener = urllib_request.build_opener(urllib_request.ProxyHandler({}))
-
+        client = self._ollama_client(api_base)
+        timeout = max(5, int(getattr(settings.llm.cloud, "timeout_seconds", 120) or 120))
         try:
-            with opener.open(req, timeout=max(5, int(getattr(settings.llm.cloud, "timeout_seconds", 120) or 120))) as resp:
+            with client.open("POST", "/api/chat", payload, timeout=timeout) as resp:
+                if stream_callback is not None:
+                    content = self._read_ollama_stream(resp, stream_callback)
+                    client.mark_reachable(True)
+                    return content
                 raw_body = resp.read().decode("utf-8", errors="replace")
+            client.mark_reachable(True)
             parsed = json.loads(raw_body or "{}")
             if isinstance(parsed, dict):
                 message = parsed.get("message")
@@ -569,12 +643,8 @@ class CloudLLM:
                 if error_text:
                     raise RuntimeError(error_text)
             raise RuntimeError("Resposta invalida recebida do Ollama.")
-        except urllib_error.HTTPError as exc:
-            detail = ""
-            try:
-                detail = exc.read().decode("utf-8", errors="replace").strip()
-            except Exception:
-                detail = ""
+        except OllamaHTTPError as exc:
+            detail = exc.detail
             lowered = detail.lower()
             if exc.code in (401, 403) or "unauthorized" in lowered:
                 raise RuntimeError("Ollama Cloud requer autenticacao. Execute: ollama signin") from exc
@@ -584,8 +654,9 @@ class CloudLLM:
                 ) from exc
             message = detail or f"HTTP {exc.code}"
             raise RuntimeError(f"Falha ao consultar Ollama: {message}") from exc
-        except urllib_error.URLError as exc:
-            reason = str(getattr(exc, "reason", exc))
+        except OllamaConnectionError as exc:
+            client.mark_reachable(False, exc.reason)
+            reason = exc.reason
             lowered = reason.lower()
             if (
                 "connection refused" in lowered
@@ -631,22 +702,10 @@ class CloudLLM:
         user_name: str = None,
         use_semantic: bool = True,
         request_metadata: Optional[Dict[str, Any]] = None,
+        stream_callback: Optional[StreamCallback] = None,
     ) -> Dict[str, Any]:
         metadata = request_metadata or {}
         strict_no_fallback = bool(metadata.get("disable_sembrain_fallback", False))
-        cache_key = self._get_cache_key(query, user_name)
-
-        if cache_key in self.response_cache:
-            cached_time, response = self.response_cache[cache_key]
-            if (datetime.now().timestamp() - cached_time) < 3600:
-                response = dict(response)
-                response["text"] = self._sanitize_response_text(response.get("text", ""))
-                response["request_metadata"] = metadata
-                return {
-                    **response,
-                    "cached": True,
-                    "cache_key": cache_key,
-                }
 
         if user_name is None:
             user_name = settings.llm.glados.user_name
@@ -659,9 +718,23 @@ class CloudLLM:
             except Exception as exc:
                 print(f"⚠️ Erro contexto semantico (cloud): {exc}")
 
+        # Chave inclui modelo, personalidade e digest do contexto
+        cache_key = self._get_cache_key(query, user_name, semantic_context)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            response = dict(cached_response)
+            response["text"] = self._sanitize_response_text(response.get("text", ""))
+            response["request_metadata"] = metadata
+            return {
+                **response,
+                "cached": True,
+                "cache_key": cache_key,
+            }
+
         try:
             prompt = self._build_prompt(query, user_name=user_name, semantic_context=semantic_context)
-            raw_response = self._call_litellm(prompt)
+            relay = StreamRelay(stream_callback) if stream_callback is not None else None
+            raw_response = self._call_litellm(prompt, stream_callback=relay)
             sanitized = self._sanitize_response_text(raw_response)
             final_text = self.glados_voice.format_response(
                 query,
@@ -692,13 +765,8 @@ class CloudLLM:
                 "request_metadata": metadata,
             }
 
-            self.response_cache[cache_key] = (datetime.now().timestamp(), result)
-            if len(self.response_cache) > 500:
-                sorted_keys = sorted(self.response_cache.keys(), key=lambda k: self.response_cache[k][0])
-                for key in sorted_keys[:100]:
-                    del self.response_cache[key]
-            if len(self.response_cache) % 50 == 0:
-                self._save_cache()
+            if relay is None or not relay.stopped:
+                self.response_cache.put(cache_key, result)
 
             return result
         except Exception as exc:
@@ -0,0 +1,250 @@
+"""
+index_store.py - Segmento invertido persistente do Sembrain (SQLite)
+Guarda postings, comprimento e norma de cada nota para que a busca
+consulte apenas os termos da pergunta e o índice sobreviva entre execuções.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import sqlite3
+import threading
+
+# Incrementar quando o layout das tabelas mudar (força reconstrução do segmento)
+SCHEMA_VERSION = 1
+
+
+class SembrainIndexStore:
+    """
+    Segmento de índice invertido em SQLite.
+
+    Tabelas:
+    - notes:    note_id -> (fingerprint, length, norm)
+    - postings: (term, note_id) -> tf   (índice secundário por note_id = índice direto)
+    - terms:    term -> df
+    - meta:     chave/valor (versões, total de notas usado nas normas)
+
+    Sem ``index_path`` o segmento vive apenas em memória.
+    """
+
+    def __init__(self, index_path: Optional[Path] = None, segment_version: str = "1"):
+        self.index_path = Path(index_path) if index_path else None
+        self.segment_version = f"{SCHEMA_VERSION}:{segment_version}"
+        self._lock = threading.RLock()
+        self._conn = self._open()
+
+    # ------------------------------------------------------------------
+    # Abertura / schema
+    # ------------------------------------------------------------------
+    def _open(self) -> sqlite3.Connection:
+        target = ":memory:"
+        if self.index_path is not None:
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                target = str(self.index_path)
+            except OSError as exc:
+                print(f"[GLaDOS] ⚠️  Índice em disco indisponível ({exc}); usando memória")
+                self.index_path = None
+
+        conn = sqlite3.connect(target, check_same_thread=False)
+        if target != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'segment_version'").fetchone()
+        if row is not None and row[0] != self.segment_version:
+            # Segmento de versão incompatível: descarta e reconstrói
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS notes;
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS terms;
+                DELETE FROM meta;
+                """
+            )
+
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                note_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                norm REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                note_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, note_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_note ON postings(note_id);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('segment_version', ?)",
+            (self.segment_version,),
+        )
+        conn.commit()
+
+    # ------------------------------------------------------------------
+    # Metadados
+    # ------------------------------------------------------------------
+    def get_meta(self, key: str, default: str = "") -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, str(value)),
+            )
+
+    # ------------------------------------------------------------------
+    # Notas
+    # ------------------------------------------------------------------
+    def load_notes(self) -> Dict[str, Tuple[str, int, float]]:
+        """Carrega (fingerprint, length, norm) de todas as notas do segmento"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT note_id, fingerprint, length, norm FROM notes"
+            ).fetchall()
+        return {note_id: (fingerprint, length, norm) for note_id, fingerprint, length, norm in rows}
+
+    def note_terms(self, note_id: str) -> Dict[str, int]:
+        """Índice direto: termos (e tf) de uma nota"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term, tf FROM postings WHERE note_id = ?", (note_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def remove_note(self, note_id: str):
+        """Remove uma nota tocando apenas nos seus próprios termos"""
+        with self._lock:
+            terms = [row[0] for row in self._conn.execute(
+                "SELECT term FROM postings WHERE note_id = ?", (note_id,)
+            )]
+            if terms:
+                self._conn.executemany(
+                    "UPDATE terms SET df = df - 1 WHERE term = ?",
+                    ((term,) for term in terms),
+                )
+                self._conn.executemany(
+                    "DELETE FROM terms WHERE term = ? AND df <= 0",
+                    ((term,) for term in terms),
+                )
+                self._conn.execute("DELETE FROM postings WHERE note_id = ?", (note_id,))
+            self._conn.execute("DELETE FROM notes WHERE note_id = ?", (note_id,))
+
+    def replace_note(self, note_id: str, fingerprint: str, term_counts: Dict[str, int]):
+        """Substitui os postings de uma nota (sem recalcular a norma)"""
+        with self._lock:
+            self.remove_note(note_id)
+            self._conn.execute(
+                "INSERT INTO notes (note_id, fingerprint, length, norm) VALUES (?, ?, ?, 0)",
+                (note_id, fingerprint, int(sum(term_counts.values()))),
+            )
+            if not term_counts:
+                return
+            self._conn.executemany(
+                "INSERT INTO postings (term, note_id, tf) VALUES (?, ?, ?)",
+                ((term, note_id, int(count)) for term, count in term_counts.items()),
+            )
+            self._conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                ((term,) for term in term_counts),
+            )
+
+    def set_norms(self, norms: Dict[str, float]):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE notes SET norm = ? WHERE note_id = ?",
+                ((float(norm), note_id) for note_id, norm in norms.items()),
+            )
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def document_frequencies(self, terms: Iterable[str]) -> Dict[str, int]:
+        unique_terms = list(dict.fromkeys(terms))
+        result: Dict[str, int] = {}
+        with self._lock:
+            for chunk in _chunks(unique_terms, 500):
+                placeholders = ",".join("?" * len(chunk))
+                result.update(self._conn.execute(
+                    f"SELECT term, df FROM terms WHERE term IN ({placeholders})", chunk
+                ).fetchall())
+        return result
+
+    def postings_for(self, terms: Iterable[str]) -> Dict[str, List[Tuple[str, int]]]:
+        """Listas de postings apenas dos termos pedidos"""
+        unique_terms = list(dict.fromkeys(terms))
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        with self._lock:
+            for chunk in _chunks(unique_terms, 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT term, note_id, tf FROM postings WHERE term IN ({placeholders})",
+                    chunk,
+                )
+                for term, note_id, tf in rows:
+                    postings.setdefault(term, []).append((note_id, tf))
+        return postings
+
+    def iter_weighted_postings(self, note_ids: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, int, int]]:
+        """(note_id, tf, df) do segmento ou só de ``note_ids`` — usado na recomputação de normas"""
+        query = "SELECT p.note_id, p.tf, t.df FROM postings p JOIN terms t ON t.term = p.term"
+        with self._lock:
+            if note_ids is None:
+                return iter(self._conn.execute(query).fetchall())
+            rows: List[Tuple[str, int, int]] = []
+            for chunk in _chunks(list(dict.fromkeys(note_ids)), 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(f"{query} WHERE p.note_id IN ({placeholders})", chunk).fetchall())
+        return iter(rows)
+
+    def vocabulary_size(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()
+        return int(row[0]) if row else 0
+
+    # ------------------------------------------------------------------
+    # Manutenção
+    # ------------------------------------------------------------------
+    def clear(self):
+        with self._lock:
+            self._conn.executescript(
+                """
+                DELETE FROM postings;
+                DELETE FROM terms;
+                DELETE FROM notes;
+                DELETE FROM meta WHERE key != 'segment_version';
+                """
+            )
+            self._conn.commit()
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
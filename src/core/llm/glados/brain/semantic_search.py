@@ -12,6 +12,9 @@ from datetime import datetime
 from dataclasses import dataclass
 from collections import Counter, defaultdict
 import math
+import threading
+
+from .index_store import SembrainIndexStore
 
 @dataclass
 class SearchResult:
@@ -30,56 +33,171 @@ class Sembrain:
     Técnicas usadas:
     1. TF-IDF básico (sem scikit-learn)
     2. Similaridade de cosseno manual
-    3. Indexação leve em memória
+    3. Índice invertido com normas pré-calculadas (segmento SQLite)
     4. Cache inteligente
     """
     
-    def __init__(self, vault_path: Path, notes: List[Any]):
+    # Incrementar quando _extract_note_text/_tokenize mudarem
+    SEGMENT_VERSION = "1"
+    # Variação relativa do total de notas que força recalcular todas as normas
+    NORM_DRIFT_RATIO = 0.1
+    # Acima dessa fração de notas afetadas a passada completa sai mais barata
+    PARTIAL_NORM_RATIO = 0.25
+    
+    def __init__(self, vault_path: Path, notes: List[Any], index_path: Optional[Path] = None):
         self.vault_path = vault_path
-        self.notes = notes
+        self.index_path = Path(index_path) if index_path else None
         
         # Índices leves
-        self.term_index = {}           # termo -> {note_id: tf}
-        self.note_lengths = {}         # note_id -> total_terms
-        self.idf_cache = {}            # termo -> idf
+        self._notes_by_id: Dict[str, Any] = {}     # note_id -> nota
+        self.note_stats: Dict[str, tuple] = {}     # note_id -> (fingerprint, total_terms, norma)
+        self.store = SembrainIndexStore(self.index_path, segment_version=self.SEGMENT_VERSION)
         
         # Cache de consultas
         self.query_cache = {}
         
+        # Buscas e atualizações podem vir de threads diferentes (UI, VaultWatcher)
+        self._lock = threading.RLock()
+        
         # Configurações
         self.max_terms = 1000          # Limite do vocabulário
         self.min_term_length = 3
         self.similarity_threshold = 0.1
         
+        for note in notes:
+            self._notes_by_id[self._get_note_id(note)] = note
+        
         # Construir índices
         self._build_indices()
     
+    @property
+    def notes(self) -> List[Any]:
+        return list(self._notes_by_id.values())
+    
     def _build_indices(self):
-        """Constrói índices leves das notas"""
-        print(f"🧠 Indexando {len(self.notes)} notas...")
+        """Sincroniza o segmento em disco com as notas atuais (só reindexa o que mudou)"""
+        print(f"🧠 Indexando {len(self._notes_by_id)} notas...")
+        
+        self.note_stats = dict(self.store.load_notes())
+        
+        removed = [note_id for note_id in self.note_stats if note_id not in self._notes_by_id]
+        df_changed = set()
+        for note_id in removed:
+            df_changed |= self._drop_note(note_id)
+        
+        changed = []
+        for note_id, note in self._notes_by_id.items():
+            fingerprint = self._note_fingerprint(note)
+            stored = self.note_stats.get(note_id)
+            if stored is None or stored[0] != fingerprint:
+                df_changed |= self._write_note(note_id, note, fingerprint)
+                changed.append(note_id)
+        
+        if removed or changed:
+            self._refresh_norms(changed, df_changed)
+        self.store.commit()
+        
+        reused = len(self._notes_by_id) - len(changed)
+        print(
+            f"✅ Vocabulário: {self.store.vocabulary_size()} termos "
+            f"({len(changed)} notas reindexadas, {reused} do segmento, {len(removed)} removidas)"
+        )
+    
+    def _note_fingerprint(self, note) -> str:
+        """Impressão digital barata para detectar notas alteradas"""
+        modified = getattr(note, 'modified', None)
+        content = getattr(note, 'content', '') or ''
+        if isinstance(modified, datetime):
+            return f"{modified.timestamp():.6f}:{len(content)}"
+        return hashlib.md5(self._extract_note_text(note).encode()).hexdigest()
+    
+    def _write_note(self, note_id: str, note, fingerprint: str) -> set:
+        """
+        Grava os postings de uma nota no segmento.
         
-        # Passo 1: Contar termos em cada nota
-        for note in self.notes:
-            note_id = self._get_note_id(note)
-            text = self._extract_note_text(note)
-            terms = self._tokenize(text)
-            
-            self.note_lengths[note_id] = len(terms)
-            
-            # Contar frequência de termos
-            term_counts = Counter(terms)
-            for term, count in term_counts.items():
-                if term not in self.term_index:
-                    self.term_index[term] = {}
-                self.term_index[term][note_id] = count
-        
-        # Passo 2: Calcular IDF (Inverse Document Frequency)
-        total_notes = len(self.notes)
-        for term, note_counts in self.term_index.items():
-            docs_with_term = len(note_counts)
-            self.idf_cache[term] = math.log(total_notes / (1 + docs_with_term))
-        
-        print(f"✅ Vocabulário: {len(self.term_index)} termos")
+        Returns:
+            Termos cujo df mudou (entraram ou saíram da nota)
+        """
+        old_terms = set(self.store.note_terms(note_id)) if note_id in self.note_stats else set()
+        term_counts = Counter(self._tokenize(self._extract_note_text(note)))
+        self.store.replace_note(note_id, fingerprint, term_counts)
+        self.note_stats[note_id] = (fingerprint, sum(term_counts.values()), 0.0)
+        return old_terms ^ set(term_counts)
+    
+    def _drop_note(self, note_id: str) -> set:
+        """Remove uma nota do segmento e devolve os termos cujo df mudou"""
+        if self.note_stats.pop(note_id, None) is None:
+            return set()
+        terms = set(self.store.note_terms(note_id))
+        self.store.remove_note(note_id)
+        return terms
+    
+    def _idf(self, docs_with_term: int, total_notes: Optional[int] = None) -> float:
+        total = len(self.note_stats) if total_notes is None else total_notes
+        if total <= 0:
+            return 0.0
+        return math.log(total / (1 + docs_with_term))
+    
+    def _refresh_norms(self, changed_ids: List[str], df_changed_terms: Optional[set] = None):
+        """
+        Atualiza normas dos vetores TF-IDF das notas.
+        
+        Recalcula todas quando o total de notas variou além de NORM_DRIFT_RATIO
+        desde o último cálculo completo. Senão recalcula as notas alteradas e
+        as que compartilham algum termo cujo df mudou; a única aproximação
+        restante é o N do idf, limitada pelo próprio NORM_DRIFT_RATIO. Um termo
+        comum com df alterado alcança quase todas as notas: passando de
+        PARTIAL_NORM_RATIO, a passada completa é usada.
+        """
+        total_notes = len(self.note_stats)
+        try:
+            norms_total = int(self.store.get_meta("norms_total_notes", "0") or 0)
+        except ValueError:
+            norms_total = 0
+        
+        full = (
+            norms_total <= 0
+            or total_notes <= 0
+            or abs(total_notes - norms_total) / total_notes > self.NORM_DRIFT_RATIO
+        )
+        
+        target_ids: List[str] = []
+        if not full:
+            affected = set(changed_ids)
+            if df_changed_terms:
+                for postings in self.store.postings_for(df_changed_terms).values():
+                    affected.update(note_id for note_id, _ in postings)
+            target_ids = [note_id for note_id in affected if note_id in self.note_stats]
+            full = len(target_ids) > total_notes * self.PARTIAL_NORM_RATIO
+        
+        if full:
+            rows = self.store.iter_weighted_postings()
+            target_ids = list(self.note_stats.keys())
+            self.store.set_meta("norms_total_notes", str(total_notes))
+        else:
+            # Uma consulta em lote para todas as notas afetadas
+            rows = self.store.iter_weighted_postings(target_ids)
+        
+        squares: Dict[str, float] = defaultdict(float)
+        for note_id, tf, df in rows:
+            length = self.note_stats.get(note_id, (None, 0, 0.0))[1]
+            if length:
+                weight = (tf / length) * self._idf(df, total_notes)
+                squares[note_id] += weight * weight
+        
+        norms = {note_id: math.sqrt(squares.get(note_id, 0.0)) for note_id in target_ids}
+        self.store.set_norms(norms)
+        for note_id, norm in norms.items():
+            fingerprint, length, _ = self.note_stats[note_id]
+            self.note_stats[note_id] = (fingerprint, length, norm)
+    
+    def rebuild_index(self):
+        """Descarta o segmento e reindexa todas as notas"""
+        with self._lock:
+            self.store.clear()
+            self.note_stats = {}
+            self.query_cache.clear()
+            self._build_indices()
     
     def _extract_note_text(self, note) -> str:
         """Extrai e limpa texto da nota"""
@@ -112,55 +230,6 @@ class Sembrain:
         """ID único baseado no caminho"""
         return str(note.path)
     
-    def _tf_idf_vector(self, text: str, note_id: str = None) -> Dict[str, float]:
-        """Calcula vetor TF-IDF manualmente"""
-        terms = self._tokenize(text)
-        vector = {}
-        
-        # Contar termos
-        term_counts = Counter(terms)
-        total_terms = len(terms)
-        
-        if total_terms == 0:
-            return vector
-        
-        # Calcular TF-IDF para cada termo
-        for term, count in term_counts.items():
-            if term in self.idf_cache:
-                # TF (Term Frequency)
-                if note_id and term in self.term_index and note_id in self.term_index[term]:
-                    tf = self.term_index[term][note_id] / self.note_lengths[note_id]
-                else:
-                    tf = count / total_terms
-                
-                # IDF (Inverse Document Frequency)
-                idf = self.idf_cache[term]
-                
-                # TF-IDF
-                vector[term] = tf * idf
-        
-        return vector
-    
-    def _cosine_similarity(self, vec1: Dict[str, float], vec2: Dict[str, float]) -> float:
-        """Similaridade de cosseno manual"""
-        if not vec1 or not vec2:
-            return 0.0
-        
-        # Produto escalar
-        dot_product = 0
-        for term, weight in vec1.items():
-            if term in vec2:
-                dot_product += weight * vec2[term]
-        
-        # Normas
-        norm1 = math.sqrt(sum(w * w for w in vec1.values()))
-        norm2 = math.sqrt(sum(w * w for w in vec2.values()))
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return dot_product / (norm1 * norm2)
-    
     def _find_excerpt(self, note, query: str, context_chars: int = 100) -> str:
         """Encontra trecho relevante na nota"""
         content = getattr(note, 'content', '').lower()
@@ -188,6 +257,17 @@ class Sembrain:
         # Fallback: primeiras palavras
         return content[:200] if len(content) > 200 else content
     
+    def _ensure_indexed(self, notes: List[Any]):
+        """Indexa notas desconhecidas ou alteradas recebidas como subconjunto de busca"""
+        stale = []
+        for note in notes:
+            note_id = self._get_note_id(note)
+            stored = self.note_stats.get(note_id)
+            if stored is None or stored[0] != self._note_fingerprint(note):
+                stale.append(note)
+        for note in stale:
+            self._reindex_note(note)
+    
     def search(self, query: str, limit: int = 5, notes: Optional[List[Any]] = None) -> List[SearchResult]:
         """
         Busca semântica usando TF-IDF básico
@@ -202,6 +282,15 @@ class Sembrain:
         if not query.strip():
             return []
 
+        with self._lock:
+            return self._search(query, limit, notes)
+    
+    def _search(self, query: str, limit: int, notes: Optional[List[Any]]) -> List[SearchResult]:
+        if notes is not None:
+            self._ensure_indexed(notes)
+            candidates = {self._get_note_id(note): note for note in notes}
+        else:
+            candidates = self._notes_by_id
         notes_to_search = notes if notes is not None else self.notes
         
         # Cache simples
@@ -216,19 +305,40 @@ class Sembrain:
         
         print(f"🔍 Buscando: '{query[:50]}...'")
         
-        # Vetor da consulta
-        query_vector = self._tf_idf_vector(query)
+        # Vetor da consulta: só os postings dos termos da consulta são lidos
+        query_counts = Counter(self._tokenize(query))
+        query_total = sum(query_counts.values())
+        postings = self.store.postings_for(query_counts.keys()) if query_total else {}
+        
+        query_vector = {}
+        term_idf = {}
+        for term, count in query_counts.items():
+            if term in postings:
+                term_idf[term] = self._idf(len(postings[term]))
+                query_vector[term] = (count / query_total) * term_idf[term]
+        query_norm = math.sqrt(sum(w * w for w in query_vector.values()))
+        
+        # Produto escalar acumulado por nota
+        dot_products: Dict[str, float] = defaultdict(float)
+        if query_norm > 0:
+            for term, query_weight in query_vector.items():
+                idf = term_idf[term]
+                for note_id, tf in postings[term]:
+                    if note_id not in candidates:
+                        continue
+                    length = self.note_stats[note_id][1]
+                    if length:
+                        dot_products[note_id] += query_weight * (tf / length) * idf
         
         results = []
-        for note in notes_to_search:
-            note_id = self._get_note_id(note)
-            
-            # Vetor da nota
-            note_text = self._extract_note_text(note)
-            note_vector = self._tf_idf_vector(note_text, note_id)
+        for note_id, dot_product in dot_products.items():
+            note = candidates[note_id]
+            note_norm = self.note_stats[note_id][2]
+            if note_norm == 0:
+                continue
             
             # Similaridade
-            similarity = self._cosine_similarity(query_vector, note_vector)
+            similarity = dot_product / (query_norm * note_norm)
             
             if similarity > self.similarity_threshold:
                 excerpt = self._find_excerpt(note, query)
@@ -311,52 +421,57 @@ class Sembrain:
         return "\n".join(context_lines)
     
     def add_note(self, note):
-        """Adiciona uma nota ao índice (incremental)"""
-        self.notes.append(note)
+        """Adiciona (ou atualiza) uma nota no índice (incremental)"""
         # Reindexa apenas a nova nota
         self._reindex_note(note)
     
     def _reindex_note(self, note):
-        """Reindexa uma única nota"""
-        note_id = self._get_note_id(note)
-        text = self._extract_note_text(note)
-        terms = self._tokenize(text)
-        
-        # Atualiza contagens
-        self.note_lengths[note_id] = len(terms)
-        
-        # Remove termos antigos desta nota
-        for term, note_counts in list(self.term_index.items()):
-            if note_id in note_counts:
-                del note_counts[note_id]
-                if not note_counts:  # Termo não aparece em mais nenhuma nota
-                    del self.term_index[term]
-                    if term in self.idf_cache:
-                        del self.idf_cache[term]
-        
-        # Adiciona novos termos
-        term_counts = Counter(terms)
-        for term, count in term_counts.items():
-            if term not in self.term_index:
-                self.term_index[term] = {}
-            self.term_index[term][note_id] = count
-        
-        # Recalcula IDF para termos modificados
-        total_notes = len(self.notes)
-        terms_to_update = set(term_counts.keys())
-        
-        for term in terms_to_update:
-            if term in self.term_index:
-                docs_with_term = len(self.term_index[term])
-                self.idf_cache[term] = math.log(total_notes / (1 + docs_with_term))
+        """Reindexa uma única nota usando o índice direto do segmento"""
+        self.update_notes([note], [])
     
+    def remove_note(self, note_or_path):
+        """Remove uma nota do índice (aceita a nota ou o seu caminho)"""
+        self.update_notes([], [note_or_path])
+
+    def update_notes(self, changed: List[Any], removed: List[Any]):
+        """
+        Aplica um delta de notas em lote: uma única atualização de normas
+        e um único commit no segmento.
+
+        Args:
+            changed: Notas novas ou alteradas
+            removed: Notas (ou caminhos) que saíram do vault
+        """
+        with self._lock:
+            # Remoção via índice direto: custo proporcional aos termos da nota
+            df_changed = set()
+            for item in removed:
+                note_id = self._get_note_id(item) if hasattr(item, 'path') else str(item)
+                self._notes_by_id.pop(note_id, None)
+                df_changed |= self._drop_note(note_id)
+
+            changed_ids = []
+            for note in changed:
+                note_id = self._get_note_id(note)
+                self._notes_by_id[note_id] = note
+                df_changed |= self._write_note(note_id, note, self._note_fingerprint(note))
+                changed_ids.append(note_id)
+
+            if changed_ids or removed:
+                self._refresh_norms(changed_ids, df_changed)
+                self.store.commit()
+                self.query_cache.clear()
+
     def get_stats(self) -> Dict:
         """Estatísticas do sistema"""
+        lengths = [stats[1] for stats in self.note_stats.values()]
         return {
-            "total_notes": len(self.notes),
-            "vocabulary_size": len(self.term_index),
+            "total_notes": len(self._notes_by_id),
+            "notes_indexed": len(self.note_stats),
+            "vocabulary_size": self.store.vocabulary_size(),
             "cache_size": len(self.query_cache),
-            "avg_terms_per_note": sum(self.note_lengths.values()) / len(self.note_lengths) if self.note_lengths else 0
+            "avg_terms_per_note": sum(lengths) / len(lengths) if lengths else 0,
+            "index_path": str(self.index_path) if self.index_path else None,
         }
 
 # ============================================================================
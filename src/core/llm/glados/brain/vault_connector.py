@@ -3,19 +3,27 @@ Conector do vault do Obsidian como cérebro da GLaDOS
 Atualizado com busca semântica integrada
 """
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
+import os
 import re
 import yaml
 import frontmatter
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import hashlib
+import threading
 
 from .semantic_search import Sembrain, SearchResult
+from .vault_manifest import ManifestEntry, VaultManifest
 try:
     from core.vault.bootstrap import bootstrap_vault
 except Exception:
     bootstrap_vault = None
+try:
+    from core.config.settings import settings as _settings
+except Exception:
+    _settings = None
 
 @dataclass
 class VaultNote:
@@ -55,20 +63,56 @@ class VaultStructure:
         "06-RECURSOS": "Recursos, registros e dados auxiliares"
     }
     
-    def __init__(self, vault_path: str):
+    # Extensões de arquivos de nota
+    NOTE_EXTENSIONS = ('.md', '.txt', '.markdown')
+    
+    def __init__(self, vault_path: str, cache_dir: Optional[str] = None):
         self.vault_path = Path(vault_path).expanduser()
+        self.cache_dir = self._resolve_cache_dir(cache_dir)
         self.notes_cache = {}
+        # Serializa o copiar-e-trocar do notes_cache (VaultWatcher x UI)
+        self._index_lock = threading.RLock()
         self.semantic_search = None
+        self.watcher = None
         self._validate_structure()
+        self.manifest = VaultManifest(self._vault_cache_file("vault_manifest", "manifest"))
         self._index_vault()
         self._init_semantic_search()
     
+    @staticmethod
+    def _resolve_cache_dir(cache_dir: Optional[str]) -> Optional[Path]:
+        """Diretório de cache para índices persistentes (None = só memória)"""
+        if cache_dir:
+            return Path(cache_dir).expanduser()
+        if _settings is not None:
+            try:
+                return Path(_settings.paths.cache_dir).expanduser()
+            except Exception:
+                return None
+        return None
+
+    def _vault_cache_file(self, folder: str, prefix: str) -> Optional[Path]:
+        """Arquivo de cache específico deste vault (None = só memória)"""
+        if self.cache_dir is None:
+            return None
+        vault_key = hashlib.md5(str(self.vault_path.resolve()).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / folder / f"{prefix}_{vault_key}.sqlite3"
+
+    @property
+    def semantic_index_path(self) -> Optional[Path]:
+        """Segmento SQLite do Sembrain, um por vault"""
+        return self._vault_cache_file("sembrain", "segment")
+
     def _init_semantic_search(self):
         """Inicializa o sistema de busca semântica"""
         try:
             # Converte cache para lista de notas
             notes_list = list(self.notes_cache.values())
-            self.semantic_search = Sembrain(self.vault_path, notes_list)
+            self.semantic_search = Sembrain(
+                self.vault_path,
+                notes_list,
+                index_path=self.semantic_index_path,
+            )
             print(f"[GLaDOS] ✅ Busca semântica inicializada: {len(notes_list)} notas indexadas")
             
             # Mostra estatísticas CORRIGIDO: Sembrain não tem 'model_loaded'
@@ -136,76 +180,269 @@ class VaultStructure:
         
         print(f"[GLaDOS] ✅ Estrutura criada em: {self.vault_path}")
     
-    def _index_vault(self):
-        """Indexa todas as notas do vault"""
-        print(f"[GLaDOS] 🔍 Indexando vault...")
+    def _index_vault(self, verbose: bool = True) -> Dict[str, List[str]]:
+        """
+        Indexa as notas do vault reaproveitando o manifesto persistente.
+
+        Só arquivos com tamanho/mtime diferentes são relidos, e só os que
+        também mudaram de conteúdo são parseados novamente. Arquivos que
+        sumiram do disco são removidos do cache.
+
+        Returns:
+            Delta da indexação: {"changed": [...], "removed": [...]} com
+            caminhos relativos ao vault.
+        """
+        if verbose:
+            print(f"[GLaDOS] 🔍 Indexando vault...")
         
-        # Lista de extensões de arquivos de nota
-        note_extensions = ['.md', '.txt', '.markdown']
+        with self._index_lock:
+            # Varredura só com stat(): payloads são lidos apenas para o que mudou
+            known_stats = self.manifest.load_stats()
+            notes_cache = dict(self.notes_cache)
+            seen = set()
+            changed: List[str] = []
+            pending = []
         
-        note_count = 0
-        for ext in note_extensions:
-            for md_file in self.vault_path.glob(f"**/*{ext}"):
+            for note_file in self._iter_note_files():
+                relative_path = str(note_file.relative_to(self.vault_path))
                 try:
-                    note = self._parse_note(md_file)
-                    if note:
-                        relative_path = md_file.relative_to(self.vault_path)
-                        self.notes_cache[str(relative_path)] = note
-                        note_count += 1
+                    stat_result = note_file.stat()
+                except OSError as e:
+                    print(f"[GLaDOS] ⚠️  Erro ao ler {note_file}: {e}")
+                    continue
+                cached = notes_cache.get(relative_path)
+                if (
+                    cached is not None
+                    and known_stats.get(relative_path) == (stat_result.st_size, stat_result.st_mtime_ns)
+                    and cached.modified == self._stat_modified(stat_result)
+                ):
+                    seen.add(relative_path)
+                    continue
+                pending.append((note_file, relative_path, stat_result))
+        
+            entries = self.manifest.load(rel for _, rel, _ in pending) if pending else {}
+            for note_file, relative_path, stat_result in pending:
+                try:
+                    note, was_changed = self._load_note_file(
+                        note_file, relative_path, entries.get(relative_path), stat_result
+                    )
                 except Exception as e:
-                    print(f"[GLaDOS] ⚠️  Erro ao parsear {md_file}: {e}")
+                    print(f"[GLaDOS] ⚠️  Erro ao parsear {note_file}: {e}")
+                    continue
+                if note is None:
+                    continue
+                seen.add(relative_path)
+                notes_cache[relative_path] = note
+                if was_changed:
+                    changed.append(relative_path)
+        
+            removed = [path for path in notes_cache if path not in seen]
+            for path in removed:
+                del notes_cache[path]
+            self.manifest.remove(set(removed) | (set(known_stats) - seen))
+            self.manifest.commit()
+            # Troca atômica: leitores em outras threads nunca veem o dict pela metade
+            self.notes_cache = notes_cache
         
-        print(f"[GLaDOS] ✅ {note_count} notas indexadas")
+        if verbose:
+            reused = len(seen) - len(changed)
+            print(
+                f"[GLaDOS] ✅ {len(self.notes_cache)} notas indexadas "
+                f"({len(changed)} reprocessadas, {reused} do manifesto, {len(removed)} removidas)"
+            )
+        return {"changed": changed, "removed": removed}
+    
+    def _iter_note_files(self):
+        """Percorre o vault uma única vez procurando arquivos de nota"""
+        for root, _dirs, files in os.walk(self.vault_path, followlinks=True):
+            for name in files:
+                if name.endswith(self.NOTE_EXTENSIONS):
+                    yield Path(root) / name
+    
+    def _load_note_file(
+        self,
+        file_path: Path,
+        relative_path: str,
+        entry: Optional[ManifestEntry],
+        stat_result=None,
+    ) -> Tuple[Optional[VaultNote], bool]:
+        """
+        Carrega uma nota usando o manifesto quando possível.
+
+        Returns:
+            (nota, alterada) — ``alterada`` indica que a nota difere do
+            que estava no manifesto (e precisa ir para o Sembrain).
+        """
+        if stat_result is None:
+            stat_result = file_path.stat()
+        if entry is not None and entry.matches_stat(stat_result):
+            cached = self.notes_cache.get(relative_path)
+            if cached is not None and cached.modified == self._stat_modified(stat_result):
+                return cached, False
+            return self._note_from_payload(file_path, entry.payload, stat_result), False
+        
+        raw_content = file_path.read_text(encoding='utf-8')
+        content_hash = hashlib.md5(raw_content.encode('utf-8')).hexdigest()
+        if entry is not None and entry.content_hash == content_hash:
+            # Só o mtime mudou (ex.: arquivo tocado/sincronizado): reaproveita o parse
+            payload = entry.payload
+        else:
+            payload = self._parse_note_payload(file_path, raw_content)
+        
+        self.manifest.upsert(ManifestEntry(
+            rel_path=relative_path,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            ctime=stat_result.st_ctime,
+            content_hash=content_hash,
+            payload=payload,
+        ))
+        return self._note_from_payload(file_path, payload, stat_result), True
     
     def _parse_note(self, file_path: Path) -> Optional[VaultNote]:
         """Parseia uma nota Markdown com frontmatter"""
         try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Tenta extrair frontmatter
-            frontmatter_data = {}
-            if content.startswith('---'):
+            raw_content = file_path.read_text(encoding='utf-8')
+            payload = self._parse_note_payload(file_path, raw_content)
+            return self._note_from_payload(file_path, payload, file_path.stat())
+        except Exception as e:
+            print(f"[GLaDOS] ⚠️  Erro ao parsear {file_path}: {e}")
+            return None
+    
+    def _parse_note_payload(self, file_path: Path, content: str) -> Dict[str, Any]:
+        """Extrai frontmatter, título, tags e links do texto de uma nota"""
+        # Tenta extrair frontmatter
+        frontmatter_data = {}
+        if content.startswith('---'):
+            try:
+                # Usa frontmatter se disponível
+                parsed = frontmatter.loads(content)
+                content = parsed.content
+                frontmatter_data = parsed.metadata
+            except:
+                # Fallback para parsing simples
+                parts = content.split('---', 2)
+                if len(parts) >= 3:
+                    frontmatter_str = parts[1]
+                    content = parts[2].lstrip('\n')
+                    try:
+                        frontmatter_data = yaml.safe_load(frontmatter_str) or {}
+                    except:
+                        frontmatter_data = {}
+        
+        # Extrai título do frontmatter ou do nome do arquivo
+        title = frontmatter_data.get('title', file_path.stem)
+        
+        # Extrai tags
+        tags = frontmatter_data.get('tags', [])
+        if isinstance(tags, str):
+            tags = [tags]
+        
+        # Extrai links [[link]]
+        links = re.findall(r'\[\[([^\]]+)\]\]', content)
+        
+        return {
+            'title': title,
+            'content': content.strip(),
+            'frontmatter': frontmatter_data,
+            'tags': tags,
+            'links': links,
+        }
+    
+    @staticmethod
+    def _note_from_payload(file_path: Path, payload: Dict[str, Any], stat_result) -> VaultNote:
+        """Monta a VaultNote a partir do parse e de um único stat()"""
+        return VaultNote(
+            path=file_path,
+            title=payload['title'],
+            content=payload['content'],
+            frontmatter=payload['frontmatter'],
+            tags=list(payload['tags'] or []),
+            links=list(payload['links'] or []),
+            created=datetime.fromtimestamp(stat_result.st_ctime),
+            modified=VaultStructure._stat_modified(stat_result)
+        )
+    
+    @staticmethod
+    def _stat_modified(stat_result) -> datetime:
+        return datetime.fromtimestamp(stat_result.st_mtime_ns / 1e9)
+    
+    def refresh_index(self, verbose: bool = True) -> Dict[str, List[str]]:
+        """
+        Revarre o vault e aplica apenas o delta (notas novas, alteradas e
+        removidas) ao índice semântico.
+        """
+        with self._index_lock:
+            delta = self._index_vault(verbose=verbose)
+            self._apply_semantic_delta(delta)
+        return delta
+    
+    def apply_file_changes(self, changed_paths: List[Path], removed_paths: List[Path]) -> Dict[str, List[str]]:
+        """
+        Aplica um lote de eventos de arquivo (vindo do VaultWatcher) sem
+        revarrer o vault. Caminhos "alterados" que não existem mais são
+        tratados como removidos.
+        """
+        with self._index_lock:
+            notes_cache = dict(self.notes_cache)
+            changed: List[str] = []
+            removed: List[str] = []
+        
+            for path in list(changed_paths) + list(removed_paths):
+                path = Path(path)
                 try:
-                    # Usa frontmatter se disponível
-                    parsed = frontmatter.loads(content)
-                    content = parsed.content
-                    frontmatter_data = parsed.metadata
-                except:
-                    # Fallback para parsing simples
-                    parts = content.split('---', 2)
-                    if len(parts) >= 3:
-                        frontmatter_str = parts[1]
-                        content = parts[2].lstrip('\n')
-                        try:
-                            frontmatter_data = yaml.safe_load(frontmatter_str) or {}
-                        except:
-                            frontmatter_data = {}
-            
-            # Extrai título do frontmatter ou do nome do arquivo
-            title = frontmatter_data.get('title', file_path.stem)
-            
-            # Extrai tags
-            tags = frontmatter_data.get('tags', [])
-            if isinstance(tags, str):
-                tags = [tags]
-            
-            # Extrai links [[link]]
-            import re
-            links = re.findall(r'\[\[([^\]]+)\]\]', content)
+                    relative_path = str(path.relative_to(self.vault_path))
+                except ValueError:
+                    continue
             
-            return VaultNote(
-                path=file_path,
-                title=title,
-                content=content.strip(),
-                frontmatter=frontmatter_data,
-                tags=tags,
-                links=links,
-                created=datetime.fromtimestamp(file_path.stat().st_ctime),
-                modified=datetime.fromtimestamp(file_path.stat().st_mtime)
+                if path.is_file():
+                    try:
+                        note, was_changed = self._load_note_file(path, relative_path, self.manifest.get(relative_path))
+                    except Exception as e:
+                        print(f"[GLaDOS] ⚠️  Erro ao parsear {path}: {e}")
+                        continue
+                    if note is not None:
+                        notes_cache[relative_path] = note
+                        if was_changed and relative_path not in changed:
+                            changed.append(relative_path)
+                elif relative_path in notes_cache:
+                    del notes_cache[relative_path]
+                    removed.append(relative_path)
+        
+            if removed:
+                self.manifest.remove(removed)
+            self.manifest.commit()
+            self.notes_cache = notes_cache
+        
+            delta = {"changed": changed, "removed": removed}
+            self._apply_semantic_delta(delta)
+        return delta
+    
+    def _apply_semantic_delta(self, delta: Dict[str, List[str]]):
+        if self.semantic_search and (delta["changed"] or delta["removed"]):
+            self.semantic_search.update_notes(
+                [self.notes_cache[path] for path in delta["changed"]],
+                [self.vault_path / path for path in delta["removed"]],
             )
+    
+    def start_watching(self, debounce_seconds: float = 0.4, use_polling: bool = False) -> bool:
+        """Inicia a reindexação ao vivo (inotify, ou polling como fallback)"""
+        from .vault_watcher import VaultWatcher
+        
+        if self.watcher is not None and self.watcher.is_running:
+            return True
+        try:
+            self.watcher = VaultWatcher(self, debounce_seconds=debounce_seconds, use_polling=use_polling)
+            return self.watcher.start()
         except Exception as e:
-            print(f"[GLaDOS] ⚠️  Erro ao parsear {file_path}: {e}")
-            return None
+            print(f"[GLaDOS] ⚠️  Não foi possível vigiar o vault: {e}")
+            self.watcher = None
+            return False
+    
+    def stop_watching(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
     
     def get_notes_by_folder(self, folder_name: str) -> List[VaultNote]:
         """Retorna todas as notas de uma pasta específica"""
@@ -639,16 +876,21 @@ class VaultStructure:
     def add_note_to_index(self, note_path: Path):
         """Adiciona uma nova nota ao índice"""
         try:
-            note = self._parse_note(note_path)
-            if note:
-                relative_path = note_path.relative_to(self.vault_path)
-                self.notes_cache[str(relative_path)] = note
-                
-                # Atualiza índice semântico se disponível
-                if self.semantic_search:
-                    self.semantic_search.add_note(note)
-                
-                return note
+            note_path = Path(note_path)
+            relative_path = str(note_path.relative_to(self.vault_path))
+            with self._index_lock:
+                note, _ = self._load_note_file(note_path, relative_path, None)
+                if note:
+                    notes_cache = dict(self.notes_cache)
+                    notes_cache[relative_path] = note
+                    self.notes_cache = notes_cache
+                    self.manifest.commit()
+                    
+                    # Atualiza índice semântico se disponível
+                    if self.semantic_search:
+                        self.semantic_search.add_note(note)
+                    
+                    return note
         except Exception as e:
             print(f"[GLaDOS] ⚠️  Erro ao adicionar nota ao índice: {e}")
         return None
@@ -0,0 +1,159 @@
+"""
+vault_manifest.py - Manifesto persistente das notas do vault (SQLite)
+Guarda tamanho, mtime, hash e o resultado do parse de cada nota para que
+a indexação do VaultStructure só releia arquivos que realmente mudaram.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import pickle
+import sqlite3
+import threading
+
+# Incrementar quando o formato do payload/parse mudar
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """Estado conhecido de um arquivo de nota"""
+    rel_path: str
+    size: int
+    mtime_ns: int
+    ctime: float
+    content_hash: str
+    payload: Dict[str, Any]
+
+    def matches_stat(self, stat_result) -> bool:
+        return self.size == stat_result.st_size and self.mtime_ns == stat_result.st_mtime_ns
+
+
+class VaultManifest:
+    """
+    Manifesto de notas indexadas.
+
+    ``payload`` contém title/content/frontmatter/tags/links já parseados.
+    Sem ``manifest_path`` o manifesto vive só em memória (nada é reaproveitado
+    entre execuções, mas a lógica de delta continua válida).
+    """
+
+    def __init__(self, manifest_path: Optional[Path] = None):
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self._lock = threading.RLock()
+        self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        target = ":memory:"
+        if self.manifest_path is not None:
+            try:
+                self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                target = str(self.manifest_path)
+            except OSError as exc:
+                print(f"[GLaDOS] ⚠️  Manifesto em disco indisponível ({exc}); usando memória")
+                self.manifest_path = None
+
+        conn = sqlite3.connect(target, check_same_thread=False)
+        if target != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != MANIFEST_VERSION:
+            conn.execute("DROP TABLE IF EXISTS notes")
+            conn.execute(f"PRAGMA user_version = {MANIFEST_VERSION}")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                rel_path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                ctime REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        return conn
+
+    def load(self, rel_paths: Optional[Iterable[str]] = None) -> Dict[str, ManifestEntry]:
+        """
+        Carrega entradas com payload; payloads corrompidos são descartados.
+
+        Args:
+            rel_paths: Restringe a carga a esses caminhos (None = todas)
+        """
+        entries: Dict[str, ManifestEntry] = {}
+        query = "SELECT rel_path, size, mtime_ns, ctime, content_hash, payload FROM notes"
+        with self._lock:
+            if rel_paths is None:
+                rows = self._conn.execute(query).fetchall()
+            else:
+                rows = []
+                wanted = list(dict.fromkeys(rel_paths))
+                for start in range(0, len(wanted), 500):
+                    chunk = wanted[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(self._conn.execute(
+                        f"{query} WHERE rel_path IN ({placeholders})", chunk
+                    ).fetchall())
+        for rel_path, size, mtime_ns, ctime, content_hash, payload in rows:
+            try:
+                data = pickle.loads(payload)
+            except Exception:
+                continue
+            entries[rel_path] = ManifestEntry(rel_path, size, mtime_ns, ctime, content_hash, data)
+        return entries
+
+    def load_stats(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime_ns) de todas as entradas, sem desserializar payloads"""
+        with self._lock:
+            rows = self._conn.execute("SELECT rel_path, size, mtime_ns FROM notes").fetchall()
+        return {rel_path: (size, mtime_ns) for rel_path, size, mtime_ns in rows}
+
+    def get(self, rel_path: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rel_path, size, mtime_ns, ctime, content_hash, payload FROM notes WHERE rel_path = ?",
+                (rel_path,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return ManifestEntry(*row[:5], pickle.loads(row[5]))
+        except Exception:
+            return None
+
+    def upsert(self, entry: ManifestEntry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO notes "
+                "(rel_path, size, mtime_ns, ctime, content_hash, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    entry.rel_path,
+                    int(entry.size),
+                    int(entry.mtime_ns),
+                    float(entry.ctime),
+                    entry.content_hash,
+                    pickle.dumps(entry.payload, protocol=pickle.HIGHEST_PROTOCOL),
+                ),
+            )
+
+    def remove(self, rel_paths: Iterable[str]):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM notes WHERE rel_path = ?",
+                ((rel_path,) for rel_path in rel_paths),
+            )
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error:
+                pass
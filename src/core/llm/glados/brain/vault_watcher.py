@@ -0,0 +1,198 @@
+"""
+vault_watcher.py - Reindexação ao vivo do cérebro da GLaDOS
+Observa o vault (inotify via watchdog, com fallback por polling), agrupa
+eventos de criação/alteração/remoção/renomeação e aplica o lote ao
+VaultStructure e ao Sembrain depois de um curto período de silêncio.
+"""
+from pathlib import Path
+from typing import Dict, Optional
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except Exception:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+class _VaultEventHandler(FileSystemEventHandler):
+    """Traduz eventos do watchdog para o lote pendente do VaultWatcher"""
+
+    def __init__(self, watcher: "VaultWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self._queue(event, CHANGED)
+
+    def on_modified(self, event):
+        self._queue(event, CHANGED)
+
+    def on_deleted(self, event):
+        self._queue(event, REMOVED)
+
+    def on_moved(self, event):
+        if event.is_directory:
+            self.watcher.request_rescan()
+            return
+        # Renomear = remover a origem + criar o destino
+        self.watcher.notify(Path(event.src_path), REMOVED)
+        self.watcher.notify(Path(event.dest_path), CHANGED)
+
+    def _queue(self, event, action: str):
+        if event.is_directory:
+            # Pastas movidas/apagadas podem não gerar eventos para cada arquivo
+            if action == REMOVED:
+                self.watcher.request_rescan()
+            return
+        self.watcher.notify(Path(event.src_path), action)
+
+
+class VaultWatcher:
+    """
+    Observador do vault com debounce.
+
+    Eventos são acumulados em ``_pending`` (caminho -> ação, o último
+    evento vence) e aplicados em lote quando nenhum evento novo chega por
+    ``debounce_seconds``. Sem watchdog, faz polling com o manifesto do
+    VaultStructure (apenas stat() dos arquivos).
+    """
+
+    def __init__(
+        self,
+        vault_structure,
+        debounce_seconds: float = 0.4,
+        poll_interval: float = 2.0,
+        use_polling: bool = False,
+    ):
+        self.vault_structure = vault_structure
+        self.vault_path = Path(vault_structure.vault_path)
+        self.debounce_seconds = max(0.05, float(debounce_seconds))
+        self.poll_interval = max(0.2, float(poll_interval))
+        self.mode = "polling" if (use_polling or not WATCHDOG_AVAILABLE) else "inotify"
+
+        self._pending: Dict[Path, str] = {}
+        self._rescan = False
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+        self._running = False
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"batches": 0, "notes_changed": 0, "notes_removed": 0, "last_apply_ms": 0.0}
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def start(self) -> bool:
+        if self._running:
+            return True
+        self._running = True
+
+        if self.mode == "inotify":
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_VaultEventHandler(self), str(self.vault_path), recursive=True)
+                self._observer.daemon = True
+                self._observer.start()
+            except Exception as exc:
+                print(f"[GLaDOS] ⚠️  Observador de arquivos indisponível ({exc}); usando polling")
+                self._observer = None
+                self.mode = "polling"
+
+        self._thread = threading.Thread(target=self._run, name="glados-vault-watcher", daemon=True)
+        self._thread.start()
+        print(f"[GLaDOS] 👁️  Vigiando vault ({self.mode}): {self.vault_path}")
+        return True
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    # ------------------------------------------------------------------
+    # Entrada de eventos
+    # ------------------------------------------------------------------
+    def notify(self, path: Path, action: str):
+        """Registra um evento de arquivo (thread-safe)"""
+        if not str(path).endswith(self.vault_structure.NOTE_EXTENSIONS):
+            return
+        with self._condition:
+            self._pending[Path(path)] = action
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    def request_rescan(self):
+        """Pede uma revarredura (stat-only) do vault no próximo lote"""
+        with self._condition:
+            self._rescan = True
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    # ------------------------------------------------------------------
+    # Loop de aplicação
+    # ------------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._condition:
+                if self.mode == "polling":
+                    self._condition.wait(self.poll_interval)
+                    if not self._running:
+                        return
+                    self._rescan = True
+                else:
+                    while self._running and not self._pending and not self._rescan:
+                        self._condition.wait()
+                    if not self._running:
+                        return
+                    # Debounce: espera o vault ficar quieto
+                    while self._running:
+                        remaining = self._last_event + self.debounce_seconds - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+
+                batch, self._pending = self._pending, {}
+                rescan, self._rescan = self._rescan, False
+
+            self._apply(batch, rescan)
+
+    def _apply(self, batch: Dict[Path, str], rescan: bool):
+        started = time.perf_counter()
+        try:
+            if rescan:
+                delta = self.vault_structure.refresh_index(verbose=False)
+            else:
+                changed = [path for path, action in batch.items() if action == CHANGED]
+                removed = [path for path, action in batch.items() if action == REMOVED]
+                delta = self.vault_structure.apply_file_changes(changed, removed)
+        except Exception as exc:
+            print(f"[GLaDOS] ⚠️  Erro aplicando alterações do vault: {exc}")
+            return
+
+        if delta["changed"] or delta["removed"]:
+            self.stats["batches"] += 1
+            self.stats["notes_changed"] += len(delta["changed"])
+            self.stats["notes_removed"] += len(delta["removed"])
+            self.stats["last_apply_ms"] = (time.perf_counter() - started) * 1000.0
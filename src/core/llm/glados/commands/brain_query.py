@@ -120,9 +120,9 @@ def consultar_cerebro(
         
         if semantic and system['vault'].semantic_search:
             stats = system['vault'].semantic_search.get_stats()
-            console.print(f"  • Modelo de embeddings: {'✅ Carregado' if stats['model_loaded'] else '❌ Não disponível'}")
+            console.print(f"  • Vocabulário: {stats['vocabulary_size']} termos")
             console.print(f"  • Notas indexadas: {stats['notes_indexed']}")
-            console.print(f"  • Cache de consultas: {stats['query_cache_size']} entradas")
+            console.print(f"  • Cache de consultas: {stats['cache_size']} entradas")
         
         console.print(f"  • Notas encontradas: {len(notas)}")
         console.print(f"  • Método: {'Semântico' if semantic else 'Textual'}")
@@ -407,25 +407,24 @@ def reindexar_busca(
         task = progress.add_task("[cyan]Reindexando...", total=None)
         
         try:
-            # Força reconstrução do índice
+            semantic_search = system['vault'].semantic_search
             if forcar:
-                # Remove cache existente
-                cache_path = system['vault'].semantic_search.cache_path
-                if cache_path.exists():
-                    cache_path.unlink()
-                    console.print("  • Cache anterior removido")
-            
-            # Reconstrói índice
-            system['vault'].semantic_search._build_embeddings_index()
+                # Descarta o segmento persistido e reconstrói do zero
+                semantic_search.rebuild_index()
+                console.print("  • Segmento anterior descartado")
+            else:
+                # Sincroniza apenas notas novas/alteradas/removidas
+                semantic_search._build_indices()
             
             progress.update(task, completed=True)
             
             console.print("\n[green]✅ Reindexação concluída![/green]")
             
             # Mostra estatísticas atualizadas
-            stats = system['vault'].semantic_search.get_stats()
+            stats = semantic_search.get_stats()
             console.print(f"  • Notas indexadas: {stats['notes_indexed']}")
-            console.print(f"  • Cache salvo em: {stats['cache_path']}")
+            console.print(f"  • Vocabulário: {stats['vocabulary_size']} termos")
+            console.print(f"  • Segmento salvo em: {stats['index_path'] or 'memória'}")
             
         except Exception as e:
             console.print(f"\n[red]❌ Erro na reindexação: {e}[/red]")
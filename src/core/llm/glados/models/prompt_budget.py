@@ -0,0 +1,190 @@
+"""
+Orçamento de prompt com o tokenizer real do modelo.
+
+- TokenCounter: conta tokens com ``llm.tokenize`` e memoiza por bloco de
+  texto (notas se repetem entre perguntas); sem modelo carregado cai na
+  estimativa de ~4 caracteres por token.
+- split_context_blocks: separa cabeçalho, blocos de nota e rodapé dos
+  formatos de contexto produzidos pelo vault (pacote de navegação, Sembrain,
+  contexto cerebral e contexto manual).
+- PromptBudget: empacota os blocos, na ordem de relevância em que chegam,
+  exatamente no espaço livre da janela e registra a contabilidade de tokens.
+"""
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+
+# Linhas que abrem um bloco de nota nos formatos de contexto conhecidos
+_BLOCK_START = re.compile(r"^(--- .+ ---|## Nota \d+:.*|Título:.*)$")
+# Linhas que encerram a lista de notas (regras/instruções finais)
+_FOOTER_START = re.compile(r"^(Regras:.*|---|### FIM_.*)$")
+
+
+class TokenCounter:
+    """Contagem de tokens memoizada por bloco de texto"""
+
+    def __init__(self, llm: Any = None, max_entries: int = 4096):
+        self.llm = llm
+        self.max_entries = max(16, int(max_entries))
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self.exact = llm is not None and callable(getattr(llm, "tokenize", None))
+        self.hits = 0
+        self.misses = 0
+
+    def _tokenize_count(self, text: str) -> int:
+        if self.exact:
+            try:
+                return len(self.llm.tokenize(text.encode("utf-8"), add_bos=False, special=True))
+            except Exception:
+                # Tokenizer indisponível: mantém a estimativa pelo resto da sessão
+                self.exact = False
+        return max(1, len(text) // 4) if text else 0
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = self._tokenize_count(text)
+        self._cache[key] = value
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return value
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Maior prefixo (cortado em fim de linha/palavra) que cabe em ``max_tokens``"""
+        if max_tokens <= 0 or not text:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._tokenize_count(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        cut = text[:low]
+        boundary = max(cut.rfind("\n"), cut.rfind(" "))
+        if boundary > len(cut) // 2:
+            cut = cut[:boundary]
+        return cut.rstrip()
+
+
+def split_context_blocks(context: str) -> Tuple[str, List[str], str]:
+    """Separa o contexto em (cabeçalho, blocos de nota, rodapé)"""
+    lines = (context or "").split("\n")
+    starts = [index for index, line in enumerate(lines) if _BLOCK_START.match(line.strip())]
+    if not starts:
+        return context or "", [], ""
+
+    header = "\n".join(lines[: starts[0]])
+    bounds = starts + [len(lines)]
+    blocks = ["\n".join(lines[begin:end]) for begin, end in zip(bounds, bounds[1:])]
+
+    # O rodapé começa na primeira linha de encerramento dentro do último bloco
+    last_lines = blocks[-1].split("\n")
+    for offset, line in enumerate(last_lines[1:], start=1):
+        if _FOOTER_START.match(line.strip()):
+            blocks[-1] = "\n".join(last_lines[:offset])
+            return header, blocks, "\n".join(last_lines[offset:])
+    return header, blocks, ""
+
+
+@dataclass
+class BudgetReport:
+    """Contabilidade de tokens de uma requisição"""
+    n_ctx: int = 0
+    exact: bool = False
+    fixed_tokens: int = 0
+    context_tokens_in: int = 0
+    context_tokens: int = 0
+    blocks_total: int = 0
+    blocks_kept: int = 0
+    blocks_truncated: int = 0
+    prompt_tokens: int = 0
+    generation_tokens: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PromptBudget:
+    """
+    Distribui a janela ``n_ctx`` entre prompt fixo, contexto e geração.
+
+    A geração reserva ``min(max_tokens, max(2 * min_generation, n_ctx // 4))``;
+    o contexto ocupa o resto, bloco a bloco. Depois de montado o prompt,
+    a geração recebe tudo o que sobrou (até ``max_tokens``).
+    """
+
+    # Abaixo disso um trecho parcial de nota mais confunde do que ajuda
+    MIN_PARTIAL_BLOCK = 48
+
+    def __init__(self, counter: TokenCounter, n_ctx: int, safety_tokens: int = 16, min_generation: int = 64):
+        self.counter = counter
+        self.n_ctx = max(256, int(n_ctx))
+        self.safety_tokens = max(0, int(safety_tokens))
+        self.min_generation = max(16, int(min_generation))
+
+    def generation_reserve(self, max_tokens: int) -> int:
+        return max(self.min_generation, min(int(max_tokens), max(self.min_generation * 2, self.n_ctx // 4)))
+
+    def pack_context(self, context: str, fixed_tokens: int, max_tokens: int) -> Tuple[str, BudgetReport]:
+        """Empacota o contexto no espaço livre depois do prompt fixo e da reserva de geração"""
+        report = BudgetReport(n_ctx=self.n_ctx, exact=self.counter.exact, fixed_tokens=fixed_tokens)
+        available = self.n_ctx - fixed_tokens - self.generation_reserve(max_tokens) - self.safety_tokens
+        report.context_tokens_in = self.counter.count(context)
+
+        if report.context_tokens_in <= available:
+            _header, blocks, _footer = split_context_blocks(context)
+            report.blocks_total = report.blocks_kept = len(blocks)
+            report.context_tokens = report.context_tokens_in
+            return context, report
+
+        header, blocks, footer = split_context_blocks(context)
+        report.blocks_total = len(blocks)
+        parts: List[str] = []
+        remaining = available
+        # Cabeçalho e rodapé (âncora/regras) são obrigatórios, truncados se preciso
+        for fixed_part in (header, footer):
+            remaining -= self.counter.count(fixed_part) + (1 if fixed_part else 0)
+        if remaining < 0:
+            header = self.counter.truncate(header, max(0, self.counter.count(header) + remaining))
+            remaining = 0
+
+        for block in blocks:
+            cost = self.counter.count(block) + 1
+            if cost <= remaining:
+                parts.append(block)
+                remaining -= cost
+                report.blocks_kept += 1
+                continue
+            if remaining >= self.MIN_PARTIAL_BLOCK:
+                partial = self.counter.truncate(block, remaining - 1)
+                if partial:
+                    parts.append(partial)
+                    report.blocks_kept += 1
+                    report.blocks_truncated += 1
+            break
+
+        packed = "\n".join(part for part in [header, *parts, footer] if part)
+        report.context_tokens = self.counter.count(packed)
+        return packed, report
+
+    def generation_tokens(self, prompt: str, max_tokens: int, report: Optional[BudgetReport] = None) -> int:
+        """Tokens de geração que cabem depois do prompt completo (contagem exata)"""
+        prompt_tokens = self.counter.count(prompt)
+        available = self.n_ctx - prompt_tokens - self.safety_tokens
+        generation = max(32, min(int(max_tokens), available))
+        if report is not None:
+            report.prompt_tokens = prompt_tokens
+            report.generation_tokens = generation
+        return generation
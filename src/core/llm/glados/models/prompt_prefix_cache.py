@@ -0,0 +1,132 @@
+"""
+Cache de prefixo de prompt para o llama.cpp.
+
+O início dos prompts da GLaDOS (sistema + usuário + regras + persona) é
+idêntico entre perguntas. Em vez de reavaliar essas centenas de tokens a
+cada chamada, o estado do llama.cpp logo após o prefixo é guardado com
+``save_state()`` e restaurado com ``load_state()``; o ``Llama.generate``
+reaproveita então o maior prefixo comum e só avalia o restante do prompt.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+
+
+class PromptPrefixCache:
+    """
+    Estados do llama.cpp por prefixo estático de prompt (LRU limitado em bytes).
+
+    A chave inclui modelo e ``n_ctx``: se qualquer um mudar, o estado antigo
+    simplesmente não casa e o prefixo é reavaliado. Qualquer falha da API de
+    estado desativa o cache e a geração segue pelo caminho normal.
+    """
+
+    def __init__(self, max_entries: int = 4, max_bytes: int = 96 * 1024 * 1024):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.enabled = self.max_bytes > 0
+        self._states: "OrderedDict[Tuple[str, int, str], Tuple[Any, int]]" = OrderedDict()
+        self._tokens: Dict[Tuple[str, str], List[int]] = {}
+        self._bytes = 0
+        self.stats = {"warm": 0, "restored": 0, "built": 0, "prefix_tokens": 0}
+
+    @staticmethod
+    def _digest(prefix: str) -> str:
+        return hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _signature(llm: Any) -> Tuple[str, int]:
+        n_ctx = llm.n_ctx() if callable(getattr(llm, "n_ctx", None)) else int(getattr(llm, "n_ctx", 0) or 0)
+        return str(getattr(llm, "model_path", "") or ""), int(n_ctx)
+
+    def _prefix_tokens(self, llm: Any, model_path: str, prefix: str, digest: str) -> List[int]:
+        key = (model_path, digest)
+        tokens = self._tokens.get(key)
+        if tokens is None:
+            # Mesma tokenização usada pelo create_completion (BOS + tokens especiais)
+            tokens = list(llm.tokenize(prefix.encode("utf-8"), add_bos=True, special=True))
+            if len(self._tokens) > 4 * self.max_entries:
+                self._tokens.clear()
+            self._tokens[key] = tokens
+        return tokens
+
+    @staticmethod
+    def _current_tokens(llm: Any, limit: int) -> Optional[List[int]]:
+        current = getattr(llm, "_input_ids", None)
+        if current is None:
+            return None
+        if hasattr(current, "tolist"):
+            current = current.tolist()
+        return [int(token) for token in list(current)[:limit]]
+
+    def prime(self, llm: Any, prefix: str) -> str:
+        """
+        Garante que o contexto do llama.cpp comece pelo ``prefix``.
+
+        Retorna ``"warm"`` (já estava carregado), ``"restored"`` (estado
+        restaurado), ``"built"`` (prefixo avaliado e salvo) ou ``"disabled"``.
+        """
+        if not self.enabled or llm is None or not prefix:
+            return "disabled"
+        try:
+            model_path, n_ctx = self._signature(llm)
+            digest = self._digest(prefix)
+            tokens = self._prefix_tokens(llm, model_path, prefix, digest)
+            # Prefixo maior que metade da janela não compensa guardar
+            if not tokens or (n_ctx and len(tokens) >= n_ctx // 2):
+                return "disabled"
+            self.stats["prefix_tokens"] = len(tokens)
+
+            if self._current_tokens(llm, len(tokens)) == tokens:
+                self.stats["warm"] += 1
+                return "warm"
+
+            key = (model_path, n_ctx, digest)
+            cached = self._states.get(key)
+            if cached is not None:
+                llm.load_state(cached[0])
+                self._states.move_to_end(key)
+                self.stats["restored"] += 1
+                return "restored"
+
+            llm.reset()
+            llm.eval(tokens)
+            state = llm.save_state()
+            size = int(getattr(state, "llama_state_size", 0) or 0)
+            self._store(key, state, size)
+            self.stats["built"] += 1
+            return "built"
+        except Exception as exc:
+            print(f"[GLaDOS] ⚠️  Cache de prefixo desativado ({exc})")
+            self.enabled = False
+            self.clear()
+            try:
+                llm.reset()
+            except Exception:
+                pass
+            return "disabled"
+
+    def _store(self, key: Tuple[str, int, str], state: Any, size: int):
+        if size > self.max_bytes:
+            return
+        previous = self._states.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._states[key] = (state, size)
+        self._bytes += size
+        while self._states and (len(self._states) > self.max_entries or self._bytes > self.max_bytes):
+            _key, (_state, old_size) = self._states.popitem(last=False)
+            self._bytes -= old_size
+
+    def clear(self):
+        self._states.clear()
+        self._tokens.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "entries": len(self._states),
+            "bytes": self._bytes,
+        }
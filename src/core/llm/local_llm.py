@@ -5,8 +5,6 @@ Versão com busca semântica integrada (Sembrain)
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-import hashlib
-import pickle
 from datetime import datetime
 import re
 
@@ -14,6 +12,8 @@ from core.config.settings import settings
 from core.llm.glados.models.tinyllama_wrapper import TinyLlamaGlados, LlamaConfig
 from core.llm.glados.brain.vault_connector import VaultStructure
 from core.llm.glados.personality import create_personality_voice
+from core.llm.response_cache import ResponseCache
+from core.llm.streaming import StreamCallback, StreamRelay
 from core.llm.runtime_discovery import (
     detect_nvidia_gpus,
     pick_model_path,
@@ -37,7 +37,7 @@ class LocalLLM:
         self.model = None
         self.vault_structure = None
         self.sembrain = None
-        self.response_cache = {}
+        self.response_cache = self._load_cache()
         self.query_history = []
         self.runtime_info: Dict[str, Any] = {
             "models": [],
@@ -118,6 +118,7 @@ class LocalLLM:
                 n_threads=cpu_threads,
                 n_batch=settings.llm.cpu.batch_size,
                 use_mlock=settings.llm.cpu.use_mlock,
+                prefix_cache_mb=int(getattr(settings.llm, "prefix_cache_mb", 96) or 0),
                 verbose=False
             )
             self.runtime_info["device_mode"] = config.device_mode
@@ -137,6 +138,10 @@ class LocalLLM:
             if hasattr(settings.llm, 'use_semantic_search') and settings.llm.use_semantic_search:
                 self._init_sembrain()
             
+            # Reindexação ao vivo das notas editadas no Obsidian
+            if bool(getattr(settings.llm, "watch_vault", True)):
+                self.vault_structure.start_watching()
+            
             # Personalidade ativa (GLaDOS/Marvin)
             glados_voice = create_personality_voice(
                 user_name=str(getattr(settings.llm.glados, "user_name", "Helio") or "Helio"),
@@ -154,9 +159,6 @@ class LocalLLM:
                     f"device={self.model.runtime_device}"
                 )
             
-            # Carregar cache se existir
-            self._load_cache()
-            
             self._initialized = True
             print("✅ LLM local inicializado com busca semântica")
             
@@ -181,7 +183,11 @@ class LocalLLM:
             notes = self.vault_structure.get_all_notes()
             vault_path = Path(settings.paths.vault).expanduser()
 
-            self.sembrain = Sembrain(vault_path, notes)
+            self.sembrain = Sembrain(
+                vault_path,
+                notes,
+                index_path=getattr(self.vault_structure, "semantic_index_path", None),
+            )
             print(f"🧠 Sembrain inicializado: {len(notes)} notas indexadas")
             
         except ImportError as e:
@@ -190,31 +196,49 @@ class LocalLLM:
         except Exception as e:
             print(f"⚠️  Erro inicializando Sembrain: {e}")
     
-    def _get_cache_key(self, query: str, user_name: str = None) -> str:
-        """Gera chave única para cache"""
-        key_data = f"{query}_{user_name or 'default'}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+    def _get_cache_key(self, query: str, user_name: str = None, context: str = "") -> str:
+        """Gera chave única para cache (modelo, personalidade e contexto inclusos)"""
+        cfg = getattr(self.model, "config", None)
+        glados_cfg = settings.llm.glados
+        return ResponseCache.make_key(
+            query,
+            model=str(getattr(cfg, "model_path", "") or ""),
+            personality=(
+                f"{getattr(glados_cfg, 'personality_profile', 'auto')}|"
+                f"{getattr(glados_cfg, 'personality_intensity', 0.7)}|"
+                f"{getattr(glados_cfg, 'glados_name', 'GLaDOS')}"
+            ),
+            user=user_name or "default",
+            context=context,
+            params={
+                "temperature": getattr(cfg, "temperature", None),
+                "top_p": getattr(cfg, "top_p", None),
+                "repeat_penalty": getattr(cfg, "repeat_penalty", None),
+                "max_tokens": getattr(cfg, "max_tokens", None),
+            },
+        )
     
-    def _load_cache(self):
-        """Carrega cache de respostas do disco"""
-        cache_path = Path(settings.paths.cache_dir) / "llm_responses.pkl"
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'rb') as f:
-                    self.response_cache = pickle.load(f)
-                print(f"📦 Cache carregado: {len(self.response_cache)} respostas")
-            except Exception as e:
-                print(f"⚠️  Erro carregando cache: {e}")
-                self.response_cache = {}
+    @staticmethod
+    def _load_cache() -> ResponseCache:
+        """Abre o cache de respostas persistente (SQLite, gravação incremental)"""
+        cache_cfg = settings.cache
+        store_path = None
+        if bool(getattr(cache_cfg, "enabled", True)):
+            store_path = Path(settings.paths.cache_dir) / "llm_responses.sqlite3"
+        cache = ResponseCache(
+            store_path=store_path,
+            max_entries=500,
+            max_bytes=int(getattr(cache_cfg, "max_bytes_mb", 16) or 16) * 1024 * 1024,
+            ttl_seconds=float(getattr(cache_cfg, "ttl", 3600) or 3600),
+        )
+        if len(cache):
+            print(f"📦 Cache carregado: {len(cache)} respostas")
+        return cache
     
     def _save_cache(self):
-        """Salva cache de respostas no disco"""
+        """Grava no disco as respostas pendentes do cache"""
         try:
-            cache_path = Path(settings.paths.cache_dir) / "llm_responses.pkl"
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(cache_path, 'wb') as f:
-                pickle.dump(self.response_cache, f)
+            self.response_cache.flush()
         except Exception as e:
             print(f"⚠️  Erro salvando cache: {e}")
 
@@ -325,8 +349,12 @@ class LocalLLM:
         user_name: str = None,
         use_semantic: bool = True,
         request_metadata: Optional[Dict[str, Any]] = None,
+        stream_callback: Optional[StreamCallback] = None,
     ) -> Dict[str, Any]:
-        """Gera resposta para uma consulta com contexto semântico"""
+        """
+        Gera resposta para uma consulta com contexto semântico.
+        ``stream_callback`` recebe os trechos sanitizados durante a geração.
+        """
         metadata = request_metadata or {}
         strict_vault_only = bool(metadata.get("vault_only", False) or metadata.get("strict_vault_only", False))
         strict_no_fallback = bool(metadata.get("disable_sembrain_fallback", False) or strict_vault_only)
@@ -340,23 +368,6 @@ class LocalLLM:
         if strict_vault_only:
             use_semantic = False
 
-        # Verificar cache primeiro
-        cache_key = self._get_cache_key(query, user_name)
-        if cache_key in self.response_cache:
-            cached_time, response = self.response_cache[cache_key]
-            if (datetime.now().timestamp() - cached_time) < 3600:  # 1 hora
-                print("⚡ Resposta do cache")
-                response = dict(response)
-                response["text"] = self._sanitize_response_text(response.get("text", ""))
-                response["request_metadata"] = metadata
-                if "navigation_packet" not in response and isinstance(response.get("request_metadata"), dict):
-                    response["navigation_packet"] = response["request_metadata"].get("navigation_packet")
-                return {
-                    **response,
-                    "cached": True,
-                    "cache_key": cache_key
-                }
-        
         if self.model is None:
             models_dir_hint = str(getattr(settings.llm, "models_dir", settings.paths.models_dir))
             return {
@@ -429,12 +440,37 @@ class LocalLLM:
             except Exception as e:
                 print(f"⚠️  Erro obtendo contexto semântico: {e}")
         
+        # Verificar cache (chave inclui modelo, personalidade e contexto)
+        cache_key = self._get_cache_key(query, user_name, semantic_context)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            print("⚡ Resposta do cache")
+            response = dict(cached_response)
+            response["text"] = self._sanitize_response_text(response.get("text", ""))
+            response["request_metadata"] = metadata
+            if "navigation_packet" not in response and isinstance(response.get("request_metadata"), dict):
+                response["navigation_packet"] = response["request_metadata"].get("navigation_packet")
+            return {
+                **response,
+                "cached": True,
+                "cache_key": cache_key
+            }
+        
         try:
-            response = self.model.generate_response(
-                query,
-                user_name,
-                extra_context=semantic_context,
-            )
+            relay = StreamRelay(stream_callback) if stream_callback is not None else None
+            if relay is not None:
+                response = self.model.generate_response(
+                    query,
+                    user_name,
+                    extra_context=semantic_context,
+                    stream_callback=relay,
+                )
+            else:
+                response = self.model.generate_response(
+                    query,
+                    user_name,
+                    extra_context=semantic_context,
+                )
             
             # Registrar no histórico
             self.query_history.append({
@@ -464,21 +500,13 @@ class LocalLLM:
                 "request_metadata": metadata,
                 "navigation_packet": metadata.get("navigation_packet"),
             }
+            budget_report = getattr(self.model, "last_budget", None)
+            if budget_report is not None:
+                result["token_budget"] = budget_report.to_dict()
             
-            self.response_cache[cache_key] = (datetime.now().timestamp(), result)
-            
-            # Limitar cache
-            if len(self.response_cache) > 500:
-                # Remove as mais antigas
-                sorted_keys = sorted(self.response_cache.keys(), 
-                                   key=lambda k: self.response_cache[k][0])
-                keys_to_remove = sorted_keys[:100]
-                for key in keys_to_remove:
-                    del self.response_cache[key]
-            
-            # Salvar cache periodicamente
-            if len(self.response_cache) % 50 == 0:
-                self._save_cache()
+            # LRU/TTL com persistência incremental (só o delta vai para o disco)
+            if relay is None or not relay.stopped:
+                self.response_cache.put(cache_key, result)
             
             return result
             
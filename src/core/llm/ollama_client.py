@@ -0,0 +1,286 @@
+"""
+Cliente HTTP do Ollama para o backend cloud.
+
+- Conexões keep-alive reaproveitadas (pool por host), sem handshake TCP a
+  cada pergunta; conexão reaproveitada que o servidor fechou é refeita uma vez.
+- Probe de saúde (``/api/tags``) em cache com TTL curto; vencido, devolve o
+  último resultado e atualiza em segundo plano (só bloqueia se nunca houve
+  probe ou se o último falhou).
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import http.client
+import json
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+
+class OllamaHTTPError(RuntimeError):
+    """Resposta HTTP de erro do servidor (corpo já lido em ``detail``)."""
+
+    def __init__(self, code: int, detail: str = ""):
+        super().__init__(detail or f"HTTP {code}")
+        self.code = int(code)
+        self.detail = str(detail or "")
+
+
+class OllamaConnectionError(RuntimeError):
+    """Falha de rede ao falar com o servidor (recusado, timeout, DNS...)."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = str(reason or "")
+
+
+# Erros de conexão reaproveitada que o servidor encerrou por ociosidade
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+# Fim de stream lido ao devolver a conexão ao pool
+_DRAIN_TIMEOUT = 0.2
+_DRAIN_BYTES = 64
+
+
+class OllamaHTTPClient:
+    """Pool de conexões keep-alive para um ``api_base``."""
+
+    def __init__(
+        self,
+        api_base: str,
+        *,
+        max_idle: int = 4,
+        probe_ttl: float = 15.0,
+        failed_probe_ttl: float = 2.0,
+    ):
+        self.api_base = str(api_base or "").strip().rstrip("/")
+        parsed = urlsplit(self.api_base)
+        self._scheme = (parsed.scheme or "http").lower()
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port
+        self._base_path = parsed.path.rstrip("/")
+        self.max_idle = max(1, int(max_idle))
+        self.probe_ttl = max(0.0, float(probe_ttl))
+        self.failed_probe_ttl = max(0.0, float(failed_probe_ttl))
+
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._probe_result: Optional[Dict[str, Any]] = None
+        self._probe_at = 0.0
+        self._probe_refreshing = False
+        self.stats = {"connections": 0, "reused": 0, "probes": 0, "probe_hits": 0}
+
+    # ------------------------------------------------------------------
+    # Conexões
+    # ------------------------------------------------------------------
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        self.stats["connections"] += 1
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+
+    def _acquire(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            return self._new_connection(timeout), False
+        self.stats["reused"] += 1
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    @contextmanager
+    def open(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: float = 120.0,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """
+        Abre uma requisição e entrega a resposta (status 2xx).
+
+        A conexão volta ao pool só se a resposta foi lida até o fim; leitura
+        interrompida (ex.: streaming cancelado) fecha a conexão, o que também
+        faz o Ollama abortar a geração.
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Connection": "keep-alive"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        url_path = f"{self._base_path}{path}"
+
+        response = None
+        connection = None
+        for attempt in range(2):
+            connection, reused = self._acquire(timeout)
+            try:
+                connection.request(method, url_path, body=body, headers=headers)
+                response = connection.getresponse()
+                break
+            except _STALE_ERRORS as exc:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise OllamaConnectionError(str(exc) or type(exc).__name__) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                reason = "timed out" if isinstance(exc, socket.timeout) else str(exc) or type(exc).__name__
+                raise OllamaConnectionError(reason) from exc
+
+        if response.status >= 400:
+            try:
+                detail = response.read().decode("utf-8", errors="replace").strip()
+            except Exception:
+                detail = ""
+            self._finish(connection, response)
+            raise OllamaHTTPError(response.status, detail)
+
+        try:
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        self._finish(connection, response)
+
+    def _finish(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        if not response.isclosed() and not response.will_close:
+            self._drain_tail(connection, response)
+        if response.isclosed() and not response.will_close:
+            self._release(connection)
+        else:
+            connection.close()
+
+    @staticmethod
+    def _drain_tail(connection: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        """Consome o fim já enviado da resposta (ex.: chunk final após ``done``)."""
+        try:
+            if response.length == 0:
+                response.read()
+            elif response.chunked and connection.sock is not None:
+                # Só o terminador pendente; stream ainda gerando não fecha aqui
+                connection.sock.settimeout(_DRAIN_TIMEOUT)
+                response.read(_DRAIN_BYTES)
+        except (OSError, http.client.HTTPException, ValueError):
+            pass
+
+    def request_json(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: float = 120.0,
+    ) -> Any:
+        with self.open(method, path, payload, timeout=timeout) as response:
+            raw_body = response.read().decode("utf-8", errors="replace")
+        return json.loads(raw_body or "{}")
+
+    # ------------------------------------------------------------------
+    # Probe de saúde
+    # ------------------------------------------------------------------
+    def probe(self, *, timeout: float = 2.0, force: bool = False) -> Dict[str, Any]:
+        """Resultado de ``/api/tags`` em cache (``cached`` indica se veio do cache)."""
+        with self._probe_lock:
+            cached = self._probe_result
+            age = time.monotonic() - self._probe_at
+            if cached is not None and not force:
+                ttl = self.probe_ttl if cached.get("reachable") else self.failed_probe_ttl
+                if age < ttl:
+                    self.stats["probe_hits"] += 1
+                    return {**cached, "cached": True}
+                if cached.get("reachable"):
+                    # Servidor estava no ar: responde já e confirma em segundo plano
+                    self.stats["probe_hits"] += 1
+                    self._refresh_probe_in_background(timeout)
+                    return {**cached, "cached": True}
+        return {**self._run_probe(timeout), "cached": False}
+
+    def _refresh_probe_in_background(self, timeout: float) -> None:
+        if self._probe_refreshing:
+            return
+        self._probe_refreshing = True
+
+        def _worker():
+            try:
+                self._run_probe(timeout)
+            finally:
+                self._probe_refreshing = False
+
+        threading.Thread(target=_worker, name="ollama-probe", daemon=True).start()
+
+    def _run_probe(self, timeout: float) -> Dict[str, Any]:
+        self.stats["probes"] += 1
+        try:
+            payload = self.request_json("GET", "/api/tags", timeout=max(1.0, float(timeout)))
+            models = payload.get("models", []) if isinstance(payload, dict) else []
+            model_names = []
+            for item in models:
+                if isinstance(item, dict):
+                    name = str(item.get("name") or "").strip()
+                    if name:
+                        model_names.append(name)
+            result: Dict[str, Any] = {
+                "reachable": True,
+                "api_base": self.api_base,
+                "models_count": len(model_names),
+                "models": model_names[:20],
+            }
+        except OllamaConnectionError as exc:
+            result = {"reachable": False, "api_base": self.api_base, "error": exc.reason}
+        except Exception as exc:
+            result = {"reachable": False, "api_base": self.api_base, "error": str(exc)}
+        self._store_probe(result)
+        return result
+
+    def _store_probe(self, result: Dict[str, Any]) -> None:
+        with self._probe_lock:
+            self._probe_result = dict(result)
+            self._probe_at = time.monotonic()
+
+    def mark_reachable(self, reachable: bool, error: str = "") -> None:
+        """Atualiza o probe com o desfecho de uma chamada real (sem ida extra ao servidor)."""
+        with self._probe_lock:
+            if self._probe_result is None and reachable:
+                # Sem probe completo ainda: deixa a lista de modelos para a primeira consulta
+                return
+            previous = dict(self._probe_result or {"api_base": self.api_base})
+            previous["reachable"] = bool(reachable)
+            if reachable:
+                previous.pop("error", None)
+            else:
+                previous["error"] = str(error or "")
+            self._probe_result = previous
+            self._probe_at = time.monotonic()
+
+
+_CLIENTS: Dict[str, OllamaHTTPClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_ollama_client(api_base: str) -> OllamaHTTPClient:
+    """Cliente compartilhado por ``api_base`` (pool e probe únicos por servidor)."""
+    key = str(api_base or "").strip().rstrip("/")
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = OllamaHTTPClient(key)
+            _CLIENTS[key] = client
+        return client
@@ -0,0 +1,290 @@
+"""
+Cache de respostas compartilhado pelos backends LLM (local/cloud).
+
+- Despejo LRU em O(1) (OrderedDict), TTL e limites por entradas e bytes.
+- Chaves derivadas de consulta + modelo + personalidade + digest do contexto,
+  então trocar de modelo ou editar notas não serve respostas velhas.
+- Persistência opcional em SQLite gravando só o delta (entradas novas,
+  acessadas ou removidas desde o último flush).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """Cache LRU/TTL com limite em bytes e persistência incremental."""
+
+    def __init__(
+        self,
+        store_path: Optional[Path] = None,
+        max_entries: int = 500,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        flush_every: int = 20,
+    ):
+        self.store_path = Path(store_path) if store_path else None
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1024, int(max_bytes))
+        self.ttl_seconds = float(ttl_seconds)
+        self.flush_every = max(1, int(flush_every))
+
+        # key -> (created, value, size)
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        # Delta pendente para o disco
+        self._dirty: Dict[str, float] = {}      # key -> last_access (valor novo)
+        self._touched: Dict[str, float] = {}    # key -> last_access (só acesso)
+        self._deleted: set = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.store_path is not None:
+            self._open_store()
+
+    # ------------------------------------------------------------------
+    # Chaves
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(
+        query: str,
+        *,
+        model: str = "",
+        personality: str = "",
+        user: str = "",
+        context: str = "",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Chave estável: contexto entra apenas como digest."""
+        context_digest = hashlib.sha1(str(context or "").encode("utf-8")).hexdigest()
+        payload = json.dumps(
+            {
+                "q": str(query or ""),
+                "m": str(model or ""),
+                "p": str(personality or ""),
+                "u": str(user or ""),
+                "c": context_digest,
+                "g": params or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # API de cache
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            created, value, _size = entry
+            if self._expired(created):
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if key in self._dirty:
+                self._dirty[key] = time.time()
+            else:
+                self._touched[key] = time.time()
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        try:
+            size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries[key][2]
+            self._entries[key] = (time.time(), value, size)
+            self._entries.move_to_end(key)
+            self._bytes += size
+            self._dirty[key] = time.time()
+            self._touched.pop(key, None)
+            self._deleted.discard(key)
+            self._evict()
+            if len(self._dirty) + len(self._deleted) >= self.flush_every:
+                self.flush()
+
+    def clear(self):
+        with self._lock:
+            self._deleted.update(self._entries.keys())
+            self._entries.clear()
+            self._dirty.clear()
+            self._touched.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM responses")
+                    self._conn.commit()
+                    self._deleted.clear()
+                except sqlite3.Error as exc:
+                    print(f"⚠️  Erro limpando cache persistente: {exc}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "pending_writes": len(self._dirty) + len(self._touched) + len(self._deleted),
+                "store_path": str(self.store_path) if self.store_path else None,
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds > 0 and (time.time() - created) >= self.ttl_seconds
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+        self._dirty.pop(key, None)
+        self._touched.pop(key, None)
+        self._deleted.add(key)
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._drop(oldest_key)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Persistência (SQLite, só delta)
+    # ------------------------------------------------------------------
+    def _open_store(self):
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.store_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            self._load()
+        except (OSError, sqlite3.Error) as exc:
+            print(f"⚠️  Cache persistente indisponível ({exc}); usando só memória")
+            self._conn = None
+
+    def _load(self):
+        now = time.time()
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl_seconds,))
+        rows = self._conn.execute(
+            "SELECT key, created, size, payload FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, created, size, payload in rows:
+            try:
+                value = pickle.loads(payload)
+            except Exception:
+                self._deleted.add(key)
+                continue
+            self._entries[key] = (created, value, int(size))
+            self._bytes += int(size)
+        self._evict()
+        self.flush()
+
+    def flush(self):
+        """Grava no disco apenas o que mudou desde o último flush."""
+        with self._lock:
+            if self._conn is None:
+                self._dirty.clear()
+                self._touched.clear()
+                self._deleted.clear()
+                return
+            if not self._dirty and not self._touched and not self._deleted:
+                return
+            try:
+                if self._deleted:
+                    self._conn.executemany(
+                        "DELETE FROM responses WHERE key = ?",
+                        ((key,) for key in self._deleted),
+                    )
+                rows = []
+                for key, last_access in self._dirty.items():
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    created, value, size = entry
+                    rows.append((
+                        key,
+                        created,
+                        last_access,
+                        size,
+                        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                    ))
+                if rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO responses (key, created, last_access, size, payload) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                if self._touched:
+                    # Acessos só atualizam a ordem LRU, sem regravar o payload
+                    self._conn.executemany(
+                        "UPDATE responses SET last_access = ? WHERE key = ?",
+                        ((last_access, key) for key, last_access in self._touched.items()),
+                    )
+                self._conn.commit()
+                self._dirty.clear()
+                self._touched.clear()
+                self._deleted.clear()
+            except sqlite3.Error as exc:
+                print(f"⚠️  Erro salvando cache: {exc}")
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
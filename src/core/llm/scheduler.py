@@ -0,0 +1,525 @@
+"""
+Fila única de pedidos à LLM, na frente do ``LLMBackendProxy``.
+
+Há uma só instância de modelo (llama.cpp ou um Ollama local), então os
+pedidos de chat, revisão, transcrição etc. passam todos por aqui:
+
+- prioridades: chat interativo antes de revisão/transcrição em lote; um
+  pedido interativo interrompe o lote em execução, que volta para a fila
+  (resposta parcial interrompida não entra no cache do backend). O lote
+  não transmite trechos durante a geração: o stream é entregue de uma vez
+  ao final, para que uma tentativa interrompida nunca chegue ao consumidor;
+- fila limitada: cheia, descarta o pedido menos prioritário ou recusa;
+- ``supersede_key``: pergunta nova do mesmo chat cancela a anterior (na
+  fila ou gerando);
+- pedidos idênticos em andamento são coalescidos numa única geração;
+- métricas de profundidade da fila, espera e duração (``get_stats``).
+
+Cancelamento usa a convenção do streaming: o callback passa a retornar
+False e o backend para de gerar.
+"""
+from __future__ import annotations
+
+from collections import deque
+import hashlib
+import heapq
+import itertools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.llm.streaming import StreamCallback
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 50
+PRIORITY_BACKGROUND = 100
+
+PRIORITY_NAMES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "normal": PRIORITY_NORMAL,
+    "background": PRIORITY_BACKGROUND,
+}
+
+# Metadados que mudam a cada pedido e não alteram a resposta
+_VOLATILE_METADATA_KEYS = {"request_id", "timestamp"}
+
+
+class LLMRequestCancelled(RuntimeError):
+    """Pedido cancelado, substituído ou descartado antes de terminar."""
+
+
+class LLMQueueFull(RuntimeError):
+    """Fila cheia de pedidos com prioridade igual ou maior."""
+
+
+def resolve_priority(value: Any, default: int = PRIORITY_NORMAL) -> int:
+    """Aceita nome (``interactive``/``normal``/``background``) ou número."""
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, (int, float)):
+        return int(value)
+    name = str(value or "").strip().lower()
+    if name in PRIORITY_NAMES:
+        return PRIORITY_NAMES[name]
+    try:
+        return int(name)
+    except ValueError:
+        return default
+
+
+class LLMTicket:
+    """Pedido de um chamador; vários tickets podem compartilhar a mesma geração."""
+
+    def __init__(
+        self,
+        request_metadata: Dict[str, Any],
+        priority: int,
+        supersede_key: str = "",
+        stream_callback: Optional[StreamCallback] = None,
+    ):
+        self.query = ""
+        self.request_metadata = request_metadata
+        self.priority = priority
+        self.supersede_key = supersede_key
+        self.stream_callback = stream_callback
+        self.submitted_at = time.monotonic()
+        self.coalesced = False
+        self._job: Optional["_Job"] = None
+        self._event = threading.Event()
+        self._result: Optional[Dict[str, Any]] = None
+        self._error: Optional[BaseException] = None
+        self._cancelled = False
+        self._callbacks: List[Callable[["LLMTicket"], None]] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # API do chamador
+    # ------------------------------------------------------------------
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._error
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Espera o resultado; relança o erro ou ``LLMRequestCancelled``."""
+        if not self._event.wait(timeout):
+            raise TimeoutError("Tempo esgotado aguardando a LLM.")
+        if self._error is not None:
+            raise self._error
+        return dict(self._result or {})
+
+    def cancel(self, reason: str = "cancelado") -> bool:
+        job = self._job
+        if job is None:
+            return self._finish(error=LLMRequestCancelled(reason), cancelled=True)
+        return job.scheduler._cancel_ticket(self, reason)
+
+    def add_done_callback(self, callback: Callable[["LLMTicket"], None]) -> None:
+        """Chamado na thread que concluir o pedido (imediatamente se já concluído)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    # ------------------------------------------------------------------
+    # Interno
+    # ------------------------------------------------------------------
+    def _finish(
+        self,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+        cancelled: bool = False,
+    ) -> bool:
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._result = result
+            self._error = error
+            self._cancelled = cancelled
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as exc:
+                print(f"⚠️ Callback de pedido LLM falhou: {exc}")
+        return True
+
+    def _deliver(self, delta: str) -> bool:
+        if self._event.is_set():
+            return False
+        if self.stream_callback is None:
+            return True
+        return self.stream_callback(delta) is not False
+
+
+class _Job:
+    """Uma geração no backend, compartilhada pelos tickets coalescidos."""
+
+    def __init__(self, scheduler: "LLMRequestScheduler", key: str, kwargs: Dict[str, Any], priority: int, seq: int):
+        self.scheduler = scheduler
+        self.key = key
+        self.kwargs = kwargs
+        self.priority = priority
+        self.seq = seq
+        self.tickets: List[LLMTicket] = []
+        self.state = "queued"
+        self.enqueued_at = time.monotonic()
+        self.preempt_requested = False
+        self.interrupted = False
+        self.attempts = 0
+
+    def live_tickets(self) -> List[LLMTicket]:
+        return [ticket for ticket in self.tickets if not ticket.done()]
+
+    @property
+    def buffered(self) -> bool:
+        # Lote guarda os trechos até o fim: nada entregue, nada a "desentregar"
+        return self.priority >= PRIORITY_BACKGROUND
+
+    def preemptible(self) -> bool:
+        return self.buffered
+
+
+class LLMRequestScheduler:
+    """Fila priorizada com um número fixo de gerações simultâneas (padrão: 1)."""
+
+    def __init__(self, backend: Any = None, *, max_pending: int = 32, max_concurrent: int = 1):
+        self._backend = backend
+        self.max_pending = max(1, int(max_pending))
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._lock = threading.Condition()
+        self._queue: List[tuple[int, int, _Job]] = []
+        self._jobs: Dict[str, _Job] = {}
+        self._running: List[_Job] = []
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self._wait_ms: deque = deque(maxlen=200)
+        self._run_ms: deque = deque(maxlen=200)
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "coalesced": 0,
+            "superseded": 0,
+            "preempted": 0,
+            "evicted": 0,
+            "rejected": 0,
+        }
+
+    @property
+    def backend(self) -> Any:
+        if self._backend is None:
+            from core.llm.backend_router import llm as backend_llm
+
+            self._backend = backend_llm
+        return self._backend
+
+    # ------------------------------------------------------------------
+    # Envio
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        query: str,
+        *,
+        user_name: Optional[str] = None,
+        use_semantic: bool = True,
+        request_metadata: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        stream_callback: Optional[StreamCallback] = None,
+        priority: Any = PRIORITY_NORMAL,
+        supersede_key: str = "",
+    ) -> LLMTicket:
+        """Enfileira um pedido (mesmos argumentos de ``LLMBackendProxy.generate``)."""
+        metadata = dict(request_metadata or {})
+        resolved_priority = resolve_priority(priority)
+        ticket = LLMTicket(metadata, resolved_priority, str(supersede_key or ""), stream_callback)
+        ticket.query = str(query or "")
+        kwargs = {
+            "query": query,
+            "user_name": user_name,
+            "use_semantic": use_semantic,
+            "request_metadata": metadata,
+            "context": context,
+            "max_tokens": max_tokens,
+        }
+        key = self._request_key(kwargs)
+
+        with self._lock:
+            if self._closed:
+                raise LLMRequestCancelled("Fila da LLM encerrada.")
+            self.stats["submitted"] += 1
+            if ticket.supersede_key:
+                self._supersede_locked(ticket.supersede_key)
+
+            job = self._jobs.get(key)
+            joinable = job is not None and (
+                job.state == "queued"
+                # Stream já começado: quem chega agora perderia os primeiros trechos
+                or (
+                    job.state == "running"
+                    and (stream_callback is None or job.buffered)
+                    and not job.preempt_requested
+                )
+            )
+            if joinable:
+                # Mesma pergunta já em andamento: pega carona na geração existente
+                ticket.coalesced = True
+                ticket._job = job
+                job.tickets.append(ticket)
+                self.stats["coalesced"] += 1
+                if resolved_priority < job.priority and job.state == "queued":
+                    self._reprioritize_locked(job, resolved_priority)
+                return ticket
+
+            if len(self._queue) >= self.max_pending:
+                self._make_room_locked(resolved_priority)
+
+            job = _Job(self, key, kwargs, resolved_priority, next(self._seq))
+            ticket._job = job
+            job.tickets.append(ticket)
+            self._jobs[key] = job
+            heapq.heappush(self._queue, (job.priority, job.seq, job))
+            self._preempt_for_locked(job)
+            self._ensure_workers_locked()
+            self._lock.notify()
+        return ticket
+
+    def run(self, query: str, *, timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        """Atalho bloqueante: ``submit(...).result()``."""
+        return self.submit(query, **kwargs).result(timeout)
+
+    @staticmethod
+    def _request_key(kwargs: Dict[str, Any]) -> str:
+        metadata = {
+            key: value
+            for key, value in (kwargs.get("request_metadata") or {}).items()
+            if key not in _VOLATILE_METADATA_KEYS
+        }
+        payload = {**kwargs, "request_metadata": metadata}
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _supersede_locked(self, supersede_key: str) -> None:
+        for job in list(self._jobs.values()):
+            for ticket in job.live_tickets():
+                if ticket.supersede_key == supersede_key:
+                    self.stats["superseded"] += 1
+                    self._cancel_ticket_locked(ticket, "substituído por pedido mais novo")
+
+    def _make_room_locked(self, priority: int) -> None:
+        worst = max((entry for entry in self._queue if entry[2].state == "queued"), default=None)
+        if worst is None or worst[0] <= priority:
+            self.stats["rejected"] += 1
+            raise LLMQueueFull(f"Fila da LLM cheia ({len(self._queue)} pedidos).")
+        job = worst[2]
+        self.stats["evicted"] += 1
+        for ticket in job.live_tickets():
+            self._cancel_ticket_locked(ticket, "descartado: fila da LLM cheia")
+
+    def _reprioritize_locked(self, job: _Job, priority: int) -> None:
+        job.priority = priority
+        self._queue = [entry for entry in self._queue if entry[2] is not job]
+        self._queue.append((job.priority, job.seq, job))
+        heapq.heapify(self._queue)
+        self._preempt_for_locked(job)
+
+    def _preempt_for_locked(self, job: _Job) -> None:
+        if len(self._running) < self.max_concurrent:
+            return
+        victims = [running for running in self._running if running.priority > job.priority and running.preemptible()]
+        if victims:
+            max(victims, key=lambda running: (running.priority, running.seq)).preempt_requested = True
+
+    # ------------------------------------------------------------------
+    # Cancelamento
+    # ------------------------------------------------------------------
+    def _cancel_ticket(self, ticket: LLMTicket, reason: str) -> bool:
+        with self._lock:
+            return self._cancel_ticket_locked(ticket, reason)
+
+    def _cancel_ticket_locked(self, ticket: LLMTicket, reason: str) -> bool:
+        if not ticket._finish(error=LLMRequestCancelled(reason), cancelled=True):
+            return False
+        self.stats["cancelled"] += 1
+        job = ticket._job
+        if job is not None and not job.live_tickets() and job.state == "queued":
+            # Ninguém mais espera: sai da fila sem chegar ao backend
+            job.state = "cancelled"
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            self._forget_locked(job)
+        return True
+
+    def cancel_where(self, predicate: Callable[[LLMTicket], bool], reason: str = "cancelado") -> int:
+        """Cancela os pedidos pendentes que satisfazem ``predicate``."""
+        with self._lock:
+            tickets = [ticket for job in self._jobs.values() for ticket in job.live_tickets() if predicate(ticket)]
+            return sum(1 for ticket in tickets if self._cancel_ticket_locked(ticket, reason))
+
+    def _forget_locked(self, job: _Job) -> None:
+        if self._jobs.get(job.key) is job:
+            self._jobs.pop(job.key, None)
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def _ensure_workers_locked(self) -> None:
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.max_concurrent:
+            thread = threading.Thread(target=self._worker_loop, name=f"llm-scheduler-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job_locked(self) -> Optional[_Job]:
+        while self._queue:
+            _priority, _seq, job = heapq.heappop(self._queue)
+            if job.state == "queued" and job.live_tickets():
+                return job
+            self._forget_locked(job)
+        return None
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._lock:
+                job = self._next_job_locked()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._lock.wait()
+                    job = self._next_job_locked()
+                job.state = "running"
+                job.preempt_requested = False
+                job.interrupted = False
+                job.attempts += 1
+                self._running.append(job)
+                started = time.monotonic()
+                if job.attempts == 1:
+                    self._wait_ms.append((started - job.enqueued_at) * 1000.0)
+            self._execute(job, started)
+
+    def _execute(self, job: _Job, started: float) -> None:
+        buffered = job.buffered
+        chunks: List[str] = []
+
+        def _relay(delta: str) -> bool:
+            if job.preempt_requested:
+                job.interrupted = True
+                return False
+            if buffered:
+                # Tentativa interrompida é descartada junto com os trechos
+                chunks.append(delta)
+                return bool(job.live_tickets())
+            alive = False
+            for ticket in job.live_tickets():
+                if ticket._deliver(delta):
+                    alive = True
+                else:
+                    # Consumidor parou o stream: equivale a cancelar o ticket
+                    self._cancel_ticket(ticket, "interrompido pelo consumidor")
+            return alive
+
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        try:
+            result = self.backend.generate(**job.kwargs, stream_callback=_relay)
+        except Exception as exc:
+            error = exc
+
+        with self._lock:
+            self._running.remove(job)
+            if job.interrupted and error is None and job.live_tickets():
+                # Lote interrompido por pedido interativo: volta à fila na posição original
+                job.state = "queued"
+                job.preempt_requested = False
+                self.stats["preempted"] += 1
+                heapq.heappush(self._queue, (job.priority, job.seq, job))
+                self._lock.notify()
+                return
+            job.state = "done"
+            self._forget_locked(job)
+            self._run_ms.append((time.monotonic() - started) * 1000.0)
+            tickets = job.live_tickets()
+            if error is not None:
+                self.stats["failed"] += 1
+            elif tickets:
+                self.stats["completed"] += 1
+
+        streamed = "".join(chunks)
+        for ticket in tickets:
+            if error is not None:
+                ticket._finish(error=error)
+                continue
+            if streamed and not ticket._deliver(streamed):
+                self._cancel_ticket(ticket, "interrompido pelo consumidor")
+                continue
+            payload = dict(result) if isinstance(result, dict) else {"text": str(result or ""), "status": "success"}
+            if ticket.coalesced or payload.get("request_metadata") is not None:
+                # Cada chamador recebe os próprios metadados (ex.: request_id do chat)
+                payload["request_metadata"] = {**dict(payload.get("request_metadata") or {}), **ticket.request_metadata}
+            ticket._finish(result=payload)
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            self._closed = True
+            for job in list(self._jobs.values()):
+                for ticket in job.live_tickets():
+                    self._cancel_ticket_locked(ticket, "fila da LLM encerrada")
+            self._lock.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _percentile(values: List[float], fraction: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return round(ordered[index], 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._wait_ms)
+            runs = list(self._run_ms)
+            queued = [entry[2] for entry in self._queue if entry[2].state == "queued"]
+            return {
+                **self.stats,
+                "queue_depth": len(queued),
+                "queue_by_priority": {
+                    str(priority): sum(1 for job in queued if job.priority == priority)
+                    for priority in sorted({job.priority for job in queued})
+                },
+                "running": len(self._running),
+                "wait_ms_p50": self._percentile(waits, 0.5),
+                "wait_ms_p95": self._percentile(waits, 0.95),
+                "run_ms_p50": self._percentile(runs, 0.5),
+                "run_ms_p95": self._percentile(runs, 0.95),
+            }
+
+
+_SCHEDULER: Optional[LLMRequestScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMRequestScheduler:
+    """Fila compartilhada na frente de ``core.llm.backend_router.llm``."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = LLMRequestScheduler()
+        return _SCHEDULER
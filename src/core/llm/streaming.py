@@ -0,0 +1,153 @@
+"""
+Utilitários de streaming de tokens para os backends LLM.
+
+- IncrementalSanitizer: aplica o sanitizador de texto completo de cada
+  backend durante a geração, emitindo só o trecho novo e estável.
+- iter_stream_events: transforma uma chamada com ``stream_callback`` em um
+  gerador de eventos (``token`` ... ``done``/``error``).
+
+Convenção do callback (igual ao ``progress_callback`` dos workers):
+recebe o trecho novo e retorna False para interromper a geração.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+StreamCallback = Callable[[str], Optional[bool]]
+
+
+class IncrementalSanitizer:
+    """
+    Sanitização incremental sobre o texto acumulado.
+
+    A cada fronteira de palavra o texto bruto inteiro passa pelo sanitizador
+    e é emitido apenas o sufixo novo; a última palavra (e um início de linha
+    curto) fica retida porque ainda pode virar marcador de vazamento ou
+    repetição. Se a sanitização
+    reescrever algo já emitido (ex.: um marcador de prompt apareceu), o
+    streaming para e a resposta final substitui a prévia.
+    """
+
+    LINE_HOLDBACK = 40
+
+    def __init__(
+        self,
+        sanitize: Callable[[str], str],
+        placeholder: str = "",
+        min_chars: int = 24,
+    ):
+        self._sanitize = sanitize
+        self.placeholder = str(placeholder or "")
+        self.min_chars = max(1, int(min_chars))
+        self.raw = ""
+        self.emitted = ""
+        self.diverged = False
+        self._pending = 0
+
+    def feed(self, chunk: str) -> str:
+        """Acumula um trecho bruto e retorna o delta sanitizado (pode ser vazio)"""
+        if not chunk:
+            return ""
+        self.raw += chunk
+        if self.diverged:
+            return ""
+        self._pending += len(chunk)
+        if not chunk[-1].isspace() and self._pending < self.min_chars:
+            return ""
+        return self._advance(final=False)
+
+    def finish(self) -> str:
+        """Retorna o que faltava emitir depois do último trecho"""
+        if self.diverged:
+            return ""
+        return self._advance(final=True)
+
+    def _advance(self, final: bool) -> str:
+        self._pending = 0
+        if not self.raw.strip():
+            return ""
+        cleaned = self._sanitize(self.raw) or ""
+        if cleaned == self.placeholder and not final:
+            return ""
+        if final:
+            stable = cleaned
+        else:
+            cut = max(cleaned.rfind(" "), cleaned.rfind("\n"))
+            stable = cleaned[: cut + 1] if cut >= 0 else ""
+            # Início de linha curto pode ser eco do prompt ("Pergunta do usuário:")
+            line_start = stable.rfind("\n")
+            if line_start >= 0 and len(stable) - line_start <= self.LINE_HOLDBACK:
+                stable = stable[: line_start + 1]
+        if not stable.startswith(self.emitted):
+            self.diverged = True
+            return ""
+        delta = stable[len(self.emitted):]
+        self.emitted = stable
+        return delta
+
+
+class StreamRelay:
+    """Repassa deltas ao callback e lembra se o consumidor interrompeu"""
+
+    def __init__(self, callback: StreamCallback):
+        self.callback = callback
+        self.stopped = False
+        self.chunks = 0
+
+    def __call__(self, delta: str) -> bool:
+        if self.stopped:
+            return False
+        self.chunks += 1
+        if self.callback(delta) is False:
+            self.stopped = True
+        return not self.stopped
+
+
+def iter_stream_events(
+    run: Callable[[StreamCallback], Dict[str, Any]],
+    poll_timeout: float = 0.1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Executa ``run(stream_callback)`` em uma thread auxiliar e produz eventos:
+
+    - ``{"type": "token", "text": delta}`` para cada trecho;
+    - ``{"type": "done", "result": resultado}`` ao terminar;
+    - ``{"type": "error", "error": mensagem}`` se ``run`` lançar exceção.
+
+    Fechar o gerador antes do fim faz o callback retornar False, o que
+    interrompe a geração no backend.
+    """
+    events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    cancelled = threading.Event()
+
+    def _callback(delta: str) -> bool:
+        if cancelled.is_set():
+            return False
+        if delta:
+            events.put({"type": "token", "text": delta})
+        return True
+
+    def _worker():
+        try:
+            result = run(_callback)
+            events.put({"type": "done", "result": result})
+        except Exception as exc:
+            events.put({"type": "error", "error": str(exc)})
+
+    thread = threading.Thread(target=_worker, name="llm-stream", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                event = events.get(timeout=poll_timeout)
+            except queue.Empty:
+                if not thread.is_alive() and events.empty():
+                    return
+                continue
+            yield event
+            if event["type"] in {"done", "error"}:
+                return
+    finally:
+        cancelled.set()
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
 import re
 import shutil
 import subprocess
-import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -19,6 +20,26 @@ class LatexExportValidationError(ValueError):
     """Erro de validação no fluxo de exportação LaTeX."""
 
 
+# Cache de build: o diretório de build persiste entre exportações para que
+# latexmk reaproveite os auxiliares e a conversão Pandoc seja reutilizada.
+_BUILD_DIRNAME = "_build"
+_PANDOC_CACHE_DIRNAME = ".pandoc-cache"
+_PANDOC_CACHE_MAX_ENTRIES = 64
+_IMAGE_MANIFEST_NAME = ".sources.json"
+_ENGINE_MARKER_NAME = ".latex-engine"
+_TEX_FORMAT_MARKER_NAME = ".tex-format.json"
+
+# Instalações TeX cujo formato pdflatex já foi verificado neste processo
+_CHECKED_TEX_FORMATS: set[str] = set()
+
+# (nome, binário exigido, argumentos do latexmk) em ordem de tentativa
+_LATEXMK_ENGINES: tuple[tuple[str, Optional[str], tuple[str, ...]], ...] = (
+    ("pdflatex", None, ("-pdf",)),
+    ("xelatex", "xelatex", ("-pdfxe", "-pdf", "-xelatex=xelatex")),
+    ("lualatex", "lualatex", ("-pdf", "-lualatex")),
+)
+
+
 @dataclass(slots=True)
 class LatexMetadata:
     author: str
@@ -88,6 +109,37 @@ def _decode_text_bytes(raw: bytes) -> str:
     return raw.decode("utf-8", errors="replace")
 
 
+def _file_signature(path: Optional[str | Path]) -> str:
+    """Identidade barata de um arquivo: caminho real, tamanho e mtime."""
+    if not path:
+        return ""
+    try:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+    except OSError:
+        return ""
+    return f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """Grava só se o conteúdo mudou (preserva o mtime para o build incremental)."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def _load_json_dict(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def _markdown_fallback_to_latex(markdown: str) -> str:
     """Fallback simples quando Pandoc não estiver disponível."""
     blocks: list[str] = []
@@ -157,15 +209,53 @@ def _is_remote_path(path: str) -> bool:
         return False
 
 
+def _same_file_copy(src_path: Path, dest_path: Path) -> bool:
+    """Cópia feita por ``shutil.copy2`` ainda atual (mesmo tamanho e mtime)."""
+    try:
+        src_stat = src_path.stat()
+        dest_stat = dest_path.stat()
+    except OSError:
+        return False
+    return src_stat.st_size == dest_stat.st_size and src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
 def _copy_images_and_rewrite_md(md_text: str, md_dir: Path, output_dir: Path) -> Path:
     """
     Copies local images referenced in the markdown to `output_dir/images`
     and returns a Path to a rewritten temporary markdown file inside `output_dir`.
+
+    Um manifesto em `images/` lembra de qual origem veio cada nome, então
+    reexportar mantém os mesmos nomes e só copia imagens alteradas.
     """
     images_dir = output_dir / "images"
     images_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = images_dir / _IMAGE_MANIFEST_NAME
+    owners: dict[str, str] = {
+        str(name): str(source) for name, source in _load_json_dict(manifest_path).items()
+    }
+    manifest_changed = False
+
+    def dest_name_for(src_path: Path) -> str:
+        source = str(src_path)
+        base = src_path.stem
+        suffix = src_path.suffix
+        candidate = src_path.name
+        i = 1
+        while True:
+            owner = owners.get(candidate)
+            if owner == source:
+                return candidate
+            if owner is None:
+                existing = images_dir / candidate
+                # Arquivo sem dono conhecido só é reaproveitado se for a mesma imagem
+                if not existing.exists() or _same_file_copy(src_path, existing):
+                    return candidate
+            # Avoid overwriting files with same name but different content
+            candidate = f"{base}_{i}{suffix}"
+            i += 1
 
     def replace(match: re.Match) -> str:
+        nonlocal manifest_changed
         orig = match.group(1).strip()
         if not orig or _is_remote_path(orig):
             return match.group(0)
@@ -175,35 +265,69 @@ def _copy_images_and_rewrite_md(md_text: str, md_dir: Path, output_dir: Path) ->
         if not src_path.exists():
             return match.group(0)
 
-        dest_name = src_path.name
+        dest_name = dest_name_for(src_path)
+        if owners.get(dest_name) != str(src_path):
+            owners[dest_name] = str(src_path)
+            manifest_changed = True
         dest_path = images_dir / dest_name
-        # Avoid overwriting files with same name but different content
-        if dest_path.exists() and dest_path.resolve() != src_path.resolve():
-            base = dest_path.stem
-            suffix = dest_path.suffix
-            i = 1
-            while True:
-                candidate = images_dir / f"{base}_{i}{suffix}"
-                if not candidate.exists():
-                    dest_path = candidate
-                    break
-                i += 1
-
-        shutil.copy2(src_path, dest_path)
+        if not _same_file_copy(src_path, dest_path):
+            shutil.copy2(src_path, dest_path)
         # Return markdown image with new relative path
-        return match.group(0).replace(orig, f"images/{dest_path.name}")
+        return match.group(0).replace(orig, f"images/{dest_name}")
 
     rewritten = re.sub(r"!\[[^\]]*\]\(([^)]+)\)", replace, md_text)
+    if manifest_changed:
+        manifest_path.write_text(json.dumps(owners, ensure_ascii=False, indent=2), encoding="utf-8")
     temp_md = output_dir / "__content_for_pandoc__.md"
-    temp_md.write_text(rewritten, encoding="utf-8")
+    _write_if_changed(temp_md, rewritten)
     return temp_md
 
 
-def md_to_latex(md_filepath: str, output_dir: Optional[Path] = None, vault_root: Optional[Path] = None) -> str:
+def _pandoc_cache_key(converter: str, markdown: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(converter.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(markdown.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_pandoc_cache(cache_dir: Path, key: str) -> Optional[str]:
+    entry = cache_dir / f"{key}.tex"
+    try:
+        cached = entry.read_text(encoding="utf-8")
+        os.utime(entry)
+    except (OSError, UnicodeDecodeError):
+        return None
+    return cached
+
+
+def _write_pandoc_cache(cache_dir: Path, key: str, latex: str) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = cache_dir / f"{key}.tex"
+        temp_entry = entry.with_suffix(".tmp")
+        temp_entry.write_text(latex, encoding="utf-8")
+        os.replace(temp_entry, entry)
+
+        entries = sorted(cache_dir.glob("*.tex"), key=lambda item: item.stat().st_mtime)
+        for stale in entries[:-_PANDOC_CACHE_MAX_ENTRIES]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def md_to_latex(
+    md_filepath: str,
+    output_dir: Optional[Path] = None,
+    vault_root: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+) -> str:
     """
     Converte um arquivo Markdown para LaTeX usando Pandoc.
     Se `output_dir` e `vault_root` forem passados, copia imagens locais para
     `output_dir/images` e reescreve o Markdown para que as imagens apontem para lá.
+    Com `cache_dir`, a saída fica em cache pelo hash do Markdown (já
+    reescrito) e da versão do conversor, evitando rodar o Pandoc de novo.
     Faz fallback para um conversor simples quando Pandoc não estiver disponível.
     """
     pandoc = shutil.which("pandoc")
@@ -218,6 +342,15 @@ def md_to_latex(md_filepath: str, output_dir: Optional[Path] = None, vault_root:
     else:
         md_to_process = str(md_path)
 
+    cache_key = None
+    if cache_dir is not None:
+        converter = f"pandoc:{_file_signature(pandoc)}" if pandoc else "fallback"
+        markdown_text = Path(md_to_process).read_text(encoding="utf-8")
+        cache_key = _pandoc_cache_key(converter, markdown_text)
+        cached = _read_pandoc_cache(cache_dir, cache_key)
+        if cached is not None:
+            return cached
+
     if pandoc:
         try:
             result = subprocess.run(
@@ -225,13 +358,17 @@ def md_to_latex(md_filepath: str, output_dir: Optional[Path] = None, vault_root:
                 capture_output=True,
                 check=True,
             )
-            return _decode_text_bytes(result.stdout)
+            latex = _decode_text_bytes(result.stdout)
         except subprocess.CalledProcessError as exc:
             error_output = _decode_text_bytes(exc.stderr or b"")
             raise RuntimeError(f"Erro ao converter {md_to_process} com Pandoc: {error_output}") from exc
+    else:
+        markdown = Path(md_to_process).read_text(encoding="utf-8")
+        latex = _markdown_fallback_to_latex(markdown)
 
-    markdown = Path(md_to_process).read_text(encoding="utf-8")
-    return _markdown_fallback_to_latex(markdown)
+    if cache_key is not None:
+        _write_pandoc_cache(cache_dir, cache_key, latex)
+    return latex
 
 
 def extract_bib_from_md(md_file: str) -> str:
@@ -308,7 +445,7 @@ def prepare_bib_file(ref_path: str, output_dir: Path) -> str:
             raise LatexExportValidationError(
                 "Nenhum bloco biblatex/bibtex encontrado no arquivo .md de referências."
             )
-        dest.write_text(bib_content, encoding="utf-8")
+        _write_if_changed(dest, bib_content)
     else:
         raise LatexExportValidationError(
             f"Formato de arquivo de referências não suportado: {ext}. Use .bib ou .md."
@@ -317,11 +454,37 @@ def prepare_bib_file(ref_path: str, output_dir: Path) -> str:
     return bib_name
 
 
-def _ensure_pdflatex_format() -> None:
-    """Garante que o formato pdflatex exista antes de compilar."""
-    if not shutil.which("pdflatex"):
+def _ensure_pdflatex_format(marker_path: Optional[Path] = None) -> None:
+    """
+    Garante que o formato pdflatex exista antes de compilar.
+
+    A verificação (fmtutil/kpsewhich) roda uma vez por instalação TeX,
+    identificada pelo binário do pdflatex; `marker_path` guarda as
+    instalações já verificadas entre execuções.
+    """
+    pdflatex = shutil.which("pdflatex")
+    if not pdflatex:
         return
 
+    installation = _file_signature(pdflatex) or pdflatex
+    if installation in _CHECKED_TEX_FORMATS:
+        return
+    marker = _load_json_dict(marker_path) if marker_path is not None else {}
+    if installation in marker.get("checked", []):
+        _CHECKED_TEX_FORMATS.add(installation)
+        return
+
+    _build_pdflatex_format()
+    _CHECKED_TEX_FORMATS.add(installation)
+    if marker_path is not None:
+        try:
+            marker_path.parent.mkdir(parents=True, exist_ok=True)
+            marker_path.write_text(json.dumps({"checked": [installation]}), encoding="utf-8")
+        except OSError:
+            pass
+
+
+def _build_pdflatex_format() -> None:
     fmt = shutil.which("fmtutil") or shutil.which("fmtutil-sys")
     if fmt:
         subprocess.run([fmt, "--byfmt", "pdflatex"], capture_output=True)
@@ -382,31 +545,36 @@ def _run_latexmk(tex_path: Path, args: list[str]) -> tuple[bool, str]:
     return result.returncode == 0, log
 
 
-def compile_pdf(tex_path: Path) -> tuple[bool, str]:
+def compile_pdf(tex_path: Path, format_marker: Optional[Path] = None) -> tuple[bool, str]:
     """
     Compila o arquivo .tex usando latexmk.
     Retorna um tuple com status e log de compilação.
+
+    O motor que compilou por último no diretório é tentado primeiro, para
+    não repetir uma tentativa que falha a cada reexportação.
     """
     if not shutil.which("latexmk"):
         return False, "latexmk não encontrado no sistema."
 
-    _ensure_pdflatex_format()
-
-    success, log = _run_latexmk(tex_path, ["-pdf"])
-    if success:
-        return True, log
+    _ensure_pdflatex_format(format_marker)
 
-    if shutil.which("xelatex"):
-        success, xelog = _run_latexmk(tex_path, ["-pdfxe", "-pdf", "-xelatex=xelatex"])
-        if success:
-            return True, xelog
-        log = xelog
-
-    if shutil.which("lualatex"):
-        success, lulog = _run_latexmk(tex_path, ["-pdf", "-lualatex"])
+    engine_marker = tex_path.parent / _ENGINE_MARKER_NAME
+    try:
+        preferred = engine_marker.read_text(encoding="utf-8").strip()
+    except OSError:
+        preferred = ""
+    engines = sorted(_LATEXMK_ENGINES, key=lambda engine: engine[0] != preferred)
+
+    log = ""
+    for name, binary, args in engines:
+        if binary and not shutil.which(binary):
+            continue
+        success, engine_log = _run_latexmk(tex_path, list(args))
         if success:
-            return True, lulog
-        log = lulog
+            if name != preferred:
+                _write_if_changed(engine_marker, name)
+            return True, engine_log
+        log = engine_log
 
     return False, log
 
@@ -493,24 +661,25 @@ class LatexExporter:
         output_dir = self._build_output_dir(main_note)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Diretório de trabalho temporário para gerar .tex e arquivos auxiliares.
-        work_dir_path = Path(tempfile.mkdtemp(prefix="latex_build_", dir=str(output_dir)))
+        # Diretório de build persistente: latexmk reaproveita .aux/.bbl/.toc
+        # e a conversão Pandoc fica em cache entre exportações.
+        build_dir = output_dir / _BUILD_DIRNAME
+        build_dir.mkdir(parents=True, exist_ok=True)
 
         main_md_path = self.vault_path / main_note.path
-        ref_md_path = self.vault_path / ref_note.path
         warnings: list[str] = []
 
-        # Converter markdown e copiar imagens/referências para o diretório de trabalho
-        conteudo_latex = md_to_latex(str(main_md_path), output_dir=work_dir_path, vault_root=self.vault_path)
+        # Converter markdown e copiar imagens/referências para o diretório de build
+        conteudo_latex = self._convert_note(main_md_path, build_dir)
         bib_name = None
         bib_path = Path("")
         if ref_note is not None:
             ref_md_path = self.vault_path / ref_note.path
-            bib_name = prepare_bib_file(str(ref_md_path), work_dir_path)
-            bib_path = work_dir_path / f"{bib_name}.bib"
+            bib_name = prepare_bib_file(str(ref_md_path), build_dir)
+            bib_path = build_dir / f"{bib_name}.bib"
 
         optional_sections_latex = {
-            key: self._load_optional_section(path, output_dir)
+            key: self._load_optional_section(path, build_dir)
             for key, path in (request.optional_sections or {}).items()
         }
 
@@ -522,23 +691,18 @@ class LatexExporter:
             optional_sections=optional_sections_latex,
         )
 
-        tex_path = work_dir_path / "dissertacao.tex"
-        tex_path.write_text(tex_content, encoding="utf-8")
+        tex_path = build_dir / "dissertacao.tex"
+        _write_if_changed(tex_path, tex_content)
 
-        compiled_pdf, compiler_log = compile_pdf(tex_path)
+        compiled_pdf, compiler_log = compile_pdf(tex_path, format_marker=self.exports_root / _TEX_FORMAT_MARKER_NAME)
         pdf_in_work = tex_path.with_suffix(".pdf")
         pdf_path = output_dir / pdf_in_work.name
 
         if compiled_pdf and pdf_in_work.exists():
-            # Mover PDF final para o diretório de saída e limpar arquivos temporários
-            shutil.move(str(pdf_in_work), str(pdf_path))
-            try:
-                shutil.rmtree(work_dir_path)
-            except Exception:
-                # Não falhar se remoção não for possível
-                pass
+            # Copiar (não mover) o PDF: latexmk usa o do build para decidir se recompila
+            shutil.copy2(str(pdf_in_work), str(pdf_path))
         else:
-            # Em caso de falha, manter os artefatos no diretório de trabalho para debug
+            # Em caso de falha, os artefatos ficam no diretório de build para debug
             if not compiled_pdf:
                 error_summary = extract_latex_error_summary(compiler_log)
                 if error_summary:
@@ -577,7 +741,15 @@ class LatexExporter:
 
     def _load_optional_section(self, relative_path: str, output_dir: Path) -> str:
         note = self.get_note(relative_path)
-        return md_to_latex(str(self.vault_path / note.path), output_dir=output_dir, vault_root=self.vault_path)
+        return self._convert_note(self.vault_path / note.path, output_dir)
+
+    def _convert_note(self, md_path: Path, build_dir: Path) -> str:
+        return md_to_latex(
+            str(md_path),
+            output_dir=build_dir,
+            vault_root=self.vault_path,
+            cache_dir=build_dir / _PANDOC_CACHE_DIRNAME,
+        )
 
     def _render_template(
         self,
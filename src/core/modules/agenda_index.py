@@ -0,0 +1,241 @@
+"""
+Índice de intervalos da agenda por dia.
+
+O ``AgendaManager`` consulta eventos dia a dia (agenda do dia, slots livres,
+rebalanceamento). Em vez de varrer ``events.values()`` a cada consulta, o
+``AgendaEventStore`` mantém, junto do dicionário de eventos:
+
+- data de início -> eventos do dia ordenados por horário;
+- eventos não concluídos ordenados pelo fim (auto-conclusão);
+- a maior duração vista, que limita a busca de sobreposições.
+
+O índice acompanha inserções/remoções no dicionário e mudanças de
+``start``/``end``/``completed`` feitas diretamente no evento. O store também
+anota os IDs alterados desde o último salvamento (``dirty``), para que a
+persistência serialize só esses eventos.
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import weakref
+
+# Campos do evento que alteram a posição no índice
+INDEXED_FIELDS = frozenset({"start", "end", "completed"})
+
+
+def _naive(value: Any) -> Optional[datetime]:
+    """Datetime local sem timezone (mesmo critério de ``_to_local_naive_datetime``)."""
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value
+    try:
+        return value.astimezone().replace(tzinfo=None)
+    except Exception:
+        return value.replace(tzinfo=None)
+
+
+class AgendaEventIndex:
+    """Índice por dia de início com busca de sobreposição por intervalo"""
+
+    def __init__(self):
+        self._by_day: Dict[date, List[Tuple[datetime, str]]] = {}
+        self._open_by_end: List[Tuple[datetime, str]] = []
+        # id -> (dia, início, fim, concluído) como está indexado
+        self._entries: Dict[str, Tuple[Optional[date], Optional[datetime], Optional[datetime], bool]] = {}
+        self._max_span = timedelta(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, event: Any):
+        event_id = event.id
+        if event_id in self._entries:
+            self.remove(event_id)
+        start = getattr(event, "start", None)
+        start_key = _naive(start)
+        end_key = _naive(getattr(event, "end", None))
+        day = start.date() if isinstance(start, datetime) else None
+        completed = bool(getattr(event, "completed", False))
+
+        if day is not None and start_key is not None:
+            insort(self._by_day.setdefault(day, []), (start_key, event_id))
+            if end_key is not None and end_key - start_key > self._max_span:
+                self._max_span = end_key - start_key
+        if end_key is not None and not completed:
+            insort(self._open_by_end, (end_key, event_id))
+        self._entries[event_id] = (day, start_key, end_key, completed)
+
+    def remove(self, event_id: str):
+        entry = self._entries.pop(event_id, None)
+        if entry is None:
+            return
+        day, start_key, end_key, completed = entry
+        if day is not None and start_key is not None:
+            items = self._by_day.get(day, [])
+            position = bisect_left(items, (start_key, event_id))
+            if position < len(items) and items[position] == (start_key, event_id):
+                del items[position]
+            if not items:
+                self._by_day.pop(day, None)
+        if end_key is not None and not completed:
+            position = bisect_left(self._open_by_end, (end_key, event_id))
+            if position < len(self._open_by_end) and self._open_by_end[position] == (end_key, event_id):
+                del self._open_by_end[position]
+
+    def clear(self):
+        self._by_day.clear()
+        self._open_by_end.clear()
+        self._entries.clear()
+        self._max_span = timedelta(0)
+
+    def day_ids(self, day: date) -> List[str]:
+        """IDs dos eventos que começam em ``day``, em ordem de início"""
+        return [event_id for _start, event_id in self._by_day.get(day, [])]
+
+    def overlapping_ids(self, start: datetime, end: datetime) -> List[str]:
+        """IDs dos eventos com intervalo que cruza ``[start, end)``"""
+        start_key, end_key = _naive(start), _naive(end)
+        if start_key is None or end_key is None or end_key <= start_key:
+            return []
+        matched: List[Tuple[datetime, str]] = []
+        # Só eventos que começam até ``max_span`` antes podem alcançar o intervalo
+        day = (start_key - self._max_span).date()
+        last_day = end_key.date()
+        while day <= last_day:
+            items = self._by_day.get(day)
+            if items:
+                limit = bisect_left(items, (end_key, ""))
+                for item_start, event_id in items[:limit]:
+                    item_end = self._entries[event_id][2]
+                    if item_end is not None and item_end > start_key:
+                        matched.append((item_start, event_id))
+            day += timedelta(days=1)
+        matched.sort()
+        return [event_id for _start, event_id in matched]
+
+    def open_ids_ending_by(self, moment: datetime) -> List[str]:
+        """IDs não concluídos com fim ``<= moment``"""
+        moment_key = _naive(moment)
+        if moment_key is None:
+            return []
+        limit = bisect_right(self._open_by_end, (moment_key, "\uffff"))
+        return [event_id for _end, event_id in self._open_by_end[:limit]]
+
+
+class AgendaEventStore(dict):
+    """
+    ``Dict[str, AgendaEvent]`` que mantém um ``AgendaEventIndex`` em sincronia.
+
+    Continua sendo um ``dict`` comum para o resto do sistema (UI, integrações
+    e serialização fazem ``events[id] = ...``/``del events[id]``).
+    """
+
+    def __init__(self, events: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.index = AgendaEventIndex()
+        # IDs inseridos, removidos ou alterados desde o último take_dirty()
+        self.dirty: Set[str] = set()
+        self.update(events or {})
+
+    # ---- sincronização ----
+
+    def _attach(self, event: Any):
+        try:
+            object.__setattr__(event, "_index_owner", weakref.ref(self))
+        except (AttributeError, TypeError):
+            pass
+        self.index.add(event)
+
+    def _detach(self, event_id: str, event: Any):
+        self.index.remove(getattr(event, "id", event_id))
+        owner = getattr(event, "__dict__", {}).get("_index_owner")
+        if owner is not None and owner() is self:
+            try:
+                object.__delattr__(event, "_index_owner")
+            except AttributeError:
+                pass
+
+    def event_changed(self, event: Any, name: str):
+        """Chamado pelo evento a cada atributo alterado"""
+        event_id = getattr(event, "id", None)
+        if dict.get(self, event_id) is not event:
+            return
+        self.dirty.add(event_id)
+        if name in INDEXED_FIELDS:
+            self.index.add(event)
+
+    def mark_dirty(self, event_id: str):
+        """Para mutações in-place (``event.metadata[...] = ...``) que o evento não vê"""
+        self.dirty.add(event_id)
+
+    def take_dirty(self) -> Set[str]:
+        """Devolve e zera os IDs alterados desde a última chamada"""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def __setitem__(self, event_id: str, event: Any):
+        previous = dict.get(self, event_id)
+        if previous is not None and previous is not event:
+            self._detach(event_id, previous)
+        super().__setitem__(event_id, event)
+        self._attach(event)
+        self.dirty.add(event_id)
+
+    def __delitem__(self, event_id: str):
+        event = dict.__getitem__(self, event_id)
+        super().__delitem__(event_id)
+        self._detach(event_id, event)
+        self.dirty.add(event_id)
+
+    def pop(self, event_id: str, *default):
+        if event_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(event_id)
+        event = dict.__getitem__(self, event_id)
+        del self[event_id]
+        return event
+
+    def popitem(self):
+        event_id, event = super().popitem()
+        self._detach(event_id, event)
+        self.dirty.add(event_id)
+        return event_id, event
+
+    def setdefault(self, event_id: str, default: Any = None):
+        if event_id not in self:
+            self[event_id] = default
+        return dict.__getitem__(self, event_id)
+
+    def update(self, *args, **kwargs):
+        for event_id, event in dict(*args, **kwargs).items():
+            self[event_id] = event
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for event_id, event in list(self.items()):
+            self._detach(event_id, event)
+            self.dirty.add(event_id)
+        super().clear()
+        self.index.clear()
+
+    # ---- consultas ----
+
+    def _resolve(self, event_ids: Iterable[str]) -> List[Any]:
+        return [dict.__getitem__(self, event_id) for event_id in event_ids if event_id in self]
+
+    def events_on(self, day: date) -> List[Any]:
+        """Eventos que começam em ``day``, ordenados por horário (inclui concluídos)"""
+        return self._resolve(self.index.day_ids(day))
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Any]:
+        """Eventos que se sobrepõem a ``[start, end)``"""
+        return self._resolve(self.index.overlapping_ids(start, end))
+
+    def open_ending_by(self, moment: datetime) -> List[Any]:
+        """Eventos não concluídos que terminaram até ``moment``"""
+        return self._resolve(self.index.open_ids_ending_by(moment))
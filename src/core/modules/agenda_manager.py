@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date
 from enum import Enum
+from contextlib import contextmanager
+from functools import wraps
 import json
 from pathlib import Path
 import heapq
@@ -20,6 +22,8 @@ from .smart_allocator import SmartAllocator
 from .pomodoro_timer import PomodoroTimer
 from .writing_assistant import WritingAssistant
 from .commitment_groups import CommitmentGroupKey, matches_group_key
+from .agenda_index import INDEXED_FIELDS, AgendaEventStore
+from .agenda_store import AgendaJournal
 
 
 class AgendaEventType(Enum):
@@ -72,6 +76,14 @@ class AgendaEvent:
     estimated_difficulty: float = 0.0
     progress_notes: List[str] = field(default_factory=list)
     
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # Mantém o índice por dia e a lista de alterados do AgendaManager em sincronia
+        owner_ref = self.__dict__.get("_index_owner")
+        owner = owner_ref() if owner_ref is not None else None
+        if owner is not None:
+            owner.event_changed(self, name)
+    
     def duration_minutes(self) -> float:
         """Retorna duração em minutos"""
         return (self.end - self.start).total_seconds() / 60
@@ -122,6 +134,15 @@ class AgendaEvent:
         )
 
 
+def _batched_save(method):
+    """Agrupa os salvamentos feitos durante uma operação em massa em um só."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch_updates():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TimeSlot:
     """Slot de tempo para alocação"""
     def __init__(self, start: datetime, end: datetime, 
@@ -163,6 +184,9 @@ class AgendaManager:
         # Arquivos de dados
         self.agenda_file = self.vault_path / "06-RECURSOS" / "agenda.json"
         self.preferences_file = self.vault_path / "06-RECURSOS" / "preferences.json"
+        self.agenda_store = AgendaJournal(self.agenda_file)
+        self._batch_depth = 0
+        self._batch_pending = False
         
         # Inicializa módulos
         self.reading_manager = ReadingManager(vault_path)
@@ -170,8 +194,11 @@ class AgendaManager:
         self.writing_assistant = WritingAssistant(vault_path)
         # Pomodoro será inicializado quando necessário
         
-        # Carrega dados
-        self.events = self._load_events()
+        # Carrega dados (dicionário indexado por dia)
+        self.events = AgendaEventStore()
+        self.events.update(self._load_events())
+        # O que acabou de ser carregado já está em disco
+        self.events.take_dirty()
         self.user_preferences = self._load_preferences()
         
         # Estatísticas e aprendizado
@@ -186,13 +213,16 @@ class AgendaManager:
         """Carrega eventos da agenda"""
         events = {}
         
-        if self.agenda_file.exists():
+        if self.agenda_file.exists() or self.agenda_store.journal_path.exists():
             try:
-                with open(self.agenda_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                # Snapshot agenda.json + diário de alterações
+                data = self.agenda_store.load()
                 
                 for event_id, event_data in data.items():
                     events[event_id] = AgendaEvent.from_dict(event_data)
+                self.agenda_store.mark_persisted(
+                    {event_id: event.to_dict() for event_id, event in events.items()}
+                )
             except Exception as e:
                 print(f"Erro ao carregar agenda: {e}")
                 # Criar agenda vazia
@@ -479,9 +509,13 @@ class AgendaManager:
             if str(item or "").strip()
         }
 
+        self.auto_complete_past_events()
+        day_start = datetime.combine(target_day, datetime.min.time())
+
         occupied: List[Tuple[datetime, datetime]] = []
-        for event in self.get_day_events(target_day.isoformat()):
-            if event.type.value in ignored_types:
+        # Sobreposição (não só o dia de início): pega eventos que cruzam a meia-noite
+        for event in self.events.overlapping(day_start, day_start + timedelta(days=1)):
+            if event.completed or event.type.value in ignored_types:
                 continue
             occupied.append((event.start, event.end))
 
@@ -651,16 +685,40 @@ class AgendaManager:
         )
     
     def _save_events(self):
-        """Salva eventos no arquivo"""
+        """Salva eventos alterados (diário incremental; adiado dentro de batch_updates)"""
+        if self._batch_depth > 0:
+            self._batch_pending = True
+            return
+        dirty = self.events.take_dirty()
         try:
-            data = {event_id: event.to_dict() 
-                   for event_id, event in self.events.items()}
-            
-            self.agenda_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.agenda_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Só os eventos marcados pelo store; a agenda inteira só ao compactar
+            changed = {
+                event_id: self.events[event_id].to_dict()
+                for event_id in dirty
+                if event_id in self.events
+            }
+            removed = [event_id for event_id in dirty if event_id not in self.events]
+            self.agenda_store.save(
+                changed,
+                removed,
+                snapshot=lambda: {event_id: event.to_dict() for event_id, event in self.events.items()},
+            )
         except Exception as e:
+            # Mantém as marcas para tentar de novo no próximo salvamento
+            self.events.dirty |= dirty
             print(f"Erro ao salvar agenda: {e}")
+
+    @contextmanager
+    def batch_updates(self):
+        """Adia os salvamentos até o fim do bloco e grava uma única vez."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_pending:
+                self._batch_pending = False
+                self._save_events()
     
     def _save_preferences(self):
         """Salva preferências do usuário"""
@@ -699,18 +757,11 @@ class AgendaManager:
         completed_ids: List[str] = []
         changed = False
 
-        for event in self.events.values():
-            if bool(getattr(event, "completed", False)):
-                continue
-
-            event_end = self._to_local_naive_datetime(getattr(event, "end", None))
-            if event_end is None:
-                continue
-
-            if event_end <= current_time:
-                event.completed = True
-                completed_ids.append(event.id)
-                changed = True
+        # Índice por fim: só os eventos abertos que já terminaram
+        for event in self.events.open_ending_by(current_time):
+            event.completed = True
+            completed_ids.append(event.id)
+            changed = True
 
         if changed:
             self._save_events()
@@ -799,6 +850,7 @@ class AgendaManager:
         
         return event.id
 
+    @_batched_save
     def allocate_writing_time(
         self,
         title: str,
@@ -919,14 +971,8 @@ class AgendaManager:
                 # Fallback conservador para não quebrar a UI.
                 target_date = datetime.now().date()
         
-        day_events = []
-        for event in self.events.values():
-            if event.start.date() == target_date and not event.completed:
-                day_events.append(event)
-        
-        # Ordena por horário
-        day_events.sort(key=lambda x: x.start)
-        return day_events
+        # Índice por dia já devolve os eventos ordenados por horário
+        return [event for event in self.events.events_on(target_date) if not event.completed]
     
     def find_free_slots(self, date: str, duration_minutes: int,
                        start_hour: int = 8, end_hour: int = 22,
@@ -1205,6 +1251,7 @@ class AgendaManager:
 
         return False
     
+    @_batched_save
     def allocate_reading_time(self, book_id: str, pages_per_day: float,
                             reading_speed: float = 10.0,
                             days_off: List[int] = None,
@@ -1508,6 +1555,7 @@ class AgendaManager:
             "rebalance": rebalance_result,
         }
     
+    @_batched_save
     def emergency_mode(self, objective: str, days: int = 3,
                       focus_area: str = None) -> Dict:
         """
@@ -1855,6 +1903,7 @@ class AgendaManager:
             return 8, 22
         return start_hour, end_hour
 
+    @_batched_save
     def create_review_plan(
         self,
         book_id: str,
@@ -1984,6 +2033,7 @@ class AgendaManager:
             )
         return result
     
+    @_batched_save
     def transition_to_review(self, book_id: str, review_type: str = "spaced",
                            deadline: str = None) -> Dict:
         """
@@ -2222,6 +2272,7 @@ class AgendaManager:
                 protected_events.append(event)
                 continue
             movable_events.append(event)
+        protected_ids = {event.id for event in protected_events}
 
         if not movable_events:
             return {
@@ -2251,12 +2302,8 @@ class AgendaManager:
             day_end = datetime.combine(day_cursor, datetime.min.time()).replace(hour=work_end, minute=0)
 
             day_events = [
-                event for event in self.events.values()
-                if event.start.date() == day_cursor
-                and (
-                    event in protected_events
-                    or event.start <= now
-                )
+                event for event in self.events.events_on(day_cursor)
+                if event.id in protected_ids or event.start <= now
             ]
             productive_minutes = 0
             for event in day_events:
@@ -2270,7 +2317,12 @@ class AgendaManager:
                     productive_minutes += max(0, int(event.duration_minutes()))
             existing_day_load_minutes[date_str] = productive_minutes
 
-            occupied_ranges: List[Tuple[datetime, datetime]] = [(event.start, event.end) for event in day_events]
+            midnight = datetime.combine(day_cursor, datetime.min.time())
+            occupied_ranges: List[Tuple[datetime, datetime]] = [
+                (event.start, event.end)
+                for event in self.events.overlapping(midnight, midnight + timedelta(days=1))
+                if event.id in protected_ids or event.start <= now
+            ]
             occupied_ranges.extend(
                 (event.start, event.end)
                 for event in self._build_virtual_routine_events(day_cursor)
@@ -2412,6 +2464,7 @@ class AgendaManager:
         matched.sort(key=lambda item: item.start)
         return matched
 
+    @_batched_save
     def remove_commitment(self, group_key: CommitmentGroupKey) -> Dict[str, Any]:
         events = self.list_commitment_events(group_key, include_completed=False)
         if not events:
@@ -2436,6 +2489,7 @@ class AgendaManager:
             "updated_dates": sorted(updated_dates),
         }
 
+    @_batched_save
     def reschedule_commitment(
         self,
         group_key: CommitmentGroupKey,
@@ -2622,6 +2676,7 @@ class AgendaManager:
             for event in active:
                 if event.id in movable_ids and isinstance(event.metadata, dict):
                     event.metadata["deadline"] = deadline
+                    self.events.mark_dirty(event.id)
             self._save_events()
             try:
                 deadline_day = date.fromisoformat(deadline)
@@ -0,0 +1,176 @@
+"""
+Persistência incremental da agenda.
+
+``agenda.json`` continua sendo o snapshot legível do vault, mas deixa de ser
+reescrito a cada mutação:
+
+- cada salvamento recebe só os eventos marcados como alterados, compara com a
+  última versão persistida e anexa as diferenças (``put``/``del``) ao diário
+  ``agenda.journal.jsonl``;
+- quando o diário cresce, ele é compactado em um novo snapshot gravado de
+  forma atômica (arquivo temporário + ``os.replace``) e então descartado;
+- ao carregar, o snapshot é lido e o diário reaplicado. Uma linha final
+  truncada (queda no meio da escrita) é ignorada; reaplicar o diário sobre
+  um snapshot já compactado é idempotente.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+import json
+import os
+import tempfile
+
+
+def _fingerprint(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class AgendaJournal:
+    """Snapshot JSON + diário append-only de eventos da agenda"""
+
+    def __init__(self, snapshot_path: Path, compact_min_records: int = 200):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(f"{self.snapshot_path.stem}.journal.jsonl")
+        self.compact_min_records = max(1, int(compact_min_records))
+        # id -> impressão digital da versão persistida
+        self._persisted: Dict[str, str] = {}
+        self._journal_records = 0
+        # Snapshot ilegível: o próximo salvamento regrava tudo
+        self._force_compact = False
+        self.stats = {"appended": 0, "compactions": 0, "skipped_saves": 0}
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot + diário reaplicado (``id -> dicionário do evento``)"""
+        data: Dict[str, Dict[str, Any]] = {}
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    data = json.load(f) or {}
+            except Exception:
+                self._force_compact = True
+                raise
+
+        self._journal_records = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Última linha incompleta de uma escrita interrompida:
+                        # compacta no próximo salvamento para não anexar após ela
+                        self._force_compact = True
+                        break
+                    event_id = str(record.get("id") or "")
+                    if not event_id:
+                        continue
+                    if record.get("op") == "del":
+                        data.pop(event_id, None)
+                    elif isinstance(record.get("event"), dict):
+                        data[event_id] = record["event"]
+                    self._journal_records += 1
+        return data
+
+    def mark_persisted(self, serialized: Dict[str, Dict[str, Any]]):
+        """Define a versão em disco (após carregar e normalizar os eventos)"""
+        self._persisted = {event_id: _fingerprint(data) for event_id, data in serialized.items()}
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def _diff(
+        self,
+        changed: Dict[str, Dict[str, Any]],
+        removed: Iterable[str],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str], List[str]]:
+        records: List[Dict[str, Any]] = []
+        fingerprints: Dict[str, str] = {}
+        for event_id, data in changed.items():
+            fingerprint = _fingerprint(data)
+            if self._persisted.get(event_id) != fingerprint:
+                fingerprints[event_id] = fingerprint
+                records.append({"op": "put", "id": event_id, "event": data})
+        deleted = [
+            event_id for event_id in dict.fromkeys(removed)
+            if event_id in self._persisted and event_id not in changed
+        ]
+        records.extend({"op": "del", "id": event_id} for event_id in deleted)
+        return records, fingerprints, deleted
+
+    def save(
+        self,
+        changed: Dict[str, Dict[str, Any]],
+        removed: Iterable[str],
+        snapshot: Callable[[], Dict[str, Dict[str, Any]]],
+    ) -> int:
+        """
+        Persiste só o que mudou; retorna o número de registros gravados.
+
+        Args:
+            changed: Eventos alterados (``id -> dicionário``)
+            removed: IDs de eventos removidos
+            snapshot: Serializa a agenda inteira; só é chamado ao compactar
+        """
+        records, fingerprints, deleted = self._diff(changed, removed)
+        if not records:
+            self.stats["skipped_saves"] += 1
+            return 0
+
+        total_events = len(self._persisted.keys() | fingerprints.keys()) - len(deleted)
+        if self._force_compact or self._journal_records + len(records) > max(
+            self.compact_min_records, total_events // 2
+        ):
+            self.compact(snapshot())
+            return len(records)
+
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += len(records)
+        self.stats["appended"] += len(records)
+        self._persisted.update(fingerprints)
+        for event_id in deleted:
+            self._persisted.pop(event_id, None)
+        return len(records)
+
+    def compact(self, serialized: Dict[str, Dict[str, Any]]):
+        """Grava um snapshot completo de forma atômica e zera o diário"""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{self.snapshot_path.name}.",
+            suffix=".tmp",
+            dir=str(self.snapshot_path.parent),
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(serialized, f, indent=2, ensure_ascii=False, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.snapshot_path)
+        except Exception:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+        # O snapshot já contém tudo; se cair antes daqui o diário é reaplicado sem efeito
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._journal_records = 0
+        self._force_compact = False
+        self._persisted = {event_id: _fingerprint(data) for event_id, data in serialized.items()}
+        self.stats["compactions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "journal_records": self._journal_records,
+            "events": len(self._persisted),
+        }
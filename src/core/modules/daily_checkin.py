@@ -2,8 +2,9 @@
 Sistema de check-in diário para feedback contínuo
 """
 from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, field
+from bisect import bisect_left, insort
 import json
 from pathlib import Path
 import uuid
@@ -59,6 +60,50 @@ class CheckinData:
         )
 
 
+@dataclass
+class CheckinAggregate:
+    """Somas de um período (dia ou semana) para médias sem reler os check-ins"""
+    count: int = 0
+    mood_sum: float = 0.0
+    energy_sum: float = 0.0
+    focus_sum: float = 0.0
+    productivity_sum: float = 0.0
+    achievements: int = 0
+    
+    def add(self, checkin: CheckinData):
+        self.count += 1
+        self.mood_sum += checkin.mood_score
+        self.energy_sum += checkin.energy_level
+        self.focus_sum += checkin.focus_score
+        self.productivity_sum += checkin.productivity_score
+        self.achievements += len(checkin.achievements)
+    
+    def merge(self, other: 'CheckinAggregate'):
+        self.count += other.count
+        self.mood_sum += other.mood_sum
+        self.energy_sum += other.energy_sum
+        self.focus_sum += other.focus_sum
+        self.productivity_sum += other.productivity_sum
+        self.achievements += other.achievements
+    
+    def averages(self) -> Dict[str, float]:
+        if not self.count:
+            return {"mood": 0.0, "energy": 0.0, "focus": 0.0, "productivity": 0.0}
+        return {
+            "mood": round(self.mood_sum / self.count, 2),
+            "energy": round(self.energy_sum / self.count, 2),
+            "focus": round(self.focus_sum / self.count, 2),
+            "productivity": round(self.productivity_sum / self.count, 2)
+        }
+
+
+def _parse_day(date_str: str) -> Optional[date]:
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
 class DailyCheckinSystem:
     def __init__(self, vault_path: str, user_id: str = "default"):
         """
@@ -71,11 +116,24 @@ class DailyCheckinSystem:
         self.vault_path = Path(vault_path).expanduser()
         self.user_id = user_id
         
-        # Arquivo de check-ins
+        # Arquivo de check-ins: log JSON Lines só de acréscimo; o JSON
+        # antigo é lido uma vez para migrar e não é mais reescrito
         self.checkin_file = self.vault_path / "06-RECURSOS" / "daily_checkins.json"
+        self.checkin_log = self.checkin_file.with_suffix(".jsonl")
+        
+        # Índice por data e agregados diários/semanais
+        self._ids_by_date: Dict[str, List[str]] = {}
+        self._dates: List[str] = []
+        self._daily: Dict[str, CheckinAggregate] = {}
+        self._weekly: Dict[str, CheckinAggregate] = {}
+        self._streak_current = 0
+        self._streak_longest = 0
+        self._streak_last: Optional[date] = None
+        self._log_lines = 0
         
         # Carrega check-ins existentes
         self.checkins = self._load_checkins()
+        self._rebuild_index()
         
         # Histórico
         self.history = []
@@ -84,6 +142,29 @@ class DailyCheckinSystem:
         """Carrega check-ins do arquivo"""
         checkins = {}
         
+        if self.checkin_log.exists():
+            try:
+                needs_compaction = False
+                with open(self.checkin_log, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._log_lines += 1
+                        if not line.endswith("\n"):
+                            # Última linha interrompida: reescreve o log
+                            needs_compaction = True
+                        try:
+                            checkin = CheckinData.from_dict(json.loads(line))
+                        except (ValueError, KeyError, TypeError):
+                            needs_compaction = True
+                            continue
+                        # Linha mais recente do mesmo id prevalece
+                        checkins.pop(checkin.id, None)
+                        checkins[checkin.id] = checkin
+                if needs_compaction or self._log_lines > 2 * len(checkins) + 100:
+                    self._write_log(checkins)
+            except Exception as e:
+                print(f"Erro ao carregar check-ins: {e}")
+            return checkins
+        
         if self.checkin_file.exists():
             try:
                 with open(self.checkin_file, 'r', encoding='utf-8') as f:
@@ -91,23 +172,130 @@ class DailyCheckinSystem:
                 
                 for checkin_id, checkin_data in data.items():
                     checkins[checkin_id] = CheckinData.from_dict(checkin_data)
+                self._write_log(checkins)
             except Exception as e:
                 print(f"Erro ao carregar check-ins: {e}")
         
         return checkins
     
-    def _save_checkins(self):
-        """Salva check-ins no arquivo"""
+    def _write_log(self, checkins: Dict[str, CheckinData]):
+        """Reescreve o log compactado (uma linha por check-in)"""
+        self.checkin_log.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.checkin_log.with_suffix(".jsonl.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for checkin in checkins.values():
+                f.write(json.dumps(checkin.to_dict(), ensure_ascii=False) + "\n")
+        temp_path.replace(self.checkin_log)
+        self._log_lines = len(checkins)
+    
+    def _append_checkin(self, checkin: CheckinData):
+        """Registra um check-in: uma linha no log e atualização dos índices"""
+        self.checkins[checkin.id] = checkin
+        self._index_checkin(checkin)
         try:
-            data = {checkin_id: checkin.to_dict() 
-                   for checkin_id, checkin in self.checkins.items()}
-            
-            self.checkin_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.checkin_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.checkin_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.checkin_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(checkin.to_dict(), ensure_ascii=False) + "\n")
+            self._log_lines += 1
         except Exception as e:
             print(f"Erro ao salvar check-ins: {e}")
     
+    def _rebuild_index(self):
+        """Reconstrói índice por data, agregados e sequências a partir de self.checkins"""
+        self._ids_by_date = {}
+        self._dates = []
+        self._daily = {}
+        self._weekly = {}
+        for checkin in self.checkins.values():
+            self._add_to_index(checkin)
+        self._dates.sort()
+        self._recompute_streaks()
+    
+    def _add_to_index(self, checkin: CheckinData) -> bool:
+        """Adiciona ao índice; retorna True se a data é nova"""
+        ids = self._ids_by_date.get(checkin.date)
+        is_new_day = ids is None
+        if is_new_day:
+            ids = self._ids_by_date[checkin.date] = []
+            self._dates.append(checkin.date)
+            self._daily[checkin.date] = CheckinAggregate()
+        ids.append(checkin.id)
+        self._daily[checkin.date].add(checkin)
+        
+        day = _parse_day(checkin.date)
+        if day is not None:
+            week_key = (day - timedelta(days=day.weekday())).isoformat()
+            self._weekly.setdefault(week_key, CheckinAggregate()).add(checkin)
+        return is_new_day
+    
+    def _index_checkin(self, checkin: CheckinData):
+        """Atualiza índices para um check-in novo em O(1) no caso comum (data de hoje)"""
+        if not self._add_to_index(checkin):
+            return
+        
+        # Data nova: _add_to_index acrescentou ao fim; reposiciona se retroativa
+        self._dates.pop()
+        insort(self._dates, checkin.date)
+        
+        day = _parse_day(checkin.date)
+        if day is None:
+            return
+        if self._streak_last is None or day == self._streak_last + timedelta(days=1):
+            self._streak_current += 1
+            self._streak_last = day
+        elif day > self._streak_last:
+            self._streak_current = 1
+            self._streak_last = day
+        else:
+            # Check-in retroativo pode unir sequências: recalcula
+            self._recompute_streaks()
+            return
+        self._streak_longest = max(self._streak_longest, self._streak_current)
+    
+    def _recompute_streaks(self):
+        self._streak_current = 0
+        self._streak_longest = 0
+        self._streak_last = None
+        for date_str in self._dates:
+            day = _parse_day(date_str)
+            if day is None:
+                continue
+            if self._streak_last is not None and day == self._streak_last + timedelta(days=1):
+                self._streak_current += 1
+            else:
+                self._streak_current = 1
+            self._streak_last = day
+            self._streak_longest = max(self._streak_longest, self._streak_current)
+    
+    def _dates_since(self, days: int) -> List[str]:
+        """Datas com check-in a partir de hoje - days (mais antigas primeiro)"""
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        return self._dates[bisect_left(self._dates, cutoff):]
+    
+    def get_checkins_for_date(self, date_str: str) -> List[CheckinData]:
+        """
+        Retorna check-ins de uma data
+        
+        Args:
+            date_str: Data no formato YYYY-MM-DD
+            
+        Returns:
+            Check-ins do dia em ordem de registro
+        """
+        return [self.checkins[checkin_id] for checkin_id in self._ids_by_date.get(date_str, [])]
+    
+    def get_streaks(self) -> Dict[str, int]:
+        """
+        Retorna sequências de dias consecutivos com check-in
+        
+        Returns:
+            Sequência atual (zerada se ontem e hoje ficaram sem check-in) e a mais longa
+        """
+        current = self._streak_current
+        if self._streak_last is None or (datetime.now().date() - self._streak_last).days > 1:
+            current = 0
+        return {"current": current, "longest": self._streak_longest}
+    
     def morning_routine(self, energy_level: float = 3.0, 
                        focus_score: float = 3.0,
                        goals_today: List[str] = None) -> Dict:
@@ -145,11 +333,8 @@ class DailyCheckinSystem:
             productivity_score=0.0
         )
         
-        # Adiciona à coleção
-        self.checkins[checkin.id] = checkin
-        
-        # Salva
-        self._save_checkins()
+        # Adiciona à coleção e ao log
+        self._append_checkin(checkin)
         
         # Rotina sugerida
         routine = {
@@ -222,11 +407,8 @@ class DailyCheckinSystem:
             productivity_score=productivity_score
         )
         
-        # Adiciona à coleção
-        self.checkins[checkin.id] = checkin
-        
-        # Salva
-        self._save_checkins()
+        # Adiciona à coleção e ao log
+        self._append_checkin(checkin)
         
         # Análise do dia
         analysis = {
@@ -269,10 +451,7 @@ class DailyCheckinSystem:
         base_score = 5.0  # neutro
         
         # Verifica se há check-ins para este dia
-        day_checkins = []
-        for checkin in self.checkins.values():
-            if checkin.date == date_str:
-                day_checkins.append(checkin)
+        day_checkins = self.get_checkins_for_date(date_str)
         
         if not day_checkins:
             return base_score
@@ -359,12 +538,9 @@ class DailyCheckinSystem:
         Returns:
             Lista de check-ins ordenados por data
         """
-        cutoff_date = (datetime.now() - timedelta(days=days)).date()
-        
         recent = []
-        for checkin in self.checkins.values():
-            checkin_date = datetime.strptime(checkin.date, "%Y-%m-%d").date()
-            if checkin_date >= cutoff_date:
+        for date_str in reversed(self._dates_since(days)):
+            for checkin in self.get_checkins_for_date(date_str):
                 recent.append({
                     "date": checkin.date,
                     "time": checkin.time,
@@ -374,9 +550,6 @@ class DailyCheckinSystem:
                     "achievements": checkin.achievements
                 })
         
-        # Ordena por data (mais recente primeiro)
-        recent.sort(key=lambda x: x["date"], reverse=True)
-        
         return recent
     
     def get_trends(self, days: int = 30) -> Dict:
@@ -389,15 +562,18 @@ class DailyCheckinSystem:
         Returns:
             Análise de tendências
         """
-        recent_checkins = self.get_recent_checkins(days)
+        # Soma os agregados diários da janela (sem reler os check-ins)
+        window = CheckinAggregate()
+        for date_str in self._dates_since(days):
+            window.merge(self._daily[date_str])
         
-        if not recent_checkins:
+        if not window.count:
             return {"message": "Dados insuficientes para análise"}
         
         # Calcula médias
-        avg_mood = sum(c["mood_score"] for c in recent_checkins) / len(recent_checkins)
-        avg_energy = sum(c["energy_level"] for c in recent_checkins) / len(recent_checkins)
-        avg_productivity = sum(c["productivity_score"] for c in recent_checkins) / len(recent_checkins)
+        avg_mood = window.mood_sum / window.count
+        avg_energy = window.energy_sum / window.count
+        avg_productivity = window.productivity_sum / window.count
         
         # Identifica padrões
         patterns = []
@@ -429,12 +605,39 @@ class DailyCheckinSystem:
         
         return {
             "analysis_period_days": days,
-            "total_checkins_analyzed": len(recent_checkins),
+            "total_checkins_analyzed": window.count,
             "averages": {
                 "mood": round(avg_mood, 2),
                 "energy": round(avg_energy, 2),
                 "productivity": round(avg_productivity, 2)
             },
+            "streaks": self.get_streaks(),
             "detected_patterns": patterns,
             "recommendations": recommendations
         }
+    
+    def get_weekly_summary(self, weeks: int = 12) -> List[Dict]:
+        """
+        Resume as últimas semanas (segunda a domingo)
+        
+        Args:
+            weeks: Número de semanas, incluindo a atual
+            
+        Returns:
+            Lista de semanas (mais recente primeiro) com médias e contagens
+        """
+        today = datetime.now().date()
+        week_start = today - timedelta(days=today.weekday())
+        summary = []
+        for offset in range(weeks):
+            start = week_start - timedelta(weeks=offset)
+            aggregate = self._weekly.get(start.isoformat())
+            if aggregate is None:
+                continue
+            summary.append({
+                "week_start": start.isoformat(),
+                "checkins": aggregate.count,
+                "achievements": aggregate.achievements,
+                "averages": aggregate.averages()
+            })
+        return summary
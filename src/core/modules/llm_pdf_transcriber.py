@@ -12,6 +12,7 @@ from datetime import datetime
 import hashlib
 
 from .book_processor import BookMetadata, ProcessingResult, ProcessingStatus
+from .pdf_document_pool import PDFDocumentPool
 from .obsidian.vault_manager import ObsidianVaultManager
 
 logger = logging.getLogger(__name__)
@@ -39,7 +40,10 @@ class LLMPDFProcessor:
         """
         self.llm = llm_instance
         self.vault_manager = vault_manager or ObsidianVaultManager()
-        self.page_cache = {}
+        # Documento aberto uma vez e páginas em cache, compartilhados por capítulo e livro
+        self.documents = PDFDocumentPool()
+        # Sessões abertas com ``with``; o pool é fechado quando a última termina
+        self._sessions = 0
         
         # Tenta importar a LLM se não foi fornecida
         if self.llm is None:
@@ -53,6 +57,23 @@ class LLMPDFProcessor:
                 logger.info("📚 Usando apenas extração básica de texto")
         
         logger.info(f"LLMPDFProcessor inicializado (LLM: {self.llm is not None})")
+
+    def _generate(self, prompt: str, use_semantic: bool) -> Dict[str, Any]:
+        """Gera pela fila da LLM em prioridade de lote quando usa a LLM compartilhada."""
+        try:
+            from core.llm.backend_router import llm as glados_llm
+            from core.llm.scheduler import PRIORITY_BACKGROUND, get_llm_scheduler
+        except ImportError:
+            glados_llm = None
+        if glados_llm is not None and self.llm is glados_llm:
+            # Cede a vez para o chat interativo em vez de disputar o mesmo modelo
+            return get_llm_scheduler().run(
+                prompt,
+                use_semantic=use_semantic,
+                request_metadata={"workflow": "pdf_transcription"},
+                priority=PRIORITY_BACKGROUND,
+            )
+        return self.llm.generate(prompt, use_semantic=use_semantic)
     
     def extract_page_text(self, pdf_path: str, page_num: int) -> str:
         """
@@ -66,16 +87,27 @@ class LLMPDFProcessor:
             Texto extraído
         """
         try:
-            doc = fitz.open(pdf_path)
-            page = doc.load_page(page_num)
-            text = page.get_text()
-            doc.close()
-            
-            return text
+            return self.documents.page_text(pdf_path, page_num)
         except Exception as e:
             logger.error(f"Erro extraindo página {page_num}: {e}")
             return ""
     
+    def close(self):
+        """Fecha os documentos abertos e limpa o cache de páginas."""
+        self.documents.close()
+    
+    def __enter__(self):
+        """Mantém os documentos abertos entre chamadas (ex.: vários capítulos)."""
+        self._sessions += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._sessions -= 1
+        if self._sessions <= 0:
+            self._sessions = 0
+            self.close()
+        return False
+    
     def process_page_with_llm(self, pdf_path: str, page_num: int, 
                             metadata: BookMetadata) -> str:
         """
@@ -106,7 +138,7 @@ class LLMPDFProcessor:
                 prompt = self._create_llm_prompt(text, metadata, page_num)
                 
                 # Usa a LLM do GLaDOS
-                response = self.llm.generate(prompt, use_semantic=False)
+                response = self._generate(prompt, use_semantic=False)
                 
                 if response and "text" in response:
                     llm_text = response["text"]
@@ -138,6 +170,9 @@ class LLMPDFProcessor:
         """
         Processa um intervalo específico de páginas como um capítulo
     
+        O PDF é fechado ao final, a menos que a chamada esteja dentro de
+        ``with processor:`` (para reaproveitar o documento entre capítulos).
+    
         Args:
             pdf_path: Caminho do PDF
             start_page: Página inicial (0-index)
@@ -148,23 +183,26 @@ class LLMPDFProcessor:
         Returns:
             Resultado do processamento
         """
+        with self:
+            return self._process_chapter_range(pdf_path, start_page, end_page, metadata, chapter_num)
+
+    def _process_chapter_range(self, pdf_path: str, start_page: int, end_page: int,
+                               metadata: BookMetadata, chapter_num: Optional[int]) -> Dict:
         try:
-            import fitz
-        
-            doc = fitz.open(pdf_path)
+            total_pages = self.documents.page_count(pdf_path)
             chapter_text = ""
         
             # Garante que as páginas estão dentro dos limites
             start_page = max(0, start_page)
-            end_page = min(len(doc) - 1, end_page)
+            end_page = min(total_pages - 1, end_page)
         
             print(f"📄 Processando páginas {start_page+1} a {end_page+1}")
         
             for page_num in range(start_page, end_page + 1):
-                if page_num >= len(doc):
+                if page_num >= total_pages:
                     break
                 
-                print(f"  Página {page_num+1}/{len(doc)}")
+                print(f"  Página {page_num+1}/{total_pages}")
             
                 # Extrai texto
                 text = self.extract_page_text(pdf_path, page_num)
@@ -175,8 +213,6 @@ class LLMPDFProcessor:
             
                 chapter_text += f"\n\n--- Página {page_num + 1} ---\n\n{text}"
         
-            doc.close()
-        
             # Detecta título do capítulo
             lines = chapter_text.strip().split('\n')
             chapter_title = f"Capítulo {chapter_num}" if chapter_num else "Capítulo"
@@ -266,11 +302,15 @@ Responda APENAS com o texto corrigido, sem comentários adicionais."""
         Returns:
             Resultados do processamento
         """
+        with self:
+            return self._process_book(pdf_path, metadata, output_dir, max_pages)
+
+    def _process_book(self, pdf_path: str, metadata: BookMetadata,
+                      output_dir: Path, max_pages: Optional[int]) -> Dict[str, Any]:
         logger.info(f"Processando livro '{metadata.title}' com LLM")
         
         try:
-            doc = fitz.open(pdf_path)
-            total_pages = len(doc)
+            total_pages = self.documents.page_count(pdf_path)
             
             if max_pages:
                 pages_to_process = min(max_pages, total_pages)
@@ -312,7 +352,6 @@ Responda APENAS com o texto corrigido, sem comentários adicionais."""
                 if needs_llm and self.llm:
                     time.sleep(0.5)  # 500ms entre páginas com LLM
             
-            doc.close()
             
             # Organiza em capítulos
             chapters = self._organize_into_chapters(processed_pages, metadata, output_dir)
@@ -441,7 +480,7 @@ Forneça uma análise filosófica concisa:
 
 Seja direto e filosófico, evite formalidades excessivas."""
             
-            response = self.llm.generate(prompt, use_semantic=True)
+            response = self._generate(prompt, use_semantic=True)
             
             if response and "text" in response:
                 return response["text"]
@@ -0,0 +1,173 @@
+"""
+Diário de páginas do OCR (append-only, gravado em lotes).
+
+Substitui um arquivo por página + reescrita do estado JSON inteiro a cada
+página: cada resultado vira uma linha ``{"page", "source", "text"}`` ou
+``{"page", "failed"}`` em ``.ocr_pages.jsonl``. As linhas ficam em memória e
+são gravadas (com fsync) a cada ``flush_every`` páginas ou
+``flush_interval`` segundos. Na leitura vale o último registro de cada
+página; uma linha final truncada é ignorada e força a compactação.
+
+O caminho com threads do ``PDFProcessor`` grava páginas de vários workers no
+mesmo diário, então toda leitura/escrita do estado passa por um lock.
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Set
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class OCRPageJournal:
+    """Texto, origem e falhas por página (1-index) de um documento"""
+
+    def __init__(self, path: Path, flush_every: int = 16, flush_interval: float = 5.0):
+        self.path = Path(path)
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.texts: Dict[int, str] = {}
+        self.sources: Dict[int, str] = {}
+        self.failures: Dict[int, str] = {}
+        self._pending: List[Dict[str, Any]] = []
+        self._records = 0
+        self._needs_compaction = False
+        self._last_flush = time.monotonic()
+        # Reentrante: _queue -> flush -> compact
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def load(self) -> "OCRPageJournal":
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> "OCRPageJournal":
+        self.texts.clear()
+        self.sources.clear()
+        self.failures.clear()
+        self._records = 0
+        if not self.path.exists():
+            return self
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    page = int(record["page"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # Escrita interrompida: reescreve o diário no próximo flush
+                    self._needs_compaction = True
+                    break
+                self._apply(page, record)
+                self._records += 1
+        return self
+
+    def _apply(self, page: int, record: Dict[str, Any]):
+        if "failed" in record:
+            self.failures[page] = str(record.get("failed") or "")
+            self.texts.pop(page, None)
+            self.sources.pop(page, None)
+            return
+        self.texts[page] = str(record.get("text") or "")
+        self.sources[page] = str(record.get("source") or "text")
+        self.failures.pop(page, None)
+
+    def text(self, page: int) -> str:
+        with self._lock:
+            return self.texts.get(int(page), "")
+
+    def completed_pages(self) -> Set[int]:
+        with self._lock:
+            return {page for page, text in self.texts.items() if text.strip()}
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def record_text(self, page: int, text: str, source: str):
+        record = {"page": int(page), "source": str(source or "text"), "text": text}
+        with self._lock:
+            self._apply(int(page), record)
+            self._queue(record)
+
+    def record_failure(self, page: int, reason: str):
+        record = {"page": int(page), "failed": str(reason or "")}
+        with self._lock:
+            self._apply(int(page), record)
+            self._queue(record)
+
+    def _queue(self, record: Dict[str, Any]):
+        with self._lock:
+            self._pending.append(record)
+            if (
+                len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> bool:
+        """Grava os registros pendentes; retorna True se algo foi escrito"""
+        with self._lock:
+            return self._flush()
+
+    def _flush(self) -> bool:
+        self._last_flush = time.monotonic()
+        if self._needs_compaction:
+            self.compact()
+            return True
+        if not self._pending:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in self._pending)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._records += len(self._pending)
+        self._pending.clear()
+        return True
+
+    def compact(self):
+        """Reescreve o diário com só o último registro de cada página (atômico)"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records: List[Dict[str, Any]] = []
+        for page in sorted(set(self.texts) | set(self.failures)):
+            if page in self.failures:
+                records.append({"page": page, "failed": self.failures[page]})
+            else:
+                records.append({"page": page, "source": self.sources.get(page, "text"), "text": self.texts[page]})
+        fd, temp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.path)
+        except Exception:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+        self._records = len(records)
+        self._pending.clear()
+        self._needs_compaction = False
+
+    def discard(self):
+        """Remove o diário depois que o conteúdo foi consolidado nos capítulos"""
+        with self._lock:
+            self._pending.clear()
+            self._needs_compaction = False
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,117 @@
+"""
+Pool de documentos PDF abertos com cache de texto por página.
+
+Abrir um PDF com PyMuPDF lê e interpreta toda a tabela xref; fazer isso a
+cada página de um livro de centenas de páginas domina o tempo de extração.
+O pool mantém poucos documentos abertos (LRU) e guarda o texto extraído por
+(digest do arquivo, página), então editar ou substituir o PDF invalida o
+cache naturalmente.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import logging
+import threading
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # pragma: no cover - dependência opcional em runtime
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+
+class PDFDocumentPool:
+    """Handles de documento reaproveitados + cache limitado de páginas"""
+
+    def __init__(self, max_open: int = 4, max_text_pages: int = 2048):
+        self.max_open = max(1, int(max_open))
+        self.max_text_pages = max(1, int(max_text_pages))
+
+        self._lock = threading.RLock()
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        # (caminho, tamanho, mtime) -> digest do conteúdo
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._texts: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self.stats = {"opens": 0, "text_hits": 0, "text_misses": 0}
+
+    # ------------------------------------------------------------------
+    # Documentos
+    # ------------------------------------------------------------------
+    def file_digest(self, pdf_path: str) -> str:
+        """Digest do conteúdo, recalculado só quando tamanho/mtime mudam"""
+        path = Path(pdf_path).resolve()
+        stat = path.stat()
+        identity = (str(path), int(stat.st_size), int(stat.st_mtime_ns))
+        with self._lock:
+            digest = self._digests.get(identity)
+            if digest is None:
+                hasher = hashlib.sha1()
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b""):
+                        hasher.update(block)
+                digest = hasher.hexdigest()
+                self._digests[identity] = digest
+            return digest
+
+    def _document(self, pdf_path: str, digest: str):
+        document = self._documents.get(digest)
+        if document is not None:
+            self._documents.move_to_end(digest)
+            return document
+        if fitz is None:
+            raise ImportError("PyMuPDF não está instalado")
+        document = fitz.open(pdf_path)
+        self.stats["opens"] += 1
+        self._documents[digest] = document
+        while len(self._documents) > self.max_open:
+            _digest, old_document = self._documents.popitem(last=False)
+            try:
+                old_document.close()
+            except Exception:
+                pass
+        return document
+
+    def page_count(self, pdf_path: str) -> int:
+        with self._lock:
+            return len(self._document(pdf_path, self.file_digest(pdf_path)))
+
+    # ------------------------------------------------------------------
+    # Páginas
+    # ------------------------------------------------------------------
+    def page_text(self, pdf_path: str, page_num: int) -> str:
+        """Texto da página (0-index), lido uma vez por versão do arquivo"""
+        with self._lock:
+            digest = self.file_digest(pdf_path)
+            key = (digest, int(page_num))
+            text = self._texts.get(key)
+            if text is not None:
+                self._texts.move_to_end(key)
+                self.stats["text_hits"] += 1
+                return text
+            self.stats["text_misses"] += 1
+            text = self._document(pdf_path, digest).load_page(int(page_num)).get_text()
+            self._texts[key] = text
+            while len(self._texts) > self.max_text_pages:
+                self._texts.popitem(last=False)
+            return text
+
+    def close(self):
+        """Fecha todos os documentos e descarta o cache de texto"""
+        with self._lock:
+            for document in self._documents.values():
+                try:
+                    document.close()
+                except Exception as e:
+                    logger.debug(f"Falha ao fechar documento: {e}")
+            self._documents.clear()
+            self._texts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "open_documents": len(self._documents),
+                "cached_pages": len(self._texts),
+            }
@@ -3,11 +3,13 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import re
-import io
 import json
+import multiprocessing
+import os
 import shutil
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 try:
     import fitz  # PyMuPDF
@@ -24,27 +26,67 @@ try:
 except ImportError:  # pragma: no cover - dependência opcional em runtime
     pytesseract = None
 
-try:
-    import numpy as np
-except ImportError:  # pragma: no cover - dependência opcional em runtime
-    np = None
-
 from .book_processor import ProcessingQuality
+from .ocr_page_journal import OCRPageJournal
 
 logger = logging.getLogger(__name__)
 
+# Estado de cada processo do pool de OCR (um documento aberto por worker)
+_OCR_WORKER: Dict[str, Any] = {}
+
+
+def _ocr_worker_init(filepath: str, quality: Any, language: str, config: Dict[str, Any]) -> None:
+    """Inicializa o worker: abre o próprio handle do PDF (PyMuPDF não é thread/process-safe)."""
+    # Um tesseract por worker; o paralelismo vem do pool
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    processor = PDFProcessorOCR(quality=quality, language=language, max_workers=1, process_workers=1)
+    processor.config = dict(config)
+    _OCR_WORKER["processor"] = processor
+    _OCR_WORKER["doc"] = fitz.open(filepath)
+
+
+def _ocr_worker_extract(page_num: int) -> tuple[int, str, Dict[str, Any]]:
+    """Renderiza/OCRiza uma página no worker e devolve o texto ao coordenador."""
+    try:
+        page = _OCR_WORKER["doc"].load_page(page_num)
+        text, extraction_meta = _OCR_WORKER["processor"]._extract_page_text(page)
+        return page_num, text, extraction_meta
+    except Exception as exc:
+        return page_num, "", {"method": "error", "score": 0.0, "error": str(exc)}
+
+
 class PDFProcessorOCR:
     """Processador de PDF com OCR avançado."""
     
+    # Abaixo disso o custo de subir os processos não compensa
+    MIN_PAGES_FOR_PROCESS_POOL = 8
+    # Classificação de página: camada de texto "suficiente" e página "escaneada"
+    DIGITAL_MIN_CHARS = 200
+    SCANNED_MIN_IMAGE_COVERAGE = 0.5
+    # Pontuação a partir da qual não vale tentar outra extração/config de OCR
+    TEXT_EARLY_EXIT_SCORE = 80.0
+    OCR_EARLY_EXIT_SCORE = 60.0
+
     def __init__(self, quality: ProcessingQuality = ProcessingQuality.STANDARD, 
-                 language: str = 'por', max_workers: int = 4):
+                 language: str = 'por', max_workers: int = 4,
+                 process_workers: Optional[int] = None):
         self.quality = quality
         self.language = language
         self.max_workers = max_workers
+        # Processos para OCR (CPU-bound); None = núcleos disponíveis
+        if process_workers is None:
+            process_workers = min(os.cpu_count() or 1, 8)
+        self.process_workers = max(1, int(process_workers))
         self.config = self._get_quality_config(quality)
         self.state_file: Optional[Path] = None
-        self.page_cache_dir: Optional[Path] = None
+        self.page_journal: Optional[OCRPageJournal] = None
         self.runtime_state: Dict[str, Any] = {}
+        # Páginas extraídas pelo pool de processos, já registradas no estado
+        self._prefetched_pages: Dict[int, tuple[str, Dict[str, Any]]] = {}
+        # Classificação por página (0-index) do documento atual
+        self._page_profiles: Dict[int, Dict[str, Any]] = {}
+        # Tempo/método por página (1-index) extraída nesta execução
+        self._page_stats: Dict[int, Dict[str, Any]] = {}
 
     @staticmethod
     def extract_page_text_preserving_layout(page, preserve_layout: bool = True) -> str:
@@ -244,11 +286,12 @@ class PDFProcessorOCR:
 
             if self.runtime_state.get("scan_heavy_mode"):
                 warnings.append(
-                    "PDF escaneado pesado detectado. OCR será feito de forma sequencial com cache e retomada."
+                    "PDF escaneado pesado detectado. OCR será feito página a página com cache e retomada."
                 )
-                if self.runtime_state.get("completed_pages"):
+                completed_pages = self.page_journal.completed_pages() if self.page_journal else set()
+                if completed_pages:
                     warnings.append(
-                        f"Retomando OCR a partir do progresso salvo ({len(self.runtime_state.get('completed_pages', []))} página(s) já processadas)."
+                        f"Retomando OCR a partir do progresso salvo ({len(completed_pages)} página(s) já processadas)."
                     )
 
             if requires_ocr and not self._ocr_is_available():
@@ -274,11 +317,17 @@ class PDFProcessorOCR:
             else:
                 pages_to_process = total_pages
             
+            # OCR pesado: cada processo abre o próprio documento e extrai as páginas;
+            # a montagem dos capítulos abaixo só consome o resultado.
+            prefetched = 0
+            if self._should_use_process_pool(pages_to_process):
+                prefetched = self._prefetch_pages_in_processes(filepath, range(pages_to_process))
+
             # Usa plano de capítulos detectado (TOC/heurística) quando disponível.
             chapter_plan = self._build_chapter_plan(metadata, pages_to_process)
             if chapter_plan:
                 chapters = self._process_chapter_plan(doc, chapter_plan, output_dir)
-            elif self.config.get('parallel_processing'):
+            elif self.config.get('parallel_processing') and not prefetched:
                 chapters = self._process_parallel(doc, pages_to_process, output_dir)
             else:
                 chapters = self._process_sequential(doc, pages_to_process, output_dir)
@@ -309,8 +358,10 @@ class PDFProcessorOCR:
                 missing_after_recovery = []
             
             doc.close()
+            self._prefetched_pages.clear()
 
             if missing_after_recovery:
+                self._finish_page_journal(consolidated=False)
                 warnings.append(
                     f"Não foi possível cobrir todas as páginas. Faixas faltantes: {missing_after_recovery}"
                 )
@@ -319,55 +370,64 @@ class PDFProcessorOCR:
                     'warnings': warnings,
                     'success': False,
                     'pages_processed': pages_to_process,
-                    'total_pages': total_pages
+                    'total_pages': total_pages,
+                    'page_cache_dir': self._kept_page_journal_path(),
+                    'page_stats': self._page_stats_summary(),
                 }
 
             total_pages_without_text = sum(int(ch.get("missing_text_pages", 0) or 0) for ch in chapters)
             if total_pages_without_text > 0:
+                self._finish_page_journal(consolidated=False)
                 warnings.append(
                     f"{total_pages_without_text} página(s) sem texto extraído após OCR."
                 )
-                if self.page_cache_dir:
+                if self.page_journal:
                     warnings.append(
-                        f"O progresso do OCR foi salvo em {self.page_cache_dir} para retomada posterior."
+                        f"O progresso do OCR foi salvo em {self.page_journal.path} para retomada posterior."
                     )
                 return {
                     'chapters': chapters,
                     'warnings': warnings,
                     'success': False,
                     'pages_processed': pages_to_process,
-                    'total_pages': total_pages
+                    'total_pages': total_pages,
+                    'page_cache_dir': self._kept_page_journal_path(),
+                    'page_stats': self._page_stats_summary(),
                 }
             
+            # Todas as páginas estão nos capítulos: o diário não é mais necessário
+            self._finish_page_journal(consolidated=True)
             return {
                 'chapters': chapters,
                 'warnings': warnings,
                 'success': True,
                 'pages_processed': pages_to_process,
                 'total_pages': total_pages,
-                'page_cache_dir': str(self.page_cache_dir) if self.page_cache_dir else None,
+                'page_cache_dir': self._kept_page_journal_path(),
+                'page_stats': self._page_stats_summary(),
             }
             
         except Exception as e:
+            self._finish_page_journal(consolidated=False)
             logger.error(f"Erro no processamento OCR: {e}")
             return {
                 'chapters': [],
                 'warnings': [f"Erro OCR: {str(e)}"],
-                'success': False
+                'success': False,
+                'page_cache_dir': self._kept_page_journal_path(),
             }
 
     def _prepare_processing_runtime(self, metadata: Any, output_dir: Path, total_pages: int) -> None:
         """Configura estratégia de execução e persistência para o documento atual."""
         self.state_file = output_dir / ".ocr_state.json"
-        self.page_cache_dir = output_dir / ".ocr_pages"
-        self.page_cache_dir.mkdir(parents=True, exist_ok=True)
+        self.page_journal = OCRPageJournal(output_dir / ".ocr_pages.jsonl").load()
+        self._page_profiles.clear()
+        self._page_stats.clear()
 
         self.runtime_state = self._load_state()
+        self._migrate_legacy_page_cache(output_dir / ".ocr_pages")
         self.runtime_state.setdefault("total_pages", total_pages)
         self.runtime_state.setdefault("quality", self.quality.value)
-        self.runtime_state.setdefault("completed_pages", [])
-        self.runtime_state.setdefault("failed_pages", {})
-        self.runtime_state.setdefault("page_sources", {})
 
         requires_ocr = bool(getattr(metadata, "requires_ocr", False))
         is_scan_heavy = requires_ocr or self._document_looks_scan_heavy(total_pages)
@@ -398,8 +458,10 @@ class PDFProcessorOCR:
 
     def _document_looks_scan_heavy(self, total_pages: int) -> bool:
         """Usa estado anterior para reconhecer documentos problemáticos."""
-        completed = set(int(page) for page in self.runtime_state.get("completed_pages", []))
-        failed = self.runtime_state.get("failed_pages", {}) or {}
+        if not self.page_journal:
+            return False
+        completed = self.page_journal.completed_pages()
+        failed = self.page_journal.failures
         return bool(failed) and len(completed) < max(3, total_pages // 10)
 
     def _load_state(self) -> Dict[str, Any]:
@@ -412,55 +474,79 @@ class PDFProcessorOCR:
         return {}
 
     def _save_state(self) -> None:
-        """Persiste estado incremental do OCR."""
+        """Persiste a configuração da execução; o progresso por página fica no diário."""
         if not self.state_file:
             return
+        state = dict(self.runtime_state)
+        if self.page_journal:
+            state["completed_count"] = len(self.page_journal.completed_pages())
+            state["failed_pages"] = {str(page): reason for page, reason in sorted(self.page_journal.failures.items())}
         self.state_file.write_text(
-            json.dumps(self.runtime_state, ensure_ascii=False, indent=2),
+            json.dumps(state, ensure_ascii=False, indent=2),
             encoding="utf-8",
         )
 
-    def _page_cache_path(self, page_num: int) -> Optional[Path]:
-        """Retorna caminho do cache da página."""
-        if not self.page_cache_dir:
-            return None
-        return self.page_cache_dir / f"page-{page_num + 1:04d}.txt"
+    def _migrate_legacy_page_cache(self, legacy_dir: Path) -> None:
+        """Importa o cache antigo (um .txt por página) para o diário e o remove."""
+        page_sources = self.runtime_state.pop("page_sources", None) or {}
+        failed_pages = self.runtime_state.pop("failed_pages", None) or {}
+        self.runtime_state.pop("completed_pages", None)
+        if not self.page_journal:
+            return
+        for page, reason in failed_pages.items():
+            if str(page).isdigit() and int(page) not in self.page_journal.texts:
+                self.page_journal.record_failure(int(page), reason)
+        if legacy_dir.is_dir():
+            for cache_path in sorted(legacy_dir.glob("page-*.txt")):
+                page = cache_path.stem.split("-", 1)[-1]
+                if not page.isdigit() or int(page) in self.page_journal.texts:
+                    continue
+                try:
+                    text = cache_path.read_text(encoding="utf-8")
+                except Exception:
+                    continue
+                if text.strip():
+                    self.page_journal.record_text(int(page), text, page_sources.get(str(int(page)), "cache"))
+        self.page_journal.flush()
+        if legacy_dir.is_dir():
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+
+    def _finish_page_journal(self, consolidated: bool) -> None:
+        """Grava o diário no fim da execução (ou o descarta se já está nos capítulos)."""
+        if not self.page_journal:
+            return
+        try:
+            if consolidated:
+                self.page_journal.discard()
+                self.runtime_state["consolidated"] = True
+            else:
+                self.page_journal.compact()
+            self._save_state()
+        except Exception as e:
+            logger.warning(f"Falha ao gravar diário de OCR: {e}")
+
+    def _kept_page_journal_path(self) -> Optional[str]:
+        """Diário de OCR mantido para retomada (None se descartado ou inexistente)."""
+        journal = self.page_journal
+        if journal and (journal.completed_pages() or journal.failures) and journal.path.exists():
+            return str(journal.path)
+        return None
 
     def _load_cached_page_text(self, page_num: int) -> str:
         """Lê texto já OCRizado para evitar retrabalho."""
-        cache_path = self._page_cache_path(page_num)
-        if cache_path and cache_path.exists():
-            try:
-                return cache_path.read_text(encoding="utf-8")
-            except Exception:
-                return ""
-        return ""
+        if not self.page_journal:
+            return ""
+        return self.page_journal.text(page_num + 1)
 
     def _save_cached_page_text(self, page_num: int, text: str, source: str) -> None:
-        """Persiste texto da página e atualiza estado."""
-        cache_path = self._page_cache_path(page_num)
-        if cache_path:
-            cache_path.write_text(text, encoding="utf-8")
-
-        completed = {
-            int(item) for item in self.runtime_state.get("completed_pages", [])
-            if isinstance(item, int) or str(item).isdigit()
-        }
-        completed.add(page_num + 1)
-        self.runtime_state["completed_pages"] = sorted(completed)
-
-        page_sources = self.runtime_state.setdefault("page_sources", {})
-        page_sources[str(page_num + 1)] = source
-
-        failed = self.runtime_state.setdefault("failed_pages", {})
-        failed.pop(str(page_num + 1), None)
-        self._save_state()
+        """Registra texto da página no diário (gravado em lotes)."""
+        if self.page_journal:
+            self.page_journal.record_text(page_num + 1, text, source)
 
     def _mark_page_failure(self, page_num: int, reason: str) -> None:
         """Registra falha da página para facilitar retomada/diagnóstico."""
-        failed = self.runtime_state.setdefault("failed_pages", {})
-        failed[str(page_num + 1)] = reason
-        self._save_state()
+        if self.page_journal:
+            self.page_journal.record_failure(page_num + 1, reason)
 
     def _find_missing_ranges(self, chapters: List[Dict[str, Any]], total_pages: int) -> List[tuple[int, int]]:
         """
@@ -682,68 +768,245 @@ class PDFProcessorOCR:
             logger.error(f"Erro processando páginas {start_page}-{end_page}: {e}")
             return None
 
+    def _should_use_process_pool(self, pages_to_process: int) -> bool:
+        """Pool de processos só compensa quando haverá OCR (CPU-bound) em várias páginas."""
+        return (
+            fitz is not None
+            and self.process_workers > 1
+            and pages_to_process >= self.MIN_PAGES_FOR_PROCESS_POOL
+            and bool(self.config.get("ocr_enabled"))
+            and self._ocr_is_available()
+        )
+
+    def _prefetch_pages_in_processes(self, filepath: str, page_numbers) -> int:
+        """
+        Extrai páginas em um pool de processos.
+
+        Os workers só renderizam e OCRizam; o coordenador grava cache e estado
+        de retomada na ordem das páginas. Retorna quantas páginas foram extraídas.
+        """
+        pending = [
+            page_num for page_num in page_numbers
+            if page_num not in self._prefetched_pages and not self._load_cached_page_text(page_num).strip()
+        ]
+        if len(pending) < 2:
+            return 0
+
+        workers = min(self.process_workers, len(pending))
+        chunksize = max(1, min(4, len(pending) // (workers * 4)))
+        logger.info(f"OCR em {workers} processo(s) para {len(pending)} página(s)")
+        extracted = 0
+        try:
+            # forkserver evita fork de um processo com threads de UI ativas
+            start_methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context("forkserver") if "forkserver" in start_methods else None
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp_context,
+                initializer=_ocr_worker_init,
+                initargs=(str(filepath), self.quality, self.language, dict(self.config)),
+            ) as executor:
+                # map devolve na ordem de submissão: o estado avança página a página
+                for page_num, text, extraction_meta in executor.map(_ocr_worker_extract, pending, chunksize=chunksize):
+                    if extraction_meta.get("method") == "error":
+                        logger.warning(f"Worker de OCR falhou na página {page_num + 1}: {extraction_meta.get('error')}")
+                        continue
+                    self._record_page_result(page_num, text, extraction_meta)
+                    self._prefetched_pages[page_num] = (text, extraction_meta)
+                    extracted += 1
+        except Exception as e:
+            # Sem pool (ambiente restrito, worker morto): o caminho em processo cobre o resto
+            logger.warning(f"Pool de processos de OCR indisponível, seguindo no processo atual: {e}")
+        return extracted
+
     def _extract_page_with_resume(self, doc, page_num: int) -> tuple[str, Dict[str, Any]]:
         """Extrai página reutilizando cache persistido quando houver."""
+        prefetched = self._prefetched_pages.pop(page_num, None)
+        if prefetched is not None:
+            return prefetched
+
         cached_text = self._load_cached_page_text(page_num)
         if cached_text.strip():
-            cached_source = (self.runtime_state.get("page_sources", {}) or {}).get(str(page_num + 1), "cache")
+            cached_source = self.page_journal.sources.get(page_num + 1, "cache") if self.page_journal else "cache"
             return cached_text, {"method": cached_source, "score": self._score_extracted_text(cached_text), "cached": True}
 
         page = doc.load_page(page_num)
-        text, extraction_meta = self._extract_best_page_text(page)
+        cleaned, extraction_meta = self._extract_page_text(page)
+        self._record_page_result(page_num, cleaned, extraction_meta)
+        return cleaned, extraction_meta
+
+    def _extract_page_text(self, page) -> tuple[str, Dict[str, Any]]:
+        """Extração nativa + OCR quando necessário, sem tocar no estado persistido."""
+        started = time.perf_counter()
+        profile = self._classify_page(page)
+        page_class = profile["page_class"]
+
+        if page_class in ("scanned", "vector", "blank") and not profile["text_chars"]:
+            # Sem camada de texto: nada a pontuar na extração nativa
+            text, extraction_meta = "", {"method": "empty", "score": 0.0}
+        else:
+            early_exit = self.TEXT_EARLY_EXIT_SCORE if page_class == "digital" else None
+            text, extraction_meta = self._extract_best_page_text(page, early_exit_score=early_exit)
 
-        if self._should_try_ocr(text, extraction_meta):
-            ocr_text = self._ocr_page(page)
+        ocr_passes = 0
+        if self._page_needs_ocr(profile, text, extraction_meta):
+            ocr_text, ocr_passes = self._ocr_page(page, profile)
             if self._is_better_candidate(ocr_text, text):
                 text = ocr_text
                 extraction_meta["method"] = "ocr"
             if text:
                 text = f"[OCR] {text}"
 
-        cleaned = self._clean_page_text(text)
+        extraction_meta["page_class"] = page_class
+        extraction_meta["ocr_passes"] = ocr_passes
+        extraction_meta["seconds"] = round(time.perf_counter() - started, 4)
+        return self._clean_page_text(text), extraction_meta
+
+    def _classify_page(self, page) -> Dict[str, Any]:
+        """
+        Classifica a página antes de extrair (uma vez por página do documento).
+
+        - ``digital``: camada de texto suficiente; OCR só se a extração for ruim;
+        - ``scanned``: imagem cobre a página e quase não há texto; OCR direto;
+        - ``vector``: sem texto nem imagem, só desenhos (texto convertido em curvas);
+        - ``blank``: nada para extrair;
+        - ``mixed``: decide pelo resultado da extração nativa.
+        """
+        page_number = getattr(page, "number", None)
+        cached = self._page_profiles.get(page_number) if page_number is not None else None
+        if cached is not None:
+            return cached
+
+        profile: Dict[str, Any] = {
+            "page_class": "mixed",
+            "text_chars": 0,
+            "text_coverage": 0.0,
+            "image_coverage": 0.0,
+            "image_dpi": None,
+        }
+        try:
+            rect = page.rect
+            page_area = max(float(rect.width) * float(rect.height), 1.0)
+            text_chars = 0
+            text_area = 0.0
+            for block in page.get_text("blocks") or []:
+                x0, y0, x1, y1, block_text, _block_no, block_type = block[:7]
+                if int(block_type) != 0:
+                    continue
+                text_chars += len("".join(str(block_text or "").split()))
+                text_area += max(0.0, x1 - x0) * max(0.0, y1 - y0)
+
+            image_area = 0.0
+            image_dpi: Optional[float] = None
+            for info in page.get_image_info() or []:
+                x0, y0, x1, y1 = info.get("bbox") or (0, 0, 0, 0)
+                width_pt = max(0.0, min(x1, rect.x1) - max(x0, rect.x0))
+                height_pt = max(0.0, min(y1, rect.y1) - max(y0, rect.y0))
+                image_area += width_pt * height_pt
+                if x1 - x0 > 0 and info.get("width"):
+                    # Resolução real da imagem: renderizar acima disso não traz detalhe
+                    native = float(info["width"]) * 72 / float(x1 - x0)
+                    image_dpi = native if image_dpi is None else max(image_dpi, native)
+        except Exception as exc:
+            logger.debug("Classificação falhou na página %s: %s", page_number, exc)
+            return profile
+
+        image_coverage = min(1.0, image_area / page_area)
+        profile.update({
+            "text_chars": text_chars,
+            "text_coverage": round(min(1.0, text_area / page_area), 3),
+            "image_coverage": round(image_coverage, 3),
+            "image_dpi": int(image_dpi) if image_dpi else None,
+        })
+
+        if text_chars >= self.DIGITAL_MIN_CHARS and image_coverage < self.SCANNED_MIN_IMAGE_COVERAGE:
+            profile["page_class"] = "digital"
+        elif text_chars < self.DIGITAL_MIN_CHARS and image_coverage >= self.SCANNED_MIN_IMAGE_COVERAGE:
+            profile["page_class"] = "scanned"
+        elif not text_chars and not image_area:
+            try:
+                has_drawings = bool(page.get_drawings())
+            except Exception:
+                has_drawings = True
+            profile["page_class"] = "vector" if has_drawings else "blank"
+
+        if page_number is not None:
+            self._page_profiles[page_number] = profile
+        return profile
+
+    def _page_needs_ocr(self, profile: Dict[str, Any], text: str, extraction_meta: Dict[str, Any]) -> bool:
+        """Usa a classificação para pular ou antecipar o OCR."""
+        page_class = profile.get("page_class")
+        if page_class == "blank":
+            return False
+        if page_class in ("scanned", "vector") and not (text or "").strip():
+            return bool(self.config.get("ocr_enabled")) and self._ocr_is_available()
+        return self._should_try_ocr(text, extraction_meta)
+
+    def _record_page_result(self, page_num: int, cleaned: str, extraction_meta: Dict[str, Any]) -> None:
+        """Registra o resultado da página no cache e no estado de retomada."""
         if cleaned.strip():
             source = str(extraction_meta.get("method") or "text")
             self._save_cached_page_text(page_num, cleaned, source)
         else:
             self._mark_page_failure(page_num, "Sem texto extraído")
+        if "seconds" in extraction_meta:
+            self._page_stats[page_num + 1] = {
+                "page_class": extraction_meta.get("page_class", "mixed"),
+                "method": extraction_meta.get("method", "empty"),
+                "ocr_passes": int(extraction_meta.get("ocr_passes", 0) or 0),
+                "seconds": float(extraction_meta["seconds"]),
+            }
 
-        return cleaned, extraction_meta
-
-    def _extract_best_page_text(self, page) -> tuple[str, Dict[str, Any]]:
-        """Seleciona a melhor extração textual disponível para uma página."""
-        candidates: List[tuple[str, str]] = []
-        preserve_layout = bool(self.config.get('preserve_layout', True))
+    def _page_stats_summary(self) -> Dict[str, Any]:
+        """Resumo de tempo por página/classe para o resultado do processamento."""
+        by_class: Dict[str, int] = {}
+        for entry in self._page_stats.values():
+            by_class[entry["page_class"]] = by_class.get(entry["page_class"], 0) + 1
+        return {
+            "pages": len(self._page_stats),
+            "seconds": round(sum(entry["seconds"] for entry in self._page_stats.values()), 4),
+            "ocr_pages": sum(1 for entry in self._page_stats.values() if entry["ocr_passes"]),
+            "ocr_passes": sum(entry["ocr_passes"] for entry in self._page_stats.values()),
+            "by_class": by_class,
+            "per_page": {page: dict(entry) for page, entry in sorted(self._page_stats.items())},
+        }
 
-        try:
-            text = self.extract_page_text_preserving_layout(page, preserve_layout=preserve_layout)
-            candidates.append(("layout", text))
-        except Exception as exc:
-            logger.debug("Extração com layout falhou na página %s: %s", getattr(page, "number", "?"), exc)
+    def _extract_best_page_text(self, page, early_exit_score: Optional[float] = None) -> tuple[str, Dict[str, Any]]:
+        """
+        Seleciona a melhor extração textual disponível para uma página.
 
+        Com ``early_exit_score``, para no primeiro candidato que alcança a pontuação.
+        """
+        preserve_layout = bool(self.config.get('preserve_layout', True))
         extraction_attempts = [
+            ("layout", lambda: self.extract_page_text_preserving_layout(page, preserve_layout=preserve_layout)),
             ("text", lambda: page.get_text("text", sort=True)),
             ("blocks", lambda: self._extract_text_from_blocks(page)),
             ("words", lambda: self._extract_text_from_words(page)),
         ]
 
+        best_method = "empty"
+        best_text = ""
+        best_score = -1.0
+        tried = 0
         for method, extractor in extraction_attempts:
             try:
-                candidates.append((method, extractor() or ""))
+                candidate = extractor() or ""
             except Exception as exc:
                 logger.debug("Extração %s falhou na página %s: %s", method, getattr(page, "number", "?"), exc)
-
-        best_method = "empty"
-        best_text = ""
-        best_score = -1.0
-        for method, candidate in candidates:
+                continue
+            tried += 1
             cleaned = self._clean_page_text(candidate)
             score = self._score_extracted_text(cleaned)
             if score > best_score:
                 best_score = score
                 best_text = cleaned
                 best_method = method
+            if early_exit_score is not None and best_score >= early_exit_score:
+                break
 
-        return best_text, {"method": best_method, "score": best_score}
+        return best_text, {"method": best_method, "score": best_score, "candidates": tried}
 
     def _extract_text_from_blocks(self, page) -> str:
         """Reagrupa blocos para PDFs cujo texto sai embaralhado no modo padrão."""
@@ -843,22 +1106,34 @@ class PDFProcessorOCR:
         current_score = self._score_extracted_text(self._clean_page_text(current))
         return candidate_score > current_score + 5
     
-    def _ocr_page(self, page) -> str:
-        """Aplica OCR em uma página."""
+    def _ocr_page(self, page, profile: Optional[Dict[str, Any]] = None) -> tuple[str, int]:
+        """
+        Aplica OCR em uma página; retorna o texto e quantas passadas do tesseract rodaram.
+
+        Começa pela primeira config no DPI planejado e só tenta as demais
+        enquanto a pontuação não alcança ``OCR_EARLY_EXIT_SCORE``.
+        """
+        passes = 0
         try:
             if not self._ocr_is_available():
-                return ""
+                return "", passes
 
             # Aplica OCR
             lang = self.config.get('language_model', self.language)
             ocr_configs = self.config.get('ocr_configs') or ["--psm 6"]
             timeout_seconds = float(self.config.get('ocr_timeout_seconds') or 20)
-            dpi_candidates = self._ocr_dpi_candidates()
+            dpi_candidates = self._ocr_dpi_candidates((profile or {}).get("image_dpi"))
             best_text = ""
             best_score = -1.0
 
+            # Renderiza uma vez no maior DPI; os fallbacks são reduções da mesma imagem
+            source_dpi = max(dpi_candidates)
+            source_image = None
+
             for dpi in dpi_candidates:
-                image = self._render_page_image(page, dpi)
+                if source_image is None:
+                    source_image = self._render_page_image(page, source_dpi)
+                image = self._scale_page_image(source_image, source_dpi, dpi)
 
                 if self.config.get('preprocess_image'):
                     image = self._preprocess_image(image)
@@ -873,14 +1148,17 @@ class PDFProcessorOCR:
                             config=config,
                             timeout=timeout_seconds,
                         )
+                        passes += 1
                         cleaned = self._clean_page_text(text)
                         score = self._score_extracted_text(cleaned)
                         if score > best_score:
                             best_text = cleaned
                             best_score = score
+                        if best_score >= self.OCR_EARLY_EXIT_SCORE:
+                            break
 
                     if best_text.strip():
-                        return best_text.strip()
+                        return best_text.strip(), passes
                 except RuntimeError as exc:
                     logger.warning(
                         "OCR timeout/falha na página %s com dpi=%s: %s",
@@ -890,15 +1168,18 @@ class PDFProcessorOCR:
                     )
                     continue
 
-            return best_text.strip()
+            return best_text.strip(), passes
             
         except Exception as e:
             logger.warning(f"OCR falhou na página {page.number}: {e}")
-            return ""
+            return "", passes
 
-    def _ocr_dpi_candidates(self) -> List[int]:
+    def _ocr_dpi_candidates(self, native_dpi: Optional[int] = None) -> List[int]:
         """Lista DPIs candidatos para OCR com fallback progressivo."""
         base_dpi = int(self.config.get("image_dpi") or 120)
+        if native_dpi:
+            # Acima da resolução da imagem escaneada só cresce o custo do tesseract
+            base_dpi = max(72, min(base_dpi, int(native_dpi)))
         fallback_dpis = [base_dpi]
         if base_dpi > 110:
             fallback_dpis.append(max(96, int(base_dpi * 0.8)))
@@ -911,12 +1192,29 @@ class PDFProcessorOCR:
         return unique
 
     def _render_page_image(self, page, dpi: int) -> Image.Image:
-        """Renderiza a página em imagem PIL para OCR."""
+        """
+        Renderiza a página direto em escala de cinza para OCR.
+
+        A imagem PIL aponta para as amostras do pixmap (sem codificar/decodificar
+        PNG); o pixmap fica em ``image.info`` para manter o buffer vivo.
+        """
         zoom = dpi / 72
         mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        img_data = pix.tobytes("png")
-        return Image.open(io.BytesIO(img_data))
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        samples = getattr(pix, "samples_mv", None)
+        if samples is None:
+            return Image.frombytes("L", (pix.width, pix.height), pix.samples, "raw", "L", pix.stride, 1)
+        image = Image.frombuffer("L", (pix.width, pix.height), samples, "raw", "L", pix.stride, 1)
+        image.info["_pixmap"] = pix
+        return image
+
+    def _scale_page_image(self, image: Image.Image, source_dpi: int, dpi: int) -> Image.Image:
+        """Reduz a imagem renderizada em ``source_dpi`` para ``dpi``."""
+        if dpi >= source_dpi:
+            return image
+        width = max(1, round(image.width * dpi / source_dpi))
+        height = max(1, round(image.height * dpi / source_dpi))
+        return image.resize((width, height), Image.LANCZOS)
 
     def _ocr_is_available(self) -> bool:
         """Valida dependências Python e o binário do Tesseract."""
@@ -995,25 +1293,19 @@ class PDFProcessorOCR:
     
     def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """Pré-processa imagem para melhor OCR."""
-        if np is None:
-            return image
-
         # Converte para escala de cinza
         if image.mode != 'L':
             image = image.convert('L')
-        
-        # Aumenta contraste
-        import numpy as np
-        img_array = np.array(image)
-        
-        # Normaliza
-        img_array = (img_array - img_array.min()) / (img_array.max() - img_array.min() + 1e-7) * 255
-        
-        # Remove ruído (simples threshold)
-        threshold = np.mean(img_array)
-        img_array = np.where(img_array > threshold * 0.7, 255, 0)
-        
-        return Image.fromarray(img_array.astype('uint8'))
 
+        # Normalizar o contraste e limiarizar em 70% da média normalizada
+        # equivale a cortar em ``min + 0.7 * (média - min)`` nos tons originais:
+        # uma tabela de 256 entradas evita copiar a página para arrays float.
+        histogram = image.histogram()
+        total = sum(histogram) or 1
+        mean = sum(value * count for value, count in enumerate(histogram)) / total
+        lowest = next((value for value, count in enumerate(histogram) if count), 0)
+        cutoff = lowest + 0.7 * (mean - lowest)
+
+        return image.point([255 if value > cutoff else 0 for value in range(256)])
 
 PDFProcessor = PDFProcessorOCR
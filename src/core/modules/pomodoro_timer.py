@@ -1,28 +1,87 @@
 # [file name]: src/core/modules/pomodoro_timer.py
 """
 Temporizador Pomodoro para estudos filosóficos
+
+O timer não faz polling: as fases são medidas em ``time.monotonic()`` e um
+agendador dorme até o próximo prazo real (fim da fase, tick pedido por
+``on_tick`` ou gravação adiada das estatísticas). Sem prazo pendente (timer
+ocioso ou pausado) não há nenhum despertar. Dentro da GUI o agendador é um
+``QTimer`` de disparo único no laço de eventos do Qt, e os callbacks rodam
+na thread da interface; fora dela, uma thread espera numa ``Condition`` que
+é notificada a cada mudança de estado.
 """
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
 import time
-from typing import Dict, Optional
+import weakref
+from typing import Callable, Dict, Optional
 from datetime import datetime, timedelta
-import threading
-import json
 from pathlib import Path
 
+try:
+    from PyQt6.QtCore import QCoreApplication, QObject, Qt, QTimer, pyqtSignal
+except Exception:  # Qt é opcional (CLI, testes)
+    QCoreApplication = None
+    QObject = None
+
+
+# Espera antes de gravar estatísticas alteradas (várias sessões viram uma escrita)
+STATS_FLUSH_DELAY = 30.0
+
+_LIVE_TIMERS: "weakref.WeakSet[PomodoroTimer]" = weakref.WeakSet()
+
+
+def _flush_live_timers():
+    for timer in list(_LIVE_TIMERS):
+        timer.flush_stats()
+
+
+atexit.register(_flush_live_timers)
+
+
+if QObject is not None:
+    class _QtWakeup(QObject):
+        """``QTimer`` de disparo único que pode ser rearmado de qualquer thread"""
+
+        rearm = pyqtSignal(int)
+
+        def __init__(self, callback: Callable[[], None]):
+            super().__init__()
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._timer.timeout.connect(callback)
+            # Emitido fora da thread da GUI, o sinal chega enfileirado
+            self.rearm.connect(self._rearm)
+
+        def _rearm(self, msec: int):
+            if msec < 0:
+                self._timer.stop()
+            else:
+                self._timer.start(msec)
+
+
 class PomodoroTimer:
     """Temporizador Pomodoro para gerenciamento de tempo de estudo"""
     
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, use_qt: Optional[bool] = None):
         """
         Inicializa o temporizador Pomodoro
         
         Args:
             vault_path: Caminho para o vault do Obsidian
+            use_qt: Agenda no laço de eventos do Qt; ``None`` detecta se há
+                uma ``QCoreApplication`` ativa
         """
         self.vault_path = Path(vault_path).expanduser()
         self.stats_file = self.vault_path / "06-RECURSOS" / "pomodoro_stats.json"
         
-        # Estado do timer
+        # Estado do timer. start_time/paused_time/elapsed_paused ficam em
+        # relógio de parede só por compatibilidade; a contagem usa o monotônico.
         self.is_running = False
         self.is_paused = False
         self.start_time = None
@@ -40,8 +99,21 @@ class PomodoroTimer:
         self.stats = self._load_stats()
         self.current_session_type = "work"  # work, short_break, long_break
         
-        # Thread do timer
+        # Agendador (thread ou QTimer, escolhido no primeiro agendamento)
         self.timer_thread = None
+        self._use_qt = use_qt
+        self._qt_wakeup = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._started_mono: Optional[float] = None
+        self._frozen_at: Optional[float] = None
+        self._paused_total = 0.0
+        self._target_duration = 0.0
+        self._deadline: Optional[float] = None
+        self._stats_dirty = False
+        self._stats_flush_at: Optional[float] = None
+        self.scheduler_stats = {"wakeups": 0, "stats_writes": 0}
+        _LIVE_TIMERS.add(self)
         
         # Callbacks
         self.on_tick = None
@@ -73,14 +145,54 @@ class PomodoroTimer:
         return stats
     
     def _save_stats(self):
-        """Salva estatísticas no arquivo"""
+        """Salva estatísticas no arquivo (troca atômica do arquivo inteiro)"""
+        with self._cond:
+            payload = json.dumps(self.stats, indent=2, default=str)
+            self._stats_dirty = False
+            self._stats_flush_at = None
         try:
             self.stats_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2)
+            fd, temp_name = tempfile.mkstemp(
+                prefix=f".{self.stats_file.name}.",
+                suffix=".tmp",
+                dir=str(self.stats_file.parent),
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(temp_name, self.stats_file)
+            except Exception:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+                raise
+            self.scheduler_stats["stats_writes"] += 1
         except Exception as e:
             print(f"Erro ao salvar estatísticas: {e}")
     
+    def flush_stats(self) -> bool:
+        """
+        Grava agora as estatísticas pendentes
+        
+        Returns:
+            True se havia alterações para gravar
+        """
+        with self._cond:
+            if not self._stats_dirty:
+                return False
+        self._save_stats()
+        self._reschedule()
+        return True
+    
+    def _mark_stats_dirty(self):
+        """Adia a gravação: sessões próximas saem numa única escrita"""
+        with self._cond:
+            self._stats_dirty = True
+            if self._stats_flush_at is None:
+                self._stats_flush_at = time.monotonic() + STATS_FLUSH_DELAY
+        self._reschedule()
+    
     def start(self, session_type: str = "work", discipline: str = None) -> bool:
         """
         Inicia uma sessão Pomodoro
@@ -92,62 +204,161 @@ class PomodoroTimer:
         Returns:
             True se iniciado com sucesso
         """
-        if self.is_running:
-            return False
-        
-        self.current_session_type = session_type
-        self.is_running = True
-        self.is_paused = False
-        self.start_time = time.time()
-        self.elapsed_paused = 0
-        
-        # Cria registro da sessão
-        self.current_session = {
-            "type": session_type,
-            "discipline": discipline,
-            "start_time": datetime.now().isoformat(),
-            "planned_duration": self._get_duration_for_type(session_type),
-            "notes": ""
-        }
+        with self._cond:
+            if self.is_running:
+                return False
+            
+            duration = self._get_duration_for_type(session_type)
+            now = time.monotonic()
+            self.current_session_type = session_type
+            self.is_running = True
+            self.is_paused = False
+            self.start_time = time.time()
+            self.paused_time = None
+            self.elapsed_paused = 0
+            self._started_mono = now
+            self._frozen_at = None
+            self._paused_total = 0.0
+            self._target_duration = float(duration)
+            self._deadline = now + duration
+            
+            # Cria registro da sessão
+            self.current_session = {
+                "type": session_type,
+                "discipline": discipline,
+                "start_time": datetime.now().isoformat(),
+                "planned_duration": duration,
+                "notes": ""
+            }
         
-        # Inicia thread do timer
-        self.timer_thread = threading.Thread(target=self._run_timer)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
+        self._reschedule()
         
         # Chama callback de mudança de fase
         if self.on_phase_change:
-            self.on_phase_change(session_type, self._get_duration_for_type(session_type))
+            self.on_phase_change(session_type, duration)
         
         return True
     
-    def _run_timer(self):
-        """Executa o timer em uma thread separada"""
-        target_duration = self._get_duration_for_type(self.current_session_type)
-        
-        while self.is_running:
-            if not self.is_paused:
-                current_time = time.time()
-                elapsed = current_time - self.start_time - self.elapsed_paused
-                
-                # Chama callback de tick
-                if self.on_tick:
-                    self.on_tick(elapsed, target_duration - elapsed)
-                
-                # Verifica se terminou
-                if elapsed >= target_duration:
-                    self.is_running = False
-                    self._complete_session()
-                    
-                    # Chama callback de conclusão
-                    if self.on_complete:
-                        self.on_complete(self.current_session_type)
-                    
-                    break
-                
-                time.sleep(1)  # Tick a cada segundo
+    def elapsed_seconds(self) -> float:
+        """Tempo efetivo da sessão atual (sem pausas), em segundos"""
+        with self._cond:
+            return self._elapsed_locked(time.monotonic())
+    
+    def remaining_seconds(self) -> float:
+        """Tempo que falta para o fim da sessão atual, em segundos"""
+        with self._cond:
+            if self._started_mono is None:
+                return float(self._get_duration_for_type(self.current_session_type))
+            return max(0.0, self._target_duration - self._elapsed_locked(time.monotonic()))
+    
+    def _elapsed_locked(self, now: float) -> float:
+        if self._started_mono is None:
+            return 0.0
+        reference = self._frozen_at if self._frozen_at is not None else now
+        return max(0.0, reference - self._started_mono - self._paused_total)
+    
+    # ------------------------------------------------------------------
+    # Agendador
+    # ------------------------------------------------------------------
+    def _next_wakeup_locked(self, now: float) -> Optional[float]:
+        """Próximo instante (monotônico) em que há algo a fazer, ou None"""
+        wakeups = []
+        if self.is_running and not self.is_paused and self._deadline is not None:
+            wakeups.append(self._deadline)
+            if self.on_tick:
+                elapsed = self._elapsed_locked(now)
+                wakeups.append(now + (1.0 - elapsed % 1.0))
+        if self._stats_flush_at is not None:
+            wakeups.append(self._stats_flush_at)
+        return min(wakeups, default=None)
+    
+    def _resolve_backend_locked(self) -> bool:
+        """Decide (uma vez) entre QTimer e thread; True para Qt"""
+        if self._use_qt is None:
+            self._use_qt = QCoreApplication is not None and QCoreApplication.instance() is not None
+        if self._use_qt and self._qt_wakeup is None:
+            app = QCoreApplication.instance() if QCoreApplication is not None else None
+            if app is None:
+                self._use_qt = False
             else:
-                time.sleep(0.1)  # Pausa mais curta
+                self._qt_wakeup = _QtWakeup(self._on_wakeup)
+                self._qt_wakeup.moveToThread(app.thread())
+        return bool(self._use_qt)
+    
+    def _reschedule(self):
+        """Reprograma o agendador depois de qualquer mudança de estado"""
+        with self._cond:
+            if self._closed:
+                return
+            if not self._resolve_backend_locked():
+                if self.timer_thread is None or not self.timer_thread.is_alive():
+                    if self._next_wakeup_locked(time.monotonic()) is None:
+                        return  # Ocioso: nem thread é necessária
+                    self.timer_thread = threading.Thread(
+                        target=self._scheduler_loop, name="pomodoro-timer", daemon=True
+                    )
+                    self.timer_thread.start()
+                self._cond.notify_all()
+                return
+            now = time.monotonic()
+            wakeup = self._next_wakeup_locked(now)
+            msec = -1 if wakeup is None else max(0, math.ceil((wakeup - now) * 1000))
+        self._qt_wakeup.rearm.emit(msec)
+    
+    def _scheduler_loop(self):
+        """Thread do agendador: dorme até o próximo prazo ou até ser notificada"""
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    wakeup = self._next_wakeup_locked(now)
+                    if wakeup is not None and wakeup <= now:
+                        break
+                    self._cond.wait(None if wakeup is None else wakeup - now)
+            self._on_wakeup(reschedule=False)
+    
+    def _on_wakeup(self, reschedule: bool = True):
+        """Trata o que venceu: fim da fase, tick e/ou gravação das estatísticas"""
+        completed_type = None
+        tick = None
+        with self._cond:
+            self.scheduler_stats["wakeups"] += 1
+            now = time.monotonic()
+            if self.is_running and not self.is_paused and self._deadline is not None:
+                if now >= self._deadline:
+                    self.is_running = False
+                    self._frozen_at = now
+                    self._deadline = None
+                    completed_type = self.current_session_type
+                elif self.on_tick:
+                    elapsed = self._elapsed_locked(now)
+                    tick = (elapsed, self._target_duration - elapsed)
+            flush = self._stats_flush_at is not None and now >= self._stats_flush_at
+        
+        if completed_type is not None:
+            self._complete_session()
+            
+            # Chama callback de conclusão
+            if self.on_complete:
+                self.on_complete(completed_type)
+        elif tick is not None and self.on_tick:
+            self.on_tick(*tick)
+        
+        if flush:
+            self._save_stats()
+        if reschedule:
+            self._reschedule()
+    
+    def close(self):
+        """Grava o que estiver pendente e encerra o agendador"""
+        self.flush_stats()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._qt_wakeup is not None:
+            self._qt_wakeup.rearm.emit(-1)
     
     def _get_duration_for_type(self, session_type: str) -> int:
         """Obtém duração baseada no tipo de sessão"""
@@ -166,11 +377,14 @@ class PomodoroTimer:
         Returns:
             True se pausado com sucesso
         """
-        if not self.is_running or self.is_paused:
-            return False
-        
-        self.is_paused = True
-        self.paused_time = time.time()
+        with self._cond:
+            if not self.is_running or self.is_paused:
+                return False
+            
+            self.is_paused = True
+            self.paused_time = time.time()
+            self._frozen_at = time.monotonic()
+        self._reschedule()
         return True
     
     def resume(self) -> bool:
@@ -180,16 +394,21 @@ class PomodoroTimer:
         Returns:
             True se retomado com sucesso
         """
-        if not self.is_running or not self.is_paused:
-            return False
-        
-        self.is_paused = False
-        
-        # Calcula tempo pausado
-        if self.paused_time:
-            self.elapsed_paused += time.time() - self.paused_time
-            self.paused_time = None
-        
+        with self._cond:
+            if not self.is_running or not self.is_paused:
+                return False
+            
+            self.is_paused = False
+            
+            # Calcula tempo pausado
+            if self._frozen_at is not None:
+                self._paused_total += time.monotonic() - self._frozen_at
+                self._frozen_at = None
+            if self.paused_time:
+                self.elapsed_paused += time.time() - self.paused_time
+                self.paused_time = None
+            self._deadline = self._started_mono + self._paused_total + self._target_duration
+        self._reschedule()
         return True
     
     def stop(self, save_stats: bool = True) -> Dict:
@@ -202,16 +421,19 @@ class PomodoroTimer:
         Returns:
             Dados da sessão interrompida
         """
-        was_running = self.is_running
-        
-        self.is_running = False
-        self.is_paused = False
+        with self._cond:
+            was_running = self.is_running
+            
+            # Calcula duração real
+            if was_running and self._frozen_at is None:
+                self._frozen_at = time.monotonic()
+            actual_duration = self._elapsed_locked(time.monotonic())
+            self.is_running = False
+            self.is_paused = False
+            self._deadline = None
+        self._reschedule()
         
         if was_running and self.current_session:
-            # Calcula duração real
-            end_time = time.time()
-            actual_duration = end_time - self.start_time - self.elapsed_paused
-            
             self.current_session["end_time"] = datetime.now().isoformat()
             self.current_session["actual_duration"] = actual_duration
             self.current_session["completed"] = actual_duration >= self.current_session["planned_duration"] * 0.9
@@ -228,11 +450,8 @@ class PomodoroTimer:
     def _complete_session(self):
         """Completa uma sessão e atualiza estatísticas"""
         if self.current_session:
-            end_time = time.time()
-            actual_duration = end_time - self.start_time - self.elapsed_paused
-            
             self.current_session["end_time"] = datetime.now().isoformat()
-            self.current_session["actual_duration"] = actual_duration
+            self.current_session["actual_duration"] = self.elapsed_seconds()
             self.current_session["completed"] = True
             
             self._update_stats(self.current_session)
@@ -288,8 +507,8 @@ class PomodoroTimer:
         if len(self.stats["session_history"]) > 100:
             self.stats["session_history"] = self.stats["session_history"][-100:]
         
-        # Salva estatísticas
-        self._save_stats()
+        # Gravação adiada: várias sessões seguidas viram uma escrita
+        self._mark_stats_dirty()
     
     def get_stats(self) -> Dict:
         """
@@ -331,15 +550,14 @@ class PomodoroTimer:
         
         # Sessão atual se estiver rodando
         if self.is_running and self.current_session:
-            current_time = time.time()
-            elapsed = current_time - self.start_time - self.elapsed_paused
-            remaining = self._get_duration_for_type(self.current_session_type) - elapsed
+            elapsed = self.elapsed_seconds()
+            remaining = self.remaining_seconds()
             
             stats["current_session"] = {
                 "type": self.current_session_type,
                 "elapsed": self._format_time(elapsed),
                 "remaining": self._format_time(remaining),
-                "progress": (elapsed / self._get_duration_for_type(self.current_session_type)) * 100
+                "progress": (elapsed / max(self._target_duration, 1)) * 100
             }
         
         return stats
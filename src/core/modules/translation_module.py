@@ -2,10 +2,301 @@
 """
 Módulo de tradução para termos filosóficos
 """
-from typing import Dict, List, Optional
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 import json
+import os
+import re
+import threading
+import time
+import unicodedata
 from pathlib import Path
 
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+# Termos curtos ("a", "de") casam só por inteiro; os demais também por prefixo
+_MIN_PREFIX_LENGTH = 3
+# Ocorrência empacotada: id da nota nos 32 bits altos, linha nos baixos
+_LINE_MASK = 0xFFFFFFFF
+# Ocorrências de notas antigas toleradas antes de compactar os arrays
+_COMPACT_MIN_DEAD = 200_000
+
+
+# Blocos de diacríticos combinantes (acentos latinos, espíritos e acentos gregos)
+_COMBINING_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+
+
+def normalize_term(text: str) -> str:
+    """Normaliza para busca: sem maiúsculas e sem acentos/espíritos (λόγος -> λογος)"""
+    if text.isascii():
+        return text.lower()
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text.casefold()))
+
+
+class _IndexedNote:
+    """Estado indexado de uma nota: identidade no disco e início de cada linha"""
+
+    __slots__ = ("note_id", "mtime_ns", "size", "postings", "line_offsets")
+
+    def __init__(self, note_id: int, mtime_ns: int, size: int, postings: int, line_offsets: array):
+        self.note_id = note_id
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.postings = postings
+        self.line_offsets = line_offsets
+
+
+class VaultTermIndex:
+    """
+    Índice de ocorrências de termos no vault (token normalizado -> nota, linha)
+
+    Cada token aponta para um ``array`` de pares (id da nota, linha)
+    empacotados em 64 bits, sem um objeto Python por ocorrência. Cada nota
+    guarda só os offsets em bytes do início das linhas; o contexto de uma
+    ocorrência é lido do arquivo a partir deles. Notas novas, alteradas
+    (mtime/tamanho) ou removidas são reindexadas na consulta; ocorrências
+    de versões antigas são descartadas na leitura e compactadas em lote.
+    """
+
+    def __init__(self, vault_path: str, refresh_interval: float = 2.0):
+        """
+        Args:
+            vault_path: Caminho para o vault do Obsidian
+            refresh_interval: Intervalo mínimo (s) entre varreduras de mtime
+        """
+        self.vault_path = Path(vault_path).expanduser()
+        self.refresh_interval = refresh_interval
+        self._notes: Dict[str, _IndexedNote] = {}
+        self._live_ids: Dict[int, str] = {}
+        self._next_note_id = 0
+        self._postings: Dict[str, array] = {}
+        self._live_postings = 0
+        self._dead_postings = 0
+        self._vocabulary: Optional[List[str]] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self.stats = {"notes_indexed": 0, "refreshes": 0, "compactions": 0}
+
+    def refresh(self, force: bool = False) -> None:
+        """Reindexa notas alteradas desde a última varredura"""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._refreshed_at is not None
+                and now - self._refreshed_at < self.refresh_interval
+            ):
+                return
+            self._refreshed_at = now
+            self.stats["refreshes"] += 1
+
+            seen = set()
+            for rel_path, full_path, stat in self._walk_notes():
+                seen.add(rel_path)
+                indexed = self._notes.get(rel_path)
+                if indexed and indexed.mtime_ns == stat.st_mtime_ns and indexed.size == stat.st_size:
+                    continue
+                self._index_note(rel_path, full_path, stat)
+
+            for rel_path in [path for path in self._notes if path not in seen]:
+                self._drop_note(rel_path)
+
+            if self._dead_postings > max(_COMPACT_MIN_DEAD, self._live_postings):
+                self._compact()
+
+    def _walk_notes(self):
+        for root, _dirs, files in os.walk(self.vault_path):
+            for name in files:
+                if not name.endswith(".md"):
+                    continue
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                rel_path = Path(full_path).relative_to(self.vault_path).as_posix()
+                yield rel_path, full_path, stat
+
+    def _index_note(self, rel_path: str, full_path: str, stat: os.stat_result) -> None:
+        self._drop_note(rel_path)
+        try:
+            with open(full_path, "rb") as handle:
+                raw = handle.read()
+        except OSError:
+            return
+
+        line_offsets = array("Q")
+        offset = 0
+        for raw_line in raw.split(b"\n"):
+            line_offsets.append(offset)
+            offset += len(raw_line) + 1
+        line_offsets.append(offset)
+
+        # A normalização não cria nem remove quebras: as linhas seguem alinhadas
+        note_postings: Dict[str, List[int]] = {}
+        normalized = normalize_term(raw.decode("utf-8", errors="ignore"))
+        for line_number, line in enumerate(normalized.split("\n")):
+            for token in set(_TOKEN_PATTERN.findall(line)):
+                postings = note_postings.get(token)
+                if postings is None:
+                    note_postings[token] = [line_number]
+                else:
+                    postings.append(line_number)
+
+        note_id = self._next_note_id
+        self._next_note_id += 1
+        base = note_id << 32
+        count = 0
+        for token, lines in note_postings.items():
+            packed = [base | line_number for line_number in lines]
+            count += len(packed)
+            entries = self._postings.get(token)
+            if entries is None:
+                self._postings[token] = array("Q", packed)
+            else:
+                entries.extend(packed)
+
+        self._notes[rel_path] = _IndexedNote(note_id, stat.st_mtime_ns, stat.st_size, count, line_offsets)
+        self._live_ids[note_id] = rel_path
+        self._live_postings += count
+        self._vocabulary = None
+        self.stats["notes_indexed"] += 1
+
+    def _drop_note(self, rel_path: str) -> None:
+        indexed = self._notes.pop(rel_path, None)
+        if indexed is None:
+            return
+        # As ocorrências ficam nos arrays até a compactação; sem id vivo, são ignoradas
+        del self._live_ids[indexed.note_id]
+        self._live_postings -= indexed.postings
+        self._dead_postings += indexed.postings
+
+    def _compact(self) -> None:
+        live_ids = self._live_ids
+        for token in list(self._postings):
+            kept = array("Q", [entry for entry in self._postings[token] if (entry >> 32) in live_ids])
+            if kept:
+                self._postings[token] = kept
+            else:
+                del self._postings[token]
+        self._dead_postings = 0
+        self._vocabulary = None
+        self.stats["compactions"] += 1
+
+    def _matching_tokens(self, query_token: str) -> List[str]:
+        if len(query_token) < _MIN_PREFIX_LENGTH:
+            return [query_token] if query_token in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        matches = []
+        position = bisect_left(vocabulary, query_token)
+        while position < len(vocabulary) and vocabulary[position].startswith(query_token):
+            matches.append(vocabulary[position])
+            position += 1
+        return matches
+
+    def _candidate_lines(self, query_token: str) -> Dict[str, set]:
+        live_ids = self._live_ids
+        lines: Dict[str, set] = {}
+        for token in self._matching_tokens(query_token):
+            for entry in self._postings[token]:
+                rel_path = live_ids.get(entry >> 32)
+                if rel_path is None:
+                    continue
+                note_lines = lines.get(rel_path)
+                if note_lines is None:
+                    lines[rel_path] = {entry & _LINE_MASK}
+                else:
+                    note_lines.add(entry & _LINE_MASK)
+        return lines
+
+    def find(self, term: str, context_lines: int = 2, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Procura um termo ignorando maiúsculas e acentos
+
+        Args:
+            term: Termo (uma ou mais palavras)
+            context_lines: Linhas de contexto antes e depois da ocorrência
+            limit: Máximo de ocorrências retornadas
+
+        Returns:
+            Ocorrências com arquivo, linha (1-based) e contexto
+        """
+        normalized = normalize_term(term).strip()
+        query_tokens = _TOKEN_PATTERN.findall(normalized)
+        if not query_tokens:
+            return []
+
+        self.refresh()
+        with self._lock:
+            # Todas as palavras do termo precisam aparecer na mesma linha
+            candidates: Optional[Dict[str, set]] = None
+            for query_token in sorted(set(query_tokens), key=len, reverse=True):
+                token_lines = self._candidate_lines(query_token)
+                if candidates is None:
+                    candidates = token_lines
+                else:
+                    candidates = {
+                        rel_path: lines & token_lines[rel_path]
+                        for rel_path, lines in candidates.items()
+                        if rel_path in token_lines
+                    }
+                if not candidates:
+                    return []
+            located = [
+                (rel_path, self._notes[rel_path].line_offsets, sorted(lines))
+                for rel_path, lines in sorted(candidates.items())
+                if lines
+            ]
+
+        results = []
+        for rel_path, line_offsets, line_numbers in located:
+            snippets = self._read_snippets(rel_path, line_offsets, line_numbers, context_lines)
+            for line_number, line, context in snippets:
+                # Confirma a expressão inteira (ordem e vizinhança das palavras)
+                if normalized not in normalize_term(line):
+                    continue
+                results.append({"arquivo": rel_path, "contexto": context, "linha": line_number + 1})
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    def _read_snippets(
+        self, rel_path: str, line_offsets: array, line_numbers: List[int], context_lines: int
+    ) -> List[Tuple[int, str, str]]:
+        total_lines = len(line_offsets) - 1
+        snippets = []
+        try:
+            with open(self.vault_path / rel_path, "rb") as handle:
+                for line_number in line_numbers:
+                    start = max(0, line_number - context_lines)
+                    end = min(total_lines, line_number + context_lines + 1)
+                    handle.seek(line_offsets[start])
+                    raw = handle.read(max(0, line_offsets[end] - 1 - line_offsets[start]))
+                    lines = raw.decode("utf-8", errors="ignore").split("\n")
+                    line = lines[line_number - start] if line_number - start < len(lines) else ""
+                    snippets.append((line_number, line, "\n".join(lines)))
+        except OSError:
+            return []
+        return snippets
+
+
+_TERM_INDEXES: Dict[str, VaultTermIndex] = {}
+_TERM_INDEXES_LOCK = threading.Lock()
+
+
+def get_vault_term_index(vault_path: str) -> VaultTermIndex:
+    """Índice compartilhado por vault (construído uma vez por processo)"""
+    key = str(Path(vault_path).expanduser())
+    with _TERM_INDEXES_LOCK:
+        index = _TERM_INDEXES.get(key)
+        if index is None:
+            index = VaultTermIndex(key)
+            _TERM_INDEXES[key] = index
+        return index
+
+
 class TranslationAssistant:
     """Assistente de tradução para termos filosóficos"""
     
@@ -18,6 +309,7 @@ class TranslationAssistant:
         """
         self.vault_path = Path(vault_path).expanduser()
         self.glossary_file = self.vault_path / "06-RECURSOS" / "glossario_filosofico.json"
+        self.term_index = get_vault_term_index(str(self.vault_path))
         
         # Carrega glossário
         self.glossary = self._load_glossary()
@@ -141,28 +433,8 @@ class TranslationAssistant:
         }
         
         try:
-            # Procura por menções ao termo
-            for md_file in self.vault_path.glob("**/*.md"):
-                try:
-                    content = md_file.read_text(encoding='utf-8', errors='ignore')
-                    
-                    if term.lower() in content.lower():
-                        # Extrai contexto
-                        import re
-                        lines = content.split('\n')
-                        for i, line in enumerate(lines):
-                            if term.lower() in line.lower():
-                                context_start = max(0, i - 2)
-                                context_end = min(len(lines), i + 3)
-                                context = '\n'.join(lines[context_start:context_end])
-                                
-                                result["notas_encontradas"].append({
-                                    "arquivo": md_file.relative_to(self.vault_path).as_posix(),
-                                    "contexto": context,
-                                    "linha": i + 1
-                                })
-                except:
-                    continue
+            # Procura por menções ao termo no índice do vault
+            result["notas_encontradas"] = self.term_index.find(term)
             
             # Se encontrou notas, tenta inferir tradução
             if result["notas_encontradas"]:
@@ -171,7 +443,6 @@ class TranslationAssistant:
                     context = note["contexto"]
                     
                     # Procura por padrões como "termo (tradução)"
-                    import re
                     pattern = rf'{re.escape(term)}\s*\(([^)]+)\)'
                     match = re.search(pattern, context, re.IGNORECASE)
                     
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib.util
+import json
 import sys
 import types
 import uuid
@@ -262,3 +263,134 @@ def test_auto_complete_past_events_marks_event_completed_and_hides_it_from_day_v
     reloaded_manager = agenda_manager_cls(str(tmp_path))
     assert reloaded_manager.events[completed_event_id].completed is True
     assert reloaded_manager.events[remaining_event_id].completed is False
+
+
+def test_day_index_follows_direct_event_mutations(tmp_path: Path):
+    agenda_manager_cls = _load_agenda_manager_class()
+    manager = agenda_manager_cls(str(tmp_path))
+
+    late_id = manager.add_event(
+        title="Leitura noturna",
+        start="2099-05-10 20:00",
+        end="2099-05-10 21:00",
+        event_type="leitura",
+    )
+    early_id = manager.add_event(
+        title="Aula da manhã",
+        start="2099-05-10 08:00",
+        end="2099-05-10 10:00",
+        event_type="aula",
+    )
+    assert [event.id for event in manager.get_day_events("2099-05-10")] == [early_id, late_id]
+
+    # Mudanças feitas direto no evento (como no rebalanceamento) reindexam
+    moved = manager.events[late_id]
+    moved.start = datetime(2099, 5, 11, 9, 0)
+    moved.end = datetime(2099, 5, 11, 10, 0)
+    assert [event.id for event in manager.get_day_events("2099-05-10")] == [early_id]
+    assert [event.id for event in manager.get_day_events("2099-05-11")] == [late_id]
+
+    overlapping = manager.events.overlapping(datetime(2099, 5, 10, 9, 30), datetime(2099, 5, 11, 9, 30))
+    assert [event.id for event in overlapping] == [early_id, late_id]
+
+    # Remoção pelo dicionário (UI/integrações) também sai do índice
+    del manager.events[early_id]
+    assert manager.get_day_events("2099-05-10") == []
+    manager.events.pop(late_id)
+    assert manager.events.overlapping(datetime(2099, 5, 10), datetime(2099, 5, 12)) == []
+
+
+def test_free_slots_account_for_events_crossing_midnight(tmp_path: Path):
+    agenda_manager_cls = _load_agenda_manager_class()
+    manager = agenda_manager_cls(str(tmp_path))
+
+    manager.add_event(
+        title="Plantão",
+        start="2099-05-10 22:00",
+        end="2099-05-11 11:00",
+        event_type="casual",
+    )
+
+    slots = manager.find_free_slots("2099-05-11", 30, start_hour=8, consider_preferences=False)
+
+    assert slots
+    assert all(slot["start"] >= "2099-05-11 11:00" for slot in slots)
+
+
+def test_agenda_persists_incrementally_and_survives_torn_journal(tmp_path: Path):
+    agenda_manager_cls = _load_agenda_manager_class()
+    manager = agenda_manager_cls(str(tmp_path))
+    store = manager.agenda_store
+    snapshot_before = store.snapshot_path.read_text(encoding="utf-8") if store.snapshot_path.exists() else ""
+
+    with manager.batch_updates():
+        first_id = manager.add_event("Leitura A", "2099-06-01 09:00", "2099-06-01 10:00", event_type="leitura")
+        second_id = manager.add_event("Leitura B", "2099-06-01 11:00", "2099-06-01 12:00", event_type="leitura")
+        # Nada é gravado enquanto o lote está aberto
+        assert not store.journal_path.exists() or first_id not in store.journal_path.read_text(encoding="utf-8")
+
+    journal_lines = store.journal_path.read_text(encoding="utf-8").splitlines()
+    assert {first_id, second_id} <= {line.split('"id": "', 1)[1].split('"', 1)[0] for line in journal_lines}
+    # Só o diário cresce; o snapshot não é reescrito a cada mutação
+    current_snapshot = store.snapshot_path.read_text(encoding="utf-8") if store.snapshot_path.exists() else ""
+    assert current_snapshot == snapshot_before
+
+    manager.events[first_id].title = "Leitura A (revista)"
+    manager._save_events()
+    del manager.events[second_id]
+    manager._save_events()
+    manager._save_events()
+    assert store.get_stats()["skipped_saves"] >= 1
+
+    # Queda no meio de uma escrita deixa uma linha truncada no fim do diário
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "id": "quebrado", "ev')
+
+    reloaded = agenda_manager_cls(str(tmp_path))
+    assert reloaded.events[first_id].title == "Leitura A (revista)"
+    assert second_id not in reloaded.events
+    assert "quebrado" not in reloaded.events
+
+    # O primeiro salvamento após a queda compacta em um snapshot atômico,
+    # então os registros seguintes não são anexados à linha truncada
+    assert reloaded.agenda_store.get_stats()["compactions"] == 1
+    reloaded.add_event("Leitura C", "2099-06-02 09:00", "2099-06-02 10:00", event_type="leitura")
+    for line in reloaded.agenda_store.journal_path.read_text(encoding="utf-8").splitlines():
+        assert json.loads(line)["op"] in {"put", "del"}
+    again = agenda_manager_cls(str(tmp_path))
+    assert again.events[first_id].title == "Leitura A (revista)"
+    assert len(again.events) == len(reloaded.events)
+
+
+def test_save_serializes_only_events_marked_dirty(tmp_path: Path):
+    agenda_manager_cls = _load_agenda_manager_class()
+    manager = agenda_manager_cls(str(tmp_path))
+    with manager.batch_updates():
+        ids = [
+            manager.add_event(f"Leitura {hour}", f"2099-07-01 {hour:02d}:00", f"2099-07-01 {hour:02d}:30", event_type="leitura")
+            for hour in range(8, 18)
+        ]
+
+    event_cls = type(manager.events[ids[0]])
+    serialized: list[str] = []
+    original_to_dict = event_cls.to_dict
+
+    def _tracking(self):
+        serialized.append(self.id)
+        return original_to_dict(self)
+
+    event_cls.to_dict = _tracking
+    try:
+        manager.events[ids[3]].title = "Leitura revista"
+        manager.events[ids[5]].metadata["notes"] = "capítulo 2"
+        manager.events.mark_dirty(ids[5])
+        del manager.events[ids[7]]
+        manager._save_events()
+    finally:
+        event_cls.to_dict = original_to_dict
+
+    assert sorted(serialized) == sorted([ids[3], ids[5]])
+    reloaded = agenda_manager_cls(str(tmp_path))
+    assert reloaded.events[ids[3]].title == "Leitura revista"
+    assert reloaded.events[ids[5]].metadata["notes"] == "capítulo 2"
+    assert ids[7] not in reloaded.events
@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from ui.utils.citation_notes import BACKFILL_MANIFEST_NAME, backfill_citation_notes
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _book(vault_root: Path, author: str, title: str) -> Path:
+    note = vault_root / "01-LEITURAS" / author / title / f"📖 {title}.md"
+    _write(note, f"---\ntitle: {title}\nauthor: {author}\ntype: book\n---\n\n# {title}\n")
+    return note.parent
+
+
+def _bump_mtime(path: Path, seconds: int = 5) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_backfill_only_reprocesses_changed_books(tmp_path: Path):
+    vault_root = tmp_path
+    first = _book(vault_root, "Aristóteles", "Ética")
+    _book(vault_root, "Platão", "República")
+
+    progress: list[tuple[int, int, str]] = []
+    initial = backfill_citation_notes(vault_root, progress_callback=lambda *args: progress.append(args))
+
+    assert initial["processed_books"] == 2 and initial["created_notes"] == 2
+    assert [item[:2] for item in progress] == [(1, 2), (2, 2)]
+    assert (vault_root / "06-RECURSOS" / BACKFILL_MANIFEST_NAME).exists()
+    assert (first / "Citações" / "Citações Ética.md").exists()
+
+    repeat = backfill_citation_notes(vault_root)
+    assert repeat["processed_books"] == 0 and repeat["skipped_books"] == 2
+
+    (first / "Citações" / "Citações Ética.md").unlink()
+    _bump_mtime(first / "Citações")
+    changed = backfill_citation_notes(vault_root)
+    assert changed["processed_books"] == 1 and changed["created_notes"] == 1
+    assert changed["skipped_books"] == 1
+
+
+def test_backfill_stops_when_progress_callback_declines(tmp_path: Path):
+    vault_root = tmp_path
+    _book(vault_root, "Aristóteles", "Ética")
+    _book(vault_root, "Platão", "República")
+
+    stopped = backfill_citation_notes(vault_root, progress_callback=lambda done, total, name: False)
+    assert stopped["interrupted"] and stopped["processed_books"] == 1
+
+    resumed = backfill_citation_notes(vault_root)
+    assert resumed["processed_books"] == 1 and resumed["created_notes"] == 1
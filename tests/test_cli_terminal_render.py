@@ -0,0 +1,128 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    from src.cli.interactive import terminal as terminal_module
+    from src.cli.interactive.terminal import GLTerminal
+except Exception:
+    GLTerminal = None
+
+
+pytestmark = pytest.mark.skipif(GLTerminal is None, reason="dependências da CLI ausentes")
+
+
+@pytest.fixture()
+def term(capsys):
+    terminal = GLTerminal(use_blessed=False)
+    terminal.width, terminal.height = 300, 80
+    terminal.max_fps = 0
+    capsys.readouterr()
+    return terminal
+
+
+def _draw_menu(terminal, selected):
+    terminal.clear()
+    terminal.print_at(0, 0, "GLaDOS Planner", {"color": "accent", "bold": True})
+    for y in range(1, 79):
+        style = {"color": "accent", "reverse": True} if y == selected else {"color": "info"}
+        terminal.print_at(0, y, f"item {y} " * 30, style)
+    terminal.flush()
+
+
+def test_only_changed_rows_are_rewritten_in_one_write(term, capsys, monkeypatch):
+    _draw_menu(term, selected=3)
+    capsys.readouterr()
+
+    writes = []
+    real_write = sys.stdout.write
+    monkeypatch.setattr(sys.stdout, "write", lambda data: writes.append(data) or real_write(data))
+    _draw_menu(term, selected=4)
+    output = capsys.readouterr().out
+
+    assert len(writes) == 1
+    # Só as linhas 3 e 4 (1-based: 4 e 5) mudaram de estilo
+    assert "\033[4;1H" in output and "\033[5;1H" in output and "\033[6;1H" not in output
+    assert term.get_stats()["rows_last_frame"] == 2
+
+    _draw_menu(term, selected=4)
+    assert capsys.readouterr().out == ""
+    assert term.get_stats()["frames_skipped"] == 1
+
+
+def test_rows_left_empty_by_new_frame_are_erased(term, capsys):
+    _draw_menu(term, selected=3)
+    term.clear()
+    term.print_at(10, 0, "Check-in")
+    capsys.readouterr()
+    term.flush()
+    output = capsys.readouterr().out
+
+    assert output.startswith("\033[1;1H")
+    assert output.count("\033[K") == 78
+    assert "Check-in" in output and "item" not in output
+
+
+def test_styled_text_occupies_its_visible_width(term, capsys):
+    term.print_at(0, 0, "ab", {"color": "error"})
+    term.print_at(2, 0, "cd")
+    term.print_at(298, 1, "cortado")
+    term.flush()
+
+    assert "".join(term._current_chars[0][:4]) == "abcd"
+    assert "".join(term._current_chars[1][298:]) == "co"
+    assert term._apply_style("ab", {"color": "error"}) == "\033[31;1mab\033[0m"
+
+
+def test_frame_rate_cap_waits_for_next_frame_slot(term, capsys, monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(terminal_module.time, "perf_counter", lambda: clock[0])
+    monkeypatch.setattr(terminal_module.time, "sleep", lambda seconds: sleeps.append(seconds))
+    term.max_fps = 50
+
+    term.print_at(0, 0, "um")
+    term.flush()
+    clock[0] += 0.005
+    term.print_at(0, 0, "dois")
+    term.flush()
+    term.print_at(0, 0, "três")
+    term.flush(force=True)
+
+    assert sleeps == [pytest.approx(0.015)]
+    assert term.get_stats()["frames_throttled"] == 1
+
+
+def test_frame_rate_cap_sleeps_without_holding_the_lock(term, capsys, monkeypatch):
+    import threading
+
+    acquired = []
+
+    def sleep(_seconds):
+        # Outra thread (ex.: write/resize) consegue o lock durante a espera
+        def probe():
+            got = term._lock.acquire(blocking=False)
+            acquired.append(got)
+            if got:
+                term._lock.release()
+
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+
+    monkeypatch.setattr(terminal_module.time, "sleep", sleep)
+    term.max_fps = 1
+
+    term.print_at(0, 0, "um")
+    term.flush()
+    term.print_at(0, 0, "dois")
+    term.flush()
+
+    assert acquired == [True]
+    assert "dois" in capsys.readouterr().out
+
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6 import sip
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+from ui.utils.cover_thumbnails import CoverThumbnailLoader, CoverThumbnailStore
+
+
+@pytest.fixture(scope="module")
+def app():
+    # QApplication (não só QGuiApplication): o teste da LibraryView cria widgets
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def _cover(path: Path, width: int = 1200, height: int = 1800) -> Path:
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor("#336699"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Formato deduzido da extensão (capa.png é PNG de verdade)
+    assert image.save(str(path))
+    return path
+
+
+def test_store_caches_prescaled_thumbnail_by_cover_identity(app, tmp_path: Path, monkeypatch):
+    cover = _cover(tmp_path / "livro" / "cover.jpg")
+    store = CoverThumbnailStore(cache_dir=tmp_path / "thumbs")
+
+    thumbnail = store.thumbnail(cover)
+    assert (thumbnail.width(), thumbnail.height()) == (170, 230)
+    assert len(list((tmp_path / "thumbs").glob("*.png"))) == 1
+
+    # Segunda leitura vem do disco, sem decodificar a capa original
+    monkeypatch.setattr(store, "_scaled_cover", lambda path: pytest.fail("capa decodificada de novo"))
+    assert store.thumbnail(cover).size() == thumbnail.size()
+
+    old_key = store.key_for(cover)
+    stat = cover.stat()
+    os.utime(cover, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert store.key_for(cover) != old_key
+
+
+def test_loader_delivers_thumbnails_and_generates_missing_covers(app, tmp_path: Path):
+    with_cover = tmp_path / "Autor" / "Com capa"
+    _cover(with_cover / "capa.png", 400, 600)
+    without_cover = tmp_path / "Autor" / "Sem capa"
+    without_cover.mkdir(parents=True)
+
+    loader = CoverThumbnailLoader(CoverThumbnailStore(cache_dir=tmp_path / "thumbs"))
+    delivered = {}
+    loader.thumbnail_ready.connect(lambda key, image: delivered.__setitem__(key, image))
+
+    assert loader.request("a", with_cover, "Com capa")
+    assert not loader.request("a", with_cover, "Com capa")
+    loader.request("b", without_cover, "Sem capa")
+
+    deadline = time.monotonic() + 10
+    while len(delivered) < 2 and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+    assert {key: image.size().width() for key, image in delivered.items()} == {"a": 170, "b": 170}
+    assert (without_cover / "cover.png").exists()
+    assert not loader.is_pending("a")
+    loader.shutdown()
+
+
+def test_library_view_shuts_the_cover_pool_down_when_destroyed(app, monkeypatch):
+    from ui.views.library import LibraryView
+
+    stopped = []
+    original = CoverThumbnailLoader.shutdown
+
+    def recording_shutdown(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        stopped.append(self)
+
+    monkeypatch.setattr(CoverThumbnailLoader, "shutdown", recording_shutdown)
+    view = LibraryView()
+    loader = view.cover_loader
+    sip.delete(view)
+
+    assert stopped == [loader]
+    assert loader.pool.activeThreadCount() == 0
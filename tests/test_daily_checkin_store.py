@@ -0,0 +1,96 @@
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.modules.daily_checkin import CheckinData, DailyCheckinSystem
+
+
+def _day(offset: int) -> str:
+    return (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def _checkin(checkin_id: str, offset: int, mood: float, productivity: float = 5.0) -> dict:
+    return CheckinData(
+        id=checkin_id,
+        date=_day(offset),
+        time="08:00",
+        mood_score=mood,
+        energy_level=3.0,
+        focus_score=3.0,
+        achievements=["leitura"],
+        productivity_score=productivity,
+    ).to_dict()
+
+
+def test_legacy_json_is_migrated_and_new_checkins_are_appended(tmp_path: Path):
+    legacy = tmp_path / "06-RECURSOS" / "daily_checkins.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps({
+        "a": _checkin("a", 1, 4.0),
+        "b": _checkin("b", 400, 1.0),
+    }), encoding="utf-8")
+
+    system = DailyCheckinSystem(str(tmp_path))
+    log = legacy.with_suffix(".jsonl")
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 2
+
+    system.evening_checkin(mood_score=5.0, achievements=["capítulo"])
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3 and json.loads(lines[-1])["mood_score"] == 5.0
+
+    # Nova instância lê o log, não o JSON antigo
+    reloaded = DailyCheckinSystem(str(tmp_path))
+    assert len(reloaded.checkins) == 3
+    assert [item["date"] for item in reloaded.get_recent_checkins(7)] == [_day(0), _day(1)]
+
+
+def test_trends_and_weekly_summary_come_from_date_aggregates(tmp_path: Path):
+    log = tmp_path / "06-RECURSOS" / "daily_checkins.jsonl"
+    log.parent.mkdir(parents=True)
+    entries = [_checkin("hoje", 0, 5.0, 8.0), _checkin("ontem", 1, 3.0, 6.0), _checkin("antigo", 200, 1.0, 1.0)]
+    log.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+
+    system = DailyCheckinSystem(str(tmp_path))
+    trends = system.get_trends(30)
+    assert trends["total_checkins_analyzed"] == 2
+    assert trends["averages"] == {"mood": 4.0, "energy": 3.0, "productivity": 7.0}
+    assert system.get_trends(365)["total_checkins_analyzed"] == 3
+
+    weeks = system.get_weekly_summary(2)
+    assert sum(week["checkins"] for week in weeks) == 2
+    assert weeks[0]["week_start"] <= _day(0)
+
+
+def test_streaks_follow_consecutive_days_including_backfill(tmp_path: Path):
+    log = tmp_path / "06-RECURSOS" / "daily_checkins.jsonl"
+    log.parent.mkdir(parents=True)
+    entries = [_checkin("d3", 3, 3.0), _checkin("d1", 1, 3.0)]
+    log.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+
+    system = DailyCheckinSystem(str(tmp_path))
+    assert system.get_streaks() == {"current": 1, "longest": 1}
+
+    system.morning_routine()
+    assert system.get_streaks() == {"current": 2, "longest": 2}
+
+    # Dia que faltava une as duas sequências
+    system._append_checkin(CheckinData.from_dict(_checkin("d2", 2, 3.0)))
+    assert system.get_streaks() == {"current": 4, "longest": 4}
+    assert [c.id for c in system.get_checkins_for_date(_day(2))] == ["d2"]
+
+
+def test_interrupted_last_line_is_skipped_and_log_compacted(tmp_path: Path):
+    log = tmp_path / "06-RECURSOS" / "daily_checkins.jsonl"
+    log.parent.mkdir(parents=True)
+    log.write_text(json.dumps(_checkin("ok", 0, 4.0)) + "\n" + '{"id": "cortad', encoding="utf-8")
+
+    system = DailyCheckinSystem(str(tmp_path))
+    assert list(system.checkins) == ["ok"]
+    assert log.read_text(encoding="utf-8").endswith("\n")
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 1
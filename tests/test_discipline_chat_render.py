@@ -0,0 +1,103 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from ui.views.discipline_chat import DisciplineChatView
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture
+def view(app, monkeypatch):
+    view = DisciplineChatView()
+    view._conversation_messages = {
+        "Ética": [("user" if i % 2 else "assistant", f"mensagem {i}") for i in range(150)],
+        "Lógica": [("assistant", "Olá")],
+    }
+    view._set_conversation_entries([{"name": "Ética"}, {"name": "Lógica"}], preferred_chat="Ética")
+    assert view._current_conversation == "Ética"
+
+    # Conta quantas linhas são montadas a partir daqui
+    inserted = []
+    original = view._insert_message_row
+
+    def counting_insert(**kwargs):
+        inserted.append(kwargs["role"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(view, "_insert_message_row", counting_insert)
+    view.inserted = inserted
+    yield view
+    view._stop_typing_animation()
+    view.deleteLater()
+
+
+def _select(view, name):
+    items = view.sidebar_list.findItems(name, Qt.MatchFlag.MatchExactly)
+    view.sidebar_list.setCurrentItem(items[0])
+    assert view._current_conversation == name
+
+
+def _containers(view):
+    return [container for _entry, container, _bubble in view._rendered_rows]
+
+
+def test_typing_ticks_only_update_the_transient_bubble(view):
+    history_rows = _containers(view)
+
+    view._start_typing_animation(conversation="Ética", text="resposta longa " * 20)
+    bubble = view._transient_bubble
+    for _ in range(10):
+        view._tick_typing_animation()
+
+    assert view.inserted == ["assistant_typing"]
+    assert view._transient_bubble is bubble
+    assert _containers(view) == history_rows
+    assert view._typing_visible_chars > 0
+
+
+def test_appending_a_message_mounts_a_single_row(view):
+    history_rows = _containers(view)
+
+    view._append_history_message("Ética", "user", "nova pergunta")
+    view._render_messages()
+
+    assert view.inserted == ["user"]
+    assert _containers(view)[:-1] == history_rows
+    assert len(view._rendered_rows) == DisciplineChatView.MESSAGE_PAGE_SIZE + 1
+
+
+def test_switching_conversation_rebuilds_only_the_last_page(view):
+    page = DisciplineChatView.MESSAGE_PAGE_SIZE
+    history = view._conversation_messages["Ética"]
+
+    view._current_conversation = "Lógica"
+    view._render_messages()
+    view._set_conversation_entries([{"name": "Ética"}, {"name": "Lógica"}], preferred_chat="Ética")
+    assert view._current_conversation == "Ética"
+
+    assert len(view.inserted) == 1 + page
+    assert view._rendered_history_start == len(history) - page
+    assert [entry for entry, _container, _bubble in view._rendered_rows] == history[-page:]
+
+    # Página anterior entra no topo, na ordem do histórico
+    assert view._load_older_messages()
+    assert len(view.inserted) == 1 + 2 * page
+    assert [entry for entry, _container, _bubble in view._rendered_rows] == history[-2 * page :]
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.modules import LaTex
+
+
+def _fake_tools(monkeypatch, tmp_path: Path, available: set[str]) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    for name in available:
+        (bin_dir / name).write_text("#!/bin/sh\n", encoding="utf-8")
+    monkeypatch.setattr(
+        LaTex.shutil,
+        "which",
+        lambda name: str(bin_dir / name) if name in available else None,
+    )
+    return bin_dir
+
+
+def test_pandoc_output_is_cached_by_markdown_content(monkeypatch, tmp_path: Path):
+    _fake_tools(monkeypatch, tmp_path, {"pandoc"})
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        text = Path(command[1]).read_text(encoding="utf-8")
+        return subprocess.CompletedProcess(command, 0, stdout=f"% {text}".encode("utf-8"), stderr=b"")
+
+    monkeypatch.setattr(LaTex.subprocess, "run", fake_run)
+    note = tmp_path / "vault" / "cap1.md"
+    note.parent.mkdir()
+    note.write_text("# Capítulo\n\nPrimeiro parágrafo.", encoding="utf-8")
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    cache_dir = build_dir / ".pandoc-cache"
+
+    first = LaTex.md_to_latex(str(note), output_dir=build_dir, vault_root=note.parent, cache_dir=cache_dir)
+    again = LaTex.md_to_latex(str(note), output_dir=build_dir, vault_root=note.parent, cache_dir=cache_dir)
+    assert first == again and len(calls) == 1
+
+    note.write_text("# Capítulo\n\nParágrafo revisado.", encoding="utf-8")
+    edited = LaTex.md_to_latex(str(note), output_dir=build_dir, vault_root=note.parent, cache_dir=cache_dir)
+    assert "revisado" in edited and len(calls) == 2
+
+
+def test_images_keep_their_names_and_are_copied_only_when_changed(monkeypatch, tmp_path: Path):
+    vault = tmp_path / "vault"
+    (vault / "a").mkdir(parents=True)
+    (vault / "b").mkdir()
+    (vault / "a" / "fig.png").write_bytes(b"figura A")
+    (vault / "b" / "fig.png").write_bytes(b"figura B")
+    markdown = "![A](a/fig.png)\n\n![B](b/fig.png)"
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+
+    first = LaTex._copy_images_and_rewrite_md(markdown, vault, build_dir).read_text(encoding="utf-8")
+    assert "images/fig.png" in first and "images/fig_1.png" in first
+
+    copies = []
+    real_copy = LaTex.shutil.copy2
+    monkeypatch.setattr(LaTex.shutil, "copy2", lambda src, dest: copies.append(Path(src).parent.name) or real_copy(src, dest))
+    second = LaTex._copy_images_and_rewrite_md(markdown, vault, build_dir).read_text(encoding="utf-8")
+    assert second == first and copies == []
+
+    (vault / "b" / "fig.png").write_bytes(b"figura B editada")
+    third = LaTex._copy_images_and_rewrite_md(markdown, vault, build_dir).read_text(encoding="utf-8")
+    assert third == first and copies == ["b"]
+    assert (build_dir / "images" / "fig_1.png").read_bytes() == b"figura B editada"
+
+
+def test_pdflatex_format_is_checked_once_per_installation(monkeypatch, tmp_path: Path):
+    bin_dir = _fake_tools(monkeypatch, tmp_path, {"pdflatex"})
+    builds = []
+    monkeypatch.setattr(LaTex, "_build_pdflatex_format", lambda: builds.append(1))
+    monkeypatch.setattr(LaTex, "_CHECKED_TEX_FORMATS", set())
+    marker = tmp_path / "exports" / ".tex-format.json"
+
+    LaTex._ensure_pdflatex_format(marker)
+    LaTex._ensure_pdflatex_format(marker)
+    assert len(builds) == 1
+
+    # Outro processo: o marcador em disco evita repetir o fmtutil
+    monkeypatch.setattr(LaTex, "_CHECKED_TEX_FORMATS", set())
+    LaTex._ensure_pdflatex_format(marker)
+    assert len(builds) == 1
+
+    # Instalação atualizada (binário diferente) verifica de novo
+    pdflatex = bin_dir / "pdflatex"
+    os.utime(pdflatex, ns=(pdflatex.stat().st_atime_ns, pdflatex.stat().st_mtime_ns + 10**9))
+    LaTex._ensure_pdflatex_format(marker)
+    assert len(builds) == 2
+
+
+def test_engine_that_compiled_last_time_is_tried_first(monkeypatch, tmp_path: Path):
+    _fake_tools(monkeypatch, tmp_path, {"latexmk", "xelatex"})
+    monkeypatch.setattr(LaTex, "_ensure_pdflatex_format", lambda marker=None: None)
+    attempts = []
+
+    def fake_latexmk(tex_path, args):
+        attempts.append(args[0])
+        return args[0] == "-pdfxe", "log"
+
+    monkeypatch.setattr(LaTex, "_run_latexmk", fake_latexmk)
+    tex_path = tmp_path / "build" / "dissertacao.tex"
+    tex_path.parent.mkdir()
+    tex_path.write_text("\\documentclass{article}", encoding="utf-8")
+
+    assert LaTex.compile_pdf(tex_path) == (True, "log")
+    assert attempts == ["-pdf", "-pdfxe"]
+    assert LaTex.compile_pdf(tex_path) == (True, "log")
+    assert attempts == ["-pdf", "-pdfxe", "-pdfxe"]
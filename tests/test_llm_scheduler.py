@@ -0,0 +1,163 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMQueueFull,
+    LLMRequestCancelled,
+    LLMRequestScheduler,
+)
+
+
+class _GatedBackend:
+    """Gera um token por vez; cada geração espera ``release`` antes de terminar."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def generate(self, query, user_name=None, use_semantic=True, request_metadata=None, context=None, max_tokens=None, stream_callback=None):
+        with self.lock:
+            self.calls.append(query)
+        self.started.set()
+        while not self.release.wait(0.01):
+            if stream_callback is not None and stream_callback("") is False:
+                return {"text": "parcial", "status": "success", "request_metadata": request_metadata}
+        if stream_callback is not None:
+            for piece in ("resposta ", f"para {query}"):
+                if stream_callback(piece) is False:
+                    break
+        return {"text": f"resposta para {query}", "status": "success", "request_metadata": request_metadata}
+
+
+def _wait_for_call(backend: _GatedBackend, count: int) -> None:
+    deadline = 200
+    while len(backend.calls) < count and deadline:
+        threading.Event().wait(0.01)
+        deadline -= 1
+    assert len(backend.calls) >= count
+
+
+def test_interactive_request_preempts_background_batch_and_batch_resumes():
+    backend = _GatedBackend()
+    scheduler = LLMRequestScheduler(backend)
+
+    batch = scheduler.submit("revisão do capítulo", priority="background")
+    _wait_for_call(backend, 1)
+    queued_batch = scheduler.submit("outra revisão", priority=PRIORITY_BACKGROUND)
+    chat = scheduler.submit("pergunta do chat", priority=PRIORITY_INTERACTIVE)
+
+    # O chat interrompe o lote e roda antes dele e da outra revisão
+    _wait_for_call(backend, 2)
+    assert backend.calls[:2] == ["revisão do capítulo", "pergunta do chat"]
+    backend.release.set()
+
+    assert chat.result(5)["text"] == "resposta para pergunta do chat"
+    assert batch.result(5)["text"] == "resposta para revisão do capítulo"
+    assert queued_batch.result(5)["text"] == "resposta para outra revisão"
+    assert backend.calls == ["revisão do capítulo", "pergunta do chat", "revisão do capítulo", "outra revisão"]
+
+    stats = scheduler.get_stats()
+    assert stats["preempted"] == 1 and stats["completed"] == 3 and stats["queue_depth"] == 0
+    scheduler.shutdown()
+
+
+class _DraftingBackend(_GatedBackend):
+    """Emite um rascunho antes de esperar ``release``, como um lote já gerando."""
+
+    def generate(self, query, stream_callback=None, **kwargs):
+        if stream_callback is not None and stream_callback(f"rascunho de {query} ") is False:
+            return {"text": "parcial", "status": "success"}
+        return super().generate(query, stream_callback=stream_callback, **kwargs)
+
+
+def test_streaming_batch_is_still_preempted_and_streams_only_the_final_attempt():
+    backend = _DraftingBackend()
+    scheduler = LLMRequestScheduler(backend)
+    batch_chunks = []
+    chat_chunks = []
+
+    batch = scheduler.submit("revisão do capítulo", priority="background", stream_callback=batch_chunks.append)
+    _wait_for_call(backend, 1)
+    chat = scheduler.submit("pergunta do chat", priority="interactive", stream_callback=chat_chunks.append)
+
+    _wait_for_call(backend, 2)
+    assert backend.calls[:2] == ["revisão do capítulo", "pergunta do chat"]
+    # Rascunho da tentativa interrompida nunca chegou ao consumidor do lote
+    assert batch_chunks == []
+    backend.release.set()
+
+    assert chat.result(5)["text"] == "resposta para pergunta do chat"
+    assert batch.result(5)["text"] == "resposta para revisão do capítulo"
+    assert "".join(chat_chunks) == "rascunho de pergunta do chat resposta para pergunta do chat"
+    assert batch_chunks == ["rascunho de revisão do capítulo resposta para revisão do capítulo"]
+    assert scheduler.get_stats()["preempted"] == 1
+    scheduler.shutdown()
+
+
+def test_identical_requests_share_one_generation_with_their_own_metadata():
+    backend = _GatedBackend()
+    scheduler = LLMRequestScheduler(backend)
+    blocker = scheduler.submit("bloqueio")
+    _wait_for_call(backend, 1)
+
+    first = scheduler.submit("o que é virtude?", request_metadata={"view": "chat", "request_id": "a"})
+    second = scheduler.submit("o que é virtude?", request_metadata={"view": "chat", "request_id": "b"})
+    backend.release.set()
+
+    assert first.result(5)["request_metadata"]["request_id"] == "a"
+    assert second.result(5)["request_metadata"]["request_id"] == "b"
+    assert second.coalesced and backend.calls.count("o que é virtude?") == 1
+    assert blocker.result(5)["status"] == "success"
+    assert scheduler.get_stats()["coalesced"] == 1
+    scheduler.shutdown()
+
+
+def test_newer_question_supersedes_running_and_queued_ones():
+    backend = _GatedBackend()
+    scheduler = LLMRequestScheduler(backend)
+    tokens = []
+
+    running = scheduler.submit("primeira", supersede_key="chat:Ética", stream_callback=tokens.append)
+    _wait_for_call(backend, 1)
+    latest = scheduler.submit("segunda", supersede_key="chat:Ética")
+
+    with pytest.raises(LLMRequestCancelled):
+        running.result(5)
+    backend.release.set()
+    assert latest.result(5)["text"] == "resposta para segunda"
+    # A geração substituída parou sem entregar mais trechos
+    assert backend.calls == ["primeira", "segunda"] and "".join(tokens) == ""
+    assert scheduler.get_stats()["superseded"] == 1
+    scheduler.shutdown()
+
+
+def test_full_queue_evicts_lower_priority_or_rejects():
+    backend = _GatedBackend()
+    scheduler = LLMRequestScheduler(backend, max_pending=2)
+    scheduler.submit("em execução")
+    _wait_for_call(backend, 1)
+
+    background = scheduler.submit("lote", priority="background")
+    scheduler.submit("normal")
+    scheduler.submit("chat", priority="interactive")
+    with pytest.raises(LLMRequestCancelled):
+        background.result(1)
+    with pytest.raises(LLMQueueFull):
+        scheduler.submit("mais um lote", priority="background")
+
+    stats = scheduler.get_stats()
+    assert stats["evicted"] == 1 and stats["rejected"] == 1 and stats["queue_depth"] == 2
+    backend.release.set()
+    scheduler.shutdown()
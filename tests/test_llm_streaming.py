@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.backend_router import LLMBackendProxy
+from core.llm.streaming import IncrementalSanitizer
+
+
+def _drop_prompt_echo(text: str) -> str:
+    text = text.strip()
+    if "Pergunta do usuário:" in text:
+        text = text.split("Pergunta do usuário:", 1)[0].strip()
+    return text
+
+
+def test_incremental_sanitizer_emits_stable_prefix_and_stops_on_rewrite():
+    sanitizer = IncrementalSanitizer(_drop_prompt_echo, min_chars=1)
+    deltas = [sanitizer.feed(piece) for piece in ["A virtude ", "é hábito", " prático. "]]
+
+    # A última palavra fica retida até a próxima fronteira estável
+    assert "".join(deltas) == "A virtude é hábito "
+
+    deltas.append(sanitizer.feed("\nPergunta do usuário: ignore"))
+    deltas.append(sanitizer.feed(" tudo "))
+    deltas.append(sanitizer.finish())
+    assert "".join(deltas) == "A virtude é hábito prático."
+    assert not sanitizer.diverged
+
+    rewritten = IncrementalSanitizer(lambda text: text.strip().upper() if "!" in text else text.strip(), min_chars=1)
+    assert rewritten.feed("calma sempre ") == "calma "
+    assert rewritten.feed("agora! ") == ""
+    assert rewritten.diverged
+
+
+class _StreamingBackend:
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.gate = threading.Event()
+
+    def generate(self, query, user_name=None, use_semantic=True, request_metadata=None, stream_callback=None):
+        sent = []
+        for index, piece in enumerate(["Olá, ", "mundo ", "cruel."]):
+            if stream_callback is not None and stream_callback(piece) is False:
+                self.stopped.set()
+                break
+            sent.append(piece)
+            if index == 0 and stream_callback is not None:
+                self.gate.wait(2)
+        return {"text": "".join(sent), "status": "success", "request_metadata": request_metadata}
+
+
+def _proxy_with(backend) -> LLMBackendProxy:
+    proxy = LLMBackendProxy()
+    proxy._backend = backend
+    proxy._backend_kind = proxy._desired_backend_kind()
+    return proxy
+
+
+def test_proxy_generate_stream_yields_tokens_then_final_result():
+    backend = _StreamingBackend()
+    backend.gate.set()
+    proxy = _proxy_with(backend)
+
+    events = list(proxy.generate_stream("pergunta", user_name="Ana", request_metadata={"view": "teste"}))
+
+    assert [event["type"] for event in events] == ["token", "token", "token", "done"]
+    assert "".join(event["text"] for event in events[:-1]) == "Olá, mundo cruel."
+    assert events[-1]["result"]["text"] == "Olá, mundo cruel."
+    assert events[-1]["result"]["request_metadata"]["view"] == "teste"
+
+
+def test_closing_the_stream_stops_generation():
+    backend = _StreamingBackend()
+    proxy = _proxy_with(backend)
+
+    stream = proxy.generate_stream("pergunta", user_name="Ana")
+    assert next(stream) == {"type": "token", "text": "Olá, "}
+    stream.close()
+    backend.gate.set()
+
+    assert backend.stopped.wait(2)
@@ -0,0 +1,130 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.ollama_client import OllamaConnectionError, OllamaHTTPClient, OllamaHTTPError
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address)
+        type(self).requests.append(("GET", self.path, None))
+        self._send_json(200, {"models": [{"name": "qwen3:4b"}]})
+
+    def do_POST(self):
+        type(self).connections.add(self.client_address)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        type(self).requests.append(("POST", self.path, payload))
+        if payload.get("model") == "ausente":
+            self._send_json(404, {"error": "model not found"})
+            return
+        if not payload.get("stream"):
+            self._send_json(200, {"message": {"content": "ok"}, "done": True})
+            return
+        lines = [{"message": {"content": f"parte {index} "}, "done": index == 2} for index in range(3)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            data = json.dumps(line).encode("utf-8") + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture()
+def server():
+    _FakeOllama.connections = set()
+    _FakeOllama.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_reuse_one_keep_alive_connection(server):
+    client = OllamaHTTPClient(server)
+    for _ in range(3):
+        assert client.request_json("POST", "/api/chat", {"model": "m", "keep_alive": "30m"}) == {
+            "message": {"content": "ok"},
+            "done": True,
+        }
+    with client.open("POST", "/api/chat", {"model": "m", "stream": True}) as response:
+        for raw_line in response:
+            if json.loads(raw_line)["done"]:
+                # Como CloudLLM._read_ollama_stream: para no "done", antes do chunk final
+                break
+
+    assert len(_FakeOllama.connections) == 1
+    client.request_json("GET", "/api/tags")
+    assert client.stats == {**client.stats, "connections": 1, "reused": 4}
+    assert _FakeOllama.requests[0][2]["keep_alive"] == "30m"
+
+    with pytest.raises(OllamaHTTPError) as excinfo:
+        client.request_json("POST", "/api/chat", {"model": "ausente"})
+    assert excinfo.value.code == 404 and "not found" in excinfo.value.detail
+    client.close()
+
+
+def test_interrupted_stream_drops_connection_instead_of_reusing_it(server):
+    client = OllamaHTTPClient(server)
+    with client.open("POST", "/api/chat", {"model": "m", "stream": True}) as response:
+        response.readline()
+    client.request_json("POST", "/api/chat", {"model": "m"})
+    assert client.stats["connections"] == 2 and client.stats["reused"] == 0
+    client.close()
+
+
+def test_probe_is_cached_and_refreshed_in_background(server):
+    client = OllamaHTTPClient(server, probe_ttl=60)
+    first = client.probe()
+    assert first["reachable"] and first["models"] == ["qwen3:4b"] and not first["cached"]
+    assert client.probe()["cached"]
+    assert client.stats["probes"] == 1
+
+    # Vencido: responde com o último resultado e confirma em segundo plano
+    client._probe_at -= 120
+    assert client.probe()["cached"]
+    deadline = time.monotonic() + 5
+    while client.stats["probes"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.stats["probes"] == 2
+    client.close()
+
+
+def test_unreachable_server_reports_connection_error():
+    client = OllamaHTTPClient("http://127.0.0.1:9", failed_probe_ttl=60)
+    probe = client.probe(timeout=1)
+    assert not probe["reachable"] and probe["error"]
+    with pytest.raises(OllamaConnectionError):
+        client.request_json("GET", "/api/tags", timeout=1)
+    # Falha recente fica em cache: não repete o probe a cada pergunta
+    assert client.probe(timeout=1)["cached"]
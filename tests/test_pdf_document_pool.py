@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+fitz = pytest.importorskip("fitz")
+
+from core.modules.pdf_document_pool import PDFDocumentPool
+
+
+def _make_pdf(path: Path, pages: int, label: str) -> Path:
+    doc = fitz.open()
+    for index in range(pages):
+        doc.new_page().insert_text((72, 72), f"{label} pagina {index + 1}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_pages_share_one_open_document_and_cache_text(tmp_path):
+    pdf_path = str(_make_pdf(tmp_path / "livro.pdf", 5, "Etica"))
+    pool = PDFDocumentPool()
+
+    assert pool.page_count(pdf_path) == 5
+    texts = [pool.page_text(pdf_path, index) for index in range(5)]
+    assert "Etica pagina 3" in texts[2]
+    assert pool.page_text(pdf_path, 2) == texts[2]
+
+    stats = pool.get_stats()
+    assert stats["opens"] == 1
+    assert stats["text_hits"] == 1 and stats["text_misses"] == 5
+    pool.close()
+    assert pool.get_stats()["open_documents"] == 0
+
+
+def test_replacing_the_file_invalidates_cached_pages(tmp_path):
+    pdf_path = tmp_path / "livro.pdf"
+    _make_pdf(pdf_path, 2, "Antes")
+    pool = PDFDocumentPool()
+    assert "Antes" in pool.page_text(str(pdf_path), 0)
+
+    _make_pdf(tmp_path / "novo.pdf", 3, "Depois")
+    os.replace(tmp_path / "novo.pdf", pdf_path)
+
+    assert "Depois" in pool.page_text(str(pdf_path), 0)
+    assert pool.page_count(str(pdf_path)) == 3
+
+
+def test_llm_processor_closes_documents_after_each_entry_point(tmp_path):
+    sys.path.insert(0, str(ROOT_DIR))
+    from core.modules.book_processor import BookMetadata
+    from core.modules.llm_pdf_transcriber import LLMPDFProcessor
+
+    pdf_path = str(_make_pdf(tmp_path / "livro.pdf", 4, "Etica " * 20))
+    processor = LLMPDFProcessor(llm_instance=object(), vault_manager=object())
+    metadata = BookMetadata(title="Ética", author="Aristóteles")
+
+    assert processor.process_chapter_range(pdf_path, 0, 1, metadata, 1)["success"]
+    assert processor.documents.get_stats()["open_documents"] == 0
+
+    # Dentro de ``with`` o documento é reaproveitado entre capítulos
+    with processor:
+        processor.process_chapter_range(pdf_path, 0, 1, metadata, 1)
+        processor.process_chapter_range(pdf_path, 2, 3, metadata, 2)
+        assert processor.documents.get_stats()["open_documents"] == 1
+    stats = processor.documents.get_stats()
+    assert stats["open_documents"] == 0 and stats["opens"] == 2
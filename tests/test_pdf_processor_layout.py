@@ -66,3 +66,217 @@ def test_extract_page_text_preserving_layout_uses_sorted_text_when_layout_disabl
     text = processor.extract_page_text_preserving_layout(page, preserve_layout=False)
 
     assert text == "texto simples"
+
+
+def test_process_pool_extracts_pages_with_own_handles_and_records_state_in_order(tmp_path):
+    import pytest
+
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "livro.pdf"
+    doc = fitz.open()
+    for page_index in range(6):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Pagina {page_index + 1} sobre a virtude e o habito na etica antiga.")
+    doc.save(str(pdf_path))
+    doc.close()
+
+    processor = PDFProcessorOCR(quality=ProcessingQuality.STANDARD, process_workers=2)
+    processor._prepare_processing_runtime(metadata=None, output_dir=tmp_path, total_pages=6)
+
+    assert processor._prefetch_pages_in_processes(str(pdf_path), range(6)) == 6
+    assert sorted(processor.page_journal.completed_pages()) == [1, 2, 3, 4, 5, 6]
+    assert processor.page_journal.text(3).startswith("Pagina 3")
+
+    # A montagem do capítulo consome o que os workers extraíram
+    with fitz.open(str(pdf_path)) as reopened:
+        chapter = processor._process_page_range(reopened, 0, 6, 1, tmp_path)
+    assert chapter["missing_text_pages"] == 0
+    assert "--- Página 6 ---\n\nPagina 6" in chapter["content"]
+
+
+def test_page_journal_batches_writes_and_migrates_legacy_cache(tmp_path):
+    import json
+
+    from core.modules.ocr_page_journal import OCRPageJournal
+
+    legacy_dir = tmp_path / ".ocr_pages"
+    legacy_dir.mkdir()
+    (legacy_dir / "page-0002.txt").write_text("texto antigo", encoding="utf-8")
+    (tmp_path / ".ocr_state.json").write_text(
+        json.dumps({"completed_pages": [2], "page_sources": {"2": "ocr"}, "failed_pages": {"5": "Sem texto"}}),
+        encoding="utf-8",
+    )
+
+    processor = PDFProcessorOCR(quality=ProcessingQuality.STANDARD)
+    processor._prepare_processing_runtime(metadata=None, output_dir=tmp_path, total_pages=10)
+    assert not legacy_dir.exists()
+    assert processor._load_cached_page_text(1) == "texto antigo"
+    assert processor.page_journal.sources[2] == "ocr"
+    assert processor.page_journal.failures == {5: "Sem texto"}
+    assert "completed_pages" not in json.loads((tmp_path / ".ocr_state.json").read_text(encoding="utf-8"))
+
+    journal_path = processor.page_journal.path
+    size_before = journal_path.stat().st_size
+    processor.page_journal.flush_interval = 3600
+    processor._save_cached_page_text(0, "página um", "text")
+    # Grava em lote: nada vai para o disco até completar o lote
+    assert journal_path.stat().st_size == size_before
+    assert processor.page_journal.pending == 1
+    processor.page_journal.flush()
+
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"page": 3, "te')
+    reloaded = OCRPageJournal(journal_path).load()
+    assert reloaded.text(1) == "página um" and reloaded.text(2) == "texto antigo"
+    reloaded.record_text(3, "página três", "ocr")
+    reloaded.flush()
+    # A linha truncada foi descartada pela compactação
+    lines = journal_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["page"] for line in lines] == [1, 2, 3, 5]
+
+
+def test_page_journal_keeps_records_queued_while_another_thread_flushes(tmp_path, monkeypatch):
+    import threading
+
+    from core.modules import ocr_page_journal
+    from core.modules.ocr_page_journal import OCRPageJournal
+
+    journal = OCRPageJournal(tmp_path / ".ocr_pages.jsonl", flush_every=100, flush_interval=3600)
+    journal.record_text(1, "página um", "ocr")
+
+    # O primeiro flush fica parado no fsync enquanto outra thread registra uma página
+    in_fsync = threading.Event()
+    release = threading.Event()
+    real_fsync = ocr_page_journal.os.fsync
+
+    def slow_fsync(fd):
+        if not in_fsync.is_set():
+            in_fsync.set()
+            release.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr(ocr_page_journal.os, "fsync", slow_fsync)
+    flusher = threading.Thread(target=journal.flush)
+    flusher.start()
+    assert in_fsync.wait(5)
+    recorder = threading.Thread(target=journal.record_text, args=(2, "página dois", "ocr"))
+    recorder.start()
+    recorder.join(0.2)
+    release.set()
+    flusher.join(5)
+    recorder.join(5)
+    journal.flush()
+
+    reloaded = OCRPageJournal(journal.path).load()
+    assert reloaded.completed_pages() == {1, 2}
+
+
+def test_render_page_image_is_grayscale_and_fallback_dpis_reuse_render():
+    import pytest
+
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    page = doc.new_page(width=144, height=72)
+    page.draw_rect(fitz.Rect(0, 0, 72, 72), color=(0, 0, 0), fill=(0, 0, 0))
+
+    processor = PDFProcessorOCR(quality=ProcessingQuality.STANDARD)
+    image = processor._render_page_image(page, 144)
+    assert image.mode == "L" and image.size == (288, 144)
+    assert image.getpixel((10, 10)) == 0 and image.getpixel((280, 10)) == 255
+
+    reduced = processor._scale_page_image(image, 144, 72)
+    assert reduced.size == (144, 72)
+    assert processor._scale_page_image(image, 144, 144) is image
+
+    binary = processor._preprocess_image(image)
+    assert {color for _count, color in binary.getcolors()} <= {0, 255}
+    doc.close()
+
+
+def test_page_classifier_skips_redundant_extraction_and_ocr_passes(tmp_path, monkeypatch):
+    import pytest
+
+    fitz = pytest.importorskip("fitz")
+    from PIL import Image
+
+    from core.modules import pdf_processor
+
+    doc = fitz.open()
+    digital = doc.new_page()
+    digital.insert_textbox(
+        fitz.Rect(50, 50, 550, 800),
+        " ".join(f"Paragrafo {index} sobre virtude, habito, prudencia e justica." for index in range(40)),
+    )
+    scanned = doc.new_page()
+    scan_path = tmp_path / "scan.png"
+    Image.new("L", (300, 400), 255).save(scan_path)
+    scanned.insert_image(scanned.rect, filename=str(scan_path))
+    doc.new_page()  # em branco
+
+    processor = PDFProcessorOCR(quality=ProcessingQuality.ACADEMIC)
+    processor._prepare_processing_runtime(metadata=None, output_dir=tmp_path, total_pages=3)
+
+    profiles = [processor._classify_page(doc.load_page(index)) for index in range(3)]
+    assert [profile["page_class"] for profile in profiles] == ["digital", "scanned", "blank"]
+    assert profiles[1]["image_dpi"] == 36  # 300 px em 595 pt (A4)
+
+    calls = []
+
+    class FakeTesseract:
+        @staticmethod
+        def image_to_string(image, lang, config, timeout):
+            calls.append((image.size, config))
+            return " ".join(["Texto reconhecido pelo OCR com palavras longas"] * 20)
+
+    monkeypatch.setattr(pdf_processor, "pytesseract", FakeTesseract)
+    monkeypatch.setattr(processor, "_ocr_is_available", lambda: True)
+
+    for page_num in range(3):
+        processor._extract_page_with_resume(doc, page_num)
+
+    # Página digital: nenhum OCR e só o primeiro candidato de extração
+    text, meta = processor._extract_best_page_text(doc.load_page(0), early_exit_score=processor.TEXT_EARLY_EXIT_SCORE)
+    assert meta["candidates"] == 1 and "Paragrafo 39" in text
+
+    # Página escaneada: uma única passada (1ª config), limitada a 72 dpi pela imagem
+    assert calls == [((595, 842), "--psm 6")]
+    stats = processor._page_stats_summary()
+    assert stats["by_class"] == {"digital": 1, "scanned": 1, "blank": 1}
+    assert stats["ocr_passes"] == 1 and stats["ocr_pages"] == 1
+    assert stats["per_page"][2]["method"] == "ocr"
+    assert all(entry["seconds"] >= 0 for entry in stats["per_page"].values())
+    doc.close()
+
+
+def test_partial_run_reports_kept_page_journal_for_resume(tmp_path):
+    import pytest
+
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "livro.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Pagina 1 sobre a virtude e o habito na etica antiga.")
+    doc.new_page()
+    doc.save(str(pdf_path))
+    doc.close()
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    processor = PDFProcessorOCR(quality=ProcessingQuality.DRAFT)
+    partial = processor.process(str(pdf_path), output_dir, None)
+
+    assert partial["success"] is False
+    assert partial["page_cache_dir"] == str(output_dir / ".ocr_pages.jsonl")
+    assert (output_dir / ".ocr_pages.jsonl").exists()
+
+    complete_pdf = tmp_path / "completo.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Pagina unica sobre a justica na cidade ideal.")
+    doc.save(str(complete_pdf))
+    doc.close()
+    complete_dir = tmp_path / "completo"
+    complete_dir.mkdir()
+
+    complete = processor.process(str(complete_pdf), complete_dir, None)
+
+    assert complete["success"] is True
+    assert complete["page_cache_dir"] is None
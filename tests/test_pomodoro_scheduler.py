@@ -0,0 +1,107 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.modules import pomodoro_timer
+from core.modules.pomodoro_timer import PomodoroTimer
+
+
+def _timer(tmp_path: Path, work_seconds: float, use_qt: bool = False) -> PomodoroTimer:
+    timer = PomodoroTimer(str(tmp_path), use_qt=use_qt)
+    timer.work_duration = work_seconds
+    return timer
+
+
+def test_idle_and_paused_timer_have_nothing_scheduled(tmp_path: Path):
+    timer = _timer(tmp_path, 60)
+    assert timer.timer_thread is None
+    assert timer._next_wakeup_locked(time.monotonic()) is None
+
+    timer.start()
+    assert timer._next_wakeup_locked(time.monotonic()) == pytest.approx(time.monotonic() + 60, abs=1)
+    timer.pause()
+    assert timer._next_wakeup_locked(time.monotonic()) is None
+    elapsed = timer.elapsed_seconds()
+    time.sleep(0.05)
+    assert timer.elapsed_seconds() == elapsed
+
+    timer.stop(save_stats=False)
+    assert timer._next_wakeup_locked(time.monotonic()) is None
+    assert timer.scheduler_stats["wakeups"] == 0
+
+
+def test_phase_ends_on_a_single_wakeup_and_ignores_wall_clock(tmp_path: Path, monkeypatch):
+    timer = _timer(tmp_path, 0.3)
+    done = threading.Event()
+    timer.on_complete = lambda session_type: done.set()
+
+    timer.start()
+    timer.pause()
+    time.sleep(0.4)
+    assert not done.is_set()
+
+    # Relógio de parede salta uma hora: a contagem não muda
+    real_time = time.time
+    monkeypatch.setattr(pomodoro_timer.time, "time", lambda: real_time() + 3600)
+    timer.resume()
+    assert timer.remaining_seconds() > 0.2
+    assert done.wait(2)
+    monkeypatch.undo()
+
+    assert timer.scheduler_stats["wakeups"] == 1
+    session = timer.stats["session_history"][-1]
+    assert session["completed"] and 0.3 <= session["actual_duration"] < 0.6
+
+
+def test_statistics_writes_are_batched(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pomodoro_timer, "STATS_FLUSH_DELAY", 0.8)
+    timer = _timer(tmp_path, 0.05)
+    finished = []
+    timer.on_complete = finished.append
+
+    for _ in range(3):
+        timer.start()
+        deadline = time.monotonic() + 2
+        while timer.is_running and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert finished == ["work"] * 3
+    assert not timer.stats_file.exists()
+
+    deadline = time.monotonic() + 2
+    while not timer.stats_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert timer.scheduler_stats["stats_writes"] == 1
+    assert json.loads(timer.stats_file.read_text(encoding="utf-8"))["work_sessions"] == 3
+    assert timer.flush_stats() is False
+
+
+def test_qt_event_loop_drives_the_timer_in_the_gui_thread(tmp_path: Path):
+    QtCore = pytest.importorskip("PyQt6.QtCore")
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    timer = PomodoroTimer(str(tmp_path))
+    timer.work_duration = 0.05
+    loop = QtCore.QEventLoop()
+    threads = []
+
+    def _completed(_session_type):
+        threads.append(threading.current_thread())
+        loop.quit()
+
+    timer.on_complete = _completed
+    timer.start()
+    QtCore.QTimer.singleShot(2000, loop.quit)
+    loop.exec()
+
+    assert threads == [threading.main_thread()]
+    assert timer.timer_thread is None and not timer.is_running
+    timer.close()
+    assert app is not None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.glados.models.prompt_budget import PromptBudget, TokenCounter, split_context_blocks
+
+
+class _WordTokenizer:
+    """Tokenizer de teste: um token por palavra"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def tokenize(self, text, add_bos=True, special=False):
+        self.calls += 1
+        return ([1] if add_bos else []) + text.decode("utf-8").split()
+
+
+def _context(blocks: int, words_per_block: int) -> str:
+    lines = ["### PACOTE DE NAVEGAÇÃO", "Âncora: ética"]
+    for index in range(blocks):
+        lines.append(f"--- nota{index} ---")
+        lines.append(" ".join(f"n{index}w{word}" for word in range(words_per_block)))
+    lines.append("Regras: use apenas as notas acima.")
+    return "\n".join(lines)
+
+
+def test_split_context_keeps_header_blocks_and_footer():
+    header, blocks, footer = split_context_blocks(_context(3, 5))
+    assert header.startswith("### PACOTE")
+    assert [block.split("\n")[0] for block in blocks] == ["--- nota0 ---", "--- nota1 ---", "--- nota2 ---"]
+    assert footer == "Regras: use apenas as notas acima."
+    assert split_context_blocks("texto solto") == ("texto solto", [], "")
+
+
+def test_counts_are_exact_and_memoized():
+    tokenizer = _WordTokenizer()
+    counter = TokenCounter(tokenizer)
+    assert counter.count("um dois três") == 3
+    assert counter.count("um dois três") == 3
+    assert (counter.hits, counter.misses, tokenizer.calls) == (1, 1, 1)
+
+    fallback = TokenCounter(None)
+    assert not fallback.exact
+    assert fallback.count("abcdefgh") == 2
+
+
+def test_pack_context_fills_budget_in_relevance_order():
+    counter = TokenCounter(_WordTokenizer())
+    budget = PromptBudget(counter, n_ctx=400, safety_tokens=0, min_generation=64)
+    context = _context(6, 60)
+
+    packed, report = budget.pack_context(context, fixed_tokens=100, max_tokens=100)
+
+    # 400 - 100 fixos - 100 de geração = 200 tokens para o contexto
+    assert report.context_tokens <= 200
+    assert report.blocks_total == 6
+    assert report.blocks_kept == 3 and report.blocks_truncated == 1
+    assert "nota0" in packed and "nota1" in packed and "nota3" not in packed
+    assert packed.startswith("### PACOTE") and packed.endswith("Regras: use apenas as notas acima.")
+
+    generation = budget.generation_tokens("palavra " * 250, 512, report)
+    assert generation == 150
+    assert report.prompt_tokens == 250 and report.generation_tokens == 150
+
+    small, small_report = budget.pack_context(_context(1, 5), fixed_tokens=100, max_tokens=100)
+    assert small == _context(1, 5)
+    assert small_report.blocks_kept == 1 and small_report.blocks_truncated == 0
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.glados.models.prompt_prefix_cache import PromptPrefixCache
+
+
+class _FakeState:
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        self.llama_state_size = 1024 * len(tokens)
+
+
+class _FakeLlama:
+    """Imita a API de estado do llama-cpp-python contando tokens avaliados"""
+
+    def __init__(self, model_path="model.gguf", n_ctx=2048):
+        self.model_path = model_path
+        self._n_ctx = n_ctx
+        self._input_ids = []
+        self.evaluated = 0
+
+    def n_ctx(self):
+        return self._n_ctx
+
+    def tokenize(self, text, add_bos=True, special=False):
+        return ([1] if add_bos else []) + [ord(char) for char in text.decode("utf-8")]
+
+    def reset(self):
+        self._input_ids = []
+
+    def eval(self, tokens):
+        self.evaluated += len(tokens)
+        self._input_ids = self._input_ids + list(tokens)
+
+    def save_state(self):
+        return _FakeState(self._input_ids)
+
+    def load_state(self, state):
+        self._input_ids = list(state.tokens)
+
+    def complete(self, prompt):
+        """Reaproveita o maior prefixo comum como o Llama.generate"""
+        tokens = self.tokenize(prompt.encode("utf-8"))
+        common = 0
+        for current, new in zip(self._input_ids, tokens):
+            if current != new:
+                break
+            common += 1
+        self._input_ids = self._input_ids[:common]
+        self.eval(tokens[common:])
+
+
+def test_prefix_is_built_once_then_reused_or_restored():
+    cache = PromptPrefixCache()
+    llm = _FakeLlama()
+    prefix = "Sistema: persona fixa e regras.\n\n"
+
+    assert cache.prime(llm, prefix) == "built"
+    llm.complete(prefix + "alfa?")
+    assert llm.evaluated == len(prefix) + 1 + len("alfa?")
+
+    assert cache.prime(llm, prefix) == "warm"
+    before = llm.evaluated
+    llm.complete(prefix + "beta?")
+    assert llm.evaluated - before == len("beta?")
+
+    # Outro prompt sem o prefixo sobrescreve o contexto; o estado é restaurado
+    llm.complete("algo totalmente diferente")
+    assert cache.prime(llm, prefix) == "restored"
+    before = llm.evaluated
+    llm.complete(prefix + "gama?")
+    assert llm.evaluated - before == len("gama?")
+
+
+def test_model_or_context_change_rebuilds_and_errors_disable_cache():
+    cache = PromptPrefixCache()
+    prefix = "Regras fixas.\n\n"
+    assert cache.prime(_FakeLlama(n_ctx=2048), prefix) == "built"
+    assert cache.prime(_FakeLlama(n_ctx=1024), prefix) == "built"
+    assert cache.prime(_FakeLlama(model_path="outro.gguf", n_ctx=2048), prefix) == "built"
+    assert cache.get_stats()["entries"] == 3
+
+    broken = _FakeLlama(n_ctx=4096)
+    broken.save_state = None
+    assert cache.prime(broken, prefix) == "disabled"
+    assert cache.get_stats()["enabled"] is False
+    assert cache.prime(_FakeLlama(), prefix) == "disabled"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.response_cache import ResponseCache
+
+
+def test_lru_eviction_ttl_and_byte_limit(monkeypatch):
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", {"text": "A"})
+    cache.put("b", {"text": "B"})
+    assert cache.get("a") == {"text": "A"}
+
+    # "b" é o menos usado recentemente
+    cache.put("c", {"text": "C"})
+    assert "b" not in cache
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+    now = [1000.0]
+    monkeypatch.setattr("core.llm.response_cache.time.time", lambda: now[0])
+    cache.put("d", "fresh")
+    now[0] += 61
+    assert cache.get("d") is None
+
+    small = ResponseCache(max_entries=100, max_bytes=1024, ttl_seconds=0)
+    for index in range(10):
+        small.put(f"k{index}", "x" * 300)
+    assert small.get_stats()["bytes"] <= 1024
+    assert "k9" in small and "k0" not in small
+
+
+def test_persists_only_delta_and_reloads(tmp_path):
+    store = tmp_path / "responses.sqlite3"
+    cache = ResponseCache(store_path=store, flush_every=100)
+    cache.put("one", {"text": "1"})
+    cache.put("two", {"text": "2"})
+    assert cache.get_stats()["pending_writes"] == 2
+    cache.flush()
+    assert cache.get_stats()["pending_writes"] == 0
+
+    cache.get("one")
+    assert cache.get_stats()["pending_writes"] == 1
+    cache.close()
+
+    reloaded = ResponseCache(store_path=store)
+    assert len(reloaded) == 2
+    assert reloaded.get("two") == {"text": "2"}
+    reloaded.clear()
+    reloaded.close()
+    assert len(ResponseCache(store_path=store)) == 0
+
+
+def test_key_changes_with_model_personality_and_context():
+    base = ResponseCache.make_key("o que é virtude?", model="a.gguf", personality="p", context="nota 1")
+    assert base == ResponseCache.make_key("o que é virtude?", model="a.gguf", personality="p", context="nota 1")
+    assert base != ResponseCache.make_key("o que é virtude?", model="b.gguf", personality="p", context="nota 1")
+    assert base != ResponseCache.make_key("o que é virtude?", model="a.gguf", personality="q", context="nota 1")
+    assert base != ResponseCache.make_key("o que é virtude?", model="a.gguf", personality="p", context="nota 2")
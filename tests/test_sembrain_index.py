@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.glados.brain.semantic_search import Sembrain
+
+
+@dataclass
+class _Note:
+    path: Path
+    title: str
+    content: str
+    tags: list = field(default_factory=list)
+    modified: datetime = field(default_factory=lambda: datetime(2026, 1, 1, 12, 0))
+
+
+def _notes() -> list[_Note]:
+    return [
+        _Note(Path("a.md"), "Ética Aristotélica", "virtude felicidade eudaimonia meio termo", ["ética"]),
+        _Note(Path("b.md"), "República", "platão caverna educação filósofo justiça", ["platão"]),
+        _Note(Path("c.md"), "Virtude", "virtude hábito caráter prática aristóteles", ["virtude"]),
+    ]
+
+
+def test_search_ranks_only_notes_sharing_query_terms(tmp_path):
+    brain = Sembrain(tmp_path, _notes(), index_path=tmp_path / "segment.sqlite3")
+
+    results = brain.search("platão caverna", limit=5)
+
+    assert [str(result.note.path) for result in results] == ["b.md"]
+    assert results[0].relevance > brain.similarity_threshold
+
+
+def test_segment_is_reused_on_restart_and_tracks_changes(tmp_path):
+    index_path = tmp_path / "segment.sqlite3"
+    notes = _notes()
+    first = Sembrain(tmp_path, notes, index_path=index_path)
+    baseline = first.search("virtude", limit=5)
+    first.store.close()
+
+    reloaded = Sembrain(tmp_path, notes, index_path=index_path)
+    assert reloaded.get_stats()["notes_indexed"] == 3
+    assert [r.note.path for r in reloaded.search("virtude", limit=5)] == [r.note.path for r in baseline]
+
+    edited = _Note(Path("b.md"), "República", "virtude cívica", ["platão"], datetime(2026, 2, 1))
+    reloaded.store.close()
+    updated = Sembrain(tmp_path, [notes[0], edited], index_path=index_path)
+
+    assert updated.get_stats()["notes_indexed"] == 2
+    assert "b.md" in {str(r.note.path) for r in updated.search("virtude cívica", limit=5)}
+    assert updated.search("caverna", limit=5) == []
+
+
+def test_add_note_replaces_previous_postings(tmp_path):
+    notes = _notes()
+    brain = Sembrain(tmp_path, notes)
+
+    brain.add_note(_Note(Path("b.md"), "República", "linguagem verdade", [], datetime(2026, 3, 1)))
+
+    assert brain.get_stats()["total_notes"] == 3
+    assert brain.search("caverna", limit=5) == []
+    assert [str(r.note.path) for r in brain.search("linguagem verdade", limit=5)] == ["b.md"]
+
+
+def _assert_norms_match_rebuild(brain: Sembrain) -> None:
+    incremental = {note_id: stats[2] for note_id, stats in brain.note_stats.items()}
+    brain.rebuild_index()
+    rebuilt = {note_id: stats[2] for note_id, stats in brain.note_stats.items()}
+
+    assert incremental.keys() == rebuilt.keys()
+    for note_id, norm in rebuilt.items():
+        assert abs(incremental[note_id] - norm) < 1e-9
+
+
+def _spy_norm_passes(brain: Sembrain, monkeypatch) -> list:
+    passes = []
+    original = brain.store.iter_weighted_postings
+
+    def spy(note_ids=None):
+        passes.append(None if note_ids is None else sorted(note_ids))
+        return original(note_ids)
+
+    monkeypatch.setattr(brain.store, "iter_weighted_postings", spy)
+    return passes
+
+
+def test_incremental_update_refreshes_norms_of_notes_sharing_changed_terms(tmp_path, monkeypatch):
+    fillers = [_Note(Path(f"f{i}.md"), f"Avulsa {i}", f"tópico{chr(97 + i)} isolado{chr(97 + i)}") for i in range(10)]
+    brain = Sembrain(tmp_path, _notes() + fillers)
+    passes = _spy_norm_passes(brain, monkeypatch)
+
+    # "virtude" sai de a.md: muda o df e, portanto, a norma de c.md (não editada)
+    brain.update_notes([_Note(Path("a.md"), "Ética", "eudaimonia meio termo", [], datetime(2026, 3, 1))], [])
+
+    # Só as notas afetadas, numa única consulta
+    assert passes == [["a.md", "c.md"]]
+    _assert_norms_match_rebuild(brain)
+
+
+def test_df_change_of_a_common_term_falls_back_to_a_full_norm_pass(tmp_path, monkeypatch):
+    notes = [_Note(Path(f"n{i}.md"), f"Nota {i}", f"filosofia assunto{chr(97 + i)}") for i in range(8)]
+    brain = Sembrain(tmp_path, notes)
+    passes = _spy_norm_passes(brain, monkeypatch)
+
+    # "filosofia" sai de uma nota: o df muda para todas as outras
+    brain.update_notes([_Note(Path("n0.md"), "Nota 0", "assuntoa", [], datetime(2026, 3, 1))], [])
+
+    assert passes == [None]
+    _assert_norms_match_rebuild(brain)
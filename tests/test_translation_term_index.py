@@ -0,0 +1,67 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.modules import translation_module
+from core.modules.translation_module import TranslationAssistant, VaultTermIndex
+
+
+def _note(vault: Path, relative: str, text: str) -> Path:
+    path = vault / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_lookup_ignores_case_and_accents_and_returns_context(tmp_path: Path):
+    _note(tmp_path, "01-LEITURAS/heraclito.md", "# Heráclito\n\nintro\nO λόγος (razão) é comum a todos.\nfim\n")
+    _note(tmp_path, "02-NOTAS/heidegger.md", "Sobre o DASEIN\nDaseins Verfassung\n\nÜbermensch e Übermenschen\n")
+    index = VaultTermIndex(str(tmp_path))
+
+    greek = index.find("λογος")
+    assert greek == [{
+        "arquivo": "01-LEITURAS/heraclito.md",
+        "contexto": "\nintro\nO λόγος (razão) é comum a todos.\nfim\n",
+        "linha": 4,
+    }]
+    assert [hit["linha"] for hit in index.find("dasein")] == [1, 2]
+    assert [hit["linha"] for hit in index.find("ubermensch")] == [4]
+    assert index.find("λόγος (razão)")[0]["linha"] == 4
+    assert index.find("razão λόγος") == []
+
+
+def test_index_follows_note_changes_by_mtime(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(translation_module, "_COMPACT_MIN_DEAD", 0)
+    note = _note(tmp_path, "nota.md", "aletheia\n")
+    index = VaultTermIndex(str(tmp_path), refresh_interval=0)
+    assert len(index.find("aletheia")) == 1
+    indexed = index.stats["notes_indexed"]
+
+    # Sem mudança: nenhuma nota é relida
+    index.find("aletheia")
+    assert index.stats["notes_indexed"] == indexed
+
+    note.write_text("physis\n", encoding="utf-8")
+    stat = note.stat()
+    os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert index.find("aletheia") == [] and len(index.find("physis")) == 1
+
+    note.unlink()
+    assert index.find("physis") == []
+    # Ocorrências das versões antigas saem dos arrays na compactação
+    assert index.stats["compactions"] >= 1 and index._postings == {}
+
+
+def test_assistant_infers_translation_from_indexed_notes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(translation_module, "_TERM_INDEXES", {})
+    _note(tmp_path, "leituras/kant.md", "Kant usa Anschauung (intuição) na Estética.\n")
+    assistant = TranslationAssistant(str(tmp_path))
+
+    result = assistant.translate_term("anschauung")
+    assert result["tradução"] == "intuição"
+    assert result["notas_encontradas"][0]["arquivo"] == "leituras/kant.md"
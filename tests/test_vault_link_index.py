@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from ui.utils.vault_link_index import VaultLinkIndex
+
+
+def _write(path: Path, content: str = "# Nota\n") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_resolves_like_obsidian_with_a_single_scan(tmp_path: Path):
+    obra = tmp_path / "01-LEITURAS" / "Aristóteles" / "Ética" / "📖 Ética a Nicômaco.md"
+    capitulo = tmp_path / "01-LEITURAS" / "Aristóteles" / "Ética" / "Livro II.md"
+    outro = tmp_path / "02-ANOTAÇÕES" / "Livro II.md"
+    _write(obra, "---\naliases:\n  - EN\n  - Nicomachean Ethics\n---\n# Obra\n")
+    _write(capitulo)
+    _write(outro)
+    _write(tmp_path / ".obsidian" / "ignorada.md")
+
+    index = VaultLinkIndex(tmp_path, max_age=60)
+
+    assert index.resolve("01-LEITURAS/Aristóteles/Ética/📖 Ética a Nicômaco") == obra
+    assert index.resolve("ética a nicômaco") == obra
+    assert index.resolve("etica-a-nicomaco") == obra
+    assert index.resolve("Nicomachean Ethics|EN") == obra
+    assert index.resolve("Ética/Livro II.md") == capitulo
+    # Nome ambíguo: caminho mais curto, salvo restrição de pasta
+    assert index.resolve("Livro II") == outro
+    assert index.resolve("Livro II", within="01-LEITURAS") == capitulo
+    assert index.resolve("ignorada") is None
+    assert [path.name for path in index.notes(within=capitulo.parent)] == ["Livro II.md", "📖 Ética a Nicômaco.md"]
+
+    stats = index.get_stats()
+    # Só a varredura inicial + a forçada pelo link sem resultado
+    assert stats["scans"] == 2 and stats["parsed"] == 3 and stats["notes"] == 3
+
+
+def test_picks_up_new_renamed_and_edited_notes(tmp_path: Path):
+    first = tmp_path / "01-LEITURAS" / "Autor" / "Obra" / "Primeira.md"
+    _write(first)
+    index = VaultLinkIndex(tmp_path, max_age=60)
+    assert index.resolve("Primeira") == first
+
+    second = first.with_name("Segunda.md")
+    first.rename(second)
+    assert index.resolve("Segunda") == second
+    assert index.resolve("Primeira") is None
+
+    _write(second, "---\naliases: [Apelido]\n---\n")
+    index.invalidate()
+    assert index.resolve("Apelido") == second
+
+
+def test_broken_links_share_one_forced_rescan(tmp_path: Path):
+    _write(tmp_path / "01-LEITURAS" / "Autor" / "Obra" / "Existente.md")
+    index = VaultLinkIndex(tmp_path, max_age=60)
+
+    for missing in ("Ausente 1", "Ausente 2", "Ausente 3", "Ausente 1", "Ausente 1"):
+        assert index.resolve(missing) is None
+
+    # Varredura inicial + uma única forçada pelos links quebrados
+    assert index.get_stats()["scans"] == 2
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.glados.brain.vault_connector import VaultStructure
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _count_parses(monkeypatch) -> list[str]:
+    parsed: list[str] = []
+    original = VaultStructure._parse_note_payload
+
+    def _tracking(self, file_path, content):
+        parsed.append(file_path.name)
+        return original(self, file_path, content)
+
+    monkeypatch.setattr(VaultStructure, "_parse_note_payload", _tracking)
+    return parsed
+
+
+def test_restart_reuses_manifest_without_reparsing(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    cache = tmp_path / "cache"
+    _write(vault / "02-ANOTAÇÕES" / "aula.md", "---\ntitle: Aula 1\ntags: [etica]\n---\nVirtude e [[Republica]].\n")
+
+    first = VaultStructure(str(vault), cache_dir=str(cache))
+    note = first.get_note_by_path("02-ANOTAÇÕES/aula.md")
+    assert note.title == "Aula 1"
+    assert note.tags == ["etica"]
+    assert note.links == ["Republica"]
+
+    parsed = _count_parses(monkeypatch)
+    second = VaultStructure(str(vault), cache_dir=str(cache))
+
+    assert parsed == []
+    assert second.get_note_by_path("02-ANOTAÇÕES/aula.md").content == note.content
+
+
+def test_refresh_index_returns_only_the_delta(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    keep = vault / "02-ANOTAÇÕES" / "keep.md"
+    edit = vault / "02-ANOTAÇÕES" / "edit.md"
+    gone = vault / "02-ANOTAÇÕES" / "gone.md"
+    _write(keep, "Justica na cidade.\n")
+    _write(edit, "Texto antigo.\n")
+    _write(gone, "Caverna.\n")
+
+    structure = VaultStructure(str(vault), cache_dir=str(tmp_path / "cache"))
+    parsed = _count_parses(monkeypatch)
+
+    _write(edit, "Texto novo sobre linguagem.\n")
+    stat = edit.stat()
+    os.utime(edit, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000))
+    gone.unlink()
+
+    delta = structure.refresh_index()
+
+    assert delta == {"changed": ["02-ANOTAÇÕES/edit.md"], "removed": ["02-ANOTAÇÕES/gone.md"]}
+    assert parsed == ["edit.md"]
+    assert structure.get_note_by_path("02-ANOTAÇÕES/gone.md") is None
+    assert [note.path.name for note in structure.search_notes("linguagem")] == ["edit.md"]
+
+
+def test_unchanged_rescan_reads_no_manifest_payloads(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    edit = vault / "02-ANOTAÇÕES" / "edit.md"
+    _write(vault / "02-ANOTAÇÕES" / "keep.md", "Justica na cidade.\n")
+    _write(edit, "Texto antigo.\n")
+    structure = VaultStructure(str(vault), cache_dir=str(tmp_path / "cache"))
+
+    loaded: list[list[str]] = []
+    original = structure.manifest.load
+
+    def _tracking(rel_paths=None):
+        rel_paths = None if rel_paths is None else list(rel_paths)
+        loaded.append(rel_paths)
+        return original(rel_paths)
+
+    monkeypatch.setattr(structure.manifest, "load", _tracking)
+
+    assert structure.refresh_index(verbose=False) == {"changed": [], "removed": []}
+    assert loaded == []
+
+    _write(edit, "Texto novo.\n")
+    stat = edit.stat()
+    os.utime(edit, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000))
+
+    assert structure.refresh_index(verbose=False)["changed"] == ["02-ANOTAÇÕES/edit.md"]
+    assert loaded == [["02-ANOTAÇÕES/edit.md"]]
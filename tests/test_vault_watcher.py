@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.llm.glados.brain.vault_connector import VaultStructure
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+def test_apply_file_changes_handles_create_rename_and_delete(tmp_path):
+    vault = tmp_path / "vault"
+    old = vault / "02-ANOTAÇÕES" / "velha.md"
+    _write(old, "Alegoria da caverna.\n")
+    structure = VaultStructure(str(vault), cache_dir=str(tmp_path / "cache"))
+
+    new = vault / "02-ANOTAÇÕES" / "nova.md"
+    old.rename(new)
+    created = vault / "02-ANOTAÇÕES" / "criada.md"
+    _write(created, "Teoria das formas.\n")
+
+    delta = structure.apply_file_changes([new, created], [old])
+
+    assert sorted(delta["changed"]) == ["02-ANOTAÇÕES/criada.md", "02-ANOTAÇÕES/nova.md"]
+    assert delta["removed"] == ["02-ANOTAÇÕES/velha.md"]
+    assert [note.path.name for note in structure.search_notes("caverna")] == ["nova.md"]
+    assert structure.semantic_search.get_stats()["notes_indexed"] == len(structure.notes_cache)
+
+
+def test_polling_watcher_makes_new_notes_searchable(tmp_path):
+    vault = tmp_path / "vault"
+    _write(vault / "02-ANOTAÇÕES" / "base.md", "Justica.\n")
+    structure = VaultStructure(str(vault), cache_dir=str(tmp_path / "cache"))
+    assert structure.start_watching(use_polling=True)
+    structure.watcher.poll_interval = 0.2
+    try:
+        _write(vault / "02-ANOTAÇÕES" / "nova.md", "Linguagem e verdade.\n")
+        assert _wait_for(lambda: structure.get_note_by_path("02-ANOTAÇÕES/nova.md") is not None)
+        assert [note.path.name for note in structure.search_notes("linguagem")] == ["nova.md"]
+    finally:
+        structure.stop_watching()
+
+
+def test_concurrent_index_updates_do_not_lose_notes(tmp_path):
+    import threading
+
+    vault = tmp_path / "vault"
+    folder = vault / "02-ANOTAÇÕES"
+    _write(folder / "base.md", "Justica.\n")
+    structure = VaultStructure(str(vault), cache_dir=str(tmp_path / "cache"))
+
+    watched = [folder / f"watch-{i}.md" for i in range(20)]
+    added = [folder / f"ui-{i}.md" for i in range(20)]
+    for path in watched + added:
+        _write(path, f"Nota {path.stem}.\n")
+
+    def _watcher():
+        for path in watched:
+            structure.apply_file_changes([path], [])
+
+    def _ui():
+        for path in added:
+            structure.add_note_to_index(path)
+
+    threads = [threading.Thread(target=_watcher), threading.Thread(target=_ui)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for path in watched + added:
+        assert structure.get_note_by_path(str(path.relative_to(vault))) is not None
@@ -915,6 +915,7 @@ class AgendaController(QObject):
                 created.discipline = event_data.get("discipline")
             if created and "description" in event_data and hasattr(created, "metadata"):
                 created.metadata["description"] = event_data.get("description")
+                self.agenda_manager.events.mark_dirty(created.id)
             if created:
                 self.agenda_manager._save_events()
             created_data = created.to_dict() if created and hasattr(created, "to_dict") else {"id": event_id}
@@ -1018,6 +1019,7 @@ class AgendaController(QObject):
                 for key in ("description", "notes"):
                     if key in updates:
                         event.metadata[key] = updates[key]
+                        self.agenda_manager.events.mark_dirty(event_id)
 
             self.agenda_manager._save_events()
             self._invalidate_agenda_cache()
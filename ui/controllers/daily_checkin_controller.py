@@ -71,14 +71,13 @@ class DailyCheckinController(QObject):
             self._morning_done_today = False
             self._evening_done_today = False
 
-            # Carregar check-ins existentes para hoje
-            for checkin in self.checkin_system.checkins.values():
-                if checkin.date == today:
-                    checkin_type = self._infer_checkin_type(checkin)
-                    if checkin_type == "morning":
-                        self._morning_done_today = True
-                    elif checkin_type == "evening":
-                        self._evening_done_today = True
+            # Carregar check-ins existentes para hoje (índice por data)
+            for checkin in self.checkin_system.get_checkins_for_date(today):
+                checkin_type = self._infer_checkin_type(checkin)
+                if checkin_type == "morning":
+                    self._morning_done_today = True
+                elif checkin_type == "evening":
+                    self._evening_done_today = True
 
     def _infer_checkin_type(self, checkin) -> str:
         """Infere tipo do check-in a partir de notas e horário."""
@@ -5,6 +5,7 @@ Controladora principal para assistente GLaDOS com integração completa do backe
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QThread, QTimer
 from PyQt6.QtGui import QImage, QPixmap
 import logging
+import time
 import traceback
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
@@ -13,6 +14,12 @@ import json
 # Importações do backend completo
 from core.config.settings import settings
 from core.llm.backend_router import llm as backend_llm
+from core.llm.scheduler import (
+    PRIORITY_INTERACTIVE,
+    LLMQueueFull,
+    LLMRequestCancelled,
+    get_llm_scheduler,
+)
 from core.llm.glados.personality import create_personality_voice
 from core.llm.glados.brain.vault_connector import VaultStructure
 from core.llm.glados.models.tinyllama_wrapper import TinyLlamaGlados
@@ -46,12 +53,14 @@ class BackendWorker(QThread):
     task_completed = pyqtSignal(object)
     task_failed = pyqtSignal(str, str)  # (error_type, error_message)
     progress_updated = pyqtSignal(int, str)  # (percent, message)
+    token_received = pyqtSignal(str, str)  # (delta, texto acumulado)
     
     def __init__(self, task_type: str, task_data: Dict, parent=None):
         super().__init__(parent)
         self.task_type = task_type
         self.task_data = task_data
         self.is_running = True
+        self._streamed_text = ""
     
     def run(self):
         """Executa a tarefa na thread"""
@@ -91,12 +100,14 @@ class BackendWorker(QThread):
 
         self.progress_updated.emit(10, "Consultando o cérebro de GLaDOS...")
 
-        # Gerar resposta usando backend completo
+        # Gerar resposta usando backend completo (tokens chegam via token_received)
+        stream_callback = self._on_stream_chunk if self.task_data.get("stream", True) else None
         result = backend_llm.generate(
             query=query,
             user_name=user_name,
             use_semantic=use_semantic,
             request_metadata=request_metadata,
+            stream_callback=stream_callback,
         )
         
         self.progress_updated.emit(90, "Formando resposta no estilo GLaDOS...")
@@ -112,6 +123,14 @@ class BackendWorker(QThread):
 
         return result
     
+    def _on_stream_chunk(self, delta: str) -> bool:
+        """Repassa trecho gerado para a UI; False interrompe a geração"""
+        if not self.is_running:
+            return False
+        self._streamed_text += delta
+        self.token_received.emit(delta, self._streamed_text)
+        return True
+    
     def _run_vault_search(self) -> Dict:
         """Busca no vault do Obsidian"""
         query = self.task_data.get("query", "")
@@ -247,6 +266,7 @@ class GladosController(QObject):
     
     # Sinais para UI
     response_ready = pyqtSignal(dict)  # Resposta completa do LLM
+    response_chunk = pyqtSignal(dict)  # Trecho parcial (streaming): delta, text, request_metadata
     vault_results_ready = pyqtSignal(dict)  # Resultados da busca no vault
     semantic_context_ready = pyqtSignal(dict)  # Contexto semântico
     brain_analysis_ready = pyqtSignal(dict)  # Análise do cérebro
@@ -262,6 +282,9 @@ class GladosController(QObject):
     # Sinais de personalidade
     personality_updated = pyqtSignal(dict)
     voice_tone_changed = pyqtSignal(float, bool)  # (intensity, sarcasm_enabled)
+
+    # Conclusão de pedido da fila da LLM (vem da thread da fila)
+    _llm_ticket_finished = pyqtSignal(object)
     
     def __init__(self, vault_path: Optional[str] = None):
         super().__init__()
@@ -278,6 +301,11 @@ class GladosController(QObject):
         
         # Workers ativos
         self.active_workers: Dict[str, BackendWorker] = {}
+
+        # Perguntas à LLM passam pela fila priorizada compartilhada
+        self.llm_scheduler = get_llm_scheduler()
+        self.pending_llm_requests: List[Any] = []
+        self._llm_ticket_finished.connect(self._on_llm_ticket_finished)
         
         # Histórico de conversa
         self.conversation_history: List[Dict] = []
@@ -379,32 +407,78 @@ class GladosController(QObject):
         user_name: str = "Helio",
         request_metadata: Optional[Dict[str, Any]] = None,
     ):
-        """Envia pergunta para GLaDOS (backend completo)"""
+        """
+        Envia pergunta para GLaDOS (backend completo) pela fila da LLM.
+
+        ``request_metadata`` aceita ``priority`` (``interactive``/``normal``/
+        ``background``; padrão interativo) e ``supersede_key``. Sem chave
+        explícita, uma pergunta nova na mesma conversa (``view`` +
+        ``conversation``) cancela a anterior ainda pendente. Em ``background``
+        o ``response_chunk`` chega de uma vez ao final, porque o lote pode ser
+        interrompido e refeito.
+        """
 
         # Adicionar ao histórico
         self._add_to_conversation("user", question)
-        
-        # Criar worker para processamento
-        task_id = f"llm_{len(self.active_workers)}"
-        worker = BackendWorker(
-            task_type="llm_generate",
-            task_data={
-                "query": question,
-                "use_semantic": use_semantic,
-                "user_name": user_name,
-                "request_metadata": request_metadata or {},
-            }
-        )
-        
-        # Conectar sinais
-        worker.task_completed.connect(self._handle_llm_response)
-        worker.task_failed.connect(self._handle_worker_error)
-        worker.progress_updated.connect(self.processing_progress)
-        
-        # Armazenar e iniciar
-        self.active_workers[task_id] = worker
+
+        metadata = dict(request_metadata or {})
+        priority = metadata.get("priority", PRIORITY_INTERACTIVE)
+        supersede_key = str(metadata.get("supersede_key") or "").strip()
+        if not supersede_key and metadata.get("view") and metadata.get("conversation"):
+            supersede_key = f"{metadata['view']}:{metadata['conversation']}"
+
+        streamed = {"text": ""}
+
+        def _on_stream_chunk(delta: str) -> bool:
+            # Thread da fila: o sinal chega à UI por conexão enfileirada
+            streamed["text"] += delta
+            self.response_chunk.emit({"delta": delta, "text": streamed["text"], "request_metadata": metadata})
+            return True
+
         self.processing_started.emit("llm_generate", f"GLaDOS processando: '{question[:50]}...'")
-        worker.start()
+        try:
+            ticket = self.llm_scheduler.submit(
+                question,
+                user_name=user_name,
+                use_semantic=use_semantic,
+                request_metadata=metadata,
+                stream_callback=_on_stream_chunk,
+                priority=priority,
+                supersede_key=supersede_key,
+            )
+        except (LLMQueueFull, LLMRequestCancelled) as e:
+            self._handle_worker_error(type(e).__name__, str(e))
+            return
+
+        self.pending_llm_requests.append(ticket)
+        self.processing_progress.emit(10, "Consultando o cérebro de GLaDOS...")
+        ticket.add_done_callback(self._llm_ticket_finished.emit)
+
+    def _on_llm_ticket_finished(self, ticket):
+        """Entrega na thread da UI o desfecho de um pedido da fila."""
+        if ticket in self.pending_llm_requests:
+            self.pending_llm_requests.remove(ticket)
+        if ticket.cancelled:
+            # Pedido substituído/cancelado: quem pediu já seguiu adiante
+            logger.info("Pedido LLM cancelado: %s", ticket.error)
+            return
+        if ticket.error is not None:
+            error = ticket.error
+            self._handle_worker_error(type(error).__name__, f"{type(error).__name__}: {error}")
+            return
+
+        result = ticket.result()
+        self.processing_progress.emit(90, "Formando resposta no estilo GLaDOS...")
+        query = ticket.query
+        result["backend_operation"] = {
+            "task_type": "llm_generate",
+            "query_length": len(query),
+            "response_length": len(result.get("text", "")),
+            "semantic_used": result.get("semantic_context_used", False),
+            "request_metadata": ticket.request_metadata,
+            "latency_ms": round((time.monotonic() - ticket.submitted_at) * 1000.0, 1),
+        }
+        self._handle_llm_response(result)
     
     def _handle_llm_response(self, result: Dict):
         """Processa resposta do LLM"""
@@ -717,6 +791,7 @@ class GladosController(QObject):
                     "active_workers": len(self.active_workers),
                     "worker_types": list(self.active_workers.keys())
                 },
+                "llm_queue": self.llm_scheduler.get_stats(),
                 "ui_cache": {
                     "cached_items": len(self.ui_cache.get("quick_responses", {})),
                     "recent_queries": len(self.ui_cache.get("recent_queries", []))
@@ -766,6 +841,9 @@ class GladosController(QObject):
                 worker.wait()
         
         self.active_workers.clear()
+        for ticket in list(self.pending_llm_requests):
+            ticket.cancel("workers parados")
+        self.pending_llm_requests.clear()
         logger.info("Todos os workers foram parados")
 
 
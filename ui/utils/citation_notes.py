@@ -3,11 +3,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import json
+import os
 from pathlib import Path
 import re
+import tempfile
 import unicodedata
 import uuid
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 from ui.utils.class_notes import load_discipline_works
 from ui.utils.discipline_links import (
@@ -23,6 +25,8 @@ DISCIPLINE_DIR = "05-DISCIPLINAS"
 READINGS_DIR = "01-LEITURAS"
 MINDMAPS_DIR = "04-MAPAS MENTAIS"
 CITATIONS_SUBDIR = "Citações"
+RESOURCES_DIR = "06-RECURSOS"
+BACKFILL_MANIFEST_NAME = "citation_notes_backfill.json"
 
 
 @dataclass(frozen=True)
@@ -751,29 +755,127 @@ def ensure_citations_note_for_book(
     }
 
 
-def backfill_citation_notes(vault_root: Path) -> Dict[str, Any]:
+def _latest_mtime_ns(directory: Path, *, suffix: str = "") -> int:
+    """Maior mtime entre a pasta e suas entradas diretas (0 se não existir)."""
+    try:
+        latest = directory.stat().st_mtime_ns
+    except OSError:
+        return 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if suffix and not entry.name.lower().endswith(suffix):
+                    continue
+                try:
+                    latest = max(latest, entry.stat(follow_symlinks=False).st_mtime_ns)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return latest
+
+
+def _load_backfill_manifest(manifest_path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_backfill_manifest(manifest_path: Path, manifest: Dict[str, Any]) -> None:
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{manifest_path.name}.", suffix=".tmp", dir=str(manifest_path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, ensure_ascii=False, indent=2)
+        os.replace(temp_name, manifest_path)
+    except Exception:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _list_book_dirs(readings_dir: Path) -> list[Path]:
+    book_dirs: list[Path] = []
+    for author_dir in sorted(readings_dir.iterdir(), key=lambda path: path.name.lower()):
+        if not author_dir.is_dir():
+            continue
+        for book_dir in sorted(author_dir.iterdir(), key=lambda path: path.name.lower()):
+            if book_dir.is_dir():
+                book_dirs.append(book_dir)
+    return book_dirs
+
+
+def backfill_citation_notes(
+    vault_root: Path,
+    *,
+    incremental: bool = True,
+    progress_callback: Optional[Callable[[int, int, str], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Garante a nota de citações de cada obra em 01-LEITURAS.
+
+    Com ``incremental``, um manifesto em 06-RECURSOS guarda o mtime de cada
+    pasta de livro e só as obras alteradas (ou cuja disciplina mudou) são
+    reprocessadas. ``progress_callback(feitos, total, obra)`` é chamado a cada
+    obra; retornar ``False`` interrompe (o progresso já feito fica salvo).
+    """
     root = Path(vault_root).expanduser().resolve(strict=False)
     readings_dir = root / READINGS_DIR
     if not readings_dir.exists():
-        return {"processed_books": 0, "created_notes": 0, "updated_notes": 0, "disciplines_linked": 0, "canvas_updates": 0}
+        return {
+            "processed_books": 0,
+            "created_notes": 0,
+            "updated_notes": 0,
+            "disciplines_linked": 0,
+            "canvas_updates": 0,
+            "skipped_books": 0,
+            "interrupted": False,
+        }
+
+    manifest_path = root / RESOURCES_DIR / BACKFILL_MANIFEST_NAME
+    manifest = _load_backfill_manifest(manifest_path) if incremental else {}
+    known_books: Dict[str, Dict[str, Any]] = dict(manifest.get("books") or {})
+    disciplines_signature = _latest_mtime_ns(root / DISCIPLINE_DIR, suffix=".md")
+    disciplines_changed = manifest.get("disciplines_signature") != disciplines_signature
+
+    discipline_index: Optional[Dict[str, tuple[str, Path]]] = None
+    if disciplines_changed:
+        discipline_index = _build_discipline_book_index(root)
+
+    book_dirs = _list_book_dirs(readings_dir)
+    books: Dict[str, Dict[str, Any]] = {}
+    pending: list[tuple[str, Path]] = []
+    for book_dir in book_dirs:
+        key = str(book_dir.relative_to(root)).replace("\\", "/")
+        entry = known_books.get(key)
+        if entry is not None:
+            books[key] = entry
+        if entry is None or entry.get("signature") != _latest_mtime_ns(book_dir):
+            pending.append((key, book_dir))
+            continue
+        if discipline_index is not None and entry.get("primary"):
+            matched = discipline_index.get(str(entry["primary"]))
+            if (matched[0] if matched else "") != str(entry.get("discipline") or ""):
+                pending.append((key, book_dir))
+
+    if pending and discipline_index is None:
+        discipline_index = _build_discipline_book_index(root)
 
-    discipline_index = _build_discipline_book_index(root)
     processed_books = 0
     created_notes = 0
     updated_notes = 0
     disciplines_linked = 0
     canvas_updates = 0
+    interrupted = False
 
-    for author_dir in sorted(readings_dir.iterdir(), key=lambda path: path.name.lower()):
-        if not author_dir.is_dir():
-            continue
-        for book_dir in sorted(author_dir.iterdir(), key=lambda path: path.name.lower()):
-            if not book_dir.is_dir():
-                continue
-            primary = find_primary_book_note(book_dir)
-            if primary is None or not primary.exists():
-                continue
-
+    for done, (key, book_dir) in enumerate(pending, start=1):
+        primary = find_primary_book_note(book_dir)
+        entry: Dict[str, Any] = {"primary": "", "discipline": ""}
+        if primary is not None and primary.exists():
             processed_books += 1
             result = ensure_citations_note_for_book(
                 root,
@@ -789,6 +891,27 @@ def backfill_citation_notes(vault_root: Path) -> Dict[str, Any]:
                 disciplines_linked += 1
             if bool(result.get("linked_in_canvas")):
                 canvas_updates += 1
+            entry = {
+                "primary": str(primary.resolve(strict=False)),
+                "discipline": str(result.get("discipline") or ""),
+            }
+        # Assinatura depois de escrever: a própria nota de citações altera a pasta
+        entry["signature"] = _latest_mtime_ns(book_dir)
+        books[key] = entry
+
+        if progress_callback is not None and progress_callback(done, len(pending), book_dir.name) is False:
+            interrupted = True
+            break
+
+    manifest = {
+        # Interrompido: a próxima execução ainda precisa comparar as disciplinas
+        "disciplines_signature": None if interrupted else _latest_mtime_ns(root / DISCIPLINE_DIR, suffix=".md"),
+        "books": books,
+    }
+    try:
+        _save_backfill_manifest(manifest_path, manifest)
+    except Exception:
+        pass
 
     return {
         "processed_books": processed_books,
@@ -796,4 +919,6 @@ def backfill_citation_notes(vault_root: Path) -> Dict[str, Any]:
         "updated_notes": updated_notes,
         "disciplines_linked": disciplines_linked,
         "canvas_updates": canvas_updates,
+        "skipped_books": len(book_dirs) - len(pending),
+        "interrupted": interrupted,
     }
@@ -9,6 +9,7 @@ import unicodedata
 from typing import Any, Optional
 
 from ui.utils.discipline_links import find_primary_book_note, get_discipline_annotation_dir
+from ui.utils.vault_link_index import get_vault_link_index
 
 
 CLASS_NOTES_DIR = "02-ANOTAÇÕES"
@@ -109,44 +110,7 @@ def _resolve_obsidian_target(vault_root: Path, target: str) -> Optional[Path]:
 
 
 def _resolve_obsidian_target_fallback(vault_root: Path, target: str) -> Optional[Path]:
-    target_path = Path(target)
-    target_name = target_path.name or target
-    target_stem = Path(target_name).stem.strip()
-    normalized_target = _normalize_token(target_stem)
-    reading_root = vault_root / "01-LEITURAS"
-    if not reading_root.exists():
-        return None
-
-    candidates = []
-    for note_path in reading_root.rglob("*.md"):
-        if not note_path.is_file():
-            continue
-        rel = str(note_path.relative_to(vault_root).with_suffix("")).replace("\\", "/")
-        stem = note_path.stem.strip()
-        stem_no_prefix = stem.removeprefix("📖 ").strip()
-        rel_norm = _normalize_token(rel)
-        stem_norm = _normalize_token(stem)
-        stem_no_prefix_norm = _normalize_token(stem_no_prefix)
-
-        score = 0
-        if rel.endswith(target):
-            score += 120
-        if stem == target_stem or stem_no_prefix == target_stem:
-            score += 100
-        if normalized_target and normalized_target in {stem_norm, stem_no_prefix_norm}:
-            score += 90
-        if normalized_target and normalized_target == rel_norm.split("/")[-1]:
-            score += 70
-        if note_path.name.startswith("📖 "):
-            score += 20
-        if score > 0:
-            candidates.append((score, note_path))
-
-    if not candidates:
-        return None
-
-    candidates.sort(key=lambda item: (-item[0], str(item[1])))
-    return candidates[0][1]
+    return get_vault_link_index(vault_root).resolve(target, within="01-LEITURAS")
 
 
 def _vault_target(vault_root: Path, note_abs: Path) -> str:
@@ -156,8 +120,8 @@ def _vault_target(vault_root: Path, note_abs: Path) -> str:
 def _collect_work_note_targets(vault_root: Path, work_dir_abs: Path, primary_note_abs: Path) -> tuple[str, ...]:
     targets: list[str] = []
     seen: set[str] = set()
-    for candidate in sorted(work_dir_abs.rglob("*.md")):
-        if not candidate.is_file() or candidate.resolve(strict=False) == primary_note_abs.resolve(strict=False):
+    for candidate in get_vault_link_index(vault_root).notes(within=work_dir_abs):
+        if candidate.resolve(strict=False) == primary_note_abs.resolve(strict=False):
             continue
         target = _vault_target(vault_root, candidate)
         if not target or target in seen:
@@ -0,0 +1,205 @@
+"""Miniaturas de capas em cache no disco, geradas fora da thread da UI."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QRect, QRunnable, QSize, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QImage, QImageReader, QPainter
+
+
+logger = logging.getLogger("GLaDOS.UI.CoverThumbnails")
+
+THUMBNAIL_SIZE = QSize(170, 230)
+COVER_FILENAMES = (
+    "cover.jpg",
+    "cover.jpeg",
+    "cover.png",
+    "cover.webp",
+    "capa.jpg",
+    "capa.jpeg",
+    "capa.png",
+    "capa.webp",
+)
+
+
+def find_cover_file(book_dir: Path) -> Optional[Path]:
+    for filename in COVER_FILENAMES:
+        path = book_dir / filename
+        if path.exists() and path.is_file():
+            return path
+    return None
+
+
+def create_blank_cover(cover_path: Path, title: str) -> None:
+    """Capa branca com o título (QImage: pode rodar em thread de trabalho)."""
+    image = QImage(680, 920, QImage.Format.Format_ARGB32)
+    image.fill(QColor("#FFFFFF"))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    frame_rect = image.rect().adjusted(18, 18, -18, -18)
+    painter.setPen(QColor("#C6CDD6"))
+    painter.drawRoundedRect(frame_rect, 20, 20)
+
+    title_rect = frame_rect.adjusted(50, 80, -50, -80)
+    painter.setPen(QColor("#1F2933"))
+    painter.setFont(QFont("Georgia", 44, QFont.Weight.Bold))
+    text_flags = int(Qt.AlignmentFlag.AlignCenter) | int(Qt.TextFlag.TextWordWrap)
+    painter.drawText(title_rect, text_flags, str(title or "Livro"))
+    painter.end()
+    image.save(str(cover_path), "PNG")
+
+
+def ensure_cover_file(book_dir: Path, title: str) -> Optional[Path]:
+    cover_path = find_cover_file(book_dir)
+    if cover_path:
+        return cover_path
+
+    generated_cover = book_dir / "cover.png"
+    try:
+        create_blank_cover(generated_cover, title)
+        if generated_cover.exists() and generated_cover.is_file():
+            return generated_cover
+    except Exception as exc:
+        logger.warning("Falha ao gerar capa placeholder para %s: %s", book_dir, exc)
+    return None
+
+
+def default_thumbnail_dir() -> Path:
+    try:
+        from core.config.settings import settings as core_settings
+
+        cache_dir = str(getattr(getattr(core_settings, "paths", None), "cache_dir", "") or "").strip()
+        if cache_dir:
+            return Path(cache_dir).expanduser() / "cover_thumbnails"
+    except Exception:
+        pass
+    return Path.home() / ".cache" / "glados" / "cover_thumbnails"
+
+
+class CoverThumbnailStore:
+    """Miniaturas pré-escaladas no disco, chaveadas por caminho+mtime+tamanho da capa."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, size: QSize = THUMBNAIL_SIZE):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_thumbnail_dir()
+        self.size = QSize(size)
+
+    def key_for(self, cover_path: Path) -> Optional[str]:
+        try:
+            stat = cover_path.stat()
+        except OSError:
+            return None
+        identity = (
+            f"{cover_path.resolve(strict=False)}|{stat.st_mtime_ns}|{stat.st_size}|"
+            f"{self.size.width()}x{self.size.height()}"
+        )
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    def thumbnail(self, cover_path: Path) -> Optional[QImage]:
+        """Miniatura da capa; gera e grava no cache quando ainda não existe."""
+        key = self.key_for(cover_path)
+        if key is None:
+            return None
+        cached_path = self.cache_dir / f"{key}.png"
+        if cached_path.exists():
+            image = QImage(str(cached_path))
+            if not image.isNull():
+                return image
+
+        image = self._scaled_cover(cover_path)
+        if image is None:
+            return None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = cached_path.with_name(f".{cached_path.name}.{os.getpid()}.tmp")
+            if image.save(str(temp_path), "PNG"):
+                os.replace(temp_path, cached_path)
+        except OSError as exc:
+            logger.debug("Falha ao gravar miniatura de %s: %s", cover_path, exc)
+        return image
+
+    def _scaled_cover(self, cover_path: Path) -> Optional[QImage]:
+        reader = QImageReader(str(cover_path))
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        if source_size.isValid() and not source_size.isEmpty():
+            # Decodifica já reduzido (JPEG reduz no próprio decoder)
+            target = source_size.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+            if target.width() < source_size.width():
+                reader.setScaledSize(target)
+        image = reader.read()
+        if image.isNull():
+            return None
+
+        image = image.scaled(
+            self.size,
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        # Recorte central: mesmo enquadramento do QLabel de tamanho fixo
+        x = max(0, (image.width() - self.size.width()) // 2)
+        y = max(0, (image.height() - self.size.height()) // 2)
+        return image.copy(QRect(x, y, self.size.width(), self.size.height()))
+
+
+class _ThumbnailJob(QRunnable):
+    def __init__(self, loader: "CoverThumbnailLoader", request_key: str, book_dir: Path, title: str):
+        super().__init__()
+        self.loader = loader
+        self.request_key = request_key
+        self.book_dir = book_dir
+        self.title = title
+
+    def run(self):
+        image = QImage()
+        try:
+            cover_path = ensure_cover_file(self.book_dir, self.title)
+            if cover_path is not None:
+                image = self.loader.store.thumbnail(cover_path) or QImage()
+        except Exception as exc:
+            logger.debug("Falha ao carregar capa de %s: %s", self.book_dir, exc)
+        try:
+            # Sinal de objeto da thread da UI: entregue lá via fila de eventos
+            self.loader._job_finished.emit(self.request_key, image)
+        except RuntimeError:
+            # Loader destruído (view fechada) enquanto a miniatura era gerada
+            pass
+
+
+class CoverThumbnailLoader(QObject):
+    """Fila de miniaturas num pool de threads; emite ``thumbnail_ready`` na thread da UI."""
+
+    thumbnail_ready = pyqtSignal(str, QImage)  # (chave do pedido, miniatura; nula se falhou)
+    _job_finished = pyqtSignal(str, QImage)
+
+    def __init__(self, store: Optional[CoverThumbnailStore] = None, max_threads: int = 2, parent=None):
+        super().__init__(parent)
+        self.store = store or CoverThumbnailStore()
+        # Sem pai: o pool não é destruído junto do loader com tarefas em andamento
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(1, int(max_threads)))
+        self._pending: set[str] = set()
+        self._job_finished.connect(self._on_job_finished)
+
+    def request(self, request_key: str, book_dir: Path, title: str) -> bool:
+        """Enfileira a miniatura da obra; ignora pedidos já em andamento."""
+        if request_key in self._pending:
+            return False
+        self._pending.add(request_key)
+        self.pool.start(_ThumbnailJob(self, request_key, Path(book_dir), title))
+        return True
+
+    def is_pending(self, request_key: str) -> bool:
+        return request_key in self._pending
+
+    def _on_job_finished(self, request_key: str, image: QImage):
+        self._pending.discard(request_key)
+        self.thumbnail_ready.emit(request_key, image)
+
+    def shutdown(self, wait_ms: int = 2000):
+        self.pool.clear()
+        self.pool.waitForDone(wait_ms)
@@ -10,6 +10,7 @@ from collections import Counter
 from typing import Any, Iterable, Optional
 
 from ui.utils.class_notes import WorkMaterial, load_discipline_works
+from ui.utils.vault_link_index import get_vault_link_index
 
 
 _STOPWORDS = {
@@ -631,7 +632,7 @@ def _resolve_target_path(vault_root: Path, target: str) -> Optional[Path]:
         full = full.resolve(strict=False)
         if full.exists() and full.is_file():
             return full
-    return None
+    return get_vault_link_index(vault_root).resolve(cleaned)
 
 
 def _searchable_text(note: ScopedVaultNote) -> str:
@@ -0,0 +1,332 @@
+"""Índice compartilhado para resolver [[wikilinks]] do vault sem varrer a árvore a cada link."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+
+# Pastas que o Obsidian não indexa como notas
+_SKIPPED_DIRS = {".obsidian", ".trash", ".git"}
+# Frontmatter costuma caber aqui; evita ler capítulos inteiros só pelos aliases
+_FRONTMATTER_READ_BYTES = 8192
+
+
+def _normalize_token(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", str(value or "").strip())
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    normalized = re.sub(r"[^a-zA-Z0-9]+", "-", normalized).strip("-").lower()
+    return normalized
+
+
+def _parse_aliases(head: str) -> tuple[str, ...]:
+    if not head.startswith("---"):
+        return ()
+    parts = head.split("---", 2)
+    if len(parts) < 3:
+        return ()
+
+    aliases: list[str] = []
+    in_list = False
+    for line in parts[1].splitlines():
+        stripped = line.strip()
+        if in_list and stripped.startswith("- "):
+            aliases.append(stripped[2:].strip().strip("'\""))
+            continue
+        in_list = False
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        if key.strip().lower() not in {"aliases", "alias"}:
+            continue
+        value = value.strip()
+        if not value:
+            in_list = True
+        elif value.startswith("[") and value.endswith("]"):
+            aliases.extend(item.strip().strip("'\"") for item in value[1:-1].split(","))
+        else:
+            aliases.append(value.strip("'\""))
+    return tuple(dict.fromkeys(alias for alias in aliases if alias))
+
+
+@dataclass(frozen=True)
+class IndexedNote:
+    """Nota indexada com as chaves usadas na resolução."""
+
+    path: Path
+    target: str
+    mtime_ns: int
+    aliases: tuple[str, ...]
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem.strip()
+
+    @property
+    def stem_no_prefix(self) -> str:
+        return self.stem.removeprefix("📖 ").strip()
+
+
+class VaultLinkIndex:
+    """
+    Mapeia caminho relativo, nome, nome normalizado e aliases -> nota.
+
+    A árvore é revarrida no máximo a cada ``max_age`` segundos; só notas
+    novas ou com mtime alterado são reprocessadas. Um link sem resultado
+    (ou apontando para nota apagada) força uma revarredura antes de desistir,
+    mas no máximo uma por ``max_age``: uma página cheia de links quebrados
+    custa uma varredura, não uma por link.
+    """
+
+    def __init__(self, vault_root: Path, *, max_age: float = 2.0):
+        self.vault_root = Path(vault_root)
+        self.max_age = max(0.0, float(max_age))
+        self._lock = threading.RLock()
+        self._notes: dict[str, IndexedNote] = {}
+        self._by_path: dict[str, str] = {}
+        self._by_name: dict[str, set[str]] = {}
+        self._by_token: dict[str, set[str]] = {}
+        self._by_alias: dict[str, set[str]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._forced_at: Optional[float] = None
+        self.stats = {"scans": 0, "parsed": 0, "lookups": 0}
+
+    # ------------------------------------------------------------------
+    # Manutenção
+    # ------------------------------------------------------------------
+    def invalidate(self) -> None:
+        """Força revarredura na próxima consulta."""
+        with self._lock:
+            self._refreshed_at = None
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Sincroniza o índice com o disco; retorna True se algo mudou."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.max_age:
+                return False
+            self._refreshed_at = now
+            self.stats["scans"] += 1
+
+            seen: dict[str, int] = {}
+            for file_path, mtime_ns in self._walk():
+                seen[file_path] = mtime_ns
+
+            changed = False
+            for key in list(self._notes):
+                if key not in seen:
+                    self._drop(key)
+                    changed = True
+            for key, mtime_ns in seen.items():
+                current = self._notes.get(key)
+                if current is not None and current.mtime_ns == mtime_ns:
+                    continue
+                if current is not None:
+                    self._drop(key)
+                self._add(key, mtime_ns)
+                changed = True
+            return changed
+
+    def _walk(self):
+        if not self.vault_root.is_dir():
+            return
+        pending = [str(self.vault_root)]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name in _SKIPPED_DIRS:
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.name.lower().endswith(".md") and entry.is_file():
+                                yield entry.path, entry.stat().st_mtime_ns
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _add(self, key: str, mtime_ns: int) -> None:
+        path = Path(key)
+        try:
+            relative = path.relative_to(self.vault_root)
+        except ValueError:
+            return
+        aliases: tuple[str, ...] = ()
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+                aliases = _parse_aliases(handle.read(_FRONTMATTER_READ_BYTES))
+        except OSError:
+            pass
+        self.stats["parsed"] += 1
+
+        note = IndexedNote(
+            path=path,
+            target=str(relative.with_suffix("")).replace("\\", "/"),
+            mtime_ns=mtime_ns,
+            aliases=aliases,
+        )
+        self._notes[key] = note
+        self._by_path[note.target.lower()] = key
+        for name in {note.stem.lower(), note.stem_no_prefix.lower()}:
+            self._by_name.setdefault(name, set()).add(key)
+        for token in self._tokens(note):
+            self._by_token.setdefault(token, set()).add(key)
+        for alias in aliases:
+            self._by_alias.setdefault(alias.lower(), set()).add(key)
+
+    def _drop(self, key: str) -> None:
+        note = self._notes.pop(key, None)
+        if note is None:
+            return
+        if self._by_path.get(note.target.lower()) == key:
+            self._by_path.pop(note.target.lower(), None)
+        buckets = (
+            (self._by_name, {note.stem.lower(), note.stem_no_prefix.lower()}),
+            (self._by_token, self._tokens(note)),
+            (self._by_alias, {alias.lower() for alias in note.aliases}),
+        )
+        for mapping, names in buckets:
+            for name in names:
+                keys = mapping.get(name)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    mapping.pop(name, None)
+
+    @staticmethod
+    def _tokens(note: IndexedNote) -> set[str]:
+        tokens = {_normalize_token(note.stem), _normalize_token(note.stem_no_prefix), _normalize_token(note.target)}
+        tokens.discard("")
+        return tokens
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def notes(self, *, within: Optional[Path] = None) -> list[Path]:
+        """Notas do vault (ou abaixo de ``within``), em ordem de caminho."""
+        with self._lock:
+            self.refresh()
+            prefix = ""
+            if within is not None:
+                try:
+                    relative = Path(os.path.abspath(str(within))).relative_to(self.vault_root)
+                    prefix = str(relative).replace("\\", "/").rstrip("/") + "/"
+                except ValueError:
+                    return []
+                if prefix == "./":
+                    prefix = ""
+            return sorted(note.path for note in self._notes.values() if note.target.startswith(prefix))
+
+    def resolve(self, target: str, *, within: str = "") -> Optional[Path]:
+        """
+        Resolve um alvo de wikilink como o Obsidian.
+
+        Ordem: caminho do vault exato, sufixo de caminho/nome do arquivo
+        (preferindo o caminho mais curto), nome normalizado e aliases.
+        ``within`` restringe a busca a uma pasta do vault (ex.: ``01-LEITURAS``).
+        """
+        cleaned = str(target or "").split("#", 1)[0].split("|", 1)[0].strip().replace("\\", "/")
+        if not cleaned:
+            return None
+
+        with self._lock:
+            self.stats["lookups"] += 1
+            self.refresh()
+            resolved = self._lookup(cleaned, within)
+            if (resolved is None or not resolved.exists()) and self._may_force_refresh():
+                # Nota criada/renomeada depois da última varredura
+                if self.refresh(force=True):
+                    resolved = self._lookup(cleaned, within)
+            return resolved
+
+    def _may_force_refresh(self) -> bool:
+        now = time.monotonic()
+        if self._forced_at is not None and now - self._forced_at < self.max_age:
+            return False
+        self._forced_at = now
+        return True
+
+    def _lookup(self, target: str, within: str) -> Optional[Path]:
+        scope = within.strip("/")
+        scope_prefix = f"{scope}/" if scope else ""
+
+        def in_scope(key: str) -> bool:
+            return self._notes[key].target.startswith(scope_prefix)
+
+        exact_target = target[:-3] if target.lower().endswith(".md") else target
+        exact = self._by_path.get(exact_target.strip("/").lower())
+        if exact is not None and in_scope(exact):
+            return self._notes[exact].path
+
+        target_name = Path(target).name or target
+        target_stem = Path(target_name).stem.strip()
+        normalized_target = _normalize_token(target_stem)
+
+        candidates: set[str] = set(self._by_name.get(target_stem.lower(), ()))
+        candidates.update(self._by_token.get(normalized_target, ()))
+        scored = [
+            (self._score(self._notes[key], target, target_stem, normalized_target), key)
+            for key in candidates
+            if in_scope(key)
+        ]
+        scored = [(score, key) for score, key in scored if score > 0]
+
+        if not scored:
+            alias_keys = self._by_alias.get(exact_target.lower()) or self._by_alias.get(target_stem.lower()) or set()
+            scored = [(60, key) for key in alias_keys if in_scope(key)]
+        if not scored:
+            return None
+
+        scored.sort(key=lambda item: (-item[0], len(self._notes[item[1]].target), item[1]))
+        return self._notes[scored[0][1]].path
+
+    @staticmethod
+    def _score(note: IndexedNote, target: str, target_stem: str, normalized_target: str) -> int:
+        stem = note.stem
+        stem_no_prefix = note.stem_no_prefix
+        score = 0
+        target_no_suffix = target[:-3] if target.lower().endswith(".md") else target
+        if ("/" + note.target.lower()).endswith("/" + target_no_suffix.strip("/").lower()):
+            score += 120
+        if stem == target_stem or stem_no_prefix == target_stem:
+            score += 100
+        elif stem.lower() == target_stem.lower() or stem_no_prefix.lower() == target_stem.lower():
+            # Obsidian ignora maiúsculas/minúsculas no nome
+            score += 95
+        if normalized_target and normalized_target in {
+            _normalize_token(stem),
+            _normalize_token(stem_no_prefix),
+            _normalize_token(note.target),
+        }:
+            score += 90
+        if score and note.path.name.startswith("📖 "):
+            score += 20
+        return score
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self.stats, "notes": len(self._notes)}
+
+
+_INDEXES: dict[str, VaultLinkIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_vault_link_index(vault_root: Path) -> VaultLinkIndex:
+    """Índice compartilhado por vault (uma instância por raiz)."""
+    key = os.path.abspath(str(vault_root))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = VaultLinkIndex(Path(key))
+            _INDEXES[key] = index
+        return index
@@ -4,6 +4,7 @@ from __future__ import annotations
 import html
 import json
 import logging
+import os
 from pathlib import Path
 import random
 import re
@@ -423,6 +424,8 @@ class DisciplineChatView(QWidget):
     FIXED_NEWS_CHAT = "Notícias"
     FIXED_CHAT_ORDER = ("__assistant__", "agenda", "noticias")
     TYPING_CURSOR = "▌"
+    # Mensagens do histórico montadas por vez (páginas anteriores sob demanda)
+    MESSAGE_PAGE_SIZE = 60
     ROLE_DATA_ROLE = Qt.ItemDataRole.UserRole + 1
     PIN_DATA_ROLE = Qt.ItemDataRole.UserRole + 2
 
@@ -446,6 +449,18 @@ class DisciplineChatView(QWidget):
         self._typing_conversation = ""
         self._typing_full_text = ""
         self._typing_visible_chars = 0
+        # Enquanto True a animação acompanha os tokens e não finaliza a mensagem.
+        self._typing_streaming = False
+        # Estado da lista montada: permite atualizar só o que mudou
+        self._rendered_conversation = ""
+        self._rendered_history_start = 0
+        self._rendered_rows: List[Tuple[Tuple[str, str], QWidget, QLabel | None]] = []
+        self._transient_row: QWidget | None = None
+        self._transient_bubble: QLabel | None = None
+        self._transient_role = ""
+        self._transient_text = ""
+        self._messages_follow_bottom = True
+        self._pending_scroll_anchor: int | None = None
 
         self.sidebar_list: QListWidget | None = None
         self.messages_layout: QVBoxLayout | None = None
@@ -593,6 +608,9 @@ class DisciplineChatView(QWidget):
         self.messages_layout.setSpacing(10)
         self.messages_layout.addStretch()
         self.messages_scroll.setWidget(messages_host)
+        messages_bar = self.messages_scroll.verticalScrollBar()
+        messages_bar.valueChanged.connect(self._on_messages_scrolled)
+        messages_bar.rangeChanged.connect(self._on_messages_range_changed)
         content_layout.addWidget(self.messages_scroll, 1)
 
         input_frame = QFrame()
@@ -786,6 +804,8 @@ class DisciplineChatView(QWidget):
         try:
             glados_controller.response_ready.connect(self._on_llm_response)
             glados_controller.error_occurred.connect(self._on_llm_error)
+            if hasattr(glados_controller, "response_chunk"):
+                glados_controller.response_chunk.connect(self._on_llm_chunk)
         except Exception as exc:
             logger.warning("Falha ao conectar sinais da LLM no DisciplineChatView: %s", exc)
 
@@ -2091,37 +2111,200 @@ class DisciplineChatView(QWidget):
         return compact[: max(20, int(max_chars) - 1)].rstrip() + "..."
 
     def _render_messages(self) -> None:
+        """
+        Sincroniza a lista de mensagens com o histórico da conversa atual.
+
+        Só as linhas que mudaram são criadas/removidas; a bolha transitória
+        (pensando/digitando) é reaproveitada. Do histórico ficam montadas
+        apenas as ``MESSAGE_PAGE_SIZE`` últimas mensagens; as anteriores entram
+        em páginas quando a rolagem chega ao topo.
+        """
         if self.messages_layout is None:
             return
 
-        while self.messages_layout.count() > 1:
-            item = self.messages_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-
         history = self._conversation_messages.get(self._current_conversation, [])
-        for role, text in history:
-            self._insert_message_row(role=role, text=text)
-
+        kept = 0
+        if self._rendered_conversation == self._current_conversation:
+            visible = history[self._rendered_history_start :]
+            for (entry, _container, _bubble), current in zip(self._rendered_rows, visible):
+                if entry is not current and entry != current:
+                    break
+                kept += 1
+
+        if kept == 0:
+            # Outra conversa ou histórico substituído: remonta só a última página
+            self._clear_message_rows()
+            self._rendered_conversation = self._current_conversation
+            self._rendered_history_start = max(0, len(history) - self.MESSAGE_PAGE_SIZE)
+            self._messages_follow_bottom = True
+
+        visible = history[self._rendered_history_start :]
+
+        changed = kept < len(visible) or kept < len(self._rendered_rows)
+        if changed:
+            # Transitória sempre depois do histórico: recriada abaixo se ainda ativa
+            self._remove_transient_row()
+            for _entry, container, _bubble in self._rendered_rows[kept:]:
+                self._discard_row_widget(container)
+            del self._rendered_rows[kept:]
+            for entry in visible[kept:]:
+                role, text = entry
+                container, bubble = self._insert_message_row(role=role, text=text)
+                self._rendered_rows.append((entry, container, bubble))
+            self._messages_follow_bottom = True
+
+        self._sync_transient_row()
+
+        if changed:
+            self._scroll_messages_to_bottom()
+
+    def _transient_message(self) -> Optional[Tuple[str, str]]:
         if self._thinking_active and self._thinking_conversation == self._current_conversation:
             dots = "." * max(1, min(self._thinking_step, 3))
             prefix = str(self._thinking_comment_text or "").strip()
             thinking_text = f"{prefix} {dots}".strip() if prefix else dots
-            self._insert_message_row(role="assistant_thinking", text=thinking_text)
-        elif self._typing_active and self._typing_conversation == self._current_conversation:
+            return "assistant_thinking", thinking_text
+        if self._typing_active and self._typing_conversation == self._current_conversation:
             partial = self._typing_full_text[: max(0, self._typing_visible_chars)]
             cursor = self.TYPING_CURSOR if (self._typing_visible_chars % 4) < 2 else ""
-            self._insert_message_row(role="assistant_typing", text=f"{partial}{cursor}")
+            return "assistant_typing", f"{partial}{cursor}"
+        return None
 
-        if self.messages_scroll is not None:
-            bar = self.messages_scroll.verticalScrollBar()
-            if bar is not None:
-                bar.setValue(bar.maximum())
+    def _sync_transient_row(self) -> None:
+        """Cria, atualiza ou remove a bolha de pensando/digitando no fim da lista."""
+        message = self._transient_message()
+        if message is None:
+            self._remove_transient_row()
+            return
+
+        role, text = message
+        if self._transient_bubble is not None and self._transient_role == role:
+            if self._transient_text != text:
+                # Tique da animação: só o texto da última bolha muda
+                self._transient_text = text
+                self._transient_bubble.setText(self._message_to_rich_html(text=text, role=role))
+                if self._messages_follow_bottom:
+                    self._scroll_messages_to_bottom()
+            return
+
+        self._remove_transient_row()
+        container, bubble = self._insert_message_row(role=role, text=text)
+        self._transient_row = container
+        self._transient_bubble = bubble
+        self._transient_role = role
+        self._transient_text = text
+        self._scroll_messages_to_bottom()
+
+    def _refresh_transient_row(self) -> None:
+        if self._rendered_conversation != self._current_conversation:
+            self._render_messages()
+            return
+        self._sync_transient_row()
 
-    def _insert_message_row(self, *, role: str, text: str) -> None:
+    def _remove_transient_row(self) -> None:
+        if self._transient_row is not None:
+            self._discard_row_widget(self._transient_row)
+        self._transient_row = None
+        self._transient_bubble = None
+        self._transient_role = ""
+        self._transient_text = ""
+
+    def _clear_message_rows(self) -> None:
         if self.messages_layout is None:
             return
+        while self.messages_layout.count() > 1:
+            item = self.messages_layout.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                widget.deleteLater()
+        self._rendered_rows = []
+        self._rendered_history_start = 0
+        self._transient_row = None
+        self._transient_bubble = None
+        self._transient_role = ""
+        self._transient_text = ""
+
+    def _discard_row_widget(self, container: QWidget) -> None:
+        if self.messages_layout is not None:
+            self.messages_layout.removeWidget(container)
+        container.hide()
+        container.deleteLater()
+
+    def _load_older_messages(self) -> bool:
+        """Monta a página anterior do histórico no topo da lista."""
+        if self.messages_layout is None or self._rendered_history_start <= 0:
+            return False
+        history = self._conversation_messages.get(self._current_conversation, [])
+        new_start = max(0, self._rendered_history_start - self.MESSAGE_PAGE_SIZE)
+        older = history[new_start : self._rendered_history_start]
+
+        bar = self.messages_scroll.verticalScrollBar() if self.messages_scroll is not None else None
+        if bar is not None:
+            # Mantém na tela a mensagem que estava no topo após o conteúdo crescer
+            self._pending_scroll_anchor = bar.maximum() - bar.value()
+        rows = []
+        for index, entry in enumerate(older):
+            role, text = entry
+            container, bubble = self._insert_message_row(role=role, text=text, index=index)
+            rows.append((entry, container, bubble))
+        self._rendered_rows[:0] = rows
+        self._rendered_history_start = new_start
+        return True
+
+    def _scroll_messages_to_bottom(self) -> None:
+        if self.messages_scroll is None:
+            return
+        bar = self.messages_scroll.verticalScrollBar()
+        if bar is not None:
+            bar.setValue(bar.maximum())
+
+    def _on_messages_scrolled(self, value: int) -> None:
+        bar = self.messages_scroll.verticalScrollBar() if self.messages_scroll is not None else None
+        if bar is None:
+            return
+        self._messages_follow_bottom = value >= bar.maximum() - 24
+        if value <= bar.minimum() and bar.maximum() > bar.minimum():
+            self._load_older_messages()
+
+    def _on_messages_range_changed(self, _minimum: int, maximum: int) -> None:
+        bar = self.messages_scroll.verticalScrollBar() if self.messages_scroll is not None else None
+        if bar is None:
+            return
+        if self._pending_scroll_anchor is not None:
+            anchor = self._pending_scroll_anchor
+            self._pending_scroll_anchor = None
+            bar.setValue(max(0, maximum - anchor))
+        elif self._messages_follow_bottom:
+            bar.setValue(maximum)
+
+    def _bubble_max_width(self) -> int:
+        max_width = 580
+        if self.messages_scroll is not None:
+            viewport = self.messages_scroll.viewport()
+            if viewport is not None:
+                viewport_w = max(420, int(viewport.width()))
+                # Limita bolhas a 60% da área do chat para usuário e LLM.
+                max_width = int(viewport_w * 0.60)
+        return max_width
+
+    def _apply_bubble_width(self, bubble: QLabel) -> None:
+        max_width = self._bubble_max_width()
+        bubble.setMaximumWidth(max_width)
+        # Evita bolhas excessivamente estreitas em mensagens curtas.
+        bubble.setMinimumWidth(min(max_width, 220))
+
+    def _update_bubble_widths(self) -> None:
+        bubbles = [bubble for _entry, _container, bubble in self._rendered_rows if bubble is not None]
+        if self._transient_bubble is not None:
+            bubbles.append(self._transient_bubble)
+        for bubble in bubbles:
+            self._apply_bubble_width(bubble)
+
+    def _insert_message_row(self, *, role: str, text: str, index: int | None = None) -> Tuple[QWidget | None, QLabel | None]:
+        if self.messages_layout is None:
+            return None, None
+        if index is None:
+            index = self.messages_layout.count() - 1
 
         if role == "news_item":
             payload = self._news_payload_from_message(text)
@@ -2133,8 +2316,8 @@ class DisciplineChatView(QWidget):
             row.addStretch(1)
             container = QWidget()
             container.setLayout(row)
-            self.messages_layout.insertWidget(self.messages_layout.count() - 1, container)
-            return
+            self.messages_layout.insertWidget(index, container)
+            return container, None
 
         row = QHBoxLayout()
         row.setContentsMargins(0, 0, 0, 0)
@@ -2148,16 +2331,7 @@ class DisciplineChatView(QWidget):
             | Qt.TextInteractionFlag.LinksAccessibleByMouse
         )
         bubble.setOpenExternalLinks(True)
-        max_width = 580
-        if self.messages_scroll is not None:
-            viewport = self.messages_scroll.viewport()
-            if viewport is not None:
-                viewport_w = max(420, int(viewport.width()))
-                # Limita bolhas a 60% da área do chat para usuário e LLM.
-                max_width = int(viewport_w * 0.60)
-        bubble.setMaximumWidth(max_width)
-        # Evita bolhas excessivamente estreitas em mensagens curtas.
-        bubble.setMinimumWidth(min(max_width, 220))
+        self._apply_bubble_width(bubble)
         bubble.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
         bubble.setText(self._message_to_rich_html(text=text, role=role))
 
@@ -2177,7 +2351,8 @@ class DisciplineChatView(QWidget):
 
         container = QWidget()
         container.setLayout(row)
-        self.messages_layout.insertWidget(self.messages_layout.count() - 1, container)
+        self.messages_layout.insertWidget(index, container)
+        return container, bubble
 
     def _message_to_rich_html(self, *, text: str, role: str) -> str:
         raw = str(text or "")
@@ -2356,7 +2531,7 @@ class DisciplineChatView(QWidget):
             return
         self._thinking_step = 1 if self._thinking_step >= 3 else (self._thinking_step + 1)
         if self._thinking_conversation == self._current_conversation:
-            self._render_messages()
+            self._refresh_transient_row()
 
     def _start_typing_animation(self, *, conversation: str, text: str) -> None:
         self._typing_active = True
@@ -2370,6 +2545,7 @@ class DisciplineChatView(QWidget):
 
     def _stop_typing_animation(self) -> None:
         self._typing_active = False
+        self._typing_streaming = False
         self._typing_conversation = ""
         self._typing_full_text = ""
         self._typing_visible_chars = 0
@@ -2383,7 +2559,7 @@ class DisciplineChatView(QWidget):
             return
 
         total = len(self._typing_full_text)
-        if total <= 0:
+        if total <= 0 and not self._typing_streaming:
             target_conversation = self._typing_conversation or self._current_conversation
             self._append_history_message(target_conversation, "assistant", "")
             self._stop_typing_animation()
@@ -2392,13 +2568,17 @@ class DisciplineChatView(QWidget):
                 self._render_messages()
             return
 
+        if self._typing_streaming and self._typing_visible_chars >= total:
+            # Aguardando próximos tokens; nada novo para desenhar.
+            return
+
         remaining = max(0, total - self._typing_visible_chars)
         step = 3 if remaining > 240 else 2 if remaining > 90 else 1
         self._typing_visible_chars = min(total, self._typing_visible_chars + step)
 
         target_conversation = self._typing_conversation or self._current_conversation
         if target_conversation == self._current_conversation:
-            self._render_messages()
+            self._refresh_transient_row()
 
         if self._typing_visible_chars >= total:
             self._append_history_message(target_conversation, "assistant", self._typing_full_text)
@@ -2921,18 +3101,38 @@ class DisciplineChatView(QWidget):
             return content[:max_chars] + "\n[...]"
         return content
 
+    def _is_active_llm_request(self, request_metadata: Any) -> bool:
+        request_metadata = request_metadata if isinstance(request_metadata, dict) else {}
+        source_view = str(request_metadata.get("view") or "").strip()
+        if source_view and source_view != "discipline_chat":
+            return False
+        request_id = str(request_metadata.get("request_id") or "").strip()
+        return not (request_id and request_id != self._active_request_id)
+
+    def _on_llm_chunk(self, payload: Dict[str, Any]) -> None:
+        if not self._llm_inflight or not isinstance(payload, dict):
+            return
+        if not self._is_active_llm_request(payload.get("request_metadata")):
+            return
+        partial = str(payload.get("text") or "").lstrip()
+        if not partial:
+            return
+
+        if not self._typing_streaming:
+            # Primeiro token: troca o indicador de "pensando" pela prévia da resposta.
+            target_conversation = self._active_request_conversation or self._current_conversation
+            self._stop_processing_indicator()
+            self._start_typing_animation(conversation=target_conversation, text=partial)
+            self._typing_streaming = True
+            return
+        self._typing_full_text = partial
+
     def _on_llm_response(self, payload: Dict[str, Any]) -> None:
         if not self._llm_inflight:
             return
         metadata = payload.get("metadata") if isinstance(payload, dict) else {}
         metadata = metadata if isinstance(metadata, dict) else {}
-        request_metadata = metadata.get("request_metadata", {})
-        request_metadata = request_metadata if isinstance(request_metadata, dict) else {}
-        source_view = str(request_metadata.get("view") or "").strip()
-        if source_view and source_view != "discipline_chat":
-            return
-        request_id = str(request_metadata.get("request_id") or "").strip()
-        if request_id and request_id != self._active_request_id:
+        if not self._is_active_llm_request(metadata.get("request_metadata", {})):
             return
 
         text = str(payload.get("text") or "").strip() or "Sem conteúdo retornado."
@@ -2943,6 +3143,13 @@ class DisciplineChatView(QWidget):
         self._stop_processing_indicator()
         self._active_request_id = ""
         self._active_request_conversation = ""
+        if self._typing_active and self._typing_streaming:
+            # Resposta final substitui a prévia mantendo o trecho já digitado em comum.
+            shown = self._typing_full_text[: self._typing_visible_chars]
+            self._typing_visible_chars = len(os.path.commonprefix([shown, text]))
+            self._typing_full_text = text
+            self._typing_streaming = False
+            return
         self._start_typing_animation(conversation=target_conversation, text=text)
 
     def _on_llm_error(self, error_type: str, error_message: str, _context: str) -> None:
@@ -2968,6 +3175,11 @@ class DisciplineChatView(QWidget):
         super().showEvent(event)
         self._load_conversations()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Linhas montadas persistem entre renderizações: reajusta a largura das bolhas
+        self._update_bubble_widths()
+
     def _list_existing_books_from_vault(self, vault_root: Path) -> List[Dict[str, str]]:
         reading_root = vault_root / "01-LEITURAS"
         if not reading_root.exists():
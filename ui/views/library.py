@@ -11,8 +11,8 @@ from typing import Any, Dict, Optional
 from datetime import datetime, timedelta
 
 import yaml
-from PyQt6.QtCore import QDate, QEvent, Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QAction, QColor, QFont, QGuiApplication, QLinearGradient, QPainter, QPixmap, QPen
+from PyQt6.QtCore import QDate, QEvent, Qt, pyqtSignal, QThread, QTimer
+from PyQt6.QtGui import QAction, QColor, QFont, QGuiApplication, QImage, QLinearGradient, QPainter, QPixmap, QPen
 from PyQt6.QtWidgets import (
     QComboBox,
     QDateEdit,
@@ -37,6 +37,7 @@ from PyQt6.QtWidgets import (
 
 from ui.widgets.cards.add_book_card import AddBookCard
 from ui.utils.citation_notes import backfill_citation_notes
+from ui.utils.cover_thumbnails import CoverThumbnailLoader
 from ui.utils.nerd_icons import LEGACY_BOOK_FILE_PATTERNS, NerdIcons, nerd_font
 
 logger = logging.getLogger("GLaDOS.UI.LibraryView")
@@ -49,6 +50,42 @@ except Exception:
     core_settings = None
 
 
+class CitationNotesBackfillWorker(QThread):
+    """Executa o backfill incremental de notas de citações fora da thread da UI."""
+
+    progress = pyqtSignal(int, int, str)  # (feitos, total, obra)
+    completed = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, vault_root: Path):
+        super().__init__()
+        self.vault_root = Path(vault_root)
+
+    def run(self):
+        try:
+            result = backfill_citation_notes(self.vault_root, progress_callback=self._report_progress)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.completed.emit(result)
+
+    @staticmethod
+    def interrupt(worker: "CitationNotesBackfillWorker") -> None:
+        try:
+            worker.requestInterruption()
+        except RuntimeError:
+            # Worker já concluído e destruído
+            pass
+
+    def _report_progress(self, done: int, total: int, book_name: str) -> bool:
+        self.progress.emit(done, total, book_name)
+        return not self.isInterruptionRequested()
+
+
+# Workers em execução: mantidos vivos até terminarem mesmo se a view for destruída
+_ACTIVE_BACKFILL_WORKERS: set[CitationNotesBackfillWorker] = set()
+
+
 class MetadataEditDialog(QDialog):
     """Diálogo simples para editar metadados de livro."""
 
@@ -163,7 +200,6 @@ class LibraryBookTile(QFrame):
         book_dir: Path,
         title: str,
         author: str,
-        cover_path: Optional[Path],
         progress_percent: float = 0.0,
         completed: bool = False,
         progress_current: int = 0,
@@ -175,12 +211,13 @@ class LibraryBookTile(QFrame):
         self.book_dir = book_dir
         self.title = title
         self.author = author
-        self.cover_path = cover_path
         self.progress_percent = max(0.0, min(100.0, float(progress_percent or 0.0)))
         self.completed = bool(completed)
         self.progress_current = max(0, int(progress_current or 0))
         self.progress_total = max(0, int(progress_total or 0))
         self.badge_text = badge_text
+        # Miniatura entregue pelo carregador em segundo plano (None = placeholder)
+        self.cover_pixmap: Optional[QPixmap] = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -288,20 +325,17 @@ class LibraryBookTile(QFrame):
         return pixmap
 
     def _render_cover(self):
-        if self.cover_path and self.cover_path.exists():
-            pixmap = QPixmap(str(self.cover_path))
-            if not pixmap.isNull():
-                scaled = pixmap.scaled(
-                    self.cover_label.size(),
-                    Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                self.cover_label.setPixmap(scaled)
-                self.cover_label.setText("")
-                return
-        self.cover_label.setPixmap(self._placeholder_cover())
+        if self.cover_pixmap is not None and not self.cover_pixmap.isNull():
+            self.cover_label.setPixmap(self.cover_pixmap)
+        else:
+            self.cover_label.setPixmap(self._placeholder_cover())
         self.cover_label.setText("")
 
+    def set_cover_pixmap(self, pixmap: Optional[QPixmap]):
+        """Troca o placeholder pela miniatura já escalada."""
+        self.cover_pixmap = pixmap
+        self._render_cover()
+
     def _render_progress_indicator(self):
         size = self.progress_label.size()
         pixmap = QPixmap(size)
@@ -380,7 +414,21 @@ class LibraryView(QWidget):
         self.sort_mode = "recent"
         self.sort_toggle_button: Optional[QPushButton] = None
         self._render_retry_count = 0
-        self._citation_notes_backfill_done = False
+        self._citation_backfill_worker: Optional[CitationNotesBackfillWorker] = None
+        self.cover_loader = CoverThumbnailLoader(parent=self)
+        self.cover_loader.thumbnail_ready.connect(self._on_cover_thumbnail_ready)
+        # O loader (filho) já foi destruído quando o sinal chega; shutdown só usa o pool sem pai
+        self.destroyed.connect(lambda _obj=None, loader=self.cover_loader: loader.shutdown())
+        # Miniaturas por pasta do livro; None = sem capa legível
+        self._cover_pixmaps: Dict[str, Optional[QPixmap]] = {}
+        self._stale_covers: set[str] = set()
+        self._tiles: Dict[str, LibraryBookTile] = {}
+        self._visible_covers_timer = QTimer(self)
+        self._visible_covers_timer.setSingleShot(True)
+        self._visible_covers_timer.setInterval(40)
+        self._visible_covers_timer.timeout.connect(self._load_visible_covers)
+        self._citation_backfill_rerun = False
+        self.citation_backfill_label: Optional[QLabel] = None
         self._layout_timer = QTimer(self)
         self._layout_timer.setSingleShot(True)
         self._layout_timer.timeout.connect(self._render_books_grid)
@@ -502,6 +550,10 @@ class LibraryView(QWidget):
         self.books_count_label = QLabel("0 livros")
         self.books_count_label.setObjectName("library_count_label")
 
+        self.citation_backfill_label = QLabel("")
+        self.citation_backfill_label.setObjectName("library_count_label")
+        self.citation_backfill_label.setVisible(False)
+
         self.search_input = QLineEdit()
         self.search_input.setObjectName("library_search_input")
         self.search_input.setPlaceholderText("Buscar por título ou autor...")
@@ -511,6 +563,7 @@ class LibraryView(QWidget):
         controls.addWidget(self.sort_toggle_button)
         controls.addWidget(refresh_button)
         controls.addWidget(self.books_count_label)
+        controls.addWidget(self.citation_backfill_label)
         controls.addStretch(1)
         controls.addWidget(self.search_input, 1)
         books_panel_layout.addLayout(controls)
@@ -532,6 +585,7 @@ class LibraryView(QWidget):
         self.books_scroll.setAcceptDrops(True)
         self.books_scroll.viewport().setAcceptDrops(True)
         self.books_scroll.viewport().installEventFilter(self)
+        self.books_scroll.verticalScrollBar().valueChanged.connect(self._schedule_visible_covers)
         books_widget = QWidget()
         books_widget.setAcceptDrops(True)
         books_widget.installEventFilter(self)
@@ -576,6 +630,10 @@ class LibraryView(QWidget):
             self.book_controller.book_processing_completed.connect(self._on_processing_completed)
             self.book_controller.book_processing_failed.connect(self.add_book_card.on_processing_failed)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_visible_covers()
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._layout_timer.start(100)
@@ -821,58 +879,29 @@ class LibraryView(QWidget):
         books_root = self._books_root()
         return books_root.parent if books_root else None
 
-    def _find_cover_file(self, book_dir: Path) -> Optional[Path]:
-        candidates = [
-            "cover.jpg",
-            "cover.jpeg",
-            "cover.png",
-            "cover.webp",
-            "capa.jpg",
-            "capa.jpeg",
-            "capa.png",
-            "capa.webp",
-        ]
-        for filename in candidates:
-            path = book_dir / filename
-            if path.exists() and path.is_file():
-                return path
-        return None
-
-    def _create_blank_cover(self, cover_path: Path, title: str):
-        pixmap = QPixmap(680, 920)
-        pixmap.fill(QColor("#FFFFFF"))
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        frame_rect = pixmap.rect().adjusted(18, 18, -18, -18)
-        painter.setPen(QColor("#C6CDD6"))
-        painter.drawRoundedRect(frame_rect, 20, 20)
-
-        title_rect = frame_rect.adjusted(50, 80, -50, -80)
-        painter.setPen(QColor("#1F2933"))
-        painter.setFont(QFont("Georgia", 44, QFont.Weight.Bold))
-        text_flags = int(Qt.AlignmentFlag.AlignCenter) | int(Qt.TextFlag.TextWordWrap)
-        painter.drawText(
-            title_rect,
-            text_flags,
-            str(title or "Livro"),
-        )
-        painter.end()
-        pixmap.save(str(cover_path), "PNG")
+    def _schedule_visible_covers(self, *_args) -> None:
+        self._visible_covers_timer.start()
 
-    def _ensure_cover_file(self, book_dir: Path, title: str) -> Optional[Path]:
-        cover_path = self._find_cover_file(book_dir)
-        if cover_path:
-            return cover_path
-
-        generated_cover = book_dir / "cover.png"
-        try:
-            self._create_blank_cover(generated_cover, title)
-            if generated_cover.exists() and generated_cover.is_file():
-                return generated_cover
-        except Exception as exc:
-            logger.warning("Falha ao gerar capa placeholder para %s: %s", book_dir, exc)
-        return None
+    def _load_visible_covers(self) -> None:
+        """Pede miniaturas só dos cards que estão na área visível."""
+        for key, tile in self._tiles.items():
+            if key in self._cover_pixmaps and key not in self._stale_covers:
+                continue
+            if self.cover_loader.is_pending(key) or not tile.isVisible() or tile.visibleRegion().isEmpty():
+                continue
+            self.cover_loader.request(key, tile.book_dir, tile.title)
+
+    def _on_cover_thumbnail_ready(self, key: str, image: QImage) -> None:
+        pixmap = None if image.isNull() else QPixmap.fromImage(image)
+        self._cover_pixmaps[key] = pixmap
+        self._stale_covers.discard(key)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            try:
+                tile.set_cover_pixmap(pixmap)
+            except RuntimeError:
+                # Card já descartado por uma nova renderização
+                self._tiles.pop(key, None)
 
     def _find_index_note(self, book_dir: Path) -> Optional[Path]:
         for pattern in (*LEGACY_BOOK_FILE_PATTERNS, "*.md"):
@@ -1104,7 +1133,6 @@ class LibraryView(QWidget):
                                 "title": str(book_dir.name),
                                 "author": str(author_dir.name),
                                 "book_dir": book_dir,
-                                "cover_path": self._ensure_cover_file(book_dir, str(book_dir.name)),
                             }
                         )
                 logger.info(
@@ -1116,6 +1144,8 @@ class LibraryView(QWidget):
             except Exception as exc:
                 logger.error("Falha ao carregar biblioteca em %s: %s", root, exc)
         self._books_cache = books
+        # Capas podem ter mudado: mantém as miniaturas atuais até as novas chegarem
+        self._stale_covers = set(self._cover_pixmaps)
         logger.info("Library refresh concluído | livros_total=%d | roots=%s", len(books), checked_roots)
         self._run_citation_notes_backfill()
         if self.empty_label:
@@ -1123,17 +1153,47 @@ class LibraryView(QWidget):
         self._render_books_grid()
 
     def _run_citation_notes_backfill(self) -> None:
-        if self._citation_notes_backfill_done:
-            return
+        """Dispara o backfill incremental em segundo plano (uma execução por vez)."""
         vault_root = self._vault_root()
         if not vault_root:
             return
-        try:
-            result = backfill_citation_notes(vault_root)
-            self._citation_notes_backfill_done = True
-            logger.info("Backfill de notas de citações concluído: %s", result)
-        except Exception as exc:
-            logger.warning("Falha no backfill de notas de citações: %s", exc)
+        if self._citation_backfill_worker is not None:
+            self._citation_backfill_rerun = True
+            return
+
+        worker = CitationNotesBackfillWorker(vault_root)
+        worker.progress.connect(self._on_citation_backfill_progress)
+        worker.completed.connect(self._on_citation_backfill_completed)
+        worker.failed.connect(self._on_citation_backfill_failed)
+        worker.finished.connect(self._on_citation_backfill_finished)
+        worker.finished.connect(worker.deleteLater)
+        worker.destroyed.connect(lambda _obj=None, w=worker: _ACTIVE_BACKFILL_WORKERS.discard(w))
+        self.destroyed.connect(lambda _obj=None, w=worker: CitationNotesBackfillWorker.interrupt(w))
+        _ACTIVE_BACKFILL_WORKERS.add(worker)
+        self._citation_backfill_worker = worker
+        worker.start()
+
+    def _on_citation_backfill_progress(self, done: int, total: int, book_name: str) -> None:
+        if not self.citation_backfill_label:
+            return
+        self.citation_backfill_label.setText(f"Citações: {done}/{total}")
+        self.citation_backfill_label.setToolTip(f"Atualizando notas de citações: {book_name}")
+        self.citation_backfill_label.setVisible(done < total)
+
+    def _on_citation_backfill_completed(self, result: dict) -> None:
+        logger.info("Backfill de notas de citações concluído: %s", result)
+
+    def _on_citation_backfill_failed(self, error: str) -> None:
+        logger.warning("Falha no backfill de notas de citações: %s", error)
+
+    def _on_citation_backfill_finished(self) -> None:
+        self._citation_backfill_worker = None
+        if self.citation_backfill_label:
+            self.citation_backfill_label.setVisible(False)
+        if self._citation_backfill_rerun:
+            # Houve refresh durante a execução: só as obras alteradas desde então
+            self._citation_backfill_rerun = False
+            self._run_citation_notes_backfill()
 
     def _apply_status_and_search_filters(self, books: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
         if self.status_filter_mode == "aulas":
@@ -1220,6 +1280,7 @@ class LibraryView(QWidget):
                     QTimer.singleShot(120, self._render_books_grid)
                 return
             self._render_retry_count = 0
+            self._tiles = {}
             while shelves_layout.count():
                 item = shelves_layout.takeAt(0)
                 widget = item.widget()
@@ -1315,7 +1376,6 @@ class LibraryView(QWidget):
                         book_dir=book["book_dir"],
                         title=book["title"],
                         author=book["author"],
-                        cover_path=book["cover_path"],
                         progress_percent=float(book.get("progress_percent", 0.0) or 0.0),
                         completed=bool(book.get("progress_completed", False)),
                         progress_current=int(book.get("progress_current", 0) or 0),
@@ -1327,6 +1387,10 @@ class LibraryView(QWidget):
                     tile.schedule_requested.connect(self._open_schedule_dialog)
                     tile.review_requested.connect(self._open_review_dialog)
                     tile.remove_requested.connect(self._remove_book)
+                    tile_key = str(book["book_dir"])
+                    if self._cover_pixmaps.get(tile_key) is not None:
+                        tile.set_cover_pixmap(self._cover_pixmaps[tile_key])
+                    self._tiles[tile_key] = tile
 
                     if self.sort_mode == "author":
                         rows_to_render[0].addWidget(tile)
@@ -1340,6 +1404,7 @@ class LibraryView(QWidget):
                     row_width = (200 * len(author_books)) + (10 * max(0, len(author_books) - 1)) + 20
                     books_row.setFixedSize(max(row_width, 220), 285)
                     shelf_scroll.setWidget(books_row)
+                    shelf_scroll.horizontalScrollBar().valueChanged.connect(self._schedule_visible_covers)
                     shelf_layout.addWidget(shelf_scroll)
                 else:
                     shelf_layout.addWidget(wrap_widget)
@@ -1360,6 +1425,7 @@ class LibraryView(QWidget):
             if self.books_scroll and self.books_scroll.widget():
                 self.books_scroll.widget().adjustSize()
                 self.books_scroll.viewport().update()
+            self._schedule_visible_covers()
         except Exception as exc:
             logger.exception("Falha ao renderizar prateleiras: %s", exc)
 
@@ -1371,6 +1437,7 @@ class LibraryView(QWidget):
             self.books_scroll = QScrollArea()
             self.books_scroll.setWidgetResizable(True)
             self.books_scroll.setFrameShape(QFrame.Shape.NoFrame)
+            self.books_scroll.verticalScrollBar().valueChanged.connect(self._schedule_visible_covers)
             drop_layout = self.books_drop_zone.layout() if self.books_drop_zone else None
             if isinstance(drop_layout, QVBoxLayout):
                 drop_layout.addWidget(self.books_scroll, 1)
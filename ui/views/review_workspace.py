@@ -8,7 +8,6 @@ import json
 import logging
 import re
 import shutil
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -4933,7 +4932,7 @@ class ReviewWorkspaceView(QWidget):
         except Exception:
             return
 
-        link_line = f"- [[{str(relative).replace('\\\\', '/')}|{note_path.stem}]]"
+        link_line = f"- [[{relative.as_posix()}|{note_path.stem}]]"
         target = self.current_source_note_path
 
         try:
@@ -5015,10 +5014,7 @@ class ReviewWorkspaceView(QWidget):
             self.pomodoro_timer_button.setText(self._format_mmss(self.pomodoro._get_duration_for_type("work")))
             return
 
-        now = time.time()
-        elapsed = now - self.pomodoro.start_time - self.pomodoro.elapsed_paused
-        total = self.pomodoro._get_duration_for_type(self.pomodoro.current_session_type)
-        remaining = max(total - elapsed, 0)
+        remaining = self.pomodoro.remaining_seconds()
 
         prefix = "⏸ " if self.pomodoro.is_paused else ""
         self.pomodoro_timer_button.setText(f"{prefix}{self._format_mmss(int(remaining))}")
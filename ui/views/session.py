@@ -4316,6 +4316,8 @@ class SessionView(QWidget):
         self._apply_chat_preset(selected_preset)
         self._review_backend_metadata = {
             "workflow": "review_generation",
+            # Geração em lote: cede a vez (e é interrompida) quando há pergunta no chat
+            "priority": "background",
             "book_title": self.current_book_title,
             "chapter_path": str(self.current_chapter_path) if self.current_chapter_path else "",
             "chapter_difficulty": self._review_chapter_difficulty,
@@ -6332,13 +6334,9 @@ class SessionView(QWidget):
                 self.session_pomodoro_toggle_button.setText("Iniciar")
             return
 
-        now = time.time()
-        if self.pomodoro.is_paused and self.pomodoro.paused_time:
-            elapsed = self.pomodoro.paused_time - self.pomodoro.start_time - self.pomodoro.elapsed_paused
-        else:
-            elapsed = now - self.pomodoro.start_time - self.pomodoro.elapsed_paused
+        elapsed = self.pomodoro.elapsed_seconds()
         total_seconds = max(1, self.pomodoro._get_duration_for_type(session_type))
-        remaining = max(int(total_seconds - elapsed), 0)
+        remaining = int(self.pomodoro.remaining_seconds())
         progress = max(0.0, min(1.0, elapsed / total_seconds))
 
         if (
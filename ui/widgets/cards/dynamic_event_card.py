@@ -7,6 +7,7 @@ import logging
 import random
 import re
 from pathlib import Path
+from typing import Optional
 
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QRectF, QPropertyAnimation, QEvent
 from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QFont
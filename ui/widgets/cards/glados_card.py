@@ -35,6 +35,7 @@ class GladosCard(PhilosophyCard):
         self.auto_search_enabled = True
         self.current_context_payload = {}
         self.current_notes_context_text = ""
+        self._stream_preview_start = None  # posição da prévia em streaming no chat
         
         # Inicializar atributos de widget para evitar AttributeError
         self.avatar_label = None
@@ -329,6 +330,8 @@ class GladosCard(PhilosophyCard):
             try:
                 if hasattr(self.controller, 'response_ready'):
                     self.controller.response_ready.connect(self.handle_backend_response)
+                if hasattr(self.controller, 'response_chunk'):
+                    self.controller.response_chunk.connect(self.handle_backend_chunk)
                 if hasattr(self.controller, 'vault_results_ready'):
                     self.controller.vault_results_ready.connect(self.handle_vault_results)
                 if hasattr(self.controller, 'semantic_context_ready'):
@@ -435,9 +438,30 @@ class GladosCard(PhilosophyCard):
     @pyqtSlot(dict)
     def handle_backend_response(self, response):
         """Processar resposta do backend"""
+        self._clear_stream_preview()
         text = response.get("text", "Sem resposta")
         self.add_message_to_chat(text, "assistant")
 
+    @pyqtSlot(dict)
+    def handle_backend_chunk(self, chunk):
+        """Atualiza a prévia da resposta enquanto a LLM gera os tokens"""
+        text = str(chunk.get("text") or "").strip()
+        if not text or self.chat_widget is None:
+            return
+        self._clear_stream_preview()
+        self._stream_preview_start = max(0, self.chat_widget.document().characterCount() - 1)
+        self.add_message_to_chat(text, "assistant")
+
+    def _clear_stream_preview(self):
+        """Remove a prévia em streaming (substituída pela resposta final)"""
+        if self._stream_preview_start is None or self.chat_widget is None:
+            return
+        cursor = QTextCursor(self.chat_widget.document())
+        cursor.setPosition(min(self._stream_preview_start, self.chat_widget.document().characterCount() - 1))
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        self._stream_preview_start = None
+
     @pyqtSlot(dict)
     def handle_vault_results(self, results):
         """Mostra resumo dos resultados de busca no vault."""
@@ -478,6 +502,7 @@ class GladosCard(PhilosophyCard):
     @pyqtSlot(str, str, str)
     def handle_error(self, error_type, error_message, context):
         """Processar erro"""
+        self._clear_stream_preview()
         self.add_message_to_chat(f"Erro: {error_message}", "error")
         self.handle_processing_completed("error")
         